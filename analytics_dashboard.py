@@ -16,7 +16,7 @@ import json
 import argparse
 import logging
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, List, Optional
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
@@ -28,6 +28,7 @@ load_dotenv()
 
 # Set up centralized logging
 from utils.logging_utils import setup_logging
+from utils.trade_archive import open_trade_archive
 setup_logging(log_level="INFO", log_file="logs/analytics_dashboard.log")
 logger = logging.getLogger(__name__)
 
@@ -39,10 +40,12 @@ class TradingAnalytics:
         self,
         trade_log_path: str = "logs/trade_log.csv",
         bankroll_path: str = "bankroll.json",
+        since: Optional[str] = None,
     ):
-        """Initialize analytics with data paths."""
+        """Initialize analytics with data paths (since: only trades on or after YYYY-MM-DD)."""
         self.trade_log_path = trade_log_path
         self.bankroll_path = bankroll_path
+        self.since = since
         self.trades_df = None
         self.bankroll_data = None
         self.metrics = {}
@@ -55,14 +58,21 @@ class TradingAnalytics:
         self.bankroll_data = {}
 
         try:
+            # Prefer the date-partitioned columnar archive when it exists
+            archive = open_trade_archive(self.trade_log_path)
+            if archive is not None:
+                self.trades_df = archive.read(start=self.since)
+                logger.info(f"Loaded {len(self.trades_df)} trades from archive {archive.root}")
+
             # Load trade log with robust CSV parsing
-            if os.path.exists(self.trade_log_path):
+            if archive is not None or os.path.exists(self.trade_log_path):
                 try:
-                    # Try normal CSV parsing first
-                    self.trades_df = pd.read_csv(self.trade_log_path)
-                    logger.info(
-                        f"Loaded {len(self.trades_df)} trades from {self.trade_log_path}"
-                    )
+                    if archive is None:
+                        # Try normal CSV parsing first
+                        self.trades_df = pd.read_csv(self.trade_log_path)
+                        logger.info(
+                            f"Loaded {len(self.trades_df)} trades from {self.trade_log_path}"
+                        )
                 except pd.errors.ParserError as e:
                     logger.warning(f"CSV parsing error: {e}. Attempting to fix...")
                     # Try with error handling for inconsistent field counts
@@ -108,6 +118,17 @@ class TradingAnalytics:
                             logger.warning(
                                 "Keeping timestamps as strings - some analytics may be limited"
                             )
+
+                # Date filter for the CSV path (the archive prunes partitions instead)
+                if (
+                    self.since
+                    and archive is None
+                    and "timestamp" in self.trades_df.columns
+                    and pd.api.types.is_datetime64_any_dtype(self.trades_df["timestamp"])
+                ):
+                    self.trades_df = self.trades_df[
+                        self.trades_df["timestamp"] >= pd.Timestamp(self.since[:10])
+                    ].reset_index(drop=True)
             else:
                 logger.warning(f"Trade log not found: {self.trade_log_path}")
 
@@ -713,11 +734,14 @@ def main():
     parser.add_argument(
         "--charts", action="store_true", help="Generate performance charts"
     )
+    parser.add_argument(
+        "--since", help="Only include trades on or after this date (YYYY-MM-DD)"
+    )
 
     args = parser.parse_args()
 
     # Initialize analytics
-    analytics = TradingAnalytics()
+    analytics = TradingAnalytics(since=args.since)
 
     # Generate and display report
     if args.mode == "cli":
@@ -47,7 +47,9 @@ import yaml
 import os
 from dotenv import load_dotenv
 import csv
-from typing import Dict, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional
 from zoneinfo import ZoneInfo
 
 # Import our utilities
@@ -350,7 +352,9 @@ def generate_daily_summary(config: Dict, end_time: datetime) -> str:
             broker = config.get('BROKER', 'robinhood')
             env = config.get('ALPACA_ENV', 'live') if broker == 'alpaca' else 'live'
             start_capital = config.get('START_CAPITAL_DEFAULT', config.get('START_CAPITAL', 500.0))
-            bankroll_manager = BankrollManager(start_capital=start_capital, broker=broker, env=env)
+            bankroll_manager = BankrollManager(
+                start_capital=start_capital, broker=broker, env=env, backend=config.get('BANKROLL_BACKEND')
+            )
             current_bankroll = bankroll_manager.get_current_bankroll()
             peak_bankroll = getattr(bankroll_manager, 'peak_bankroll', current_bankroll)
         except Exception:
@@ -385,6 +389,7 @@ def execute_multi_symbol_trade(
     portfolio_manager,
     slack_notifier,
     bot=None,
+    reservation_id: Optional[str] = None,
 ) -> Dict:
     """
     Execute a pre-approved multi-symbol trading opportunity directly.
@@ -401,6 +406,7 @@ def execute_multi_symbol_trade(
         portfolio_manager: Portfolio tracking instance
         slack_notifier: Slack notification instance
         bot: Existing browser instance to reuse
+        reservation_id: Capital reservation held for this trade (concurrent execution)
 
     Returns:
         Dict: Execution result with bot instance
@@ -467,7 +473,8 @@ def execute_multi_symbol_trade(
             
             # Execute Alpaca trade with enhanced error handling
             result = execute_alpaca_multi_symbol_trade(
-                trader, opportunity, config, bankroll_manager, portfolio_manager, slack_notifier, trade_action, args
+                trader, opportunity, config, bankroll_manager, portfolio_manager, slack_notifier, trade_action, args,
+                reservation_id=reservation_id,
             )
             
             # Enhanced spillover: mark contract selection failures for spillover
@@ -662,10 +669,137 @@ def execute_multi_symbol_trade(
     return {"bot": bot}
 
 
+# Serializes ledger/portfolio writes from concurrently executing trades
+_trade_record_lock = threading.Lock()
+
+
+def execute_opportunities_concurrently(
+    opportunities: List[Dict],
+    config: Dict,
+    args,
+    env_vars: Dict,
+    bankroll_manager,
+    portfolio_manager,
+    slack_notifier,
+    max_trades: int,
+) -> List[Dict]:
+    """
+    Execute the top-ranked opportunities in parallel with reserved capital.
+
+    Each dispatched opportunity first reserves its risk budget
+    (bankroll x RISK_FRACTION) from the bankroll manager, so concurrent
+    trades can never over-commit capital. Contract selection, order
+    placement and fill confirmation then run in parallel. Reservations are
+    committed on fill and rolled back on failure or no-fill, and failed
+    slots spill over to the next-ranked opportunity. New trades are also
+    capped at MAX_POSITIONS minus the positions already open, since each
+    worker's own position check cannot see the trades running beside it.
+
+    Args:
+        opportunities: Ranked opportunities from the multi-symbol scanner
+        config: Trading configuration
+        args: Command line arguments
+        env_vars: Environment variables
+        bankroll_manager: Bankroll management instance
+        portfolio_manager: Portfolio tracking instance
+        slack_notifier: Slack notification instance
+        max_trades: Maximum number of trades to fill (and run concurrently)
+
+    Returns:
+        List of execution results in completion order
+    """
+    alpaca_env = config.get("ALPACA_ENV", "paper")
+    if not sync_before_trade(env=alpaca_env):
+        logger.warning("[MULTI-SYMBOL-PARALLEL] Alpaca sync failed - proceeding with caution")
+
+    risk_budget = bankroll_manager.get_current_bankroll() * config["RISK_FRACTION"]
+    # Position slots are reserved like capital: each worker only sees the
+    # positions already on file, so the wave itself must respect MAX_POSITIONS
+    max_positions = config.get("MAX_POSITIONS", 3)
+    open_positions = len(portfolio_manager.load_positions())
+    trade_limit = min(max_trades, max(0, max_positions - open_positions))
+    if trade_limit < max_trades:
+        logger.info(
+            f"[MULTI-SYMBOL-PARALLEL] {open_positions}/{max_positions} positions open - "
+            f"limiting this scan to {trade_limit} new trade(s)"
+        )
+    pending = list(opportunities)
+    results = []
+    filled = 0
+    capital_exhausted = False
+
+    with ThreadPoolExecutor(max_workers=max(1, trade_limit), thread_name_prefix="trade-exec") as executor:
+        while pending and filled < trade_limit and not capital_exhausted:
+            # Reserve capital and a position slot for the next wave before dispatching anything
+            futures = {}
+            while pending and len(futures) < trade_limit - filled:
+                opp = pending.pop(0)
+                symbol = opp["symbol"]
+                reservation_id = bankroll_manager.reserve_capital(risk_budget, label=symbol)
+                if reservation_id is None:
+                    logger.warning(
+                        f"[MULTI-SYMBOL-PARALLEL] Insufficient unreserved capital for {symbol} - "
+                        f"not dispatching further opportunities"
+                    )
+                    capital_exhausted = True
+                    break
+                future = executor.submit(
+                    execute_multi_symbol_trade,
+                    opportunity=opp,
+                    config=config,
+                    args=args,
+                    env_vars=env_vars,
+                    bankroll_manager=bankroll_manager,
+                    portfolio_manager=portfolio_manager,
+                    slack_notifier=slack_notifier,
+                    reservation_id=reservation_id,
+                )
+                futures[future] = (symbol, reservation_id)
+
+            if not futures:
+                break
+
+            logger.info(
+                f"[MULTI-SYMBOL-PARALLEL] Dispatched {len(futures)} trade(s): "
+                f"{', '.join(symbol for symbol, _ in futures.values())}"
+            )
+
+            for future in as_completed(futures):
+                symbol, reservation_id = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logger.error(f"[MULTI-SYMBOL-PARALLEL] {symbol} execution raised: {e}")
+                    result = {"status": "ERROR", "success": False, "reason": str(e)}
+
+                result.setdefault("symbol", symbol)
+                if result.get("success", False):
+                    bankroll_manager.commit_reservation(reservation_id, result.get("total_cost", 0.0))
+                    filled += 1
+                    logger.info(f"[MULTI-SYMBOL-PARALLEL] Trade executed successfully for {symbol}")
+                else:
+                    reason = result.get("reason", "Unknown error")
+                    bankroll_manager.release_reservation(reservation_id, reason=reason)
+                    logger.warning(
+                        f"[MULTI-SYMBOL-PARALLEL] {symbol} failed "
+                        f"({result.get('error_type', 'unknown')}): {reason}"
+                    )
+                results.append(result)
+
+    logger.info(f"[MULTI-SYMBOL-PARALLEL] {filled}/{trade_limit} trade(s) filled this scan")
+    return results
+
+
 def execute_alpaca_multi_symbol_trade(
-    trader, opportunity, config, bankroll_manager, portfolio_manager, slack_notifier, trade_action, args
+    trader, opportunity, config, bankroll_manager, portfolio_manager, slack_notifier, trade_action, args,
+    reservation_id=None,
 ):
-    """Execute multi-symbol trade using Alpaca API."""
+    """Execute multi-symbol trade using Alpaca API.
+
+    When reservation_id is given the trade is sized against the capital
+    reserved for it, and the account sync is assumed to have been done once
+    by the concurrent execution stage.
+    """
     from utils.trade_confirmation import TradeConfirmationManager
     
     symbol = opportunity["symbol"]
@@ -685,10 +819,11 @@ def execute_alpaca_multi_symbol_trade(
     
     try:
         # Sync with Alpaca account before trading
-        alpaca_env = config.get("ALPACA_ENV", "paper")
-        sync_success = sync_before_trade(env=alpaca_env)
-        if not sync_success:
-            logger.warning(f"[MULTI-SYMBOL-ALPACA] Alpaca sync failed for {symbol} - proceeding with caution")
+        if reservation_id is None:
+            alpaca_env = config.get("ALPACA_ENV", "paper")
+            sync_success = sync_before_trade(env=alpaca_env)
+            if not sync_success:
+                logger.warning(f"[MULTI-SYMBOL-ALPACA] Alpaca sync failed for {symbol} - proceeding with caution")
         
         # Check market hours and trading window
         is_valid, reason_msg = trader.is_market_open_and_valid_time()
@@ -736,8 +871,11 @@ def execute_alpaca_multi_symbol_trade(
         
         # Validate position size
         total_cost = premium * quantity * 100  # Options multiplier
-        current_bankroll = bankroll_manager.get_current_bankroll()
-        max_risk = current_bankroll * config["RISK_FRACTION"]
+        if reservation_id is not None:
+            max_risk = bankroll_manager.get_reservation(reservation_id)
+        else:
+            current_bankroll = bankroll_manager.get_current_bankroll()
+            max_risk = current_bankroll * config["RISK_FRACTION"]
         
         if total_cost > max_risk:
             quantity = int(max_risk / (premium * 100))
@@ -803,18 +941,41 @@ def execute_alpaca_multi_symbol_trade(
             
             if order_id:
                 logger.info(f"[MULTI-SYMBOL-ALPACA] {symbol} order submitted successfully: {order_id}")
-                # For now, assume order will fill (Alpaca handles this asynchronously)
-                # In production, you'd want to poll for fill status using trader.poll_order_fill()
-                logger.info(f"[MULTI-SYMBOL-ALPACA] {symbol} order assumed filled (paper trading)")
+                fill_result = trader.poll_fill(order_id=order_id, timeout_s=90)
+                if fill_result.status != "FILLED":
+                    # Never leave a remainder working: a late fill would spend capital
+                    # that is released (or re-reserved for the next opportunity) now
+                    fill_result = trader.cancel_and_get_fill(order_id, last_result=fill_result)
+                if fill_result.total_filled_qty > 0:
+                    logger.info(
+                        f"[MULTI-SYMBOL-ALPACA] {symbol} order {fill_result.status}: "
+                        f"{fill_result.total_filled_qty} @ ${fill_result.avg_price:.2f}"
+                    )
+                    quantity = fill_result.total_filled_qty
+                    trade_details["quantity"] = quantity
+                    actual_fill_premium = fill_result.avg_price or premium
+                    total_cost = actual_fill_premium * quantity * 100
+                else:
+                    logger.warning(f"[MULTI-SYMBOL-ALPACA] {symbol} order not filled: {fill_result.status}")
+                    decision_result = "NOT_FILLED"
             else:
                 logger.error(f"[MULTI-SYMBOL-ALPACA] {symbol} order failed to submit")
                 decision_result = "FAILED"
         
         # Record the trade outcome
-        confirmer.record_trade_outcome(trade_details, decision_result, actual_fill_premium)
+        with _trade_record_lock:
+            confirmer.record_trade_outcome(trade_details, decision_result, actual_fill_premium)
         
         logger.info(f"[MULTI-SYMBOL-ALPACA] {symbol} trade completed: {decision_result}")
-        return {"status": decision_result, "symbol": symbol}
+        if decision_result == "submitted":
+            return {"status": decision_result, "symbol": symbol, "success": True, "total_cost": total_cost}
+        return {
+            "status": decision_result,
+            "symbol": symbol,
+            "success": False,
+            "error_type": "no_fill" if decision_result == "NOT_FILLED" else "execution",
+            "reason": f"Order {decision_result.lower()}",
+        }
         
     except Exception as e:
         logger.error(f"[MULTI-SYMBOL-ALPACA] Error executing {symbol} trade: {e}")
@@ -1112,17 +1273,25 @@ def execute_alpaca_options_trade(
             logger.info(f"  Premium: ${contract.mid:.2f}")
             logger.info(f"  Total Cost: ${total_cost:.2f}")
             
-            if unattended and ("entry" in llm_decisions or "ro_review" in llm_decisions):
-                # Use LLM for entry approval - fully automated
+            llm_entry = unattended and ("entry" in llm_decisions or "ro_review" in llm_decisions)
+            if llm_entry:
                 logger.info(f"[ALPACA] 🤖 LLM evaluating entry decision for {symbol}")
-                approval_result = _handle_llm_entry_approval(
-                    config, contract, contracts, total_cost, side, symbol
-                )
-                if not approval_result["approved"]:
-                    logger.info(f"[ALPACA] 🤖 Trade rejected by LLM: {approval_result['reason']}")
-                    return {"status": "CANCELLED", "reason": f"LLM rejected: {approval_result['reason']}"}
-                else:
-                    logger.info(f"[ALPACA] 🤖 Trade approved by LLM (confidence: {approval_result.get('confidence', 'N/A')})")
+            
+            # Independent risk checks run concurrently; LLM approval runs once they pass
+            checks = _build_pretrade_pipeline(
+                config, contract, contracts, total_cost, side, symbol, llm_entry
+            ).run()
+            if not checks.passed:
+                failed = checks.failed
+                if failed.name == "llm_entry":
+                    logger.info(f"[ALPACA] 🤖 Trade rejected by LLM: {failed.reason}")
+                    return {"status": "CANCELLED", "reason": f"LLM rejected: {failed.reason}"}
+                logger.warning(f"[ALPACA] Pre-trade check '{failed.name}' failed: {failed.reason}")
+                return {"status": "BLOCKED", "reason": failed.reason, "failed_check": failed.name}
+            
+            if llm_entry:
+                approval_result = checks.values["llm_entry"]
+                logger.info(f"[ALPACA] 🤖 Trade approved by LLM (confidence: {approval_result.get('confidence', 'N/A')})")
             else:
                 # Manual approval required
                 logger.info("[ALPACA] Manual approval required:")
@@ -1179,8 +1348,56 @@ def execute_alpaca_options_trade(
         return {"status": "ERROR", "reason": str(e)}
 
 
-def _handle_llm_entry_approval(config, contract, contracts, total_cost, side, symbol):
-    """Handle entry approval using LLM in unattended mode."""
+def _build_pretrade_pipeline(config, contract, contracts, total_cost, side, symbol, llm_entry):
+    """Build the pre-trade check graph for an Alpaca entry order.
+
+    Risk checks and LLM inputs are independent of each other and run
+    concurrently; the LLM entry approval (when enabled) depends on all of
+    them and reuses their values instead of recomputing. Only the position
+    limit blocks the order by itself: account risk, fair pricing and Greeks
+    are placeholder checks and are passed to the LLM as inputs. Contract
+    feasibility is checked by the multi-symbol path before it gets here.
+    """
+    from utils.pretrade_checks import PreTradeCheck, PreTradePipeline
+
+    checks = [
+        PreTradeCheck(
+            "position_limits_ok",
+            lambda _: _check_position_limits(config, contracts),
+            reason=lambda ok: "" if ok else f"{contracts} contracts exceeds MAX_CONTRACTS_PER_TRADE",
+        ),
+        PreTradeCheck("account_risk_ok", lambda _: _check_account_risk(config, total_cost), hard=False),
+        PreTradeCheck("price_fair_vs_mid", lambda _: _validate_fair_pricing(contract), hard=False),
+        PreTradeCheck("greeks_ok", lambda _: _validate_greeks(contract), hard=False),
+        PreTradeCheck("slippage_bps", lambda _: _calculate_slippage_bps(contract), hard=False),
+        PreTradeCheck("spread_bps", lambda _: _calculate_spread_bps(contract), hard=False),
+        PreTradeCheck("liquidity_score", lambda _: _calculate_liquidity_score(contract), hard=False),
+        PreTradeCheck("vix_bucket", lambda _: _get_vix_bucket(), hard=False),
+    ]
+
+    if llm_entry:
+        checks.append(
+            PreTradeCheck(
+                "llm_entry",
+                lambda values: _handle_llm_entry_approval(
+                    config, contract, contracts, total_cost, side, symbol, check_values=values
+                ),
+                depends_on=tuple(check.name for check in checks),
+                passes=lambda r: r["approved"],
+                reason=lambda r: r["reason"],
+            )
+        )
+
+    return PreTradePipeline(checks)
+
+
+def _handle_llm_entry_approval(config, contract, contracts, total_cost, side, symbol, check_values=None):
+    """Handle entry approval using LLM in unattended mode.
+
+    Args:
+        check_values: Pre-computed pre-trade check values (from the pre-trade
+            pipeline); computed inline when not provided
+    """
     try:
         from utils.llm_decider import LLMDecider
         from utils.llm_json_client import LLMJsonClient
@@ -1194,6 +1411,17 @@ def _handle_llm_entry_approval(config, contract, contracts, total_cost, side, sy
         llm_decider = LLMDecider(json_client, config, logger, slack_notifier=slack)
         
         # Build order context for LLM decision
+        if check_values is None:
+            check_values = {
+                "slippage_bps": _calculate_slippage_bps(contract),
+                "spread_bps": _calculate_spread_bps(contract),
+                "liquidity_score": _calculate_liquidity_score(contract),
+                "greeks_ok": _validate_greeks(contract),
+                "vix_bucket": _get_vix_bucket(),
+                "position_limits_ok": _check_position_limits(config, contracts),
+                "price_fair_vs_mid": _validate_fair_pricing(contract),
+                "account_risk_ok": _check_account_risk(config, total_cost),
+            }
         order_ctx = {
             "symbol": symbol,
             "side": side,
@@ -1202,14 +1430,7 @@ def _handle_llm_entry_approval(config, contract, contracts, total_cost, side, sy
             "premium": contract.mid,
             "quantity": contracts,
             "total_cost": total_cost,
-            "slippage_bps": _calculate_slippage_bps(contract),
-            "spread_bps": _calculate_spread_bps(contract),
-            "liquidity_score": _calculate_liquidity_score(contract),
-            "greeks_ok": _validate_greeks(contract),
-            "vix_bucket": _get_vix_bucket(),
-            "position_limits_ok": _check_position_limits(config, contracts),
-            "price_fair_vs_mid": _validate_fair_pricing(contract),
-            "account_risk_ok": _check_account_risk(config, total_cost),
+            **{key: value for key, value in check_values.items() if key != "feasibility"},
         }
         
         # Get LLM decision
@@ -1448,8 +1669,8 @@ def run_one_shot_mode(
 
 
 def log_no_trade_decision(config: Dict, decision, analysis: Dict, current_bankroll: float):
-    """Log a no-trade decision to the trade log."""
-    from utils.logging_utils import log_trade_decision
+    """Log a no-trade decision to the trade log (buffered, written in batches)."""
+    from utils.decision_log import log_no_trade
     
     trade_data = {
         "timestamp": datetime.now().isoformat(),
@@ -1463,12 +1684,12 @@ def log_no_trade_decision(config: Dict, decision, analysis: Dict, current_bankro
         "bankroll_after": current_bankroll,
         "status": "NO_TRADE",
     }
-    log_trade_decision(config["TRADE_LOG_FILE"], trade_data)
+    log_no_trade(config["TRADE_LOG_FILE"], trade_data)
 
 
 def log_blocked_trade(config: Dict, decision, analysis: Dict, current_bankroll: float, block_reason: str):
-    """Log a blocked trade decision to the trade log."""
-    from utils.logging_utils import log_trade_decision
+    """Log a blocked trade decision to the trade log (buffered, written in batches)."""
+    from utils.decision_log import log_no_trade
     
     trade_data = {
         "timestamp": datetime.now().isoformat(),
@@ -1482,7 +1703,7 @@ def log_blocked_trade(config: Dict, decision, analysis: Dict, current_bankroll:
         "bankroll_after": current_bankroll,
         "status": f"BLOCKED_{block_reason}",
     }
-    log_trade_decision(config["TRADE_LOG_FILE"], trade_data)
+    log_no_trade(config["TRADE_LOG_FILE"], trade_data)
 
 
 def record_trade_outcome(
@@ -2101,6 +2322,22 @@ def run_multi_symbol_once(
             slack_notifier.send_message(f"❌ Multi-symbol scan error: {str(e)}")
 
 
+def _apply_spillover_cooldown(bankroll_manager, symbol: str, error_type: str) -> None:
+    """Put a failed symbol on cooldown to prevent immediate retry."""
+    # Different cooldown durations based on failure type
+    if error_type == "contract_selection":
+        # Shorter cooldown for contract selection failures (expiry issues)
+        cooldown_minutes = 60
+        logger.info(f"[MULTI-SYMBOL-SPILLOVER] Contract selection failed for {symbol} - trying next opportunity")
+    else:
+        # Standard cooldown for execution failures
+        cooldown_minutes = 30
+
+    if hasattr(bankroll_manager, 'add_symbol_cooldown'):
+        bankroll_manager.add_symbol_cooldown(symbol, minutes=cooldown_minutes)
+        logger.info(f"[MULTI-SYMBOL-SPILLOVER] Added {cooldown_minutes}min cooldown for {symbol}")
+
+
 def run_multi_symbol_loop(
     config: Dict,
     args,
@@ -2156,6 +2393,20 @@ def run_multi_symbol_loop(
     bot = None
     tz = ZoneInfo("America/New_York")
 
+    # Fixed-rate schedule: scans line up with bar closes instead of drifting by scan time
+    from utils.loop_scheduler import LoopScheduler
+
+    ms_config = config.get("multi_symbol", {})
+    scheduler = LoopScheduler(
+        args.interval * 60,
+        offset_seconds=float(ms_config.get("scan_align_offset_seconds", 0)),
+        align=bool(ms_config.get("scan_align_to_clock", True)),
+        jitter_seconds=float(ms_config.get("scan_jitter_seconds", 0)),
+        name="multi-symbol scan",
+    )
+    logger.info(f"[MULTI-SYMBOL-LOOP] Schedule: {scheduler.describe()}")
+    scheduler.mark_started()
+
     try:
         while True:
             scan_count += 1
@@ -2232,6 +2483,28 @@ def run_multi_symbol_loop(
                     # Process opportunities with spillover logic
                     max_trades = config.get("multi_symbol", {}).get("max_concurrent_trades", 1)
                     executed_successfully = False
+                    broker = config.get("BROKER", "robinhood").lower()
+                    
+                    if max_trades > 1 and broker == "alpaca" and args.unattended and not args.dry_run:
+                        # Execute top-K opportunities in parallel with reserved capital
+                        results = execute_opportunities_concurrently(
+                            opportunities=opportunities,
+                            config=config,
+                            args=args,
+                            env_vars=env_vars,
+                            bankroll_manager=bankroll_manager,
+                            portfolio_manager=portfolio_manager,
+                            slack_notifier=slack_notifier,
+                            max_trades=max_trades,
+                        )
+                        for result in results:
+                            if result.get("success", False):
+                                executed_successfully = True
+                            else:
+                                _apply_spillover_cooldown(
+                                    bankroll_manager, result["symbol"], result.get("error_type", "unknown")
+                                )
+                        opportunities = []
                     
                     for i, opp in enumerate(opportunities):
                         symbol = opp["symbol"]
@@ -2267,19 +2540,7 @@ def run_multi_symbol_loop(
                                 reason = result.get("reason", "Unknown error")
                                 logger.warning(f"[MULTI-SYMBOL-SPILLOVER] {symbol} failed ({error_type}): {reason}")
                                 
-                                # Different cooldown durations based on failure type
-                                if error_type == "contract_selection":
-                                    # Shorter cooldown for contract selection failures (expiry issues)
-                                    cooldown_minutes = 60
-                                    logger.info(f"[MULTI-SYMBOL-SPILLOVER] Contract selection failed for {symbol} - trying next opportunity")
-                                else:
-                                    # Standard cooldown for execution failures
-                                    cooldown_minutes = 30
-                                
-                                # Add cooldown for failed symbol to prevent immediate retry
-                                if hasattr(bankroll_manager, 'add_symbol_cooldown'):
-                                    bankroll_manager.add_symbol_cooldown(symbol, minutes=cooldown_minutes)
-                                    logger.info(f"[MULTI-SYMBOL-SPILLOVER] Added {cooldown_minutes}min cooldown for {symbol}")
+                                _apply_spillover_cooldown(bankroll_manager, symbol, error_type)
                                 
                                 # Continue to next opportunity (spillover logic)
                                 continue
@@ -2324,19 +2585,19 @@ def run_multi_symbol_loop(
                 if slack_notifier:
                     slack_notifier.send_message(f"⚠️ Scan #{scan_count} error: {str(e)}")
 
-            # Wait for next interval
-            if end_time:
-                next_scan_time = current_time + timedelta(minutes=args.interval)
-                if next_scan_time >= end_time:
-                    logger.info(
-                        "[MULTI-SYMBOL-LOOP] Next scan would exceed end time, stopping"
-                    )
-                    break
+            # Wait for the next scheduled tick
+            next_scan_time = scheduler.next_tick_datetime(tz)
+            if end_time and next_scan_time >= end_time:
+                logger.info(
+                    "[MULTI-SYMBOL-LOOP] Next scan would exceed end time, stopping"
+                )
+                break
 
             logger.info(
-                f"[MULTI-SYMBOL-LOOP] Waiting {args.interval} minutes until next scan..."
+                f"[MULTI-SYMBOL-LOOP] Next scan at {next_scan_time.strftime('%H:%M:%S')} "
+                f"(in {scheduler.seconds_until_next():.0f}s)"
             )
-            time.sleep(args.interval * 60)
+            scheduler.wait_next()
 
     except KeyboardInterrupt:
         logger.info(
@@ -2358,6 +2619,7 @@ def run_multi_symbol_loop(
                 logger.warning(f"[MULTI-SYMBOL-LOOP] Error closing browser: {e}")
 
         logger.info(f"[MULTI-SYMBOL-LOOP] Completed {scan_count} scans")
+        logger.info(f"[MULTI-SYMBOL-LOOP] Schedule stats: {scheduler.stats.to_dict()}")
         if slack_notifier:
             slack_notifier.send_message(
                 f"✅ Multi-symbol scanner finished\n"
@@ -2435,9 +2697,19 @@ def monitor_positions_mode(
                     pass
         return
 
-    # Timed monitoring loop honoring --end-at
+    # Timed monitoring loop honoring --end-at, on the same fixed-rate schedule as monitor.run()
+    from utils.loop_scheduler import LoopScheduler
+
+    scheduler = LoopScheduler(
+        interval_minutes * 60,
+        offset_seconds=float(config.get("MONITOR_ALIGN_OFFSET_SECONDS", 0)),
+        align=bool(config.get("MONITOR_ALIGN_TO_CLOCK", True)),
+        jitter_seconds=float(config.get("MONITOR_JITTER_SECONDS", 0)),
+        name="monitor",
+    )
     try:
         tz = end_time.tzinfo
+        scheduler.mark_started()
         while True:
             now = datetime.now(tz) if tz else datetime.now()
             if now >= end_time:
@@ -2448,13 +2720,13 @@ def monitor_positions_mode(
 
             monitor.run_monitoring_cycle()
 
-            # Sleep until next cycle or until end_time, whichever is sooner
-            now = datetime.now(tz) if tz else datetime.now()
-            remaining = (end_time - now).total_seconds()
-            sleep_s = max(0, min(remaining, interval_minutes * 60))
-            if sleep_s == 0:
+            # Sleep until the next tick unless it falls past end_time
+            if scheduler.next_tick_datetime(tz) >= end_time:
+                logger.info(
+                    f"[MONITOR] Next cycle would pass end time {end_time.strftime('%H:%M %Z')}, exiting"
+                )
                 break
-            time.sleep(sleep_s)
+            scheduler.wait_next()
 
     except KeyboardInterrupt:
         logger.info("[MONITOR] Stopped by user")
@@ -2497,9 +2769,9 @@ def main():
     )
     parser.add_argument(
         "--interval",
-        type=int,
+        type=float,
         default=5,
-        help="Minutes between scans in loop mode (default: 5)",
+        help="Minutes between scans in loop mode (default: 5; fractions allowed, e.g. 0.5)",
     )
     parser.add_argument(
         "--end-at", type=str, help="End time in HH:MM format (24-hour, local time)"
@@ -2743,7 +3015,8 @@ def main():
         bankroll_manager = BankrollManager(
             start_capital=config.get("START_CAPITAL_DEFAULT", config["START_CAPITAL"]),
             broker=broker,
-            env=env
+            env=env,
+            backend=config.get("BANKROLL_BACKEND"),
         )
         
         portfolio_manager = PortfolioManager(
@@ -2751,7 +3024,7 @@ def main():
         )
         
         logger.info(f"[SCOPED] Using ledger: {bankroll_manager.ledger_id()}")
-        logger.info(f"[SCOPED] Bankroll file: {bankroll_manager.bankroll_file}")
+        logger.info(f"[SCOPED] Bankroll file: {bankroll_manager.bankroll_file} ({bankroll_manager.backend} ledger)")
         logger.info(f"[SCOPED] Positions file: {scoped_paths['positions']}")
         logger.info(f"[SCOPED] Trade history: {scoped_paths['trade_history']}")
 
@@ -10,6 +10,10 @@ Key Improvements:
 - Better option price estimation using current volatility
 - More accurate profit/loss calculations
 - Timely alerts when actual profit targets are hit
+- Batched pricing: one stock quote and one option quote request per cycle
+- Optional streaming mode: exits evaluated on each quote tick (--streaming)
+- Shared service mode: one process for all symbols, driven over IPC (--service)
+- Exit orders submitted first on a dedicated thread; alerts follow asynchronously
 
 Usage:
     python monitor_alpaca.py
@@ -18,11 +22,11 @@ Usage:
 import os
 import logging
 import time
-import csv
 import json
 import copy
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set, Tuple
 import sys
 from pathlib import Path
 
@@ -50,6 +54,11 @@ from utils.logging_utils import setup_logging
 setup_logging(log_level="INFO", log_file="logs/monitor_alpaca.log")
 logger = logging.getLogger(__name__)
 
+# Exit reasons acted on without LLM review when auto-sell is enabled (AUTO_SELL_ON_EXIT_TRIGGERS)
+OBJECTIVE_EXIT_REASONS = frozenset(
+    {ExitReason.PROFIT_TARGET, ExitReason.STOP_LOSS, ExitReason.TRAILING_STOP, ExitReason.TIME_BASED}
+)
+
 
 class EnhancedPositionMonitor:
     """
@@ -141,13 +150,37 @@ class EnhancedPositionMonitor:
             self.auto_sync_enabled = bool(cfg.get("ALPACA_AUTO_SYNC_MONITOR", True))
             # Default every 60s; can be overridden in config.yaml
             self.auto_sync_interval_seconds = int(cfg.get("ALPACA_MONITOR_SYNC_INTERVAL_SECONDS", 60))
+            # Run the sync on a background worker instead of inline in the cycle
+            self.auto_sync_background = bool(cfg.get("ALPACA_MONITOR_SYNC_BACKGROUND", True))
         except Exception:
             self.auto_sync_enabled = True
             self.auto_sync_interval_seconds = 60
+            self.auto_sync_background = True
         self._last_positions_sync = 0.0
+        # Set by start_position_sync(); see utils.position_sync_worker
+        self._sync_worker = None
+        self._sync_stale_warned = False
+
+        # Exit pipeline: close orders are submitted on a dedicated thread, alerts follow (utils.exit_executor)
+        try:
+            cfg = getattr(self, "config", None) or {}
+            self.exit_async_pipeline = bool(cfg.get("EXIT_ASYNC_PIPELINE", True))
+        except Exception:
+            self.exit_async_pipeline = True
+        self._exit_executor = None
 
         # Lazy option quote client for real-time option mid price lookups
         self._option_quote_client = None
+        # Duration of the last batched pricing stage (see price_positions)
+        self.last_pricing_ms = 0.0
+        # IVs backed out of quotes, used to reprice contracts without one (see price_positions)
+        self._iv_calibrator = None
+        # Set by run_streaming()
+        self._stream_evaluator = None
+        # Set by run()
+        self._scheduler = None
+        # Underlyings to monitor (None = all open positions); see utils.monitor_service
+        self.symbol_filter: Optional[Set[str]] = None
 
         # Stop-loss stability guard: grace period and consecutive confirmation
         try:
@@ -177,8 +210,9 @@ class EnhancedPositionMonitor:
             cfg = getattr(self, "config", {}) or {}
             broker_val = cfg.get("BROKER", "alpaca")
             env_val = cfg.get("ALPACA_ENV", "paper") if broker_val == "alpaca" else "live"
+            save_interval = float(cfg.get("MONITOR_STATE_SAVE_INTERVAL_SECONDS", 5))
         except Exception:
-            broker_val, env_val = "alpaca", "paper"
+            broker_val, env_val, save_interval = "alpaca", "paper", 5.0
 
         state_dir = os.path.join("state")
         try:
@@ -186,46 +220,37 @@ class EnhancedPositionMonitor:
         except Exception:
             pass
         state_path = os.path.join(state_dir, f"monitor_state_{broker_val}_{env_val}.json")
-        self._state_store = MonitorState(state_path)
+        self._state_store = MonitorState(state_path, min_interval_seconds=save_interval)
+        self._exit_state_cache = (None, None)  # (exit manager state_version, exported state)
         _loaded = self._state_store.load() or {}
         # Restore persisted dictionaries if available
         self.last_alerts = _loaded.get("last_alerts", {}) or self.last_alerts
         self.trailing_hits_count = _loaded.get("trailing_hits_count", {}) or self.trailing_hits_count
         self._stop_loss_breach_counts = _loaded.get("stop_loss_breach_counts", {}) or self._stop_loss_breach_counts
         self.eod_summary_sent_date = _loaded.get("eod_summary_sent_date", None) or self.eod_summary_sent_date
+        # Restore peak / trailing-stop tracking so trailing exits resume where they left off
+        self._restore_exit_tracking(_loaded)
+
+    def _restore_exit_tracking(self, loaded: Dict) -> int:
+        """Restore exit-manager peaks and trailing stops from persisted monitor state."""
+        try:
+            restored = self.exit_manager.restore_state(loaded.get("exit_manager") or {})
+            if restored:
+                logger.info(f"[MONITOR] Restored exit tracking for {restored} position(s)")
+            self._exit_state_cache = (self.exit_manager.state_version, loaded.get("exit_manager"))
+            return restored
+        except Exception as e:
+            logger.warning(f"[MONITOR] Could not restore exit tracking state: {e}")
+            return 0
 
     def _parse_occ_option_symbol(self, occ: str) -> Optional[Dict]:
         """Parse OCC option symbol like 'XLF250912C00053000' into components.
 
         Returns dict with keys: underlying, expiry (YYYY-MM-DD), option_type (CALL/PUT), strike (float)
         """
-        try:
-            if not occ or len(occ) < 10:
-                return None
-            # Underlying is letters until first digit
-            i = 0
-            while i < len(occ) and not occ[i].isdigit():
-                i += 1
-            underlying = occ[:i]
-            rest = occ[i:]
-            # Expect YYMMDD
-            y = int('20' + rest[0:2])
-            m = int(rest[2:4])
-            d = int(rest[4:6])
-            expiry = f"{y:04d}-{m:02d}-{d:02d}"
-            cp = rest[6].upper()
-            option_type = 'CALL' if cp == 'C' else 'PUT'
-            strike_pennies = rest[7:]
-            # Strike encoded to 1/1000 dollars
-            strike = float(int(strike_pennies) / 1000.0)
-            return {
-                'underlying': underlying,
-                'expiry': expiry,
-                'option_type': option_type,
-                'strike': strike,
-            }
-        except Exception:
-            return None
+        from utils.position_store import parse_occ_symbol
+
+        return parse_occ_symbol(occ)
 
     def get_current_price(self, symbol: str) -> Optional[float]:
         """
@@ -250,6 +275,24 @@ class EnhancedPositionMonitor:
 
         return None
 
+    def get_current_prices(self, symbols: List[str]) -> Dict[str, float]:
+        """
+        Get current stock prices for several symbols in one Alpaca request.
+
+        Args:
+            symbols: Stock symbols
+
+        Returns:
+            Dict of symbol -> price; symbols without a price are omitted
+        """
+        if not self.alpaca.enabled:
+            return {}
+        prices = self.alpaca.get_current_prices(symbols)
+        missing = sorted(set(symbols) - set(prices))
+        if missing:
+            logger.warning(f"[ALPACA] Failed to get price for {', '.join(missing)}")
+        return prices
+
     def estimate_option_price(
         self,
         symbol: str,
@@ -296,163 +339,15 @@ class EnhancedPositionMonitor:
         return estimate
 
     def load_positions(self) -> List[Dict]:
-        """Load current positions from the scoped CSV file with robust schema handling."""
-        positions: List[Dict] = []
-
-        try:
-            with open(self.positions_file, "r", newline="") as file:
-                reader = csv.DictReader(file)
-                for row in reader:
-                    # Skip empty rows
-                    if not any(row.values()):
-                        continue
-
-                    # Skip rows explicitly marked as closed or with a close_time
-                    try:
-                        status_str = str(row.get("status", "")).strip().lower()
-                        close_time_val = str(row.get("close_time", "")).strip()
-                        if status_str and status_str.startswith("closed"):
-                            logger.debug(f"[MONITOR] Skipping closed position row: {row}")
-                            continue
-                        if close_time_val:
-                            logger.debug(f"[MONITOR] Skipping row with close_time set: {row}")
-                            continue
-                    except Exception:
-                        # Be permissive if schema missing
-                        pass
-
-                    try:
-                        original_symbol = str(row.get("symbol", "")).strip()
-
-                        # Determine contracts/quantity
-                        qty_raw = row.get("contracts") or row.get("quantity") or "1"
-                        try:
-                            qty_f = float(str(qty_raw).strip())
-                        except Exception:
-                            qty_f = 1.0
-                        quantity = max(1, int(round(qty_f)))
-
-                        # Determine mapping for fields that may be missing
-                        strike_val = row.get("strike")
-                        option_type = row.get("option_type") or row.get("side")
-                        expiry = row.get("expiry")
-                        entry_price_raw = row.get("entry_price") or row.get("entry_premium")
-
-                        # Detect alternate 'timestamp-first' schema and remap
-                        # Example row (under header symbol,strike,option_type,expiry,quantity,contracts,entry_price,...):
-                        #   2025-09-11T09:44:44.197176,XLF,2025-09-12,53.5,CALL,1,0.22
-                        # Mapping should be: underlying=XLF, expiry=2025-09-12, strike=53.5, option_type=CALL, quantity=1, entry_price=0.22
-                        is_timestamp_symbol = False
-                        try:
-                            # datetime.fromisoformat handles microseconds too
-                            datetime.fromisoformat(original_symbol)
-                            is_timestamp_symbol = True
-                        except Exception:
-                            is_timestamp_symbol = False
-                        if is_timestamp_symbol:
-                            # Remap fields from shifted columns
-                            underlying = row.get("strike")  # actually underlying in this schema
-                            remapped_expiry = row.get("option_type")
-                            remapped_strike = row.get("expiry")
-                            remapped_option_type = row.get("quantity")
-                            remapped_qty = row.get("contracts") or "1"
-                            # Apply remapped values
-                            strike_val = remapped_strike
-                            option_type = remapped_option_type
-                            expiry = remapped_expiry
-                            try:
-                                qty_f = float(str(remapped_qty).strip())
-                            except Exception:
-                                qty_f = 1.0
-                            quantity = max(1, int(round(qty_f)))
-                        else:
-                            underlying = None
-
-                        # Parse OCC symbol if needed
-                        parsed = None
-                        if original_symbol and (not strike_val or not expiry or not option_type or len(original_symbol) > 8):
-                            # Likely an OCC option symbol (e.g., XLF250912C00053000)
-                            parsed = self._parse_occ_option_symbol(original_symbol)
-                            if parsed:
-                                underlying = parsed["underlying"]
-                                if not strike_val:
-                                    strike_val = parsed["strike"]
-                                if not expiry:
-                                    expiry = parsed["expiry"]
-                                if not option_type:
-                                    option_type = parsed["option_type"]
-
-                        # Convert numeric strike
-                        try:
-                            strike = float(strike_val) if strike_val not in (None, "") else None
-                        except Exception:
-                            strike = None
-
-                        # Compute entry_price if missing and we have market_value + unrealized_pnl
-                        entry_price = None
-                        if entry_price_raw not in (None, ""):
-                            try:
-                                entry_price = float(entry_price_raw)
-                            except Exception:
-                                entry_price = None
-                        if entry_price is None:
-                            mv_raw = row.get("market_value")
-                            upl_raw = row.get("unrealized_pnl") or row.get("unrealized_pl") or row.get("unrealized_intraday_pl")
-                            try:
-                                mv = float(mv_raw) if mv_raw not in (None, "") else None
-                                upl = float(upl_raw) if upl_raw not in (None, "") else 0.0
-                                if mv is not None and quantity > 0:
-                                    entry_value = mv - upl
-                                    entry_price = max(0.01, entry_value / (quantity * 100.0))
-                            except Exception:
-                                entry_price = None
-
-                        # Finalize underlying symbol for monitor price lookups
-                        if underlying is None:
-                            # If row had separate underlying column use it, else fall back to parsed or original
-                            underlying = row.get("underlying") or row.get("base_symbol")
-                            if not underlying:
-                                # If original was OCC and parsed failed, try best-effort
-                                parsed2 = self._parse_occ_option_symbol(original_symbol)
-                                if parsed2:
-                                    underlying = parsed2["underlying"]
-                            if not underlying and original_symbol:
-                                # Assume it is already the underlying (e.g., older schema)
-                                underlying = original_symbol
-
-                        # Normalize option_type
-                        if option_type:
-                            option_type = str(option_type).upper()
-                            option_type = "CALL" if option_type.startswith("C") else ("PUT" if option_type.startswith("P") else option_type)
-
-                        # Validate required fields
-                        if not underlying or not expiry or option_type not in ("CALL", "PUT") or strike is None:
-                            logger.warning(f"[MONITOR] Skipping incomplete position: {row}")
-                            continue
-
-                        # Only set occ_symbol when original symbol parses as OCC; otherwise leave blank
-                        # Prefer existing occ_symbol column if present; else infer from original symbol parse
-                        occ_symbol = (row.get("occ_symbol") or (original_symbol if parsed else ""))
-
-                        normalized = {
-                            "symbol": underlying,
-                            "occ_symbol": occ_symbol,
-                            "strike": strike,
-                            "option_type": option_type,
-                            "expiry": expiry,
-                            "quantity": quantity,
-                            "entry_price": entry_price if entry_price is not None else 0.01,
-                            # Carry entry_time/timestamp forward for stability gating and tracking
-                            "entry_time": (row.get("entry_time") or row.get("timestamp") or datetime.now().isoformat()),
-                        }
+        """Load current positions from the scoped CSV file with robust schema handling.
 
-                        positions.append(normalized)
-                        logger.debug(f"[MONITOR] Loaded position: {normalized['symbol']} ${normalized['strike']} {normalized['option_type']} x{normalized['quantity']}")
-
-                    except (ValueError, TypeError) as e:
-                        logger.warning(f"[MONITOR] Skipping invalid position row: {row} - Error: {e}")
-                        continue
+        The file is parsed once per version (mtime/size or an in-process change
+        notification); unchanged files are served from the shared position store.
+        """
+        from utils.position_store import get_position_store
 
+        try:
+            positions = get_position_store(self.positions_file).positions()
             logger.info(f"[MONITOR] Loaded {len(positions)} positions")
             return positions
 
@@ -463,38 +358,19 @@ class EnhancedPositionMonitor:
             logger.error(f"[MONITOR] Error loading positions: {e}")
             return []
 
-    def check_position_alerts(
-        self, position: Dict, current_price: float, estimated_option_price: float
-    ) -> None:
-        """
-        Check and send alerts for profit targets and stop losses.
-
-        Args:
-            position: Position data
-            current_price: Current stock price
-            estimated_option_price: Current estimated option price
-        """
-        symbol = position["symbol"]
-        strike = position["strike"]
-        option_type = position["option_type"]
-        entry_price = position["entry_price"]
+    def _position_pnl(self, position: Dict, option_price: float) -> Tuple[float, float]:
+        """Dollar and percent P&L of a position at the given option price."""
         quantity = position["quantity"]
-
-        # Calculate P&L
-        current_value = (
-            estimated_option_price * quantity * 100
-        )  # Options are per 100 shares
-        entry_value = entry_price * quantity * 100
+        current_value = option_price * quantity * 100  # Options are per 100 shares
+        entry_value = position["entry_price"] * quantity * 100
         pnl = current_value - entry_value
-        pnl_pct = (pnl / entry_value) * 100
+        return pnl, (pnl / entry_value) * 100
 
-        position_key = f"{symbol}_{strike}_{option_type}_{position.get('expiry')}"
-        current_time = datetime.now()
-        logger.debug(
-            f"[MONITOR] PnL debug for {position_key}: entry_price={entry_price:.4f}, qty={quantity}, "
-            f"entry_value={entry_value:.2f}, option_price={estimated_option_price:.4f}, current_value={current_value:.2f}"
-        )
+    def _alert_key(self, position: Dict) -> str:
+        return f"{position['symbol']}_{position['strike']}_{position['option_type']}_{position.get('expiry')}"
 
+    def _exit_check_due(self, position: Dict, pnl_pct: float, position_key: str, current_time: datetime) -> bool:
+        """Grace-window and alert-cooldown gates applied before exit evaluation."""
         # Stability guard: suppress early stop-loss within grace window
         try:
             stop_loss_pct_cfg = float(getattr(self.exit_manager.config, "stop_loss_pct", 25.0))
@@ -509,7 +385,7 @@ class EnhancedPositionMonitor:
                 f"[MONITOR] STOP_LOSS breach {pnl_pct:.1f}% but within grace window ({int(seconds_since_entry)}s<{self.stop_loss_grace_seconds}s) – waiting"
             )
             # Do not proceed to evaluate exits this cycle
-            return
+            return False
 
         # Check if we should send alerts (cooldown logic)
         last_alert_time = self.last_alerts.get(position_key, {}).get(
@@ -517,15 +393,97 @@ class EnhancedPositionMonitor:
         )
         time_since_last = (current_time - last_alert_time).total_seconds()
 
-        if time_since_last < self.alert_cooldown:
-            return  # Still in cooldown
+        return time_since_last >= self.alert_cooldown  # False while still in cooldown
+
+    def evaluate_positions(self, priced: List[Tuple]) -> Optional[List]:
+        """
+        Gate and evaluate a priced snapshot with one vectorized exit-manager pass.
+
+        Args:
+            priced: (position, stock price, option price, price source) rows from price_positions()
+
+        Returns:
+            ExitDecision per row (None where the row is unpriced, in its grace
+            window or in alert cooldown), or None when no exit manager is set
+        """
+        exit_manager = getattr(self, "exit_manager", None)
+        if exit_manager is None or not hasattr(exit_manager, "evaluate_exits"):
+            return None
+
+        current_time = datetime.now()
+        decisions: List = [None] * len(priced)
+        due = []
+        for i, (position, current_price, option_price, _source) in enumerate(priced):
+            if not current_price or not option_price:
+                continue
+            try:
+                _pnl, pnl_pct = self._position_pnl(position, option_price)
+                if self._exit_check_due(position, pnl_pct, self._alert_key(position), current_time):
+                    due.append(i)
+            except Exception as e:
+                logger.error(f"[MONITOR] Error checking position {position}: {e}")
+
+        if not due:
+            return decisions
+        rows = [priced[i] for i in due]
+        try:
+            results = exit_manager.evaluate_exits(
+                [row[0] for row in rows], [row[1] for row in rows], [row[2] for row in rows]
+            )
+        except Exception as e:
+            logger.warning(f"[MONITOR] Batched exit evaluation failed ({e}); evaluating one at a time")
+            results = []
+            for position, current_price, option_price, _source in rows:
+                try:
+                    results.append(exit_manager.evaluate_exit(position, current_price, option_price))
+                except Exception as pe:
+                    logger.error(f"[MONITOR] Error checking position {position}: {pe}")
+                    results.append(None)
+        for i, decision in zip(due, results):
+            decisions[i] = decision
+        return decisions
 
-        # === ADVANCED EXIT STRATEGIES EVALUATION ===
-        # Use ExitStrategyManager for sophisticated exit decisions
-        exit_decision = self.exit_manager.evaluate_exit(
-            position, current_price, estimated_option_price
+    def check_position_alerts(
+        self,
+        position: Dict,
+        current_price: float,
+        estimated_option_price: float,
+        exit_decision=None,
+    ) -> None:
+        """
+        Check and send alerts for profit targets and stop losses.
+
+        Args:
+            position: Position data
+            current_price: Current stock price
+            estimated_option_price: Current estimated option price
+            exit_decision: Decision from evaluate_positions(), which already
+                applied the grace-window and cooldown gates
+        """
+        entry_price = position["entry_price"]
+        quantity = position["quantity"]
+
+        # Calculate P&L
+        pnl, pnl_pct = self._position_pnl(position, estimated_option_price)
+
+        position_key = self._alert_key(position)
+        current_time = datetime.now()
+        logger.debug(
+            f"[MONITOR] PnL debug for {position_key}: entry_price={entry_price:.4f}, qty={quantity}, "
+            f"entry_value={entry_price * quantity * 100:.2f}, option_price={estimated_option_price:.4f}, "
+            f"current_value={estimated_option_price * quantity * 100:.2f}"
         )
 
+        if exit_decision is None:
+            if not self._exit_check_due(position, pnl_pct, position_key, current_time):
+                return
+
+            # === ADVANCED EXIT STRATEGIES EVALUATION ===
+            # Use ExitStrategyManager for sophisticated exit decisions
+            exit_decision = self.exit_manager.evaluate_exit(
+                position, current_price, estimated_option_price
+            )
+
         # Handle exit decision based on strategy type
         if exit_decision.should_exit or exit_decision.reason != ExitReason.NO_EXIT:
             # Require consecutive confirmations for STOP_LOSS to avoid flicker
@@ -578,11 +536,25 @@ class EnhancedPositionMonitor:
         pnl_pct: float,
         exit_decision,
     ) -> None:
-        """Handle advanced exit strategy decisions with appropriate alerts."""
+        """Handle advanced exit strategy decisions with appropriate alerts.
+
+        When unattended auto-sell applies, the close order is submitted first
+        (see utils.exit_executor); Slack alerts, charts and the confirmation or
+        LLM workflow are dispatched afterwards and never delay the submit.
+        """
+        triggered_at = time.perf_counter()
         symbol = position["symbol"]
         strike = position["strike"]
         option_type = position["option_type"]
 
+        auto_sell, _llm_exit = self._exit_automation()
+        auto_close = auto_sell and exit_decision.reason in OBJECTIVE_EXIT_REASONS
+        if auto_close:
+            logger.info("[EXIT] Auto-sell enabled and objective trigger fired - submitting close before alerts")
+            self._execute_sell_order(
+                position, current_price, option_price, reason=str(exit_decision.reason.value), triggered_at=triggered_at
+            )
+
         # Create detailed message based on exit reason
         if exit_decision.reason == ExitReason.TRAILING_STOP:
             message = f"""
@@ -604,7 +576,8 @@ Time: {datetime.now().strftime('%H:%M:%S ET')}
             """.strip()
 
             if self.slack.enabled:
-                self.slack.send_stop_loss_alert(
+                self._notify(
+                    self.slack.send_stop_loss_alert,
                     symbol, strike, option_type, abs(pnl_pct)
                 )
             
@@ -630,13 +603,16 @@ Time: {datetime.now().strftime('%H:%M:%S ET')}
                 )
                 if self.slack.enabled:
                     ann = f"🧭 Objective Active: TRAILING_STOP" + (f"\n{drawdown_line}" if drawdown_line else "")
-                    self.slack.send_message(ann)
+                    self._notify(self.slack.send_message, ann)
                 logger.info(f"[EXIT-ANN] Objective=TRAILING_STOP {(' | ' + drawdown_line) if drawdown_line else ''}")
             except Exception:
                 pass
 
             # Launch interactive exit confirmation workflow for trailing stop
-            self._launch_interactive_exit(position, exit_decision, current_price, option_price)
+            if not auto_close:
+                self._launch_interactive_exit(
+                    position, exit_decision, current_price, option_price, triggered_at=triggered_at
+                )
 
         elif exit_decision.reason == ExitReason.TIME_BASED:
             message = f"""
@@ -658,20 +634,24 @@ Time: {datetime.now().strftime('%H:%M:%S ET')}
             """.strip()
 
             if self.slack.enabled:
-                self.slack.send_position_alert_with_chart(
+                self._notify(
+                    self.slack.send_position_alert_with_chart,
                     position, current_price, pnl_pct, "time_based_exit", exit_decision
                 )
             
             # Post objective annotation
             try:
                 if self.slack.enabled:
-                    self.slack.send_message("🧭 Objective Active: TIME_BASED")
+                    self._notify(self.slack.send_message, "🧭 Objective Active: TIME_BASED")
                 logger.info("[EXIT-ANN] Objective=TIME_BASED")
             except Exception:
                 pass
 
             # Launch interactive exit confirmation workflow for time-based exit
-            self._launch_interactive_exit(position, exit_decision, current_price, option_price)
+            if not auto_close:
+                self._launch_interactive_exit(
+                    position, exit_decision, current_price, option_price, triggered_at=triggered_at
+                )
 
         elif exit_decision.reason == ExitReason.STOP_LOSS:
             message = f"""
@@ -693,20 +673,24 @@ Time: {datetime.now().strftime('%H:%M:%S ET')}
             """.strip()
 
             if self.slack.enabled:
-                self.slack.send_stop_loss_alert(
+                self._notify(
+                    self.slack.send_stop_loss_alert,
                     symbol, strike, option_type, abs(pnl_pct)
                 )
             
             # Post objective annotation
             try:
                 if self.slack.enabled:
-                    self.slack.send_message("🧭 Objective Active: STOP_LOSS")
+                    self._notify(self.slack.send_message, "🧭 Objective Active: STOP_LOSS")
                 logger.info("[EXIT-ANN] Objective=STOP_LOSS")
             except Exception:
                 pass
 
             # Launch interactive exit confirmation workflow for stop loss
-            self._launch_interactive_exit(position, exit_decision, current_price, option_price)
+            if not auto_close:
+                self._launch_interactive_exit(
+                    position, exit_decision, current_price, option_price, triggered_at=triggered_at
+                )
 
         elif exit_decision.reason == ExitReason.PROFIT_TARGET:
             # Extract profit level from message or use current P&L
@@ -731,16 +715,20 @@ Time: {datetime.now().strftime('%H:%M:%S ET')}
             """.strip()
 
             if self.slack.enabled:
-                self.slack.send_position_alert_with_chart(
+                self._notify(
+                    self.slack.send_position_alert_with_chart,
                     position, current_price, pnl_pct, "profit_target", exit_decision
                 )
             
             # Launch interactive exit confirmation workflow
-            self._launch_interactive_exit(position, exit_decision, current_price, option_price)
+            if not auto_close:
+                self._launch_interactive_exit(
+                    position, exit_decision, current_price, option_price, triggered_at=triggered_at
+                )
 
-        # If LLM exit just executed and status is closed, skip advisory output
-        if str(position.get("status", "")).lower().startswith("closed"):
-            logger.debug(f"[MONITOR] Skipping advisory for {symbol} ${strike} {option_type} - position closed this cycle")
+        # Skip advisory output once a close is submitted or the position closed this cycle
+        if auto_close or str(position.get("status", "")).lower().startswith("closed"):
+            logger.debug(f"[MONITOR] Skipping advisory for {symbol} ${strike} {option_type} - position closing")
             return
 
         # Log and print the alert
@@ -780,34 +768,48 @@ Time: {datetime.now().strftime('%H:%M:%S ET')}
         exit_decision,
         current_stock_price: float,
         current_option_price: float,
+        triggered_at: Optional[float] = None,
     ) -> None:
-        """Launch interactive exit confirmation workflow or LLM decision if unattended."""
+        """Launch interactive exit confirmation workflow or LLM decision if unattended.
+
+        Neither blocks the monitoring thread: LLM exit reasoning runs on the
+        exit executor's follow-up pool, and interactive prompts run one at a
+        time on its prompt thread.
+        """
         # Check if unattended mode is enabled
-        try:
-            config = getattr(self, "config", None)
-            if config is None:
-                from utils.llm import load_config
-                config = load_config("config.yaml")
-            unattended = config.get("UNATTENDED", False)
-            llm_decisions = config.get("LLM_DECISIONS", [])
+        auto_sell, llm_exit = self._exit_automation()
+
+        # Auto-sell on objective exit triggers when unattended (default OFF)
+        if auto_sell and exit_decision.reason in OBJECTIVE_EXIT_REASONS:
+            logger.info("[EXIT] Auto-sell enabled and objective trigger fired - executing sell without LLM")
+            self._execute_sell_order(
+                position, current_stock_price, current_option_price,
+                reason=str(exit_decision.reason.value), triggered_at=triggered_at,
+            )
+            return
 
-            # Auto-sell on objective exit triggers when unattended (default OFF)
-            auto_sell = (
-                config.get("AUTO_SELL_ON_EXIT_TRIGGERS", False)
-                or config.get("AUTO_SELL_ON_PROFIT_TARGET", False)
+        if llm_exit:
+            self._notify(
+                self._handle_llm_exit_decision,
+                position, exit_decision, current_stock_price, current_option_price, triggered_at=triggered_at,
             )
-            objective_reasons = {ExitReason.PROFIT_TARGET, ExitReason.STOP_LOSS, ExitReason.TRAILING_STOP, ExitReason.TIME_BASED}
-            if unattended and auto_sell and exit_decision.reason in objective_reasons:
-                logger.info("[EXIT] Auto-sell enabled and objective trigger fired - executing sell without LLM")
-                self._execute_sell_order(position, current_stock_price, current_option_price, reason=str(exit_decision.reason.value))
-                return
+            return
 
-            if unattended and "exit" in llm_decisions:
-                self._handle_llm_exit_decision(position, exit_decision, current_stock_price, current_option_price)
-                return
-        except Exception as e:
-            logger.warning(f"[EXIT] Could not check unattended mode, falling back to interactive: {e}")
-        
+        if self._get_exit_executor().exclusive(
+            self._alert_key(position),
+            self._confirm_exit_interactively,
+            position, exit_decision, current_stock_price, current_option_price,
+        ) is None:
+            logger.info(f"[EXIT-CONFIRM] Confirmation already pending for {position.get('symbol')}")
+
+    def _confirm_exit_interactively(
+        self,
+        position: Dict,
+        exit_decision,
+        current_stock_price: float,
+        current_option_price: float,
+    ) -> None:
+        """Interactive exit confirmation prompt (manual broker action)."""
         try:
             # Import Windows-safe exit confirmation workflow
             from utils.exit_confirmation_safe import SafeExitConfirmationWorkflow
@@ -871,8 +873,13 @@ Time: {datetime.now().strftime('%H:%M:%S ET')}
         exit_decision,
         current_stock_price: float,
         current_option_price: float,
+        triggered_at: Optional[float] = None,
     ) -> None:
-        """Handle exit decision using LLM in unattended mode."""
+        """Handle exit decision using LLM in unattended mode.
+
+        A SELL is submitted through the exit executor; triggered_at (when the
+        exit fired) makes the LLM round trip part of the trigger-to-submit metric.
+        """
         try:
             from datetime import datetime
             from zoneinfo import ZoneInfo
@@ -1125,108 +1132,16 @@ Time: {datetime.now().strftime('%H:%M:%S ET')}
                 print(f"Reason: {decision.reason}")
                 print(f"Confidence: {decision.confidence:.2f}")
                 
-                # Execute the sell order automatically
-                try:
-                    from utils.alpaca_options import create_alpaca_trader
-                    # Determine paper/live from config/environment
-                    cfg2 = getattr(self, "config", {}) or {}
-                    broker_cfg = cfg2.get("BROKER", os.getenv("BROKER", "robinhood"))
-                    env_cfg = cfg2.get("ALPACA_ENV", os.getenv("ALPACA_ENV", "paper" if broker_cfg == "alpaca" else "live"))
-                    paper_mode = broker_cfg == "alpaca" and env_cfg == "paper"
-                    trader = create_alpaca_trader(paper=paper_mode)
-                    if trader is None:
-                        logger.error(f"[AUTO-EXIT] Could not initialize Alpaca trader (paper={paper_mode})")
-                        self.slack.send_message(f"❌ **Auto-Exit Error: {symbol}**\n**Error:** Alpaca trader initialization failed\n**Manual intervention required**")
-                        return
-                    
-                    # Build/Get OCC contract symbol
-                    contract_symbol = position.get("occ_symbol")
-                    if not contract_symbol:
-                        try:
-                            from datetime import datetime as _dt
-                            expiry_dt = _dt.strptime(position.get("expiry", ""), "%Y-%m-%d")
-                            expiry_str = expiry_dt.strftime("%y%m%d")
-                            strike_str = f"{int(float(position.get('strike', 0)) * 1000):08d}"
-                            cp = (position.get("option_type", "C") or "C")[0].upper()
-                            underlying = position.get("symbol", symbol)
-                            contract_symbol = f"{underlying}{expiry_str}{cp}{strike_str}"
-                        except Exception:
-                            # Fallback to original symbol field if build fails
-                            contract_symbol = position.get("symbol", symbol)
-                    
-                    # Quantity
-                    quantity = int(position.get("quantity") or position.get("qty") or 1)
-                    
-                    logger.info(f"[LLM-EXIT] Placing SELL order: {contract_symbol} x{quantity} (paper={paper_mode})")
-                    
-                    # Place market sell order
-                    order_id = trader.place_market_order(contract_symbol, quantity, "SELL")
-                    
-                    if order_id:
-                        logger.info(f"[LLM-EXIT] Order placed successfully: {order_id}")
-                        
-                        # Poll for fill
-                        fill_result = trader.poll_fill(order_id=order_id, timeout_s=90)
-                        
-                        if fill_result.status == "FILLED":
-                            logger.info(f"[LLM-EXIT] Order filled: {fill_result.filled_qty} contracts at ${fill_result.avg_price:.2f}")
-                            
-                            # Send success notification
-                            success_msg = f"""✅ **Automated Exit Executed: {symbol}**
-**Order ID:** {order_id}
-**Quantity:** {fill_result.filled_qty} contracts
-**Fill Price:** ${fill_result.avg_price:.2f}
-**P&L:** {((fill_result.avg_price - position.get('entry_price', 0)) / max(position.get('entry_price', 1), 1)) * 100:+.1f}%
-**LLM Reason:** {decision.reason}
-**Confidence:** {decision.confidence:.2f}"""
-                            
-                            self.slack.send_message(success_msg)
-                            
-                            # Mark closed in-memory to avoid duplicate advisories this cycle
-                            try:
-                                position["status"] = "closed_llm"
-                                position["close_time"] = datetime.now().isoformat()
-                            except Exception:
-                                pass
-                            
-                            # Refresh local positions from Alpaca after exit
-                            try:
-                                from utils.alpaca_sync import AlpacaSync
-                                sync = AlpacaSync(env=env_cfg if broker_cfg == "alpaca" else "live")
-                                sync.sync_positions()
-                            except Exception as _sync_e:
-                                logger.warning(f"[LLM-EXIT] Post-exit sync failed: {_sync_e}")
-                            
-                        else:
-                            logger.warning(f"[LLM-EXIT] Order not filled: {fill_result.status}")
-                            
-                            # Send warning notification
-                            warning_msg = f"""⚠️ **Exit Order Not Filled: {symbol}**
-**Order ID:** {order_id}
-**Status:** {fill_result.status}
-**Manual intervention may be required**"""
-                            
-                            self.slack.send_message(warning_msg)
-                    else:
-                        logger.error(f"[LLM-EXIT] Failed to place sell order for {symbol}")
-                        
-                        # Send error notification
-                        error_msg = f"""❌ **Exit Order Failed: {symbol}**
-**Error:** Order placement failed
-**Manual intervention required**"""
-                        
-                        self.slack.send_message(error_msg)
-                except Exception as order_error:
-                    logger.error(f"[LLM-EXIT] Error executing sell order: {order_error}")
-                    
-                    # Send error notification
-                    error_msg = f"""❌ **Exit Execution Error: {symbol}**
-**Error:** {str(order_error)}
-**Manual intervention required**"""
-                    
-                    self.slack.send_message(error_msg)
-                
-                
+                # Submit the close; fill polling and notifications follow asynchronously
+                self._execute_sell_order(
+                    position,
+                    current_stock_price,
+                    current_option_price,
+                    reason=f"LLM: {decision.reason}",
+                    confidence=decision.confidence,
+                    triggered_at=triggered_at,
+                )
+
             elif decision.action in ["HOLD", "WAIT"]:
                 defer_min = decision.defer_minutes or 2
                 print(f"\n🤖 [LLM-EXIT] {decision.action} decision for {symbol}")
@@ -1253,80 +1168,170 @@ Time: {datetime.now().strftime('%H:%M:%S ET')}
             except Exception as fallback_error:
                 logger.error(f"[EXIT-LLM] Fallback also failed: {fallback_error}")
 
-    def _execute_sell_order(self, position: Dict, current_stock_price: float, current_option_price: float, reason: str = "Objective Exit", confidence: float = 1.0) -> None:
-        """Directly execute a market SELL order via Alpaca (unattended objective exit)."""
-        symbol = position.get("symbol", "UNKNOWN")
+    def _exit_automation(self) -> Tuple[bool, bool]:
+        """(auto-sell on objective triggers, LLM exit decisions), both unattended-only."""
         try:
-            from utils.alpaca_options import create_alpaca_trader
-            cfg = getattr(self, "config", None)
-            if cfg is None:
+            config = getattr(self, "config", None)
+            if config is None:
                 from utils.llm import load_config
-                cfg = load_config("config.yaml")
+                config = load_config("config.yaml")
+            unattended = config.get("UNATTENDED", False)
+            auto_sell = (
+                config.get("AUTO_SELL_ON_EXIT_TRIGGERS", False)
+                or config.get("AUTO_SELL_ON_PROFIT_TARGET", False)
+            )
+            return bool(unattended and auto_sell), bool(unattended and "exit" in config.get("LLM_DECISIONS", []))
+        except Exception as e:
+            logger.warning(f"[EXIT] Could not check unattended mode, falling back to interactive: {e}")
+            return False, False
 
-            broker_cfg = cfg.get("BROKER", os.getenv("BROKER", "alpaca"))
-            env_cfg = cfg.get("ALPACA_ENV", os.getenv("ALPACA_ENV", "paper" if broker_cfg == "alpaca" else "live"))
-            paper_mode = broker_cfg == "alpaca" and env_cfg == "paper"
-            trader = create_alpaca_trader(paper=paper_mode)
+    def _get_exit_executor(self):
+        """Lazily build the exit executor (see utils.exit_executor)."""
+        executor = getattr(self, "_exit_executor", None)
+        if executor is None:
+            from utils.exit_executor import ExitExecutor
 
-            # Determine OCC symbol
-            contract_symbol = position.get("occ_symbol")
-            if not contract_symbol:
-                try:
-                    from datetime import datetime as _dt
-                    expiry_dt = _dt.strptime(position.get("expiry", ""), "%Y-%m-%d")
-                    expiry_str = expiry_dt.strftime("%y%m%d")
-                    strike_str = f"{int(float(position.get('strike', 0)) * 1000):08d}"
-                    cp = (position.get("option_type", "C") or "C")[0].upper()
-                    underlying = position.get("symbol", symbol)
-                    contract_symbol = f"{underlying}{expiry_str}{cp}{strike_str}"
-                except Exception:
-                    contract_symbol = position.get("symbol", symbol)
+            broker, env = self._sync_target()
+            paper_mode = broker == "alpaca" and env == "paper"
+
+            def make_trader():
+                from utils.alpaca_options import create_alpaca_trader
+
+                trader = create_alpaca_trader(paper=paper_mode)
+                if trader is None:
+                    raise RuntimeError(f"Alpaca trader initialization failed (paper={paper_mode})")
+                return trader
+
+            executor = ExitExecutor(make_trader, async_mode=bool(getattr(self, "exit_async_pipeline", False)))
+            self._exit_executor = executor
+        return executor
+
+    def _notify(self, fn, *args, **kwargs) -> None:
+        """Run alert/chart/LLM work behind any pending close submit (follow-up pool)."""
+        self._get_exit_executor().follow_up(fn, *args, **kwargs)
+
+    def _close_order_for(self, position: Dict):
+        from utils.exit_executor import CloseOrder
+
+        quantity = position.get("quantity") or position.get("qty") or 1
+        return CloseOrder.build(self._alert_key(position), self._build_occ_symbol(position), quantity)
 
-            quantity = int(position.get("quantity") or position.get("qty") or 1)
+    def prepare_close_orders(self, positions: List[Dict]) -> int:
+        """Pre-build and validate close orders for open positions when unattended exits are enabled.
 
-            logger.info(f"[AUTO-EXIT] Placing SELL order: {contract_symbol} x{quantity} (paper={paper_mode})")
-            order_id = trader.place_market_order(contract_symbol, quantity, "SELL")
+        Returns:
+            Number of orders prepared (0 when exits are not automated)
+        """
+        if not any(self._exit_automation()):
+            return 0
+
+        orders = []
+        for position in positions:
+            try:
+                orders.append(self._close_order_for(position))
+            except Exception as e:
+                logger.warning(f"[EXIT-EXEC] Cannot pre-build close order for {position.get('symbol')}: {e}")
+        executor = self._get_exit_executor()
+        executor.warm()  # Build the trader client before the first exit fires
+        return executor.prepare(orders)
+
+    def exit_execution_metrics(self) -> Optional[Dict]:
+        """Trigger-to-submit latency and submit counters (None before any exit work)."""
+        executor = getattr(self, "_exit_executor", None)
+        return executor.metrics() if executor is not None else None
+
+    def stop_exit_executor(self) -> None:
+        executor = getattr(self, "_exit_executor", None)
+        if executor is not None:
+            executor.shutdown(wait=True)
+            logger.info(f"[MONITOR] Exit execution stats: {executor.metrics()}")
+            self._exit_executor = None
+
+    def _execute_sell_order(
+        self,
+        position: Dict,
+        current_stock_price: float,
+        current_option_price: float,
+        reason: str = "Objective Exit",
+        confidence: float = 1.0,
+        triggered_at: Optional[float] = None,
+    ) -> bool:
+        """Submit a market SELL via Alpaca (unattended exit).
+
+        The submit runs on the exit executor's dedicated thread using the
+        pre-built close order; fill polling, Slack and the position refresh
+        follow on its follow-up pool.
+
+        Returns:
+            True if the close was queued (False if one is already in flight)
+        """
+        symbol = position.get("symbol", "UNKNOWN")
+        try:
+            future = self._get_exit_executor().submit(
+                self._alert_key(position),
+                reason,
+                triggered_at=triggered_at,
+                fallback_order=lambda: self._close_order_for(position),
+                on_submitted=lambda submission: self._complete_sell_order(position, submission, confidence),
+            )
+            return future is not None
+        except Exception as e:
+            logger.error(f"[AUTO-EXIT] Error executing auto-sell for {symbol}: {e}")
+            self.slack.send_message(f"❌ **Auto-Exit Error: {symbol}**\n**Error:** {str(e)}\n**Manual intervention required**")
+            return False
 
-            if order_id:
-                fill_result = trader.poll_fill(order_id=order_id, timeout_s=90)
-                if fill_result.status == "FILLED":
-                    logger.info(f"[AUTO-EXIT] Order filled: {fill_result.filled_qty} @ ${fill_result.avg_price:.2f}")
-                    success_msg = f"""✅ **Automated Exit Executed: {symbol}**
+    def _complete_sell_order(self, position: Dict, submission, confidence: float = 1.0) -> None:
+        """Poll the fill of a submitted close and report it (runs after the submit)."""
+        symbol = position.get("symbol", "UNKNOWN")
+        order_id = submission.order_id
+        if not submission.submitted:
+            logger.error(f"[AUTO-EXIT] Failed to place sell order for {symbol}: {submission.error}")
+            self.slack.send_message(
+                f"❌ **Exit Order Failed: {symbol}**\n**Error:** {submission.error or 'Order placement failed'}\n**Manual intervention required**"
+            )
+            return
+
+        fill_result = self._get_exit_executor().trader().poll_fill(order_id=order_id, timeout_s=90)
+        if fill_result.status == "FILLED":
+            logger.info(f"[AUTO-EXIT] Order filled: {fill_result.filled_qty} @ ${fill_result.avg_price:.2f}")
+            success_msg = f"""✅ **Automated Exit Executed: {symbol}**
 **Order ID:** {order_id}
 **Quantity:** {fill_result.filled_qty} contracts
 **Fill Price:** ${fill_result.avg_price:.2f}
 **P&L:** {((fill_result.avg_price - position.get('entry_price', 0)) / max(position.get('entry_price', 1), 1)) * 100:+.1f}%
-**Reason:** {reason}
-**Confidence:** {confidence:.2f}"""
-                    self.slack.send_message(success_msg)
-                    # Mark closed in-memory to avoid duplicate advisories this cycle
-                    try:
-                        position["status"] = "closed_auto"
-                        position["close_time"] = datetime.now().isoformat()
-                    except Exception:
-                        pass
-                    # Refresh local positions after confirmed fill
-                    try:
-                        from utils.alpaca_sync import AlpacaSync
-                        sync = AlpacaSync(env=env_cfg if broker_cfg == "alpaca" else "live")
-                        sync.sync_positions()
-                    except Exception as _sync_e:
-                        logger.warning(f"[AUTO-EXIT] Post-exit sync failed: {_sync_e}")
-                else:
-                    warning_msg = f"""⚠️ **Exit Order Not Filled: {symbol}**
+**Reason:** {submission.reason}
+**Confidence:** {confidence:.2f}
+**Trigger→Submit:** {submission.trigger_to_submit_ms:.0f}ms"""
+            self.slack.send_message(success_msg)
+            # Mark closed in-memory to avoid duplicate advisories
+            try:
+                position["status"] = "closed_auto"
+                position["close_time"] = datetime.now().isoformat()
+            except Exception:
+                pass
+            # Refresh local positions after confirmed fill
+            self._refresh_positions_after_exit()
+        else:
+            warning_msg = f"""⚠️ **Exit Order Not Filled: {symbol}**
 **Order ID:** {order_id}
 **Status:** {fill_result.status}
 **Manual intervention may be required**"""
-                    logger.warning(f"[AUTO-EXIT] Order not filled: {fill_result.status}")
-                    self.slack.send_message(warning_msg)
-            else:
-                logger.error(f"[AUTO-EXIT] Failed to place sell order for {symbol}")
-                self.slack.send_message(f"❌ **Exit Order Failed: {symbol}**\n**Error:** Order placement failed\n**Manual intervention required**")
+            logger.warning(f"[AUTO-EXIT] Order not filled: {fill_result.status}")
+            self.slack.send_message(warning_msg)
 
-            # Recording of exit outcome is handled by Alpaca sync; no local ledger writes here
-        except Exception as e:
-            logger.error(f"[AUTO-EXIT] Error executing auto-sell for {symbol}: {e}")
-            self.slack.send_message(f"❌ **Auto-Exit Error: {symbol}**\n**Error:** {str(e)}\n**Manual intervention required**")
+        # Recording of exit outcome is handled by Alpaca sync; no local ledger writes here
+
+    def _refresh_positions_after_exit(self) -> None:
+        worker = getattr(self, "_sync_worker", None)
+        if worker is not None and worker.running:
+            worker.request_sync()
+            return
+        try:
+            broker, env = self._sync_target()
+            sync = AlpacaSync(env=env if broker == "alpaca" else "live")
+            sync.sync_positions()
+        except Exception as _sync_e:
+            logger.warning(f"[AUTO-EXIT] Post-exit sync failed: {_sync_e}")
 
     def _legacy_alert_system(
         self,
@@ -1532,9 +1537,78 @@ Avoid overnight risk!
         except Exception as _eod_e:
             logger.warning(f"[EOD] Failed to send EOD summary: {_eod_e}")
 
+    def _sync_target(self) -> Tuple[str, str]:
+        """Broker and environment to reconcile positions against."""
+        cfg = getattr(self, "config", None) or {}
+        broker = cfg.get("BROKER", os.getenv("BROKER", "alpaca"))
+        env = cfg.get("ALPACA_ENV", os.getenv("ALPACA_ENV", "paper" if broker == "alpaca" else "live"))
+        return broker, env
+
+    def start_position_sync(self, wait_seconds: float = 30.0) -> bool:
+        """
+        Start background position sync and wait for the initial reconciliation.
+
+        Falls back to one blocking startup sync when background sync is
+        disabled (ALPACA_MONITOR_SYNC_BACKGROUND / ALPACA_AUTO_SYNC_MONITOR) or
+        the broker is not Alpaca.
+
+        Args:
+            wait_seconds: Maximum time to wait for the first sync
+
+        Returns:
+            True if a background worker is running
+        """
+        from utils.position_sync_worker import PositionSyncWorker
+
+        broker, env = self._sync_target()
+        if not (
+            getattr(self, "auto_sync_enabled", True)
+            and getattr(self, "auto_sync_background", False)
+            and broker == "alpaca"
+        ):
+            self._maybe_auto_sync_positions(force=True)
+            return False
+
+        interval = max(1.0, float(getattr(self, "auto_sync_interval_seconds", 60)))
+        self._sync_worker = PositionSyncWorker(env=env, interval_seconds=interval).start()
+        if not self._sync_worker.wait_for_sync(timeout=wait_seconds):
+            logger.warning("[MONITOR] Initial position sync not confirmed; monitoring the local positions file")
+        self._last_positions_sync = time.time()
+        return True
+
+    def stop_position_sync(self) -> None:
+        worker = getattr(self, "_sync_worker", None)
+        if worker is not None:
+            worker.stop()
+            logger.info(f"[MONITOR] Position sync stats: {worker.metrics()}")
+            self._sync_worker = None
+
+    def position_sync_metrics(self) -> Optional[Dict]:
+        """Background sync duration/staleness metrics (None when syncing inline)."""
+        worker = getattr(self, "_sync_worker", None)
+        return worker.metrics() if worker is not None else None
+
+    def _check_sync_staleness(self, worker) -> None:
+        """Warn once when the background snapshot falls well behind its schedule."""
+        staleness = worker.staleness_seconds()
+        if staleness is None:
+            return
+        stale = staleness > 3 * worker.interval_seconds
+        if stale and not self._sync_stale_warned:
+            logger.warning(f"[MONITOR] Positions snapshot is stale: last Alpaca sync {staleness:.0f}s ago")
+        self._sync_stale_warned = stale
+
     def _maybe_auto_sync_positions(self, force: bool = False) -> None:
         """Periodically sync positions from Alpaca to keep CSV in lockstep with broker."""
         try:
+            worker = getattr(self, "_sync_worker", None)
+            if worker is not None and worker.running:
+                # The worker owns the cadence; cycles read its latest snapshot without waiting
+                if force:
+                    worker.request_sync()
+                self._check_sync_staleness(worker)
+                return
+
             if not self.auto_sync_enabled and not force:
                 return
             now = time.time()
@@ -1543,9 +1617,7 @@ Avoid overnight risk!
             if not force and (now - last) < interval:
                 return
 
-            cfg = getattr(self, "config", None) or {}
-            broker = cfg.get("BROKER", os.getenv("BROKER", "alpaca"))
-            env = cfg.get("ALPACA_ENV", os.getenv("ALPACA_ENV", "paper" if broker == "alpaca" else "live"))
+            broker, env = self._sync_target()
             if broker != "alpaca":
                 # Only auto-sync when broker is Alpaca
                 self._last_positions_sync = now
@@ -1599,7 +1671,10 @@ Avoid overnight risk!
             if not api_key or not secret_key:
                 logger.warning("[MONITOR] Alpaca option quote client unavailable (missing credentials)")
                 return None
-            self._option_quote_client = OptionHistoricalDataClient(api_key, secret_key)
+            from utils.alpaca_client import get_url_override
+            self._option_quote_client = OptionHistoricalDataClient(
+                api_key, secret_key, url_override=get_url_override()
+            )
             return self._option_quote_client
         except Exception as _e:
             logger.warning(f"[MONITOR] Failed to initialize option quote client: {_e}")
@@ -1611,40 +1686,135 @@ Avoid overnight risk!
         Uses Alpaca OptionLatestQuoteRequest. If bid is missing, falls back to a conservative
         estimate using 95% of ask to avoid extreme underestimation that could falsely trigger exits.
         """
-        try:
-            occ_symbol = self._build_occ_symbol(position)
-            if not occ_symbol:
-                return None
+        occ_symbol = self._build_occ_symbol(position)
+        if not occ_symbol:
+            return None
+        return self._get_option_mid_prices([occ_symbol]).get(occ_symbol)
 
+    def _get_option_mid_prices(self, occ_symbols: List[str]) -> Dict[str, float]:
+        """Fetch real-time option mid prices for several contracts in one quote request.
+
+        Returns:
+            Dict of OCC symbol -> mid price; contracts without a usable quote are omitted
+        """
+        if not occ_symbols:
+            return {}
+        try:
             client = self._ensure_option_quote_client()
             if client is None:
-                return None
+                return {}
 
             from alpaca.data.requests import OptionLatestQuoteRequest
-            request = OptionLatestQuoteRequest(symbol_or_symbols=occ_symbol)
+            unique = list(dict.fromkeys(occ_symbols))
+            request = OptionLatestQuoteRequest(symbol_or_symbols=unique)
             quotes = client.get_option_latest_quote(request)
-            if occ_symbol not in quotes:
-                return None
 
-            q = quotes[occ_symbol]
-            # Robust attribute access across SDK versions
-            bid = getattr(q, "bid_price", None) or getattr(q, "bid", None)
-            ask = getattr(q, "ask_price", None) or getattr(q, "ask", None)
-
-            if ask is not None and bid is not None and ask > 0 and bid > 0:
-                logger.debug(f"[MONITOR] Quote mid for {occ_symbol}: bid={bid}, ask={ask}")
-                return float((float(bid) + float(ask)) / 2.0)
-            if ask is not None and float(ask) > 0:
-                # Avoid underestimating with ask/2; use 95% of ask as a conservative mid proxy
-                logger.debug(f"[MONITOR] Quote ask-only for {occ_symbol}: ask={ask} → using 0.95×ask")
-                return float(ask) * 0.95
-            if bid is not None and float(bid) > 0:
-                logger.debug(f"[MONITOR] Quote bid-only for {occ_symbol}: bid={bid}")
-                return float(bid)
-            return None
+            mids = {}
+            for occ_symbol in unique:
+                if occ_symbol not in quotes:
+                    continue
+                mid = self._quote_mid(occ_symbol, quotes[occ_symbol])
+                if mid is not None:
+                    mids[occ_symbol] = mid
+            return mids
         except Exception as _e:
             logger.debug(f"[MONITOR] Option mid price fetch failed: {_e}")
-            return None
+            return {}
+
+    @staticmethod
+    def _quote_mid(occ_symbol: str, q) -> Optional[float]:
+        """Mid price from an option quote, tolerating a missing bid or ask."""
+        # Robust attribute access across SDK versions
+        bid = getattr(q, "bid_price", None) or getattr(q, "bid", None)
+        ask = getattr(q, "ask_price", None) or getattr(q, "ask", None)
+
+        if ask is not None and bid is not None and ask > 0 and bid > 0:
+            logger.debug(f"[MONITOR] Quote mid for {occ_symbol}: bid={bid}, ask={ask}")
+            return float((float(bid) + float(ask)) / 2.0)
+        if ask is not None and float(ask) > 0:
+            # Avoid underestimating with ask/2; use 95% of ask as a conservative mid proxy
+            logger.debug(f"[MONITOR] Quote ask-only for {occ_symbol}: ask={ask} → using 0.95×ask")
+            return float(ask) * 0.95
+        if bid is not None and float(bid) > 0:
+            logger.debug(f"[MONITOR] Quote bid-only for {occ_symbol}: bid={bid}")
+            return float(bid)
+        return None
+
+    def price_positions(self, positions: List[Dict]) -> List[Tuple[Dict, Optional[float], Optional[float], str]]:
+        """Price every position with one stock quote request and one option quote request.
+
+        Both requests are issued concurrently. Contracts without a live quote are
+        repriced from their last calibrated IV (price source "iv_model"), or fall
+        back to the option estimator when no fresh IV is cached.
+
+        Returns:
+            List of (position, stock_price, option_price, price_source) in input order;
+            prices are None when unavailable
+        """
+        occ_by_position = [self._build_occ_symbol(p) for p in positions]
+        symbols = [p["symbol"] for p in positions]
+        occ_symbols = [occ for occ in occ_by_position if occ]
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix="monitor-pricing") as pool:
+            stock_future = pool.submit(self.get_current_prices, symbols)
+            option_future = pool.submit(self._get_option_mid_prices, occ_symbols)
+            stock_prices = stock_future.result()
+            option_mids = option_future.result()
+        self.last_pricing_ms = (time.perf_counter() - start) * 1000
+        logger.debug(
+            f"[MONITOR] Priced {len(positions)} position(s) in {self.last_pricing_ms:.0f}ms "
+            f"({len(stock_prices)} underlyings, {len(option_mids)} quotes)"
+        )
+
+        # Calibrate IVs from this cycle's quotes, then reprice unquoted contracts in one pass
+        underlying_by_occ = {
+            occ: stock_prices[p["symbol"]]
+            for p, occ in zip(positions, occ_by_position)
+            if occ and stock_prices.get(p["symbol"])
+        }
+        model_prices = {}
+        try:
+            calibrator = self._get_iv_calibrator()
+            calibrator.observe(option_mids, underlying_by_occ)
+            unquoted = {occ: s for occ, s in underlying_by_occ.items() if occ not in option_mids}
+            if unquoted:
+                model_prices = calibrator.estimate(unquoted)
+        except Exception as e:
+            logger.debug(f"[MONITOR] IV model pricing skipped: {e}")
+
+        priced = []
+        for position, occ_symbol in zip(positions, occ_by_position):
+            current_price = stock_prices.get(position["symbol"])
+            option_price = option_mids.get(occ_symbol) if occ_symbol else None
+            price_source = "quote"
+            if option_price is None and occ_symbol in model_prices:
+                option_price = model_prices[occ_symbol]
+                price_source = "iv_model"
+            elif option_price is None and current_price:
+                option_price = self.estimate_option_price(
+                    position["symbol"], position["strike"], position["option_type"],
+                    position["expiry"], current_price,
+                )
+                price_source = "estimator"
+            priced.append((position, current_price, option_price, price_source))
+        return priced
+
+    def _get_iv_calibrator(self):
+        """Lazily build the IV calibrator used when option quotes are missing (see utils.iv_calibrator)."""
+        calibrator = getattr(self, "_iv_calibrator", None)
+        if calibrator is None:
+            from utils.iv_calibrator import IVCalibrator
+
+            cfg = getattr(self, "config", None) or {}
+            calibrator = IVCalibrator(max_age_seconds=float(cfg.get("MONITOR_IV_MAX_AGE_SECONDS", 900)))
+            self._iv_calibrator = calibrator
+        return calibrator
+
+    def iv_estimator_metrics(self) -> Optional[Dict]:
+        """Calibrated estimator usage and error against later quotes (None before the first cycle)."""
+        calibrator = getattr(self, "_iv_calibrator", None)
+        return calibrator.metrics() if calibrator is not None else None
 
     def _seconds_since_entry(self, position: Dict) -> float:
         """Compute seconds since entry_time for stability gating. Returns 0.0 on parse error."""
@@ -1659,6 +1829,13 @@ Avoid overnight risk!
         except Exception:
             return 0.0
 
+    def _filter_positions(self, positions: List[Dict]) -> List[Dict]:
+        """Keep only positions on watched underlyings (all when no filter is set)."""
+        symbol_filter = getattr(self, "symbol_filter", None)
+        if symbol_filter is None:
+            return positions
+        return [p for p in positions if str(p.get("symbol", "")).upper() in symbol_filter]
+
     def run_monitoring_cycle(self) -> None:
         """Run one complete monitoring cycle for all positions."""
         # Check for file-based circuit breaker reset at start of each cycle
@@ -1674,7 +1851,7 @@ Avoid overnight risk!
         # Periodically reconcile local CSV with Alpaca before reading positions
         self._maybe_auto_sync_positions()
 
-        positions = self.load_positions()
+        positions = self._filter_positions(self.load_positions())
         
         # Increment heartbeat counter
         self.heartbeat_counter += 1
@@ -1695,28 +1872,21 @@ Avoid overnight risk!
             heartbeat_msg = f"💰 Position monitor active - tracking {len(positions)} position(s): {', '.join(position_summary)}"
             self.send_heartbeat(heartbeat_msg)
 
-        for position in positions:
+        # Price every position up front (one stock + one option quote request), then
+        # evaluate exits for the whole snapshot in one vectorized pass
+        self.prepare_close_orders(positions)
+        priced = self.price_positions(positions)
+        decisions = self.evaluate_positions(priced)
+        for i, (position, current_price, current_option_price, price_source) in enumerate(priced):
             try:
                 symbol = position["symbol"]
                 strike = position["strike"]
                 option_type = position["option_type"]
-                expiry = position["expiry"]
 
-                # Get current stock price (real-time with Alpaca)
-                current_price = self.get_current_price(symbol)
                 if not current_price:
                     logger.error(f"[MONITOR] Could not get price for {symbol}")
                     continue
 
-                # Get current option price from real-time quotes; fallback to estimator
-                price_source = "quote"
-                current_option_price = self._get_option_mid_price(position)
-                if current_option_price is None:
-                    current_option_price = self.estimate_option_price(
-                        symbol, strike, option_type, expiry, current_price
-                    )
-                    price_source = "estimator"
-
                 if not current_option_price:
                     logger.error(
                         f"[MONITOR] Could not determine option price for {symbol}"
@@ -1724,9 +1894,14 @@ Avoid overnight risk!
                     continue
 
                 # Check for alerts
-                self.check_position_alerts(
-                    position, current_price, current_option_price
-                )
+                if decisions is None:
+                    self.check_position_alerts(
+                        position, current_price, current_option_price
+                    )
+                elif decisions[i] is not None:
+                    self.check_position_alerts(
+                        position, current_price, current_option_price, exit_decision=decisions[i]
+                    )
 
                 # Log current status
                 entry_price = position["entry_price"]
@@ -1750,48 +1925,199 @@ Avoid overnight risk!
         except Exception:
             logger.debug("[MONITOR] Skipped state save (non-fatal)")
 
-    def run(self, interval_minutes: int = 1) -> None:
+    def refresh_stream_positions(self, stream, evaluator) -> int:
+        """Reload open positions and resubscribe the quote streams to match.
+
+        Returns:
+            Number of positions being streamed
+        """
+        self._maybe_auto_sync_positions()
+        tracked = []
+        for position in self._filter_positions(self.load_positions()):
+            occ_symbol = self._build_occ_symbol(position)
+            if occ_symbol:
+                tracked.append(dict(position, occ_symbol=occ_symbol))
+        evaluator.set_positions(tracked)
+        stream.set_symbols(evaluator.underlyings, evaluator.occ_symbols)
+        self.prepare_close_orders(tracked)
+        return len(tracked)
+
+    def _on_stream_decision(self, position: Dict, current_price: float, option_price: float, exit_decision) -> None:
+        """Handle a tick-confirmed exit decision from the streaming evaluator."""
+        try:
+            quantity = position["quantity"]
+            entry_value = position["entry_price"] * quantity * 100
+            pnl = option_price * quantity * 100 - entry_value
+            pnl_pct = (pnl / entry_value) * 100 if entry_value else 0.0
+            position_key = f"{position['symbol']}_{position['strike']}_{position['option_type']}_{position.get('expiry')}"
+            now = datetime.now()
+
+            # Same stability guard as the polling cycle: no stop-loss action inside the grace window
+            if exit_decision.reason == ExitReason.STOP_LOSS and \
+                    self._seconds_since_entry(position) < float(getattr(self, "stop_loss_grace_seconds", 120)):
+                logger.info(f"[MONITOR] STOP_LOSS on {position_key} within grace window – waiting")
+                return
+
+            last_alert_time = self.last_alerts.get(position_key, {}).get("time", datetime.min)
+            if (now - last_alert_time).total_seconds() < self.alert_cooldown:
+                return
+
+            self.handle_exit_decision(position, current_price, option_price, pnl, pnl_pct, exit_decision)
+            self.last_alerts[position_key] = {
+                "time": now,
+                "type": exit_decision.reason.value,
+                "urgency": exit_decision.urgency,
+            }
+        finally:
+            # Re-arm; the alert cooldown rate-limits repeats if the position stays open
+            self._stream_evaluator.release(position["occ_symbol"])
+
+    def run_streaming(self) -> None:
+        """
+        Run tick-driven exit monitoring over real-time quote streams.
+
+        Subscribes to underlying and option quotes for open positions only and
+        evaluates exits on each tick (debounced per position). Positions are
+        reloaded every STREAM_POSITION_REFRESH_SECONDS to add and remove
+        subscriptions as positions open and close.
+        """
+        from utils.alpaca_client import get_data_stream_url_override
+        from utils.streaming_exits import QuoteStream, StreamingExitEvaluator
+
+        cfg = getattr(self, "config", None) or {}
+        api_key = os.getenv("ALPACA_KEY_ID") or os.getenv("ALPACA_API_KEY")
+        secret_key = os.getenv("ALPACA_SECRET_KEY")
+        if not api_key or not secret_key:
+            logger.error("[MONITOR] Streaming mode requires Alpaca credentials")
+            return
+
+        evaluator = StreamingExitEvaluator(
+            self.exit_manager,
+            on_decision=self._on_stream_decision,
+            debounce_ms=float(cfg.get("STREAM_EXIT_DEBOUNCE_MS", 250)),
+            confirm_ticks=int(cfg.get("STREAM_EXIT_CONFIRM_TICKS", 3)),
+            confirm_seconds=float(cfg.get("STREAM_EXIT_CONFIRM_SECONDS", 2.0)),
+        )
+        stream = QuoteStream(
+            api_key, secret_key, on_quote=evaluator.on_quote, url_override=get_data_stream_url_override()
+        )
+        evaluator.quotes = stream.quotes
+        self._stream_evaluator = evaluator
+        refresh_seconds = float(cfg.get("STREAM_POSITION_REFRESH_SECONDS", 5))
+
+        logger.info(f"[MONITOR] Starting streaming exit monitoring (refresh: {refresh_seconds:.0f}s)")
+        try:
+            self.start_position_sync()
+            while True:
+                count = self.refresh_stream_positions(stream, evaluator)
+                self.heartbeat_counter += 1
+                if self.heartbeat_counter % (self.heartbeat_interval * 12) == 0:
+                    self.send_heartbeat(
+                        f"📡 Streaming monitor active - {count} position(s), {stream.ticks_received} ticks"
+                    )
+                self.check_end_of_day_warning()
+                self._send_eod_summary_if_due()
+                try:
+                    self._save_state()
+                except Exception:
+                    logger.debug("[MONITOR] Skipped state save (non-fatal)")
+                time.sleep(refresh_seconds)
+        except KeyboardInterrupt:
+            logger.info("[MONITOR] Streaming monitoring stopped by user")
+        except Exception as e:
+            logger.error(f"[MONITOR] Streaming monitoring error: {e}")
+        finally:
+            stream.stop()
+            evaluator.close()
+            self.stop_position_sync()
+            self.stop_exit_executor()
+            self._save_state(force=True)
+
+    def run(self, interval_minutes: float = 1) -> None:
         """
         Run continuous position monitoring.
 
+        Cycles run on a fixed-rate schedule (see utils.loop_scheduler), aligned
+        to wall-clock boundaries unless MONITOR_ALIGN_TO_CLOCK is false, so the
+        cadence does not drift by each cycle's runtime.
+
         Args:
-            interval_minutes: Minutes between monitoring cycles
+            interval_minutes: Minutes between monitoring cycles (fractions allowed)
         """
+        from utils.loop_scheduler import LoopScheduler
+
+        cfg = getattr(self, "config", None) or {}
+        scheduler = LoopScheduler(
+            interval_minutes * 60,
+            offset_seconds=float(cfg.get("MONITOR_ALIGN_OFFSET_SECONDS", 0)),
+            align=bool(cfg.get("MONITOR_ALIGN_TO_CLOCK", True)),
+            jitter_seconds=float(cfg.get("MONITOR_JITTER_SECONDS", 0)),
+            name="monitor",
+        )
+        self._scheduler = scheduler
         logger.info(
-            f"[MONITOR] Starting enhanced monitoring (interval: {interval_minutes}min)"
+            f"[MONITOR] Starting enhanced monitoring ({scheduler.describe()})"
         )
         logger.info(
             f"[MONITOR] Data source: Alpaca (Real-time)"
         )
 
         try:
-            # Initial auto-sync at startup to reconcile state
-            self._maybe_auto_sync_positions(force=True)
+            # Reconcile with Alpaca at startup, then keep syncing in the background
+            self.start_position_sync()
 
+            scheduler.mark_started()
             while True:
                 self.run_monitoring_cycle()
 
-                # Sleep until next cycle
-                time.sleep(interval_minutes * 60)
+                # Sleep until the next scheduled tick
+                if scheduler.wait_next() is None:
+                    break
 
         except KeyboardInterrupt:
             logger.info("[MONITOR] Monitoring stopped by user")
         except Exception as e:
             logger.error(f"[MONITOR] Monitoring error: {e}")
+        finally:
+            self.stop_position_sync()
+            self.stop_exit_executor()
+            self._save_state(force=True)
+            logger.info(f"[MONITOR] Schedule stats: {scheduler.stats.to_dict()}")
+
 
+    def _save_state(self, force: bool = False) -> None:
+        """Persist select monitor state to disk.
 
-    def _save_state(self) -> None:
-        """Persist select monitor state to disk."""
+        Writes are coalesced by MonitorState: nothing is written when the state
+        is unchanged, and changes are written at most every
+        MONITOR_STATE_SAVE_INTERVAL_SECONDS unless force is set (shutdown).
+        """
         try:
             payload = {
                 "last_alerts": self.last_alerts,
                 "trailing_hits_count": self.trailing_hits_count,
                 "stop_loss_breach_counts": self._stop_loss_breach_counts,
                 "eod_summary_sent_date": self.eod_summary_sent_date,
+                "exit_manager": self._exit_manager_state(),
             }
-            self._state_store.save(payload)
+            self._state_store.update(payload, force=force)
         except Exception:
             pass
+
+    def _exit_manager_state(self) -> Optional[Dict]:
+        """Exported exit-manager peaks, re-exported only when its state_version changes."""
+        exit_manager = getattr(self, "exit_manager", None)
+        if exit_manager is None:
+            return None
+        version, state = getattr(self, "_exit_state_cache", (None, None))
+        if version != exit_manager.state_version:
+            state = exit_manager.export_state()
+            self._exit_state_cache = (exit_manager.state_version, state)
+        return state
+
+    def state_store_metrics(self) -> Optional[Dict]:
+        store = getattr(self, "_state_store", None)
+        return store.metrics() if store is not None else None
 def main():
     """Main entry point with configurable monitoring interval."""
     import argparse
@@ -1815,6 +2141,21 @@ def main():
         type=str,
         help="Path to config YAML (default: config.yaml or ENV CONFIG_PATH)",
     )
+    parser.add_argument(
+        "--streaming",
+        action="store_true",
+        help="Tick-driven exits over real-time quote streams (or MONITOR_STREAMING_ENABLED)",
+    )
+    parser.add_argument(
+        "--symbol",
+        action="append",
+        help="Only monitor positions on this underlying (repeatable; default: all)",
+    )
+    parser.add_argument(
+        "--service",
+        action="store_true",
+        help="Run as the shared monitor service; symbols are added over IPC (see utils/monitor_service.py)",
+    )
 
     args = parser.parse_args()
 
@@ -1823,6 +2164,8 @@ def main():
 
     cfg_path = args.config or os.getenv("CONFIG_PATH")
     monitor = EnhancedPositionMonitor(config_path=cfg_path)
+    if args.symbol:
+        monitor.symbol_filter = {s.upper() for s in args.symbol}
 
     # Show data source status
     if monitor.alpaca.enabled:
@@ -1837,6 +2180,26 @@ def main():
     print(f"[OK] Monitoring interval: {args.interval} seconds")
     print()
 
+    if args.service:
+        from utils.monitor_service import MonitorService
+
+        print("[OK] Mode: shared monitor service")
+        monitor.start_position_sync()
+        try:
+            service = MonitorService(monitor, interval_seconds=args.interval, symbols=args.symbol)
+            service.watch_open_positions()
+            service.run()
+        finally:
+            monitor.stop_position_sync()
+            monitor.stop_exit_executor()
+            monitor._save_state(force=True)
+        return
+
+    if args.streaming or (monitor.config or {}).get("MONITOR_STREAMING_ENABLED", False):
+        print("[OK] Mode: streaming (tick-driven exits)")
+        monitor.run_streaming()
+        return
+
     # Convert seconds to minutes for the run method
     interval_minutes = args.interval / 60.0
 
@@ -3,14 +3,15 @@
 Sync Alpaca Account Balance with System Bankroll
 
 This script pulls your current Alpaca account balance and updates
-the system's bankroll tracking file to match.
+the system's bankroll ledger (JSON or SQLite, per BANKROLL_BACKEND) to match.
 """
 
 import os
-import json
 from dotenv import load_dotenv
 from alpaca.trading.client import TradingClient
 
+from utils.bankroll import BankrollManager
+
 def sync_alpaca_balance(paper=False):
     """Sync Alpaca account balance with system bankroll."""
     
@@ -43,46 +44,24 @@ def sync_alpaca_balance(paper=False):
         print(f"[SYNC] Syncing Alpaca {env_suffix.upper()} account balance...")
         print(f"[BALANCE] Current Alpaca balance: ${current_balance:.2f}")
         
-        # Load existing bankroll data
-        try:
-            with open(bankroll_file, 'r') as f:
-                bankroll_data = json.load(f)
-        except FileNotFoundError:
-            print(f"[NEW] Creating new bankroll file: {bankroll_file}")
-            bankroll_data = {
-                "current_balance": 0.0,
-                "start_capital": current_balance,
-                "total_trades": 0,
-                "total_pnl": 0.0,
-                "trades": []
-            }
-        
-        # Update balance
-        old_balance = bankroll_data.get("current_balance", 0.0)
-        old_bankroll = bankroll_data.get("current_bankroll", 0.0)
-        balance_change = current_balance - old_balance
-        
-        bankroll_data["current_balance"] = current_balance
+        # Update the ledger through BankrollManager so the configured backend
+        # (BANKROLL_BACKEND: JSON file or SQLite ledger) and balance listeners see it
+        bankroll_manager = BankrollManager(
+            start_capital=current_balance, broker="alpaca", env=env_suffix
+        )
+        result = bankroll_manager.sync_account_balance(current_balance, reason="Alpaca balance sync")
+        old_balance = result["old_balance"]
+        balance_change = result["change"]
         
-        # Update current_bankroll to match account balance for deposits
         if balance_change > 0:
-            bankroll_data["current_bankroll"] = current_balance
             print(f"[BANKROLL] Updated trading bankroll to: ${current_balance:.2f}")
-        
-        # If this is a deposit (positive change), update start capital
-        if balance_change > 0:
-            bankroll_data["start_capital"] = current_balance
             print(f"[CAPITAL] Updated start capital to: ${current_balance:.2f}")
         
-        # Save updated bankroll
-        with open(bankroll_file, 'w') as f:
-            json.dump(bankroll_data, f, indent=2)
-        
         print(f"[SUCCESS] Bankroll sync complete!")
         print(f"[OLD] Old balance: ${old_balance:.2f}")
         print(f"[NEW] New balance: ${current_balance:.2f}")
         print(f"[CHANGE] Change: ${balance_change:+.2f}")
-        print(f"[FILE] Updated file: {bankroll_file}")
+        print(f"[FILE] Updated ledger: {bankroll_file} ({bankroll_manager.backend})")
         
         return current_balance
         
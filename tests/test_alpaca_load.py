@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Load tests for contract scanning and order execution against the Alpaca stand-in.
+
+Measures scan throughput (find_atm_contract across many underlyings) and
+execution throughput (market order + stream-confirmed fill) at 10, 50 and 200
+symbols with realistic per-request latency. Run with:
+
+    python -m pytest tests/test_alpaca_load.py -m slow -s
+"""
+
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from utils.alpaca_options import AlpacaOptionsTrader
+from utils.alpaca_standin import AlpacaStandin, upcoming_expiries
+from utils.order_events import OrderEventStream
+
+SYMBOL_COUNTS = [10, 50, 200]
+WORKERS = 16
+LATENCY_MS = 5.0
+
+
+def _symbols(count):
+    return [f"LD{i:03d}" for i in range(count)]
+
+
+@pytest.fixture
+def loaded_standin(request, monkeypatch):
+    count = request.param
+    with AlpacaStandin(latency_ms=LATENCY_MS, jitter_ms=LATENCY_MS, fill_delay_s=0.05) as standin:
+        expiries = [e.isoformat() for e in upcoming_expiries(trading_days=2, weeks=0)]
+        for i, symbol in enumerate(_symbols(count)):
+            standin.add_symbol(symbol, 50.0 + i, strikes_each_side=3, expiries=expiries)
+
+        monkeypatch.setenv("ALPACA_URL_OVERRIDE", standin.url)
+        monkeypatch.setenv("ALPACA_STREAM_URL_OVERRIDE", standin.stream_url)
+        monkeypatch.setenv("ALPACA_API_KEY", "test_key")
+        monkeypatch.setenv("ALPACA_KEY_ID", "test_key")
+        monkeypatch.setenv("ALPACA_SECRET_KEY", "test_secret")
+        yield standin, _symbols(count)
+
+
+def _report(stage, count, elapsed, standin):
+    print(
+        f"\n[LOAD] {stage}: {count} symbols in {elapsed:.2f}s "
+        f"({count / elapsed:.1f}/s, {standin.requests_total} requests)"
+    )
+
+
+@pytest.mark.slow
+class TestAlpacaLoad:
+    """Scan and execution throughput against the stand-in."""
+
+    @pytest.mark.parametrize("loaded_standin", SYMBOL_COUNTS, indirect=True)
+    def test_scan_throughput(self, loaded_standin):
+        """Every symbol resolves to an ATM contract under concurrent scanning."""
+        standin, symbols = loaded_standin
+        trader = AlpacaOptionsTrader(paper=True)
+        # The day before the first listed expiry: selection falls through to the
+        # next-expiry fallback, which is the path that resolves without volume data
+        target_expiry = (upcoming_expiries(trading_days=1, weeks=0)[0] - timedelta(days=1)).isoformat()
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=WORKERS) as pool:
+            contracts = list(pool.map(
+                lambda s: trader.find_atm_contract(s, "CALL", "WEEKLY", target_expiry), symbols
+            ))
+        elapsed = time.perf_counter() - start
+        _report("scan", len(symbols), elapsed, standin)
+
+        assert all(c is not None for c in contracts)
+        assert [c.underlying_symbol for c in contracts] == symbols
+
+    @pytest.mark.parametrize("loaded_standin", SYMBOL_COUNTS, indirect=True)
+    def test_execution_throughput(self, loaded_standin):
+        """Concurrent orders are all filled and confirmed over the stream."""
+        standin, symbols = loaded_standin
+        trader = AlpacaOptionsTrader(paper=True)
+        trader.order_events = OrderEventStream("test_key", "test_secret", url_override=standin.stream_url).start()
+        assert trader.order_events.wait_until_connected(10)
+
+        occ_by_symbol = {}
+        for occ, contract in standin.contracts.items():
+            occ_by_symbol.setdefault(contract["underlying_symbol"], occ)
+
+        def execute(symbol):
+            order_id = trader.place_market_order(occ_by_symbol[symbol], 1, "BUY")
+            return trader.poll_fill(order_id, timeout_s=30)
+
+        try:
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=WORKERS) as pool:
+                results = list(pool.map(execute, symbols))
+            elapsed = time.perf_counter() - start
+        finally:
+            trader.order_events.stop()
+        _report("execution", len(symbols), elapsed, standin)
+
+        assert all(r.status == "FILLED" for r in results)
+        assert len(standin.positions) == len(symbols)
+        # Fills were confirmed from the stream, not by polling
+        assert not any(key.startswith("GET /v2/orders/") for key in standin.request_counts)
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Tests for the local Alpaca REST/stream stand-in.
+
+Drives the real alpaca-py clients and the system's Alpaca wrappers against
+AlpacaStandin: account and positions, option contract filtering, quotes and
+bars, simulated fills confirmed over the trade_updates stream, and injected
+rate limiting.
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from alpaca.common.exceptions import APIError
+from alpaca.trading.client import TradingClient
+from alpaca.trading.enums import ContractType, ExerciseStyle, OrderSide, OrderStatus, TimeInForce
+from alpaca.trading.requests import GetOptionContractsRequest, GetOrdersRequest, MarketOrderRequest
+
+from utils.alpaca_client import AlpacaClient, get_stream_url_override, get_url_override
+from utils.alpaca_options import AlpacaOptionsTrader
+from utils.alpaca_standin import AlpacaStandin, upcoming_expiries
+from utils.order_events import OrderEventStream
+
+FIXTURE = project_root / "tests" / "fixtures" / "alpaca_standin.json"
+
+
+@pytest.fixture
+def standin():
+    with AlpacaStandin.from_fixture(str(FIXTURE), fill_delay_s=0.02) as server:
+        yield server
+
+
+@pytest.fixture
+def alpaca_env(standin, monkeypatch):
+    """Point every Alpaca client in the process at the stand-in."""
+    monkeypatch.setenv("ALPACA_URL_OVERRIDE", standin.url)
+    monkeypatch.setenv("ALPACA_STREAM_URL_OVERRIDE", standin.stream_url)
+    monkeypatch.setenv("ALPACA_API_KEY", "test_key")
+    monkeypatch.setenv("ALPACA_KEY_ID", "test_key")
+    monkeypatch.setenv("ALPACA_SECRET_KEY", "test_secret")
+    return standin
+
+
+@pytest.fixture
+def client(standin):
+    return TradingClient("test_key", "test_secret", paper=True, url_override=standin.url)
+
+
+def _atm_call(standin, symbol="SPY"):
+    expiry = upcoming_expiries()[0].isoformat()
+    price = standin.stock_prices[symbol]
+    calls = [
+        c for c in standin.contracts.values()
+        if c["underlying_symbol"] == symbol and c["type"] == "call" and c["expiration_date"] == expiry
+    ]
+    return min(calls, key=lambda c: abs(float(c["strike_price"]) - price))["symbol"]
+
+
+class TestStandinRest:
+    """Test REST endpoints through alpaca-py."""
+
+    def test_account_clock_and_fixture_positions(self, client):
+        """Fixture account, clock and positions are served in SDK-compatible shape."""
+        account = client.get_account()
+        assert account.account_number == "PA3STANDIN01"
+        assert float(account.cash) == 25000.0
+        assert client.get_clock().is_open is True
+
+        positions = client.get_all_positions()
+        assert [p.symbol for p in positions] == ["AAPL"]
+        assert float(positions[0].market_value) == pytest.approx(2316.0)
+
+    def test_option_contract_filters(self, standin, client):
+        """Contracts filter by underlying, expiry and type."""
+        expiry = upcoming_expiries()[0].isoformat()
+        response = client.get_option_contracts(GetOptionContractsRequest(
+            underlying_symbols=["QQQ"], expiration_date=expiry, type=ContractType.PUT,
+        ))
+
+        contracts = response.option_contracts
+        assert len(contracts) == 13
+        assert all(c.underlying_symbol == "QQQ" for c in contracts)
+        assert all(c.type == ContractType.PUT for c in contracts)
+        assert all(str(c.expiration_date) == expiry for c in contracts)
+
+    def test_exercise_style_filter(self, standin, client):
+        """The style field the trader sends narrows the chain to American contracts."""
+        occ = _atm_call(standin)
+        standin.contracts[occ]["style"] = "european"
+        expiry = upcoming_expiries()[0].isoformat()
+
+        response = client.get_option_contracts(GetOptionContractsRequest(
+            underlying_symbols=["SPY"], expiration_date=expiry, style=ExerciseStyle.AMERICAN, limit=1000,
+        ))
+        symbols = {c.symbol for c in response.option_contracts}
+        assert symbols and occ not in symbols
+
+    def test_contract_pagination(self, client):
+        """Large chains are paged with next_page_token."""
+        first = client.get_option_contracts(GetOptionContractsRequest(underlying_symbols=["SPY"], limit=10))
+        assert len(first.option_contracts) == 10
+        assert first.next_page_token == "10"
+
+        second = client.get_option_contracts(GetOptionContractsRequest(
+            underlying_symbols=["SPY"], limit=10, page_token=first.next_page_token,
+        ))
+        assert {c.symbol for c in first.option_contracts}.isdisjoint(c.symbol for c in second.option_contracts)
+
+    def test_market_data_through_alpaca_client(self, alpaca_env):
+        """AlpacaClient quotes and bars come from the stand-in when overridden."""
+        alpaca_env.set_stock_price("SPY", 650.0)
+        data = AlpacaClient(env="paper")
+
+        assert data.get_current_price("SPY") == pytest.approx(650.0)
+        bars = data.get_market_data("SPY", period="5d")
+        assert bars is not None and len(bars) > 0
+        assert bars["Close"].iloc[-1] == pytest.approx(650.0)
+
+    def test_url_override_helpers(self, alpaca_env, monkeypatch):
+        """Override helpers read the environment and default to None."""
+        assert get_url_override() == alpaca_env.url
+        assert get_stream_url_override() == alpaca_env.stream_url
+
+        monkeypatch.delenv("ALPACA_URL_OVERRIDE")
+        assert get_url_override() is None
+
+    def test_requests_require_credentials(self, standin):
+        """Requests without API key headers are rejected like the real API."""
+        import requests
+
+        response = requests.get(f"{standin.url}/v2/account", timeout=5)
+        assert response.status_code == 401
+
+
+class TestStandinOrders:
+    """Test simulated order flow."""
+
+    def test_market_order_fills_at_ask(self, standin, client):
+        """Market buys fill at the ask and open a position."""
+        occ = _atm_call(standin)
+        bid, ask = standin.option_quotes[occ]
+
+        order = client.submit_order(MarketOrderRequest(
+            symbol=occ, qty=2, side=OrderSide.BUY, time_in_force=TimeInForce.DAY,
+        ))
+        deadline = time.time() + 5
+        while client.get_order_by_id(order.id).status != OrderStatus.FILLED and time.time() < deadline:
+            time.sleep(0.02)
+
+        filled = client.get_order_by_id(order.id)
+        assert filled.status == OrderStatus.FILLED
+        assert float(filled.filled_avg_price) == pytest.approx(ask)
+
+        position = next(p for p in client.get_all_positions() if p.symbol == occ)
+        assert int(position.qty) == 2
+        assert float(client.get_account().cash) == pytest.approx(25000.0 - 2 * ask * 100)
+
+        closed = client.get_orders(GetOrdersRequest(status="closed"))
+        assert [o.id for o in closed] == [order.id]
+
+    def test_trader_fill_confirmed_by_stream(self, alpaca_env):
+        """AlpacaOptionsTrader places an order and confirms it over trade_updates."""
+        standin = alpaca_env
+        trader = AlpacaOptionsTrader(paper=True)
+        trader.order_events = OrderEventStream("test_key", "test_secret", url_override=standin.stream_url).start()
+        try:
+            assert trader.order_events.wait_until_connected(10)
+            occ = _atm_call(standin)
+
+            order_id = trader.place_market_order(occ, 3, "BUY")
+            result = trader.poll_fill(order_id, timeout_s=10)
+
+            assert result.status == "FILLED"
+            assert result.filled_qty == 3
+            assert result.avg_price == pytest.approx(standin.option_quotes[occ][1])
+            assert standin.request_counts["GET /v2/orders/" + str(order_id)] == 0
+        finally:
+            trader.order_events.stop()
+
+    def test_manual_partial_fill_then_cancel(self, standin, client):
+        """With auto-fill off, partial fills and cancels are driven explicitly."""
+        standin.auto_fill = False
+        occ = _atm_call(standin)
+        order = client.submit_order(MarketOrderRequest(
+            symbol=occ, qty=4, side=OrderSide.BUY, time_in_force=TimeInForce.DAY,
+        ))
+
+        standin.fill_order(str(order.id), qty=1, price=2.5)
+        assert client.get_order_by_id(order.id).status == OrderStatus.PARTIALLY_FILLED
+        assert [o.id for o in client.get_orders()] == [order.id]
+
+        client.cancel_order_by_id(order.id)
+        canceled = client.get_order_by_id(order.id)
+        assert canceled.status == OrderStatus.CANCELED
+        assert float(canceled.filled_qty) == 1
+
+    def test_trader_cancels_unfilled_remainder(self, alpaca_env):
+        """After a partial fill times out, the remainder is cancelled and the final fill re-read."""
+        standin = alpaca_env
+        standin.auto_fill = False
+        trader = AlpacaOptionsTrader(paper=True)
+        occ = _atm_call(standin)
+
+        order_id = trader.place_market_order(occ, 3, "BUY")
+        standin.fill_order(str(order_id), qty=1, price=2.5)
+        result = trader.poll_fill(order_id, timeout_s=0.5, interval_s=0.1)
+        assert result.status == "TIMEOUT"
+
+        final = trader.cancel_and_get_fill(order_id, last_result=result, interval_s=0.05)
+        assert (final.status, final.total_filled_qty, final.avg_price) == ("PARTIAL", 1, 2.5)
+        assert standin.orders[str(order_id)]["status"] == "canceled"
+        assert standin.fill_order(str(order_id)) is None  # No late fill possible
+
+    def test_close_position_sells_at_bid(self, standin, client):
+        """Closing a position submits a sell that fills at the bid."""
+        standin.set_stock_price("AAPL", 240.0)
+        order = client.close_position("AAPL")
+        assert order.side == OrderSide.SELL
+
+        deadline = time.time() + 5
+        while any(p.symbol == "AAPL" for p in client.get_all_positions()) and time.time() < deadline:
+            time.sleep(0.02)
+        assert not client.get_all_positions()
+        assert float(client.get_account().cash) == pytest.approx(25000.0 + 10 * 239.99)
+
+
+class TestStandinFaults:
+    """Test latency and error injection."""
+
+    def test_rate_limit_is_retried_by_sdk(self, standin, client):
+        """A single injected 429 is absorbed by the SDK's retry."""
+        standin.fail_next(1, status=429)
+
+        assert client.get_clock().is_open is True
+        assert standin.rate_limited_total == 1
+        assert standin.request_counts["GET /v2/clock"] == 2
+
+    def test_injected_error_surfaces(self, standin, client):
+        """Non-retryable injected errors surface as APIError."""
+        standin.fail_next(1, status=500)
+
+        with pytest.raises(APIError):
+            client.get_account()
+
+    def test_latency_is_applied(self, standin, client):
+        """Configured latency is added to every request."""
+        standin.latency_ms = 50
+        start = time.perf_counter()
+        client.get_clock()
+        assert time.perf_counter() - start >= 0.05
@@ -13,6 +13,8 @@ import unittest
 from unittest.mock import Mock, patch, MagicMock, mock_open
 import json
 import os
+import shutil
+import tempfile
 from datetime import datetime, timedelta
 from decimal import Decimal
 
@@ -174,6 +176,42 @@ class TestAlpacaSync(unittest.TestCase):
         self.assertTrue(result)
         sync._save_bankroll.assert_called_once()
     
+    def test_sync_bankroll_updates_ledger(self):
+        """Test bankroll sync updates the ledger through BankrollManager on either backend."""
+        from utils.bankroll import add_balance_listener, remove_balance_listener
+        
+        mock_account = Mock()
+        mock_account.equity = 1000.0
+        mock_account.cash = 500.0
+        mock_account.buying_power = 2000.0
+        seen = []
+        listener = lambda manager, balance: seen.append(balance)
+        add_balance_listener(listener)
+        self.addCleanup(remove_balance_listener, listener)
+        
+        for backend in ("json", "sqlite"):
+            with self.subTest(backend=backend):
+                tmpdir = tempfile.mkdtemp()
+                self.addCleanup(shutil.rmtree, tmpdir, True)
+                sync = AlpacaSync(env="paper", config=self.mock_config)
+                sync.bankroll_file = os.path.join(tmpdir, 'bankroll_alpaca_paper.json')
+                sync.bankroll_backend = backend
+                sync._get_account_with_retry = Mock(return_value=mock_account)
+                sync._log_sync_event = Mock()
+                with open(sync.bankroll_file, 'w') as f:
+                    json.dump({"balance": 900.0}, f)  # Written by an older sync
+                seen.clear()
+                
+                self.assertTrue(sync.sync_bankroll())
+                bankroll = sync._load_local_bankroll()
+                self.assertEqual(bankroll["current_bankroll"], 1000.0)
+                self.assertEqual(bankroll["balance"], 1000.0)
+                self.assertEqual(bankroll["cash"], 500.0)
+                self.assertEqual(bankroll["sync_adjustment"], 100.0)
+                self.assertEqual(bankroll["total_pnl"], 100.0)
+                self.assertEqual(bankroll["total_trades"], 0)
+                self.assertEqual(seen, [1000.0])
+    
     def test_sync_positions_success(self):
         """Test successful position synchronization."""
         # Mock positions data
@@ -383,6 +383,70 @@ class TestTradeRecording:
             assert result["start_capital"] == 100.0
 
 
+class TestCapitalReservations:
+    """Test atomic capital reservations for concurrent trade execution."""
+
+    def test_reserve_and_release(self):
+        """Reservations reduce available capital until released."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            bankroll_file = Path(temp_dir) / "test_bankroll.json"
+            manager = BankrollManager(str(bankroll_file), start_capital=500.0)
+
+            rid = manager.reserve_capital(200.0, label="SPY")
+            assert rid is not None
+            assert manager.get_reservation(rid) == 200.0
+            assert manager.get_available_capital() == 300.0
+
+            assert manager.release_reservation(rid, reason="no fill") == 200.0
+            assert manager.get_available_capital() == 500.0
+            assert manager.release_reservation(rid) == 0.0
+
+    def test_reserve_rejects_overcommit(self):
+        """Reservations cannot exceed unreserved capital."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            bankroll_file = Path(temp_dir) / "test_bankroll.json"
+            manager = BankrollManager(str(bankroll_file), start_capital=500.0)
+
+            assert manager.reserve_capital(250.0, label="SPY")
+            assert manager.reserve_capital(250.0, label="QQQ")
+            assert manager.reserve_capital(1.0, label="IWM") is None
+            assert manager.get_reserved_capital() == 500.0
+
+    def test_commit_drops_hold(self):
+        """Committing a filled reservation frees the hold without touching the ledger."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            bankroll_file = Path(temp_dir) / "test_bankroll.json"
+            manager = BankrollManager(str(bankroll_file), start_capital=500.0)
+
+            rid = manager.reserve_capital(100.0, label="SPY")
+            assert manager.commit_reservation(rid, actual_cost=85.0) == 100.0
+            assert manager.get_reserved_capital() == 0.0
+            assert manager.get_current_bankroll() == 500.0
+
+    def test_concurrent_reservations_are_atomic(self):
+        """Concurrent reservers never over-commit the bankroll."""
+        import threading
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            bankroll_file = Path(temp_dir) / "test_bankroll.json"
+            manager = BankrollManager(str(bankroll_file), start_capital=1000.0)
+            granted = []
+
+            def reserve():
+                rid = manager.reserve_capital(100.0, label="SYM")
+                if rid:
+                    granted.append(rid)
+
+            threads = [threading.Thread(target=reserve) for _ in range(25)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+            assert len(granted) == 10
+            assert manager.get_available_capital() == 0.0
+
+
 class TestErrorHandling:
     """Test error handling in bankroll operations."""
 
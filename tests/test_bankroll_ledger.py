@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Tests for the SQLite (WAL) bankroll ledger backend.
+
+Covers JSON migration, the unchanged BankrollManager API on top of SQLite,
+atomic updates under concurrent writers, fills, backend selection, and the
+schema (WAL mode, indexes).
+"""
+
+import json
+import sqlite3
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from utils.bankroll import BankrollManager
+from utils.bankroll_ledger import (
+    JsonBankrollLedger,
+    SqliteBankrollLedger,
+    configured_backend,
+    open_bankroll_ledger,
+    resolve_backend,
+    sqlite_path_for,
+)
+
+
+@pytest.fixture
+def json_path(tmp_path, monkeypatch):
+    monkeypatch.delenv("BANKROLL_BACKEND", raising=False)
+    monkeypatch.chdir(tmp_path)  # apply_fill appends bankroll_history.csv in the cwd
+    return tmp_path / "bankroll_test.json"
+
+
+def _legacy_ledger(path: Path, trades: int = 3) -> dict:
+    data = {
+        "current_bankroll": 520.0,
+        "start_capital": 500.0,
+        "total_trades": trades,
+        "winning_trades": 2,
+        "total_pnl": 20.0,
+        "max_drawdown": 1.5,
+        "peak_bankroll": 530.0,
+        "created_at": "2026-10-01T09:30:00",
+        "last_updated": "2026-10-16T15:00:00",
+        "trade_history": [
+            {"timestamp": f"2026-10-1{i}T10:00:00", "symbol": "SPY", "realized_pnl": 10.0, "status": "CLOSED"}
+            for i in range(trades)
+        ],
+        "win_loss_history": [True, False, True],
+        "bankroll_updates": [{"timestamp": "2026-10-02T09:00:00", "old_amount": 500.0, "new_amount": 510.0,
+                              "change": 10.0, "reason": "deposit"}],
+        "custom_note": "kept",
+    }
+    path.write_text(json.dumps(data))
+    return data
+
+
+class TestMigration:
+    """Test the one-time import from the bankroll JSON file."""
+
+    def test_json_migrated_on_first_open(self, json_path):
+        legacy = _legacy_ledger(json_path)
+
+        manager = BankrollManager(str(json_path), start_capital=100.0, backend="sqlite")
+
+        assert manager.backend == "sqlite"
+        assert manager.get_current_bankroll() == 520.0
+        assert manager._load_bankroll() == {**legacy, "last_updated": manager._load_bankroll()["last_updated"]}
+        assert manager.get_recent_outcomes(3) == [True, False, True]
+
+    def test_migration_runs_once(self, json_path):
+        _legacy_ledger(json_path)
+        BankrollManager(str(json_path), backend="sqlite").update_bankroll(600.0, "sync")
+
+        json_path.write_text(json.dumps({"current_bankroll": 1.0}))  # Stale JSON is no longer read
+        assert BankrollManager(str(json_path), backend="sqlite").get_current_bankroll() == 600.0
+
+    def test_configured_backend_is_authoritative(self, json_path):
+        _legacy_ledger(json_path)
+        BankrollManager(str(json_path), backend="sqlite")
+        assert sqlite_path_for(json_path).exists()
+
+        # A database left next to the JSON file does not switch the backend
+        assert resolve_backend(json_path) == "json"
+        assert BankrollManager(str(json_path)).backend == "json"
+
+        (json_path.parent / "config.yaml").write_text('BANKROLL_BACKEND: "sqlite"\n')
+        assert configured_backend() == "sqlite"
+        assert BankrollManager(str(json_path)).backend == "sqlite"
+
+    def test_env_and_invalid_backend(self, json_path, monkeypatch):
+        monkeypatch.setenv("BANKROLL_BACKEND", "sqlite")
+        assert isinstance(open_bankroll_ledger(json_path), SqliteBankrollLedger)
+        with pytest.raises(ValueError):
+            resolve_backend(json_path, "csv")
+
+
+class TestSqliteManager:
+    """Test the BankrollManager API on the SQLite backend."""
+
+    def test_new_ledger_seeded_from_start_capital(self, json_path):
+        manager = BankrollManager(str(json_path), start_capital=250.0, backend="sqlite")
+
+        assert not json_path.exists()
+        assert manager.get_current_bankroll() == 250.0
+        assert manager.get_bankroll_stats()["peak_bankroll"] == 250.0
+
+    def test_record_trade_and_outcomes(self, json_path):
+        manager = BankrollManager(str(json_path), start_capital=500.0, backend="sqlite")
+
+        manager.record_trade({"symbol": "QQQ", "direction": "CALL", "realized_pnl": 25.0})
+        manager.record_trade({"symbol": "SPY", "direction": "PUT", "realized_pnl": -10.0})
+
+        assert manager.get_current_bankroll() == 515.0
+        assert manager.get_recent_outcomes(2) == [True, False]
+        summary = manager.get_bankroll_stats()
+        assert (summary["total_trades"], summary["winning_trades"]) == (2, 1)
+        assert [t["symbol"] for t in manager.get_bankroll_stats()["trade_history"]] == ["QQQ", "SPY"]
+
+    def test_apply_fill_records_fill(self, json_path):
+        manager = BankrollManager(str(json_path), start_capital=500.0, backend="sqlite")
+        data = manager._load_bankroll()
+        data["trade_history"].append({"timestamp": "2026-10-16T10:00:00", "symbol": "SPY",
+                                      "position_id": "pos-1", "total_cost": 120.0})
+        manager._save_bankroll(data)
+
+        manager.apply_fill("pos-1", fill_price=1.30, contracts=1)
+
+        assert manager.get_current_bankroll() == pytest.approx(490.0)
+        trade = manager.get_bankroll_stats()["trade_history"][0]
+        assert trade["total_cost"] == pytest.approx(130.0) and trade["fill_updated"]
+        fills = manager._ledger.fills("pos-1")
+        assert len(fills) == 1 and fills[0]["symbol"] == "SPY"
+        assert fills[0]["cost_delta"] == pytest.approx(-10.0)
+
+    def test_failed_update_rolled_back(self, json_path):
+        manager = BankrollManager(str(json_path), start_capital=500.0, backend="sqlite")
+
+        with pytest.raises(RuntimeError):
+            with manager._ledger.transaction() as txn:
+                txn.summary["current_bankroll"] = 0.0
+                txn.add_trade({"symbol": "SPY"})
+                raise RuntimeError("crash mid-update")
+
+        assert manager.get_current_bankroll() == 500.0
+        assert manager.get_bankroll_stats()["trade_history"] == []
+
+    def test_concurrent_writers_lose_no_updates(self, json_path):
+        """Separate managers on separate threads (separate connections) all land."""
+        BankrollManager(str(json_path), start_capital=1000.0, backend="sqlite")
+
+        def worker():
+            manager = BankrollManager(str(json_path), backend="sqlite")
+            for _ in range(25):
+                manager.record_trade({"symbol": "SPY", "realized_pnl": 1.0})
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        manager = BankrollManager(str(json_path), backend="sqlite")
+        assert manager.get_current_bankroll() == pytest.approx(1100.0)
+        assert manager.get_bankroll_stats()["total_trades"] == 100
+
+    @pytest.mark.parametrize("backend", ["json", "sqlite"])
+    def test_account_balance_sync(self, json_path, backend):
+        manager = BankrollManager(str(json_path), start_capital=500.0, backend=backend)
+
+        result = manager.sync_account_balance(800.0)
+        assert (result["old_balance"], result["change"], result["current_bankroll"]) == (0.0, 800.0, 800.0)
+        stats = manager.get_bankroll_stats()
+        assert (stats["start_capital"], stats["current_balance"], stats["total_pnl"]) == (800.0, 800.0, 0.0)
+
+        manager.sync_account_balance(700.0)  # Withdrawal/loss: tracked, bankroll untouched
+        assert manager.get_current_bankroll() == 800.0
+        assert manager.get_bankroll_stats()["current_balance"] == 700.0
+
+    def test_reset(self, json_path):
+        manager = BankrollManager(str(json_path), start_capital=500.0, backend="sqlite")
+        manager.record_trade({"symbol": "SPY", "realized_pnl": 5.0})
+
+        manager.reset_bankroll(300.0)
+
+        assert manager.get_current_bankroll() == 300.0
+        assert manager.get_bankroll_stats()["trade_history"] == []
+
+
+class TestSchema:
+    """Test the database layout."""
+
+    def test_wal_mode_and_indexes(self, json_path):
+        BankrollManager(str(json_path), backend="sqlite")
+        conn = sqlite3.connect(sqlite_path_for(json_path))
+
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        indexes = {row[1] for row in conn.execute("SELECT type, name FROM sqlite_master WHERE type = 'index'")}
+        assert {"idx_trades_timestamp", "idx_trades_symbol", "idx_fills_timestamp", "idx_fills_symbol"} <= indexes
+
+    def test_json_backend_unchanged(self, json_path):
+        manager = BankrollManager(str(json_path), start_capital=75.0)
+
+        assert manager.backend == "json"
+        assert isinstance(manager._ledger, JsonBankrollLedger)
+        assert json.loads(json_path.read_text())["current_bankroll"] == 75.0
+        assert not sqlite_path_for(json_path).exists()
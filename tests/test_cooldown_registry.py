@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the in-memory cooldown registry.
+
+Tests monotonic expiry, write-behind persistence, reload at startup and
+legacy file compatibility.
+"""
+
+import json
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from utils.cooldown_registry import CooldownRegistry
+
+
+class TestCooldownRegistry:
+    """Test cooldown registry functionality."""
+
+    def test_add_and_expire(self):
+        """Cooldowns are active until their monotonic deadline passes."""
+        registry = CooldownRegistry(path=None)
+        registry.add("api", "SPY", 60)
+
+        assert registry.is_active("api", "SPY")
+        assert not registry.is_active("api", "QQQ")
+        assert not registry.is_active("expiry", "SPY")
+
+        with patch("utils.cooldown_registry.time.monotonic", return_value=time.monotonic() + 61):
+            assert not registry.is_active("api", "SPY")
+        assert registry.active("api") == {}
+
+    def test_wall_clock_jump_does_not_expire(self):
+        """Expiry ignores wall-clock changes."""
+        registry = CooldownRegistry(path=None)
+        registry.add("expiry", "IWM", 300)
+
+        future = datetime.now() + timedelta(days=1)
+        with patch("utils.cooldown_registry.datetime") as mock_dt:
+            mock_dt.now.return_value = future
+            assert registry.is_active("expiry", "IWM")
+
+    def test_write_behind_and_reload(self):
+        """Changes are persisted in the background and reloaded at startup."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = str(Path(temp_dir) / "cooldowns.json")
+            registry = CooldownRegistry(path=path, flush_delay_s=0.05)
+            registry.add("api", "SPY", 600)
+            registry.add("expiry", "QQQ", 300)
+
+            deadline = time.time() + 5
+            while not Path(path).exists() and time.time() < deadline:
+                time.sleep(0.02)
+            registry.close()
+
+            data = json.loads(Path(path).read_text())
+            assert set(data) == {"api", "expiry"}
+
+            reloaded = CooldownRegistry(path=path)
+            assert reloaded.is_active("api", "SPY")
+            assert reloaded.is_active("expiry", "QQQ")
+            assert 0 < reloaded.remaining("api", "SPY") <= 600
+
+    def test_loads_legacy_flat_file(self):
+        """Legacy {symbol: iso} files load into the api namespace, expired entries dropped."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "cooldowns.json"
+            path.write_text(json.dumps({
+                "SPY": (datetime.now() + timedelta(minutes=10)).isoformat(),
+                "QQQ": (datetime.now() - timedelta(minutes=10)).isoformat(),
+            }))
+
+            registry = CooldownRegistry(path=str(path))
+            assert registry.is_active("api", "SPY")
+            assert not registry.is_active("api", "QQQ")
+
+    def test_concurrent_adds(self):
+        """Concurrent writers do not lose entries."""
+        registry = CooldownRegistry(path=None)
+        symbols = [f"SYM{i}" for i in range(200)]
+
+        threads = [
+            threading.Thread(target=registry.add, args=("api", symbol, 60))
+            for symbol in symbols
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert set(registry.active("api")) == set(symbols)
+
+    def test_clear(self):
+        """Clearing removes single keys or whole namespaces."""
+        registry = CooldownRegistry(path=None)
+        registry.add("api", "SPY", 60)
+        registry.add("api", "QQQ", 60)
+
+        registry.clear("api", "SPY")
+        assert not registry.is_active("api", "SPY")
+        assert registry.is_active("api", "QQQ")
+
+        registry.clear("api")
+        assert registry.active("api") == {}
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Tests for the reverse CSV tail reader.
+
+Covers equivalence with csv.DictReader on the last N rows, quoted fields
+spanning lines, partially written last lines, degenerate files, reading only
+the end of the file, and recent_trades.load_recent on top of it.
+"""
+
+import csv
+import io
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from utils.csv_tail import tail_csv_rows
+
+HEADER = ["timestamp", "symbol", "decision", "reason", "pnl_pct"]
+
+
+def _write(path: Path, rows, header=HEADER) -> Path:
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+    return path
+
+
+def _full_tail(path: Path, n: int):
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))[-n:]
+
+
+def _rows(count: int, seed: int = 7):
+    rnd = random.Random(seed)
+    reasons = ["breakout", 'strong "momentum"', "line one\nline two", "a,b", "", "\"\n\"\n"]
+    return [
+        [f"2026-10-16T10:{i % 60:02d}:00", rnd.choice(["SPY", "QQQ"]), rnd.choice(["CALL", "PUT", "NO_TRADE"]),
+         rnd.choice(reasons), f"{rnd.uniform(-5, 5):.2f}"]
+        for i in range(count)
+    ]
+
+
+class TestTailRows:
+    """Test the rows returned against a full DictReader read."""
+
+    @pytest.mark.parametrize("block_size", [1, 3, 16, 65536])
+    @pytest.mark.parametrize("n", [1, 5, 37, 500])
+    def test_matches_dict_reader(self, tmp_path, n, block_size):
+        path = _write(tmp_path / "log.csv", _rows(200))
+        assert tail_csv_rows(path, n, block_size=block_size) == _full_tail(path, n)
+
+    def test_multiline_quoted_fields(self, tmp_path):
+        path = _write(tmp_path / "log.csv", [["t1", "SPY", "CALL", "first\nsecond\n\nthird", "1"],
+                                             ["t2", "QQQ", "PUT", "x\n", "2"]])
+
+        rows = tail_csv_rows(path, 2, block_size=4)
+        assert [r["reason"] for r in rows] == ["first\nsecond\n\nthird", "x\n"]
+
+    def test_crlf_and_blank_lines(self, tmp_path):
+        path = tmp_path / "log.csv"
+        path.write_bytes(b"timestamp,symbol\r\nt1,SPY\r\n\r\nt2,QQQ\r\n\r\n\r\n")
+
+        assert tail_csv_rows(path, 2, block_size=2) == [{"timestamp": "t1", "symbol": "SPY"},
+                                                       {"timestamp": "t2", "symbol": "QQQ"}]
+
+    def test_short_and_long_rows(self, tmp_path):
+        path = tmp_path / "log.csv"
+        path.write_text("timestamp,symbol,decision\nt1,SPY\nt2,QQQ,CALL,extra\n")
+
+        assert tail_csv_rows(path, 2) == _full_tail(path, 2)
+
+
+class TestFileEdges:
+    """Test unfinished writes and degenerate files."""
+
+    def test_missing_final_newline(self, tmp_path):
+        path = tmp_path / "log.csv"
+        path.write_text("timestamp,symbol\nt1,SPY\nt2,QQQ")
+
+        assert [r["symbol"] for r in tail_csv_rows(path, 5)] == ["SPY", "QQQ"]
+
+    def test_partial_quoted_row_ignored(self, tmp_path):
+        path = tmp_path / "log.csv"
+        path.write_text('timestamp,symbol,reason\nt1,SPY,ok\nt2,QQQ,"still being\nwrit')
+
+        assert tail_csv_rows(path, 5) == [{"timestamp": "t1", "symbol": "SPY", "reason": "ok"}]
+
+    @pytest.mark.parametrize("content", ["", "timestamp,symbol", "timestamp,symbol\n", "timestamp,symbol\n\n"])
+    def test_no_data_rows(self, tmp_path, content):
+        path = tmp_path / "log.csv"
+        path.write_text(content)
+
+        assert tail_csv_rows(path, 3) == []
+
+    def test_missing_file_and_zero_n(self, tmp_path):
+        path = _write(tmp_path / "log.csv", _rows(3))
+
+        assert tail_csv_rows(tmp_path / "missing.csv", 3) == []
+        assert tail_csv_rows(path, 0) == []
+
+    def test_utf8_bom_header(self, tmp_path):
+        path = tmp_path / "log.csv"
+        path.write_bytes("timestamp,symbol\nt1,SPY\n".encode("utf-8-sig"))
+
+        assert tail_csv_rows(path, 1) == [{"timestamp": "t1", "symbol": "SPY"}]
+
+    def test_only_the_tail_is_read(self, tmp_path):
+        """Undecodable bytes in the middle of the log would break a full read."""
+        path = tmp_path / "log.csv"
+        body = io.BytesIO()
+        body.write(b"timestamp,symbol\n")
+        body.write(b"t0,\xff\xfe\n" * 50_000)
+        body.write(b"t1,SPY\nt2,QQQ\n")
+        path.write_bytes(body.getvalue())
+
+        with pytest.raises(UnicodeDecodeError):
+            _full_tail(path, 2)
+        assert tail_csv_rows(path, 2, block_size=64) == [{"timestamp": "t1", "symbol": "SPY"},
+                                                         {"timestamp": "t2", "symbol": "QQQ"}]
+
+
+class TestLoadRecent:
+    """Test recent_trades.load_recent reading through the tail reader."""
+
+    def test_load_recent(self, tmp_path):
+        from utils.recent_trades import load_recent
+
+        rows = [["2026-10-16T09:35:00", "SPY", "CALL", "multi\nline", "2.5"],
+                ["2026-10-16T10:05:00", "QQQ", "PUT", "fade", "-1.0"],
+                ["2026-10-16T10:20:00", "SPY", "NO_TRADE", "", ""]]
+        path = _write(tmp_path / "trade_history_test.csv", _rows(1000) + rows)
+
+        assert load_recent(3, trade_file=path) == [
+            {"stamp": "09:35", "decision": "CALL", "result": "WIN"},
+            {"stamp": "10:05", "decision": "PUT", "result": "LOSS"},
+            {"stamp": "10:20", "decision": "NO_TRADE", "result": "FLAT"},
+        ]
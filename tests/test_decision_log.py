@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Tests for the buffered NO_TRADE decision log.
+
+Covers batching per scan, the size and age thresholds, ordering against
+unbuffered trade rows, and the flush guarantees on error, failure and
+shutdown.
+"""
+
+import csv
+import sys
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import utils.decision_log as decision_log
+from utils.decision_log import DecisionLogBuffer, flush_pending_decisions
+from utils.logging_utils import TRADE_LOG_HEADER, log_trade_decision
+
+
+def _no_trade(symbol, reason="Pre-LLM gate: low volume"):
+    return {"timestamp": "2026-10-16T10:00:00", "symbol": symbol, "decision": "NO_TRADE",
+            "confidence": 0.0, "reason": reason, "current_price": 580.0}
+
+
+def _rows(path):
+    with open(path, newline="") as f:
+        return list(csv.DictReader(f))
+
+
+@pytest.fixture
+def buffer(monkeypatch):
+    buffer = DecisionLogBuffer(max_rows=100, max_age_s=60)
+    monkeypatch.setattr(decision_log, "_decision_log", buffer)
+    yield buffer
+    buffer.close()
+
+
+class TestBatching:
+    """Test buffered writes."""
+
+    def test_scan_written_in_one_batch(self, buffer, tmp_path):
+        log_file = tmp_path / "logs" / "trade_history.csv"
+        with buffer.batch():
+            for symbol in ("SPY", "QQQ", "IWM", "DIA"):
+                buffer.log(str(log_file), _no_trade(symbol))
+            assert not log_file.exists()
+
+        rows = _rows(log_file)
+        assert [r["symbol"] for r in rows] == ["SPY", "QQQ", "IWM", "DIA"]
+        assert list(rows[0]) == TRADE_LOG_HEADER
+        assert buffer.flushes == 1
+
+    def test_nested_batches_flush_at_outermost(self, buffer, tmp_path):
+        log_file = tmp_path / "trades.csv"
+        with buffer.batch():
+            with buffer.batch():
+                buffer.log(str(log_file), _no_trade("SPY"))
+            assert buffer.pending == 1
+        assert buffer.pending == 0 and len(_rows(log_file)) == 1
+
+    def test_size_threshold(self, tmp_path):
+        buffer = DecisionLogBuffer(max_rows=3, max_age_s=60)
+        log_file = tmp_path / "trades.csv"
+        for symbol in ("SPY", "QQQ", "IWM", "DIA"):
+            buffer.log(str(log_file), _no_trade(symbol))
+
+        assert len(_rows(log_file)) == 3
+        assert buffer.pending == 1
+        buffer.close()
+
+    def test_age_threshold(self, tmp_path):
+        buffer = DecisionLogBuffer(max_rows=100, max_age_s=0.05)
+        log_file = tmp_path / "trades.csv"
+        buffer.log(str(log_file), _no_trade("SPY"))
+
+        deadline = time.monotonic() + 2.0
+        while buffer.pending and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert len(_rows(log_file)) == 1
+        buffer.close()
+
+    def test_trade_row_keeps_order(self, buffer, tmp_path):
+        log_file = tmp_path / "trades.csv"
+        buffer.log(str(log_file), _no_trade("SPY"))
+        log_trade_decision(str(log_file), {"symbol": "QQQ", "decision": "CALL", "status": "SUBMITTED"})
+
+        assert [r["decision"] for r in _rows(log_file)] == ["NO_TRADE", "CALL"]
+        assert flush_pending_decisions() == 0
+
+
+class TestFlushGuarantees:
+    """Test flushing on error, write failure and shutdown."""
+
+    def test_flushed_when_scan_fails(self, buffer, tmp_path):
+        log_file = tmp_path / "trades.csv"
+        with pytest.raises(RuntimeError):
+            with buffer.batch():
+                buffer.log(str(log_file), _no_trade("SPY"))
+                raise RuntimeError("scan failed")
+        assert len(_rows(log_file)) == 1
+
+    def test_failed_write_kept_for_retry(self, buffer, tmp_path):
+        log_file = tmp_path / "trades.csv"
+        buffer.log(str(log_file), _no_trade("SPY"))
+        with patch("utils.logging_utils.open", side_effect=OSError("disk full"), create=True):
+            assert buffer.flush() == 0
+        assert buffer.pending == 1 and buffer.failed_flushes == 1
+
+        assert buffer.flush() == 1
+        assert len(_rows(log_file)) == 1
+
+    def test_close_flushes_and_writes_through(self, tmp_path):
+        buffer = DecisionLogBuffer(max_rows=100, max_age_s=60)
+        log_file = tmp_path / "trades.csv"
+        buffer.log(str(log_file), _no_trade("SPY"))
+        buffer.close()
+        assert len(_rows(log_file)) == 1
+
+        buffer.log(str(log_file), _no_trade("QQQ"))
+        assert len(_rows(log_file)) == 2
+
+
+class TestCallers:
+    """Test the logging entry points that buffer NO_TRADE rows."""
+
+    def test_blocked_trade_buffered(self, buffer, tmp_path):
+        from types import SimpleNamespace
+        from main import log_blocked_trade
+
+        log_file = tmp_path / "trades.csv"
+        decision = SimpleNamespace(confidence=0.4, tokens_used=0)
+        log_blocked_trade({"SYMBOL": "SPY", "TRADE_LOG_FILE": str(log_file)}, decision,
+                          {"current_price": 580.0}, 500.0, "RISK")
+        assert buffer.pending == 1
+
+        buffer.flush()
+        assert _rows(log_file)[0]["status"] == "BLOCKED_RISK"
+
+    def test_batch_archived_once(self, buffer, tmp_path, monkeypatch):
+        from utils import trade_archive
+        from utils.trade_archive import open_trade_archive
+
+        monkeypatch.setattr(trade_archive, "_settings", {"enabled": True, "format": "npz", "flush_rows": 1,
+                                                        "flush_seconds": 30, "compact_parts": 0})
+        monkeypatch.setattr(trade_archive, "_instances", {})
+        log_file = tmp_path / "trade_history_test.csv"
+        with buffer.batch():
+            for symbol in ("SPY", "QQQ", "IWM"):
+                buffer.log(str(log_file), _no_trade(symbol))
+
+        # The first batch backfills the archive from the CSV; its rows must not be appended again
+        assert trade_archive.get_trade_archive(log_file).wait_for_backfill(timeout=10)
+        assert sorted(open_trade_archive(log_file).read(columns=["symbol"])["symbol"]) == ["IWM", "QQQ", "SPY"]
+
+    def test_rows_flushed_at_exit_reach_archive(self, tmp_path, monkeypatch):
+        from utils import trade_archive
+        from utils.trade_archive import TradeArchive, archive_root_for, flush_trade_archives
+
+        monkeypatch.setattr(trade_archive, "_settings", {"enabled": True, "format": "npz", "flush_rows": 1000,
+                                                        "flush_seconds": 30, "compact_parts": 0})
+        monkeypatch.setattr(trade_archive, "_instances", {})
+        buffer = DecisionLogBuffer(max_rows=100, max_age_s=60)
+        log_file = tmp_path / "trade_history_test.csv"
+        with buffer.batch():
+            buffer.log(str(log_file), _no_trade("SPY"))
+        buffer.log(str(log_file), _no_trade("QQQ"))
+        buffer.log(str(log_file), _no_trade("IWM"))
+
+        # Exit handlers run last-in first-out: the archive's flush before the buffer's close
+        flush_trade_archives()
+        buffer.close()
+        assert trade_archive.get_trade_archive(log_file).wait_for_backfill(timeout=10)
+
+        assert len(_rows(log_file)) == 3
+        symbols = TradeArchive(archive_root_for(log_file)).read(columns=["symbol"])["symbol"]
+        assert sorted(symbols) == ["IWM", "QQQ", "SPY"]
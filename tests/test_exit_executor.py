@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Tests for the non-blocking exit execution path.
+
+Covers pre-built close orders, the dedicated submit thread, trigger-to-submit
+metrics, duplicate guards, and the monitor submitting an auto-sell before any
+Slack/chart work.
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from utils.exit_executor import CloseOrder, ExitExecutor
+
+OCC_SPY = "SPY261016C00600000"
+
+
+class FakeTrader:
+    """Records place_market_order calls; fills everything."""
+
+    def __init__(self, order_id="order-1"):
+        self.order_id = order_id
+        self.orders = []
+
+    def place_market_order(self, contract_symbol, qty, side="BUY"):
+        self.orders.append((contract_symbol, qty, side, time.perf_counter()))
+        return self.order_id
+
+    def poll_fill(self, order_id=None, timeout_s=90):
+        return Mock(status="FILLED", filled_qty=1, avg_price=1.30)
+
+
+class TestCloseOrder:
+    """Test close order validation."""
+
+    def test_build(self):
+        order = CloseOrder.build("SPY_600.0_CALL_2026-10-16", OCC_SPY, "2")
+        assert (order.contract_symbol, order.quantity, order.side) == (OCC_SPY, 2, "SELL")
+
+    @pytest.mark.parametrize("symbol,qty", [("SPY", 1), (None, 1), (OCC_SPY, 0), (OCC_SPY, -1)])
+    def test_invalid_orders_rejected(self, symbol, qty):
+        with pytest.raises(ValueError):
+            CloseOrder.build("key", symbol, qty)
+
+
+class TestExecutor:
+    """Test the submit and follow-up pools."""
+
+    def test_prebuilt_order_submitted_with_latency(self):
+        trader = FakeTrader()
+        executor = ExitExecutor(lambda: trader)
+        executor.prepare([CloseOrder.build("k", OCC_SPY, 2)])
+        seen = []
+
+        triggered_at = time.perf_counter()
+        submission = executor.submit("k", "stop_loss", triggered_at=triggered_at, on_submitted=seen.append).result(5)
+        executor.shutdown()
+
+        assert trader.orders[0][:3] == (OCC_SPY, 2, "SELL")
+        assert submission.order_id == "order-1"
+        assert 0 <= submission.trigger_to_submit_ms <= (trader.orders[0][3] - triggered_at) * 1000 + 50
+        assert seen == [submission]
+        metrics = executor.metrics()
+        assert metrics["submits"] == 1 and metrics["prebuilt_hits"] == 1
+        assert metrics["avg_trigger_to_submit_ms"] == submission.trigger_to_submit_ms
+        assert metrics["in_flight"] == 0
+
+    def test_submit_not_delayed_by_follow_up_work(self):
+        """A slow notification on the follow-up pool does not hold up the next submit."""
+        executor = ExitExecutor(FakeTrader, follow_up_workers=1)
+        release = threading.Event()
+        executor.follow_up(release.wait, 5)
+
+        start = time.perf_counter()
+        submission = executor.submit("k", "stop_loss", fallback_order=lambda: CloseOrder.build("k", OCC_SPY, 1)).result(5)
+        elapsed = time.perf_counter() - start
+        release.set()
+        executor.shutdown()
+
+        assert submission.submitted
+        assert elapsed < 1.0
+        assert executor.metrics()["prebuilt_misses"] == 1
+
+    def test_duplicate_submit_skipped_while_in_flight(self):
+        executor = ExitExecutor(FakeTrader)
+        release = threading.Event()
+        order = CloseOrder.build("k", OCC_SPY, 1)
+        executor.prepare([order])
+
+        first = executor.submit("k", "stop_loss", on_submitted=lambda s: release.wait(5))
+        second = executor.submit("k", "stop_loss")
+        release.set()
+        first.result(5)
+        executor.shutdown()
+
+        assert second is None
+        assert executor.metrics()["duplicates_skipped"] == 1
+        assert not executor.in_flight("k")
+
+    def test_failed_placement_reported(self):
+        executor = ExitExecutor(lambda: FakeTrader(order_id=None))
+        executor.prepare([CloseOrder.build("k", OCC_SPY, 1)])
+        seen = []
+
+        submission = executor.submit("k", "stop_loss", on_submitted=seen.append).result(5)
+        executor.shutdown()
+
+        assert not submission.submitted and submission.error == "order placement failed"
+        assert seen == [submission]
+        assert executor.metrics()["failures"] == 1
+
+    def test_trader_built_once_and_rebuilt_after_error(self):
+        built = []
+
+        class Broken(FakeTrader):
+            def place_market_order(self, *args):
+                raise ConnectionError("socket closed")
+
+        def factory():
+            built.append(Broken() if not built else FakeTrader())
+            return built[-1]
+
+        executor = ExitExecutor(factory, async_mode=False)
+        executor.prepare([CloseOrder.build("k", OCC_SPY, 1)])
+        executor.warm()
+        assert len(built) == 1
+
+        assert executor.submit("k", "stop_loss").result().error == "socket closed"
+        assert executor.submit("k", "stop_loss").result().submitted
+        assert len(built) == 2
+
+    def test_sync_mode_runs_inline(self):
+        executor = ExitExecutor(FakeTrader, async_mode=False)
+        caller = threading.current_thread()
+        threads = []
+
+        executor.follow_up(lambda: threads.append(threading.current_thread()))
+        executor.exclusive("k", lambda: threads.append(threading.current_thread()))
+
+        assert threads == [caller, caller]
+
+
+class TestMonitorExitPath:
+    """Test the monitor's exit handling order."""
+
+    def _monitor(self, config):
+        from monitor_alpaca import EnhancedPositionMonitor
+        from utils.exit_strategies import ExitStrategyConfig, ExitStrategyManager
+
+        monitor = EnhancedPositionMonitor.__new__(EnhancedPositionMonitor)
+        monitor.config = dict({"BROKER": "alpaca", "ALPACA_ENV": "paper"}, **config)
+        monitor.exit_manager = ExitStrategyManager(ExitStrategyConfig(time_based_exit_enabled=False))
+        monitor.trailing_hits_count = {}
+        monitor.slack = Mock(enabled=True)
+        monitor.exit_async_pipeline = True
+        return monitor
+
+    def _position(self):
+        return {"symbol": "SPY", "strike": 600.0, "option_type": "CALL", "expiry": "2026-10-16",
+                "quantity": 1, "entry_price": 1.00, "entry_time": "2026-10-16T10:00:00"}
+
+    def test_auto_sell_submits_before_alerts(self):
+        """The close is submitted before the (slow) chart alert starts."""
+        monitor = self._monitor({"UNATTENDED": True, "AUTO_SELL_ON_EXIT_TRIGGERS": True})
+        trader = FakeTrader()
+        monitor._exit_executor = ExitExecutor(lambda: trader)
+        chart_started = []
+        monitor.slack.send_position_alert_with_chart.side_effect = lambda *a: (
+            chart_started.append(time.perf_counter()), time.sleep(0.3)
+        )
+        position = self._position()
+        assert monitor.prepare_close_orders([position]) == 1
+
+        decision = monitor.exit_manager.evaluate_exit(position, 600.0, 1.20)
+        start = time.perf_counter()
+        monitor.handle_exit_decision(position, 600.0, 1.20, 20.0, 20.0, decision)
+        handled_in = time.perf_counter() - start
+        monitor.stop_exit_executor()
+
+        assert handled_in < 0.2  # Chart rendering happened off the monitoring thread
+        assert trader.orders[0][:3] == (OCC_SPY, 1, "SELL")
+        assert trader.orders[0][3] < chart_started[0]
+        assert position["status"] == "closed_auto"
+        assert "Trigger→Submit" in monitor.slack.send_message.call_args_list[-1][0][0]
+
+    def test_no_orders_prepared_without_automation(self):
+        monitor = self._monitor({"UNATTENDED": False})
+        assert monitor.prepare_close_orders([self._position()]) == 0
+        assert monitor.exit_execution_metrics() is None
+
+    def test_interactive_confirmation_off_thread_and_deduplicated(self):
+        monitor = self._monitor({"UNATTENDED": False})
+        release = threading.Event()
+        calls = []
+
+        def confirm(*args):
+            calls.append(threading.current_thread().name)
+            release.wait(5)
+
+        monitor._confirm_exit_interactively = confirm
+        position = self._position()
+        decision = monitor.exit_manager.evaluate_exit(position, 600.0, 0.50)
+
+        monitor._launch_interactive_exit(position, decision, 600.0, 0.50)
+        monitor._launch_interactive_exit(position, decision, 600.0, 0.50)
+        release.set()
+        monitor.stop_exit_executor()
+
+        assert len(calls) == 1 and calls[0].startswith("exit-prompt")
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Tests for array-backed ExitStrategyManager evaluation.
+
+Checks that the vectorized batch pass gives the same decisions and tracking
+state as the original one-position-at-a-time logic, and that the monitor cycle
+evaluates its priced snapshot with a single batch call.
+"""
+
+import random
+import sys
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from utils.exit_strategies import ExitReason, ExitStrategyConfig, ExitStrategyManager
+
+
+def _config(**kwargs):
+    params = dict(
+        trailing_stop_activation_pct=10.0,
+        trailing_stop_distance_pct=5.0,
+        time_based_exit_enabled=False,
+        profit_targets=[15.0, 25.0, 35.0],
+        stop_loss_pct=25.0,
+    )
+    params.update(kwargs)
+    return ExitStrategyConfig(**params)
+
+
+def _position(symbol="SPY", strike=600.0, entry_price=1.00):
+    return {
+        "symbol": symbol,
+        "strike": strike,
+        "option_type": "CALL",
+        "expiry": "2026-10-16",
+        "entry_price": entry_price,
+        "entry_time": "2026-10-16T10:00:00",
+    }
+
+
+class ReferenceExitLogic:
+    """Dict-based per-position exit logic the vectorized manager must reproduce."""
+
+    def __init__(self, config):
+        self.config = config
+        self.peaks = {}
+        self.trailing = {}
+
+    def evaluate(self, position, option_price):
+        key = f"{position['symbol']}_{position['strike']}_{position['option_type']}_{position.get('entry_time', 'unknown')}"
+        pnl = ((option_price - position["entry_price"]) / position["entry_price"]) * 100
+        if key not in self.peaks:
+            self.peaks[key] = {"peak_pnl_pct": pnl, "peak_price": option_price}
+        elif pnl > self.peaks[key]["peak_pnl_pct"]:
+            self.peaks[key] = {"peak_pnl_pct": pnl, "peak_price": option_price}
+            if self.config.trailing_stop_enabled and pnl >= self.config.trailing_stop_activation_pct:
+                self.trailing[key] = pnl - self.config.trailing_stop_distance_pct
+        if self.config.trailing_stop_enabled and key in self.trailing and pnl <= self.trailing[key]:
+            return ExitReason.TRAILING_STOP, pnl
+        if pnl <= -self.config.stop_loss_pct:
+            return ExitReason.STOP_LOSS, pnl
+        for target in self.config.profit_targets:
+            if pnl >= target:
+                return ExitReason.PROFIT_TARGET, pnl
+        return ExitReason.NO_EXIT, pnl
+
+
+class TestParity:
+    """Test batch results against per-position logic."""
+
+    @pytest.mark.parametrize("trailing_enabled", [True, False])
+    def test_random_walk_matches_reference(self, trailing_enabled):
+        """Random price walks over 12 positions give identical decisions and state."""
+        rng = random.Random(7)
+        config = _config(trailing_stop_enabled=trailing_enabled)
+        manager = ExitStrategyManager(config)
+        reference = ReferenceExitLogic(config)
+        positions = [_position(f"S{i}", 100.0 + i, rng.uniform(0.5, 3.0)) for i in range(12)]
+        prices = [p["entry_price"] for p in positions]
+
+        for _ in range(200):
+            batch = rng.sample(range(len(positions)), rng.randint(1, len(positions)))
+            for i in batch:
+                prices[i] *= rng.uniform(0.9, 1.1)
+            decisions = manager.evaluate_exits(
+                [positions[i] for i in batch], [1.0] * len(batch), [prices[i] for i in batch]
+            )
+            for i, decision in zip(batch, decisions):
+                reason, pnl = reference.evaluate(positions[i], prices[i])
+                assert decision.reason == reason
+                assert decision.current_pnl_pct == pnl
+                assert decision.should_exit == (reason != ExitReason.NO_EXIT)
+
+        assert manager.position_peaks == reference.peaks
+        assert manager.trailing_stops == reference.trailing
+
+    def test_single_and_batch_agree(self):
+        """evaluate_exit() and evaluate_exits() produce the same decision objects."""
+        positions = [_position("SPY", entry_price=1.0), _position("QQQ", entry_price=2.0)]
+        single, batch = ExitStrategyManager(_config()), ExitStrategyManager(_config())
+
+        for prices in ([1.05, 2.0], [1.30, 1.4], [1.10, 1.6]):
+            one_by_one = [single.evaluate_exit(p, 1.0, x) for p, x in zip(positions, prices)]
+            assert batch.evaluate_exits(positions, [1.0, 1.0], prices) == one_by_one
+
+    def test_repeated_position_in_batch(self):
+        """A position listed twice sees its own earlier update, as sequential calls would."""
+        manager = ExitStrategyManager(_config(profit_targets=[]))
+        position = _position()
+        manager.evaluate_exit(position, 1.0, 1.00)
+
+        decisions = manager.evaluate_exits([position, position], [1.0, 1.0], [1.20, 1.10])
+
+        assert decisions[0].reason == ExitReason.NO_EXIT  # Arms trailing stop at 15%
+        assert decisions[1].reason == ExitReason.TRAILING_STOP
+
+
+class TestTrailingState:
+    """Test slot-backed trailing stop state."""
+
+    def test_first_sighting_does_not_arm(self):
+        """A position first seen above the activation level only seeds its peak."""
+        manager = ExitStrategyManager(_config(profit_targets=[]))
+        key = manager._get_position_key(_position())
+
+        manager.evaluate_exit(_position(), 1.0, 1.50)
+
+        assert manager.get_position_status(key)["trailing_stop"] is None
+        assert manager.get_position_status(key)["peak_data"]["peak_pnl_pct"] == pytest.approx(50.0)
+
+    def test_trailing_stop_triggers_after_new_peak(self):
+        manager = ExitStrategyManager(_config(profit_targets=[]))
+        position = _position()
+
+        manager.evaluate_exit(position, 1.0, 1.00)
+        manager.evaluate_exit(position, 1.0, 1.30)
+        decision = manager.evaluate_exit(position, 1.0, 1.24)
+
+        assert decision.reason == ExitReason.TRAILING_STOP
+        assert decision.trailing_stop_price == 1.24
+        assert "Peak: +30.0%" in decision.message and "Stop: 25.0%" in decision.message
+
+    def test_reset_frees_slot_for_reuse(self):
+        """Reset clears tracking; the freed slot starts clean for the next position."""
+        manager = ExitStrategyManager(_config(profit_targets=[]))
+        first, second = _position("SPY"), _position("QQQ")
+        manager.evaluate_exit(first, 1.0, 1.00)
+        manager.evaluate_exit(first, 1.0, 1.30)
+
+        manager.reset_position_tracking(manager._get_position_key(first))
+        manager.evaluate_exit(second, 1.0, 1.00)
+
+        assert manager.trailing_stops == {}
+        assert list(manager.position_peaks) == [manager._get_position_key(second)]
+
+    def test_grows_past_initial_capacity(self):
+        manager = ExitStrategyManager(_config())
+        positions = [_position(f"S{i}") for i in range(100)]
+
+        manager.evaluate_exits(positions, [1.0] * 100, [1.0] * 100)
+
+        assert len(manager.position_peaks) == 100
+
+
+class TestPriority:
+    """Test the strategy priority order in batch evaluation."""
+
+    def test_time_based_exit_applies_to_batch(self):
+        """Near the close every non-trailing position gets a time-based exit."""
+        manager = ExitStrategyManager(_config(time_based_exit_enabled=True))
+        positions = [_position("SPY"), _position("QQQ")]
+
+        with patch.object(ExitStrategyManager, "_minutes_to_close", return_value=4.5):
+            decisions = manager.evaluate_exits(positions, [1.0, 1.0], [0.50, 1.40])
+
+        assert [d.reason for d in decisions] == [ExitReason.TIME_BASED, ExitReason.TIME_BASED]
+        assert all(d.urgency == "critical" and d.time_to_close_minutes == 4 for d in decisions)
+
+    def test_stop_loss_before_profit_target(self):
+        manager = ExitStrategyManager(_config())
+        decisions = manager.evaluate_exits(
+            [_position("SPY"), _position("QQQ"), _position("IWM")], [1.0] * 3, [0.70, 1.27, 1.01]
+        )
+
+        assert [d.reason for d in decisions] == [ExitReason.STOP_LOSS, ExitReason.PROFIT_TARGET, ExitReason.NO_EXIT]
+        assert "PROFIT TARGET 15.0%" in decisions[1].message  # First configured target reached
+
+    def test_zero_entry_price_raises(self):
+        with pytest.raises(ZeroDivisionError):
+            ExitStrategyManager(_config()).evaluate_exit(_position(entry_price=0), 1.0, 1.0)
+
+
+class TestMonitorCycle:
+    """Test the monitor's batched evaluation."""
+
+    def _monitor(self):
+        from monitor_alpaca import EnhancedPositionMonitor
+
+        monitor = EnhancedPositionMonitor.__new__(EnhancedPositionMonitor)
+        monitor.exit_manager = Mock(wraps=ExitStrategyManager(_config()))
+        monitor.last_alerts = {}
+        monitor._stop_loss_breach_counts = {}
+        monitor.alert_cooldown = 300
+        monitor.stop_loss_grace_seconds = 0
+        return monitor
+
+    def test_one_batch_call_per_snapshot(self):
+        monitor = self._monitor()
+        priced = [(dict(_position(f"S{i}"), quantity=1), 100.0, 1.0 + i / 100, "quote") for i in range(10)]
+
+        decisions = monitor.evaluate_positions(priced)
+
+        monitor.exit_manager.evaluate_exits.assert_called_once()
+        assert len(decisions) == 10 and all(d is not None for d in decisions)
+
+    def test_cooldown_and_unpriced_rows_skipped(self):
+        from datetime import datetime
+
+        monitor = self._monitor()
+        positions = [dict(_position(s), quantity=1) for s in ("SPY", "QQQ", "IWM")]
+        monitor.last_alerts[monitor._alert_key(positions[0])] = {"time": datetime.now()}
+        priced = [(positions[0], 600.0, 1.2, "quote"), (positions[1], None, None, "quote"), (positions[2], 200.0, 1.1, "quote")]
+
+        decisions = monitor.evaluate_positions(priced)
+
+        assert decisions[0] is None and decisions[1] is None
+        assert decisions[2].reason == ExitReason.NO_EXIT
+        evaluated = monitor.exit_manager.evaluate_exits.call_args[0][0]
+        assert [p["symbol"] for p in evaluated] == ["IWM"]
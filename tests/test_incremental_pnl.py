@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Tests for event-driven daily/weekly P&L tracking.
+
+Covers balance events from BankrollManager, the cached balances in
+DailyPnLTracker (re-read only when the ledger changes on disk), and the
+incremental weekly totals that are persisted only on change.
+"""
+
+import json
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+import pytz
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import utils.daily_pnl_tracker as daily_module
+from utils.bankroll import BankrollManager
+from utils.bankroll_ledger import open_bankroll_ledger
+from utils.daily_pnl_tracker import DailyPnLTracker
+from utils.state_store import get_state_store
+from utils.weekly_pnl_tracker import WeeklyPnLTracker
+
+ET_TZ = pytz.timezone("US/Eastern")
+
+
+@pytest.fixture
+def config(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(daily_module, "_daily_pnl_tracker_instance", None)
+    return {"BROKER": "alpaca", "ALPACA_ENV": "paper", "BANKROLL_BACKEND": "json"}
+
+
+def _seed(backend, balance=1000.0):
+    return BankrollManager(broker="alpaca", env="paper", backend=backend, start_capital=balance)
+
+
+class TestDailyTracker:
+    """Test cached balances driven by ledger events."""
+
+    @pytest.mark.parametrize("backend", ["json", "sqlite"])
+    def test_gate_checks_do_not_reread_ledger(self, config, backend):
+        config["BANKROLL_BACKEND"] = backend
+        _seed(backend)
+        tracker = DailyPnLTracker(config)
+        tracker.track_daily_start_balance()
+
+        for _ in range(20):
+            assert tracker.calculate_current_daily_pnl()[0] == 0.0
+        assert tracker.balance_reads == 1
+
+    @pytest.mark.parametrize("backend", ["json", "sqlite"])
+    def test_fill_event_updates_pnl_without_read(self, config, backend):
+        config["BANKROLL_BACKEND"] = backend
+        writer = _seed(backend)
+        tracker = DailyPnLTracker(config)
+        tracker.track_daily_start_balance()
+
+        writer.record_trade({"symbol": "SPY", "realized_pnl": -25.0, "status": "CLOSED"})
+        daily_pnl, daily_pct, _ = tracker.calculate_current_daily_pnl()
+
+        assert daily_pnl == -25.0
+        assert daily_pct == pytest.approx(-2.5)
+        assert tracker.balance_events == 1
+        assert tracker.balance_reads == 1
+
+    def test_other_process_write_detected(self, config):
+        _seed("json")
+        tracker = DailyPnLTracker(config)
+        tracker.track_daily_start_balance()
+
+        # Another process rewrites the ledger (no in-process event)
+        path = Path("bankroll_alpaca_paper.json")
+        data = json.loads(path.read_text())
+        data["current_bankroll"] = 1040.0
+        path.write_text(json.dumps(data, indent=4))
+
+        assert tracker.calculate_current_daily_pnl()[0] == 40.0
+        assert tracker.balance_reads == 2
+
+    def test_other_process_sqlite_commit_detected(self, config):
+        config["BANKROLL_BACKEND"] = "sqlite"
+        _seed("sqlite")
+        tracker = DailyPnLTracker(config)
+        tracker.track_daily_start_balance()
+
+        ledger = open_bankroll_ledger("bankroll_alpaca_paper.json", "sqlite")
+        with ledger.transaction() as txn:
+            txn.summary["current_bankroll"] -= 60.0
+
+        assert tracker.calculate_current_daily_pnl()[0] == -60.0
+
+    def test_events_for_other_ledgers_ignored(self, config, tmp_path):
+        _seed("json")
+        tracker = DailyPnLTracker(config)
+        tracker.track_daily_start_balance()
+
+        other = BankrollManager(str(tmp_path / "other.json"), broker="alpaca", env="paper", backend="json")
+        other.update_bankroll(5.0, "unrelated ledger")
+
+        assert tracker.balance_events == 0
+        assert tracker.calculate_current_daily_pnl()[0] == 0.0
+
+
+class TestWeeklyTracker:
+    """Test incremental weekly totals."""
+
+    def test_unchanged_checks_do_not_persist(self, config):
+        _seed("json")
+        tracker = WeeklyPnLTracker(config)
+        tracker.daily_pnl_tracker.track_daily_start_balance()
+        state = get_state_store().namespace("weekly_pnl", tracker.state_file)
+
+        tracker.calculate_weekly_pnl()
+        state.flush()
+        writes = state.writes
+        for _ in range(20):
+            tracker.is_weekly_threshold_exceeded()
+        state.flush()
+
+        assert state.writes == writes
+        assert len(tracker._state["daily_history"]) == 1
+
+    def test_weekly_total_tracks_fills(self, config):
+        writer = _seed("json")
+        tracker = WeeklyPnLTracker(config)
+        tracker.daily_pnl_tracker.track_daily_start_balance()
+
+        now = datetime.now(ET_TZ)
+        tracker._state["daily_history"] = [
+            {"date": (now - timedelta(days=d)).strftime("%Y-%m-%d"), "pnl_amount": -10.0, "pnl_percent": -1.0}
+            for d in (9, 3, 2)
+        ]
+        assert tracker.calculate_weekly_pnl()[:2] == (-20.0, -2.0)
+
+        writer.record_trade({"symbol": "SPY", "realized_pnl": -50.0, "status": "CLOSED"})
+        weekly_pnl, weekly_pct, records = tracker.calculate_weekly_pnl()
+
+        assert weekly_pnl == -70.0
+        assert weekly_pct == pytest.approx(-7.0)
+        assert [r["date"] for r in records][-1] == now.strftime("%Y-%m-%d")
+        assert tracker._state["weekly_summary"]["worst_week_pnl"] == -70.0
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Tests for the calibrated option price fallback.
+
+Covers the vectorized Black-Scholes/IV helpers, per-contract IV calibration
+from quotes, the staleness bound, error scoring against later quotes, and
+the monitor repricing unquoted contracts from calibrated IVs.
+"""
+
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from utils.iv_calibrator import IVCalibrator
+from utils.option_math import black_scholes_price, implied_volatility
+
+
+def _occ(option_type="C", strike=600.0, days=7):
+    expiry = date.today() + timedelta(days=days)
+    return f"SPY{expiry.strftime('%y%m%d')}{option_type}{int(strike * 1000):08d}"
+
+
+class TestOptionMath:
+    """Test vectorized pricing helpers."""
+
+    def test_reference_prices_and_parity(self):
+        call = black_scholes_price(100.0, 100.0, 1.0, 0.2)
+        put = black_scholes_price(100.0, 100.0, 1.0, 0.2, is_call=False)
+        assert call == pytest.approx(7.9656, abs=1e-4)
+        assert call - put == pytest.approx(0.0, abs=1e-6)  # S - K at r=0
+
+    def test_zero_time_is_intrinsic(self):
+        prices = black_scholes_price([105.0, 95.0], 100.0, 0.0, 0.3, is_call=[True, False])
+        np.testing.assert_allclose(prices, [5.0, 5.0])
+
+    def test_implied_vol_round_trip(self):
+        S = np.array([100.0, 100.0, 250.0, 40.0])
+        K = np.array([100.0, 110.0, 240.0, 42.0])
+        T = np.array([1 / 365, 30 / 365, 0.5 / 365, 7 / 365])
+        sigma = np.array([0.15, 0.35, 0.6, 0.25])
+        is_call = np.array([True, False, True, False])
+
+        prices = black_scholes_price(S, K, T, sigma, 0.0, is_call)
+        np.testing.assert_allclose(implied_volatility(prices, S, K, T, 0.0, is_call), sigma, atol=1e-4)
+
+    def test_price_below_intrinsic_is_nan(self):
+        assert np.isnan(implied_volatility(5.0, 110.0, 100.0, 0.01))
+
+
+class TestCalibrator:
+    """Test IV caching and estimates."""
+
+    def test_estimate_tracks_underlying(self):
+        """A calibrated contract is repriced at its IV when the underlying moves."""
+        calibrator = IVCalibrator()
+        occ = _occ()
+        now = time.time()
+        T = (calibrator._contract(occ)[2] - now) / (365 * 24 * 3600)
+        quote = float(black_scholes_price(600.0, 600.0, T, 0.2))
+
+        assert calibrator.observe({occ: quote}, {occ: 600.0}, now=now) == 1
+        assert calibrator.implied_vol(occ) == pytest.approx(0.2, abs=1e-4)
+
+        estimate = calibrator.estimate({occ: 603.0}, now=now)[occ]
+        assert estimate == pytest.approx(float(black_scholes_price(603.0, 600.0, T, 0.2)), rel=1e-3)
+        assert estimate > quote
+
+    def test_batch_estimate_one_call(self, monkeypatch):
+        """All unquoted contracts are priced in one vectorized call."""
+        import utils.iv_calibrator as module
+
+        calibrator = IVCalibrator()
+        contracts = {_occ(t, k): 600.0 for t in "CP" for k in (590.0, 600.0, 610.0)}
+        calibrator.observe({occ: 5.0 for occ in contracts}, contracts)
+        calls = []
+        monkeypatch.setattr(module, "black_scholes_price", lambda *a: calls.append(a) or black_scholes_price(*a))
+
+        estimates = calibrator.estimate(contracts)
+
+        assert len(calls) == 1
+        assert set(estimates) == set(calibrator._samples)
+
+    def test_stale_iv_not_used(self):
+        calibrator = IVCalibrator(max_age_seconds=60)
+        occ = _occ()
+        calibrator.observe({occ: 5.0}, {occ: 600.0}, now=1_000.0 + time.time())
+
+        assert calibrator.estimate({occ: 600.0}, now=1_061.0 + time.time()) == {}
+        assert calibrator.metrics()["stale_skipped"] == 1
+        assert calibrator.implied_vol(occ) is None
+
+    def test_same_day_expiry_keeps_time_floor(self):
+        """Contracts at or past the close use min_time_seconds instead of T=0."""
+        calibrator = IVCalibrator(min_time_seconds=60)
+        occ = _occ(days=0)
+        after_close = calibrator._contract(occ)[2] + 600
+        assert calibrator.observe({occ: 0.30}, {occ: 600.0}, now=after_close) == 1
+        assert calibrator.estimate({occ: 600.0}, now=after_close)[occ] == pytest.approx(0.30, rel=1e-3)
+
+    def test_error_scored_against_next_quote(self):
+        calibrator = IVCalibrator()
+        occ = _occ()
+        now = time.time()
+        calibrator.observe({occ: 5.0}, {occ: 600.0}, now=now)
+        estimate = calibrator.estimate({occ: 602.0}, now=now + 15)[occ]
+
+        calibrator.observe({occ: 6.0}, {occ: 602.0}, now=now + 30)
+
+        error = calibrator.metrics()["error"]
+        assert error["samples"] == 1
+        assert error["mean_abs_error"] == pytest.approx(abs(estimate - 6.0), abs=1e-4)
+        assert error["mean_abs_pct_error"] == pytest.approx(abs(estimate - 6.0) / 6.0 * 100, abs=0.01)
+
+    def test_unparseable_symbols_ignored(self):
+        calibrator = IVCalibrator()
+        assert calibrator.observe({"SPY": 1.0}, {"SPY": 600.0}) == 0
+        assert calibrator.estimate({"SPY": 600.0}) == {}
+
+
+class TestMonitorPricing:
+    """Test the monitor's pricing fallback order."""
+
+    def _monitor(self, mids, stock_prices):
+        from monitor_alpaca import EnhancedPositionMonitor
+
+        monitor = EnhancedPositionMonitor.__new__(EnhancedPositionMonitor)
+        monitor.get_current_prices = Mock(side_effect=lambda symbols: dict(stock_prices))
+        monitor._get_option_mid_prices = Mock(side_effect=lambda occs: dict(mids))
+        monitor.estimate_option_price = Mock(return_value=0.42)
+        return monitor
+
+    def _position(self, occ, strike):
+        return {"symbol": "SPY", "strike": strike, "option_type": "CALL", "expiry": "",
+                "entry_price": 1.0, "quantity": 1, "occ_symbol": occ}
+
+    def test_unquoted_contract_uses_calibrated_iv(self):
+        quoted, other = _occ(strike=600.0), _occ(strike=605.0)
+        positions = [self._position(quoted, 600.0), self._position(other, 605.0)]
+        mids = {quoted: 6.0, other: 3.5}
+        stock = {"SPY": 600.0}
+        monitor = self._monitor(mids, stock)
+        monitor.price_positions(positions)  # Calibrates both contracts
+
+        del mids[other]
+        stock["SPY"] = 602.0
+        priced = monitor.price_positions(positions)
+
+        assert [row[3] for row in priced] == ["quote", "iv_model"]
+        assert priced[1][2] > 3.5  # Call repriced up with the underlying
+        monitor.estimate_option_price.assert_not_called()
+        assert monitor.iv_estimator_metrics()["estimates_made"] == 1
+
+    def test_uncalibrated_contract_falls_back_to_estimator(self):
+        occ = _occ()
+        monitor = self._monitor({}, {"SPY": 600.0})
+
+        priced = monitor.price_positions([self._position(occ, 600.0)])
+
+        assert priced[0][2:] == (0.42, "estimator")
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Tests for the drift-free loop scheduler.
+
+Uses a fake clock to check wall-clock alignment, fixed-rate ticks regardless
+of cycle runtime, overrun skipping and jitter bounds, plus a short real-time
+run of the position monitor loop on a sub-second schedule.
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from utils.loop_scheduler import LoopScheduler
+
+# 2026-10-16 14:02:17 UTC
+T0 = 1792159337.0
+
+
+class FakeClock:
+    """Clock whose sleep advances time instantly."""
+
+    def __init__(self, now=T0):
+        self.now = now
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+    def work(self, seconds):
+        self.now += seconds
+
+
+def _scheduler(clock, interval, **kwargs):
+    return LoopScheduler(interval, clock=clock, sleep=clock.sleep, **kwargs)
+
+
+class TestTickTimes:
+    """Test where ticks land."""
+
+    def test_aligned_to_bar_close_with_offset(self):
+        """A 5m schedule with a 5s offset fires 5s after each 5m boundary."""
+        clock = FakeClock()
+        scheduler = _scheduler(clock, 300, offset_seconds=5)
+
+        ticks = [scheduler.wait_next() for _ in range(3)]
+
+        assert [t % 300 for t in ticks] == [5, 5, 5]
+        assert ticks[0] == (T0 // 300 + 1) * 300 + 5
+        assert ticks[1] - ticks[0] == 300
+
+    def test_unaligned_anchors_to_start(self):
+        """Without alignment, ticks are spaced from the scheduler's start time."""
+        clock = FakeClock()
+        scheduler = _scheduler(clock, 45, align=False)
+
+        assert [scheduler.wait_next() for _ in range(3)] == [T0 + 45, T0 + 90, T0 + 135]
+
+    def test_sub_minute_interval(self):
+        """Fractional-second intervals are supported."""
+        clock = FakeClock()
+        scheduler = _scheduler(clock, 0.25)
+
+        ticks = [scheduler.wait_next() for _ in range(4)]
+
+        assert [round(b - a, 6) for a, b in zip(ticks, ticks[1:])] == [0.25, 0.25, 0.25]
+
+    def test_rejects_non_positive_interval(self):
+        """A zero interval is a configuration error."""
+        with pytest.raises(ValueError):
+            LoopScheduler(0)
+
+
+class TestFixedRate:
+    """Test that cycle runtime does not shift the schedule."""
+
+    def test_no_drift_with_variable_work(self):
+        """Ticks stay on the grid however long each cycle takes (within the interval)."""
+        clock = FakeClock()
+        scheduler = _scheduler(clock, 60, offset_seconds=5)
+        scheduler.mark_started()
+
+        ticks = []
+        for work in [12.0, 0.5, 41.0, 7.3, 59.0]:
+            clock.work(work)
+            ticks.append(scheduler.wait_next())
+
+        assert all(t % 60 == 5 for t in ticks)
+        assert [b - a for a, b in zip(ticks, ticks[1:])] == [60, 60, 60, 60]
+        assert scheduler.stats.overruns == 0
+        assert scheduler.stats.max_run_s == pytest.approx(59.0)
+
+    def test_overrun_skips_missed_ticks(self):
+        """A cycle longer than the interval skips the missed ticks instead of bunching up."""
+        clock = FakeClock()
+        scheduler = _scheduler(clock, 60)
+        first = scheduler.wait_next()
+
+        clock.work(150)  # Past two ticks
+        second = scheduler.wait_next()
+
+        assert second == first + 180
+        assert scheduler.stats.overruns == 1
+        assert scheduler.stats.missed_ticks == 2
+        assert scheduler.stats.last_run_s == pytest.approx(150)
+
+    def test_first_cycle_timed_with_mark_started(self):
+        """mark_started() times a cycle run before the first wait."""
+        clock = FakeClock()
+        scheduler = _scheduler(clock, 30)
+        scheduler.mark_started()
+        clock.work(4)
+
+        scheduler.wait_next()
+
+        assert scheduler.stats.last_run_s == pytest.approx(4)
+        assert scheduler.stats.ticks == 1
+
+
+class TestJitter:
+    """Test bounded jitter."""
+
+    def test_jitter_is_bounded_and_does_not_move_grid(self):
+        """Each tick fires within [tick, tick + jitter) and the grid stays put."""
+        clock = FakeClock()
+        scheduler = _scheduler(clock, 10, jitter_seconds=2)
+
+        for _ in range(20):
+            tick = scheduler.wait_next()
+            assert tick % 10 == 0
+            assert tick <= clock.now < tick + 2
+
+
+class TestRealTime:
+    """Test the scheduler with the real clock."""
+
+    def test_stop_interrupts_wait(self):
+        """stop() wakes a pending wait_next(), which returns None."""
+        scheduler = LoopScheduler(60)
+        threading.Timer(0.05, scheduler.stop).start()
+
+        start = time.monotonic()
+        assert scheduler.wait_next() is None
+        assert time.monotonic() - start < 5
+        assert scheduler.stopped
+
+    def test_monitor_run_uses_fixed_rate_schedule(self):
+        """EnhancedPositionMonitor.run() cycles on the grid, not after each cycle."""
+        from monitor_alpaca import EnhancedPositionMonitor
+
+        monitor = EnhancedPositionMonitor.__new__(EnhancedPositionMonitor)
+        monitor.config = {}
+        monitor._maybe_auto_sync_positions = Mock()
+        started = []
+
+        def cycle():
+            started.append(time.time())
+            time.sleep(0.03)  # Work shorter than the interval
+            if len(started) == 5:
+                monitor._scheduler.stop()
+
+        monitor.run_monitoring_cycle = cycle
+        monitor.run(interval_minutes=0.1 / 60)
+
+        assert len(started) == 5
+        # Grid-aligned: every scheduled cycle starts just after a 100ms boundary
+        for t in started[1:]:
+            assert (t % 0.1) < 0.05
+        assert monitor._scheduler.stats.overruns == 0
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Tests for batched position pricing in the Alpaca position monitor.
+
+Runs EnhancedPositionMonitor.price_positions() against the local Alpaca
+stand-in and checks that a cycle issues one stock quote and one option quote
+request regardless of position count, plus the estimator fallback. Reports
+pricing latency for 1, 5 and 20 positions.
+"""
+
+import sys
+import time
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from monitor_alpaca import EnhancedPositionMonitor
+from utils.alpaca_client import AlpacaClient
+from utils.alpaca_standin import AlpacaStandin, upcoming_expiries
+
+LATENCY_MS = 20.0
+STOCK_QUOTES = "GET /v2/stocks/quotes/latest"
+OPTION_QUOTES = "GET /v1beta1/options/quotes/latest"
+
+
+@pytest.fixture
+def standin(monkeypatch):
+    with AlpacaStandin(latency_ms=LATENCY_MS) as server:
+        expiries = [upcoming_expiries(trading_days=1, weeks=0)[0].isoformat()]
+        for i in range(20):
+            server.add_symbol(f"MN{i:02d}", 100.0 + i, strikes_each_side=1, expiries=expiries)
+
+        monkeypatch.setenv("ALPACA_URL_OVERRIDE", server.url)
+        monkeypatch.setenv("ALPACA_API_KEY", "test_key")
+        monkeypatch.setenv("ALPACA_KEY_ID", "test_key")
+        monkeypatch.setenv("ALPACA_SECRET_KEY", "test_secret")
+        yield server
+
+
+def _monitor():
+    monitor = EnhancedPositionMonitor.__new__(EnhancedPositionMonitor)
+    monitor.alpaca = AlpacaClient(env="paper")
+    monitor._option_quote_client = None
+    monitor.last_pricing_ms = 0.0
+    return monitor
+
+
+def _positions(standin, count):
+    positions = []
+    for occ, contract in standin.contracts.items():
+        if contract["type"] != "call" or float(contract["strike_price"]) != round(standin.stock_prices[contract["underlying_symbol"]]):
+            continue
+        positions.append({
+            "symbol": contract["underlying_symbol"],
+            "strike": float(contract["strike_price"]),
+            "option_type": "CALL",
+            "expiry": contract["expiration_date"],
+            "entry_price": 1.0,
+            "quantity": 1,
+            "occ_symbol": occ,
+        })
+    return positions[:count]
+
+
+class TestBatchedPricing:
+    """Test the batched pricing stage."""
+
+    @pytest.mark.parametrize("count", [1, 5, 20])
+    def test_one_request_per_asset_class(self, standin, count):
+        """Pricing N positions costs one stock and one option quote request."""
+        monitor = _monitor()
+        positions = _positions(standin, count)
+        assert len(positions) == count
+        monitor.get_current_prices([p["symbol"] for p in positions])  # warm up the data clients
+        monitor._get_option_mid_prices([p["occ_symbol"] for p in positions])
+        standin.request_counts.clear()
+
+        start = time.perf_counter()
+        priced = monitor.price_positions(positions)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        assert standin.request_counts[STOCK_QUOTES] == 1
+        assert standin.request_counts[OPTION_QUOTES] == 1
+        assert [p for p, *_ in priced] == positions
+        for position, stock_price, option_price, source in priced:
+            bid, ask = standin.option_quotes[position["occ_symbol"]]
+            assert stock_price == pytest.approx(standin.stock_prices[position["symbol"]])
+            assert option_price == pytest.approx((bid + ask) / 2)
+            assert source == "quote"
+
+        # Per-position requests, as the cycle used to do
+        start = time.perf_counter()
+        for position in positions:
+            monitor.alpaca.get_current_price(position["symbol"])
+            monitor._get_option_mid_price(position)
+        serial_ms = (time.perf_counter() - start) * 1000
+
+        print(f"\n[MONITOR] {count} position(s): batched {elapsed_ms:.0f}ms vs {serial_ms:.0f}ms per-position")
+        # Concurrent requests: roughly one round trip, not 2 x N
+        assert elapsed_ms < 2 * LATENCY_MS + 150
+        if count > 1:
+            assert elapsed_ms < serial_ms
+
+    def test_missing_option_quote_falls_back_to_estimator(self, standin):
+        """Contracts without a live quote are priced by the estimator."""
+        monitor = _monitor()
+        monitor.estimate_option_price = Mock(return_value=0.42)
+        positions = _positions(standin, 2)
+        del standin.option_quotes[positions[1]["occ_symbol"]]
+
+        priced = monitor.price_positions(positions)
+
+        assert priced[0][3] == "quote"
+        assert priced[1][2] == 0.42
+        assert priced[1][3] == "estimator"
+        monitor.estimate_option_price.assert_called_once()
+
+    def test_missing_stock_price_is_reported(self, standin):
+        """Underlyings without a quote come back unpriced and skip estimation."""
+        monitor = _monitor()
+        positions = _positions(standin, 2)
+        positions[0] = dict(positions[0], symbol="NOPE")
+
+        priced = monitor.price_positions(positions)
+
+        assert priced[0][1] is None
+        assert priced[1][1] == pytest.approx(standin.stock_prices[positions[1]["symbol"]])
+
+    def test_cycle_evaluates_priced_snapshot(self, standin):
+        """run_monitoring_cycle runs alert checks over the priced snapshot."""
+        monitor = _monitor()
+        positions = _positions(standin, 5)
+        monitor.config = {}
+        monitor.slack = Mock(enabled=False)
+        monitor.heartbeat_counter = 0
+        monitor.heartbeat_interval = 1000
+        monitor._maybe_auto_sync_positions = Mock()
+        monitor.load_positions = Mock(return_value=positions)
+        monitor.check_position_alerts = Mock()
+        monitor.check_end_of_day_warning = Mock()
+        monitor._send_eod_summary_if_due = Mock()
+        monitor._save_state = Mock()
+        standin.request_counts.clear()
+
+        monitor.run_monitoring_cycle()
+
+        assert monitor.check_position_alerts.call_count == 5
+        assert standin.request_counts[STOCK_QUOTES] == 1
+        assert standin.request_counts[OPTION_QUOTES] == 1
@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+"""
+Tests for the multiplexed monitor service.
+
+Covers the IPC command set, the launcher's service mode and the per-cycle
+quote request count of one shared monitor versus one monitor per symbol.
+The slow benchmark runs real monitor_alpaca.py processes against the Alpaca
+stand-in and compares memory and API calls of both models:
+
+    python -m pytest tests/test_monitor_service.py -m slow -s
+"""
+
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from utils.alpaca_standin import AlpacaStandin, upcoming_expiries
+from utils.monitor_launcher import MonitorLauncher
+from utils.monitor_service import MonitorService, MonitorServiceClient, get_service_address
+
+SYMBOLS = ["SPY", "QQQ", "IWM", "AAPL", "NVDA"]
+STOCK_QUOTES = "GET /v2/stocks/quotes/latest"
+OPTION_QUOTES = "GET /v1beta1/options/quotes/latest"
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return predicate()
+
+
+@pytest.fixture
+def address(tmp_path):
+    return str(tmp_path / "monitor.sock")
+
+
+@pytest.fixture
+def service(address):
+    monitor = Mock()
+    monitor.config = {}
+    monitor.symbol_filter = None
+    svc = MonitorService(monitor, address=address, interval_seconds=60)
+    thread = svc.start_in_thread()
+    yield svc
+    svc.stop()
+    thread.join(timeout=5)
+
+
+class TestServiceCommands:
+    """Test the IPC command set."""
+
+    def test_ping_and_status(self, service, address):
+        """ping returns the service PID; status reports cycle metrics."""
+        client = MonitorServiceClient(address)
+        assert client.ping() == os.getpid()
+
+        status = client.status()
+        assert status["ok"] is True
+        assert status["symbols"] == []
+        assert status["interval_seconds"] == 60
+        assert "rss_mb" in status
+
+    def test_add_runs_cycle_immediately(self, service, address):
+        """Adding a symbol updates the monitor filter and triggers a cycle without waiting a tick."""
+        client = MonitorServiceClient(address)
+        assert service.monitor.run_monitoring_cycle.call_count == 0  # Nothing watched yet
+
+        reply = client.add_symbol("spy")
+
+        assert reply == {"ok": True, "added": True, "symbols": ["SPY"]}
+        assert service.monitor.symbol_filter == {"SPY"}
+        assert _wait_for(lambda: service.monitor.run_monitoring_cycle.call_count == 1)
+        assert client.add_symbol("SPY")["added"] is False
+
+    def test_remove_and_list(self, service, address):
+        """Removing a symbol drops it from the filter."""
+        client = MonitorServiceClient(address)
+        client.add_symbol("SPY")
+        client.add_symbol("QQQ")
+
+        assert client.remove_symbol("SPY")["removed"] is True
+        assert client.list_symbols() == ["QQQ"]
+        assert service.monitor.symbol_filter == {"QQQ"}
+        assert client.remove_symbol("SPY")["removed"] is False
+
+    def test_bad_requests(self, service, address):
+        """Unknown actions, missing symbols and malformed JSON get error replies."""
+        client = MonitorServiceClient(address)
+        assert client.request("explode")["ok"] is False
+        assert client.request("add")["error"] == "symbol required"
+
+        import socket
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(address)
+            sock.sendall(b"not json\n")
+            assert b"invalid JSON" in sock.recv(4096)
+
+    def test_shutdown(self, service, address):
+        """shutdown stops the loop and removes the socket file."""
+        client = MonitorServiceClient(address)
+        assert client.shutdown() is True
+        assert _wait_for(lambda: not Path(address).exists())
+        assert client.ping() is None
+
+    def test_cycle_errors_are_reported(self, service, address):
+        """A failing cycle is recorded, not fatal."""
+        service.monitor.run_monitoring_cycle.side_effect = RuntimeError("boom")
+        client = MonitorServiceClient(address)
+        client.add_symbol("SPY")
+
+        assert _wait_for(lambda: client.status()["last_cycle_error"] == "boom")
+        assert client.ping()
+
+    def test_watch_open_positions(self, address):
+        """A (re)started service watches the underlyings of open positions."""
+        monitor = Mock()
+        monitor.config = {}
+        monitor.load_positions.return_value = [
+            {"symbol": "spy"}, {"symbol": "QQQ", "status": "closed_manual"}, {"symbol": "IWM"}, {"symbol": "AAPL"},
+        ]
+        svc = MonitorService(monitor, address=address, symbols=["AAPL"])
+
+        assert svc.watch_open_positions() == ["IWM", "SPY"]
+        assert svc.symbols == ["AAPL", "IWM", "SPY"]
+        assert monitor.symbol_filter == {"AAPL", "IWM", "SPY"}
+
+    def test_address_resolution(self, monkeypatch, tmp_path):
+        """ENV beats config beats the default socket under the project root."""
+        monkeypatch.delenv("MONITOR_SERVICE_ADDRESS", raising=False)
+        assert get_service_address(project_root=tmp_path) == str(tmp_path / ".monitor_service.sock")
+        assert get_service_address({"MONITOR_SERVICE_ADDRESS": "127.0.0.1:9000"}) == "127.0.0.1:9000"
+        monkeypatch.setenv("MONITOR_SERVICE_ADDRESS", "/tmp/x.sock")
+        assert get_service_address({"MONITOR_SERVICE_ADDRESS": "127.0.0.1:9000"}) == "/tmp/x.sock"
+
+
+class TestLauncherServiceMode:
+    """Test MonitorLauncher routing symbols to the shared service."""
+
+    def _launcher(self, tmp_path, address):
+        with patch("utils.monitor_launcher.EnhancedSlackIntegration"):
+            launcher = MonitorLauncher(project_root=tmp_path, use_service=True, service_address=address)
+        launcher.slack = None
+        return launcher
+
+    def test_symbols_go_to_one_service(self, service, address, tmp_path):
+        """ensure_monitor_running adds symbols to the running service instead of spawning."""
+        launcher = self._launcher(tmp_path, address)
+        launcher._spawn_monitor = Mock()
+        launcher._spawn_service = Mock()
+
+        assert launcher.ensure_monitor_running("SPY")
+        assert launcher.ensure_monitor_running("QQQ")
+
+        launcher._spawn_monitor.assert_not_called()
+        launcher._spawn_service.assert_not_called()
+        assert launcher.list_running_monitors() == {"QQQ": os.getpid(), "SPY": os.getpid()}
+        assert not list(tmp_path.glob(".monitor_*.pid"))
+
+        assert launcher.stop_monitor("SPY")
+        assert service.symbols == ["QQQ"]
+
+        assert launcher.cleanup_all_monitors() == 1
+        assert _wait_for(lambda: MonitorServiceClient(address).ping() is None)
+
+    def test_spawns_service_when_not_running(self, tmp_path, address):
+        """With no service answering, the launcher spawns one and waits for it."""
+        launcher = self._launcher(tmp_path, address)
+        launcher._spawn_service = Mock(return_value=None)
+
+        assert launcher.ensure_monitor_running("SPY") is False
+        launcher._spawn_service.assert_called_once()
+
+
+    def test_spawn_service_passes_interval_and_symbols(self, tmp_path, address):
+        """The spawned service gets the configured interval and the symbol being added."""
+        with patch("utils.monitor_launcher.EnhancedSlackIntegration"):
+            launcher = MonitorLauncher(project_root=tmp_path, use_service=True, service_address=address,
+                                       service_interval_seconds=30)
+        (tmp_path / "monitor_alpaca.py").touch()
+
+        with patch("utils.monitor_launcher.subprocess.Popen") as popen:
+            popen.return_value.pid = 4321
+            assert launcher._spawn_service(["spy"]) == 4321
+        assert popen.call_args[0][0][2:] == ["--service", "--interval", "30", "--symbol", "SPY"]
+
+        launcher._spawn_service = Mock(return_value=None)
+        launcher.ensure_monitor_running("QQQ")
+        launcher._spawn_service.assert_called_once_with(["QQQ"])
+
+
+def _standin_positions(standin):
+    expiry = upcoming_expiries(trading_days=1, weeks=0)[0].isoformat()
+    for i, symbol in enumerate(SYMBOLS):
+        standin.add_symbol(symbol, 100.0 + 10 * i, strikes_each_side=1, expiries=[expiry])
+    rows = []
+    for occ, contract in standin.contracts.items():
+        underlying = contract["underlying_symbol"]
+        strike = float(contract["strike_price"])
+        if contract["type"] == "call" and strike == round(standin.stock_prices[underlying]):
+            bid, ask = standin.option_quotes[occ]
+            rows.append({
+                "symbol": underlying,
+                "strike": strike,
+                "option_type": "CALL",
+                "expiry": expiry,
+                "quantity": 1,
+                "entry_price": round((bid + ask) / 2, 2),  # Flat P&L: no exits fire
+                "entry_time": "2026-10-16T10:00:00",
+                "occ_symbol": occ,
+            })
+    return rows
+
+
+def _cycle_monitor(positions):
+    """Monitor wired for run_monitoring_cycle against the stand-in."""
+    from monitor_alpaca import EnhancedPositionMonitor
+    from utils.alpaca_client import AlpacaClient
+
+    monitor = EnhancedPositionMonitor.__new__(EnhancedPositionMonitor)
+    monitor.alpaca = AlpacaClient(env="paper")
+    monitor._option_quote_client = None
+    monitor.last_pricing_ms = 0.0
+    monitor.config = {}
+    monitor.slack = Mock(enabled=False)
+    monitor.heartbeat_counter = 0
+    monitor.heartbeat_interval = 1000
+    monitor.symbol_filter = None
+    monitor._maybe_auto_sync_positions = Mock()
+    monitor.load_positions = Mock(return_value=positions)
+    monitor.check_position_alerts = Mock()
+    monitor.check_end_of_day_warning = Mock()
+    monitor._send_eod_summary_if_due = Mock()
+    monitor._save_state = Mock()
+    return monitor
+
+
+class TestSharedCycleApiCalls:
+    """Compare quote requests per cycle: one shared monitor vs one per symbol."""
+
+    def test_shared_monitor_batches_all_symbols(self, monkeypatch):
+        """One cycle over 5 symbols costs 2 quote requests instead of 10."""
+        with AlpacaStandin() as standin:
+            monkeypatch.setenv("ALPACA_URL_OVERRIDE", standin.url)
+            monkeypatch.setenv("ALPACA_API_KEY", "test_key")
+            monkeypatch.setenv("ALPACA_KEY_ID", "test_key")
+            monkeypatch.setenv("ALPACA_SECRET_KEY", "test_secret")
+            positions = _standin_positions(standin)
+            assert len(positions) == len(SYMBOLS)
+
+            per_symbol = []
+            for symbol in SYMBOLS:
+                monitor = _cycle_monitor(positions)
+                monitor.symbol_filter = {symbol}
+                per_symbol.append(monitor)
+            standin.request_counts.clear()
+            for monitor in per_symbol:
+                monitor.run_monitoring_cycle()
+            per_symbol_calls = standin.request_counts[STOCK_QUOTES] + standin.request_counts[OPTION_QUOTES]
+
+            shared = _cycle_monitor(positions)
+            svc = MonitorService(shared, address="unused", symbols=SYMBOLS)
+            standin.request_counts.clear()
+            shared.run_monitoring_cycle()
+            shared_calls = standin.request_counts[STOCK_QUOTES] + standin.request_counts[OPTION_QUOTES]
+
+        print(f"\n[MONITOR-SVC] quote requests per cycle: {per_symbol_calls} per-symbol vs {shared_calls} shared")
+        assert svc.symbols == sorted(SYMBOLS)
+        assert shared.check_position_alerts.call_count == len(SYMBOLS)
+        assert sum(m.check_position_alerts.call_count for m in per_symbol) == len(SYMBOLS)
+        assert per_symbol_calls == 2 * len(SYMBOLS)
+        assert shared_calls == 2
+
+
+@pytest.mark.slow
+class TestProcessModelBenchmark:
+    """Memory and API calls: 5 monitor processes vs one service process."""
+
+    WINDOW_S = 5.0
+
+    def _env(self, standin, workdir):
+        expiry = upcoming_expiries(trading_days=1, weeks=0)[0].isoformat()
+        rows = _standin_positions(standin)
+        (workdir / "positions.csv").write_text(
+            "symbol,strike,option_type,expiry,quantity,entry_price,entry_time\n"
+            + "".join(
+                f"{r['symbol']},{r['strike']},CALL,{expiry},1,{r['entry_price']},{r['entry_time']}\n" for r in rows
+            )
+        )
+        (workdir / "config.yaml").write_text(
+            "BROKER: alpaca\n"
+            "ALPACA_ENV: paper\n"
+            f"POSITIONS_FILE: {workdir / 'positions.csv'}\n"
+            "ALPACA_AUTO_SYNC_MONITOR: false\n"
+            "exit_strategies:\n"
+            "  time_based_exit_enabled: false\n"
+        )
+        env = dict(os.environ)
+        env.update({
+            "ALPACA_URL_OVERRIDE": standin.url,
+            "ALPACA_API_KEY": "test_key",
+            "ALPACA_KEY_ID": "test_key",
+            "ALPACA_SECRET_KEY": "test_secret",
+            "CONFIG_PATH": str(workdir / "config.yaml"),
+            "MONITOR_SERVICE_ADDRESS": str(workdir / "svc.sock"),
+        })
+        for key in ("SLACK_BOT_TOKEN", "SLACK_WEBHOOK_URL"):
+            env.pop(key, None)
+        return env
+
+    def _measure(self, standin, processes, warm):
+        import psutil
+
+        assert _wait_for(warm, timeout=60), "monitors did not start cycling"
+        standin.request_counts.clear()
+        time.sleep(self.WINDOW_S)
+        calls = sum(standin.request_counts.values())
+        rss = sum(psutil.Process(p.pid).memory_info().rss for p in processes) / (1024 * 1024)
+        return rss, calls
+
+    def _stop(self, processes):
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+    def test_service_uses_less_memory_and_fewer_calls(self, tmp_path):
+        """One service process beats five per-symbol processes on memory and API calls."""
+        script = str(project_root / "monitor_alpaca.py")
+        with AlpacaStandin() as standin:
+            env = self._env(standin, tmp_path)
+            spawn = dict(cwd=str(tmp_path), env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+            per_symbol = [
+                subprocess.Popen([sys.executable, script, "--symbol", s, "--interval", "1"], **spawn)
+                for s in SYMBOLS
+            ]
+            try:
+                rss_multi, calls_multi = self._measure(
+                    standin, per_symbol, lambda: standin.request_counts[STOCK_QUOTES] >= 2 * len(SYMBOLS)
+                )
+            finally:
+                self._stop(per_symbol)
+
+            service = subprocess.Popen([sys.executable, script, "--service", "--interval", "1"], **spawn)
+            client = MonitorServiceClient(env["MONITOR_SERVICE_ADDRESS"])
+            try:
+                assert _wait_for(lambda: client.ping() is not None, timeout=60)
+                for symbol in SYMBOLS:
+                    client.add_symbol(symbol)
+                rss_service, calls_service = self._measure(
+                    standin, [service], lambda: client.status()["cycles"] >= 2
+                )
+                assert client.status()["last_cycle_error"] is None
+            finally:
+                client.shutdown()
+                self._stop([service])
+
+        print(
+            f"\n[MONITOR-SVC] {len(SYMBOLS)} symbols over {self.WINDOW_S:.0f}s: "
+            f"per-symbol {rss_multi:.0f}MB RSS / {calls_multi} API calls, "
+            f"service {rss_service:.0f}MB RSS / {calls_service} API calls"
+        )
+        assert rss_service < rss_multi / 2
+        assert calls_service < calls_multi
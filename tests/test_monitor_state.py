@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Tests for persisted monitor state.
+
+Covers coalesced writes (unchanged state skipped, changes written at most
+every interval, flush on shutdown), datetime round-trips, and exit-manager
+peak/trailing-stop state surviving a monitor restart.
+"""
+
+import json
+import sys
+from datetime import date, datetime
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from utils.exit_strategies import ExitReason, ExitStrategyConfig, ExitStrategyManager
+from utils.monitor_state import MonitorState
+
+
+def _position():
+    return {"symbol": "SPY", "strike": 600.0, "option_type": "CALL", "expiry": "2026-10-16", "entry_price": 1.00}
+
+
+def _manager():
+    return ExitStrategyManager(ExitStrategyConfig(time_based_exit_enabled=False))
+
+
+class TestMonitorState:
+    """Test coalesced, change-tracked writes."""
+
+    def test_unchanged_state_not_rewritten(self, tmp_path):
+        store = MonitorState(str(tmp_path / "state.json"))
+        assert store.update({"a": 1})
+        mtime = (tmp_path / "state.json").stat().st_mtime_ns
+
+        assert not store.update({"a": 1})
+        assert store.writes == 1 and store.skipped == 1
+        assert (tmp_path / "state.json").stat().st_mtime_ns == mtime
+
+    def test_changes_coalesced_within_interval(self, tmp_path):
+        path = tmp_path / "state.json"
+        store = MonitorState(str(path), min_interval_seconds=60)
+        assert store.update({"a": 1})
+
+        assert not store.update({"a": 2})
+        assert not store.update({"a": 3})
+        assert store.dirty
+        assert json.loads(path.read_text()) == {"a": 1}
+
+        assert store.flush()
+        assert not store.dirty
+        assert json.loads(path.read_text()) == {"a": 3}
+        assert store.writes == 2
+
+    def test_force_writes_immediately(self, tmp_path):
+        store = MonitorState(str(tmp_path / "state.json"), min_interval_seconds=60)
+        store.update({"a": 1})
+        assert store.update({"a": 2}, force=True)
+
+    def test_reverting_change_clears_pending(self, tmp_path):
+        store = MonitorState(str(tmp_path / "state.json"), min_interval_seconds=60)
+        store.update({"a": 1})
+        store.update({"a": 2})
+        store.update({"a": 1})
+        assert not store.dirty and not store.flush()
+
+    def test_datetimes_round_trip(self, tmp_path):
+        """Alert times and the EOD date serialize (previously the whole save failed)."""
+        path = str(tmp_path / "state.json")
+        alert_time = datetime(2026, 10, 16, 10, 30, 5)
+        MonitorState(path).update({
+            "last_alerts": {"SPY_600.0_CALL_2026-10-16": {"pnl_pct": 12.5, "time": alert_time}},
+            "eod_summary_sent_date": date(2026, 10, 16),
+        })
+
+        loaded = MonitorState(path).load()
+
+        assert loaded["last_alerts"]["SPY_600.0_CALL_2026-10-16"]["time"] == alert_time
+        assert loaded["eod_summary_sent_date"] == date(2026, 10, 16)
+
+    def test_loaded_state_not_rewritten(self, tmp_path):
+        path = str(tmp_path / "state.json")
+        MonitorState(path).update({"a": 1})
+        store = MonitorState(path)
+        store.update(store.load())
+        assert store.writes == 0
+
+
+class TestExitStateRestore:
+    """Test exit-manager peak state persistence."""
+
+    def test_restored_trailing_stop_fires(self):
+        position = _position()
+        manager = _manager()
+        manager.evaluate_exit(position, 600.0, 1.00)
+        manager.evaluate_exit(position, 600.0, 1.30)  # Peak +30%, trailing stop armed at +25%
+
+        restored = _manager()
+        assert restored.restore_state(json.loads(json.dumps(manager.export_state()))) == 1
+
+        decision = restored.evaluate_exit(position, 600.0, 1.24)
+        assert decision.reason == ExitReason.TRAILING_STOP
+        assert restored.position_peaks == manager.position_peaks
+
+    def test_state_version_tracks_changes(self):
+        position = _position()
+        manager = _manager()
+        manager.evaluate_exit(position, 600.0, 1.00)
+        version = manager.state_version
+
+        manager.evaluate_exit(position, 600.0, 0.95)
+        assert manager.state_version == version
+
+        manager.evaluate_exit(position, 600.0, 1.10)
+        assert manager.state_version > version
+
+    def test_mismatched_columns_rejected(self):
+        with pytest.raises(ValueError):
+            _manager().restore_state({"keys": ["a", "b"], "peak_pnl_pct": [1.0], "peak_price": [1.0],
+                                      "trailing_stop": [None]})
+
+    def test_monitor_restart_resumes_trailing(self, tmp_path):
+        from monitor_alpaca import EnhancedPositionMonitor
+
+        def monitor():
+            m = EnhancedPositionMonitor.__new__(EnhancedPositionMonitor)
+            m.exit_manager = _manager()
+            m.last_alerts, m.trailing_hits_count, m._stop_loss_breach_counts = {}, {}, {}
+            m.eod_summary_sent_date = None
+            m._state_store = MonitorState(str(tmp_path / "monitor_state.json"), min_interval_seconds=60)
+            return m
+
+        position = _position()
+        first = monitor()
+        first.exit_manager.evaluate_exit(position, 600.0, 1.00)
+        first._save_state()
+        first.exit_manager.evaluate_exit(position, 600.0, 1.40)
+        first._save_state()  # Coalesced; written by the shutdown flush
+        first._save_state(force=True)
+
+        second = monitor()
+        assert second._restore_exit_tracking(second._state_store.load()) == 1
+        second._save_state()
+        assert second._state_store.writes == 0  # Restored state is not rewritten
+
+        decision = second.exit_manager.evaluate_exit(position, 600.0, 1.30)
+        assert decision.reason == ExitReason.TRAILING_STOP
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Unit tests for event-driven fill confirmation.
+
+Runs OrderEventStream against the local trade_updates stand-in and checks
+fill dispatch, the fill-before-register race, and the polling fallback in
+AlpacaOptionsTrader.poll_fill().
+"""
+
+import sys
+import time
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from alpaca.trading.enums import OrderStatus
+
+from utils.alpaca_options import AlpacaOptionsTrader
+from utils.alpaca_standin import TradeUpdatesStandin, make_order
+from utils.order_events import OrderEventStream
+
+
+@pytest.fixture
+def standin():
+    with TradeUpdatesStandin() as server:
+        yield server
+
+
+@pytest.fixture
+def stream(standin):
+    events = OrderEventStream("test_key", "test_secret", url_override=standin.url).start()
+    assert events.wait_until_connected(10)
+    assert standin.wait_for_listeners(1, 10)
+    yield events
+    events.stop()
+
+
+def _trader_with(order_events, client=None):
+    trader = AlpacaOptionsTrader.__new__(AlpacaOptionsTrader)
+    trader.paper = True
+    trader.client = client or Mock()
+    trader.order_events = order_events
+    return trader
+
+
+class TestOrderEventStream:
+    """Test trade_updates dispatch to per-order futures."""
+
+    def test_fill_resolves_waiter(self, standin, stream):
+        """A fill event resolves the registered future with a FILLED result."""
+        order = make_order("order-1", qty=2, filled_qty=2, filled_avg_price=1.35, client_order_id="cid-1")
+        future = stream.register(order_id="order-1")
+
+        standin.publish_order_update("fill", order)
+        result = future.result(timeout=5)
+
+        assert result.status == "FILLED"
+        assert result.filled_qty == 2
+        assert result.avg_price == pytest.approx(1.35)
+        assert result.remaining_qty == 0
+        assert result.order_id == "order-1"
+        assert result.client_order_id == "cid-1"
+        assert stream.fills_dispatched == 1
+
+    def test_fill_before_register_is_cached(self, standin, stream):
+        """A fill that arrives before registration is still delivered."""
+        order = make_order("order-2", qty=1, filled_qty=1, filled_avg_price=2.10, client_order_id="cid-2")
+        standin.publish_order_update("fill", order)
+
+        deadline = time.time() + 5
+        while stream.events_received < 1 and time.time() < deadline:
+            time.sleep(0.05)
+
+        result = stream.wait_for_fill(client_order_id="cid-2", timeout_s=1)
+        assert result.status == "FILLED"
+        assert result.order_id == "order-2"
+
+    def test_cancel_after_partial_fill(self, standin, stream):
+        """Cancel events map to poll_fill's lowercase status with remaining qty."""
+        order = make_order("order-3", qty=5, filled_qty=2, filled_avg_price=0.95)
+        future = stream.register(order_id="order-3")
+
+        standin.publish_order_update("partial_fill", order)
+        standin.publish_order_update("canceled", order)
+        result = future.result(timeout=5)
+
+        assert result.status == OrderStatus.CANCELED.value
+        assert result.filled_qty == 2
+        assert result.remaining_qty == 3
+
+    def test_timeout_reports_partial_fill(self, standin, stream):
+        """Timeout while connected returns TIMEOUT with partial quantities."""
+        order = make_order("order-4", qty=4, filled_qty=1, filled_avg_price=1.00)
+        standin.publish_order_update("partial_fill", order)
+
+        result = stream.wait_for_fill(order_id="order-4", timeout_s=1)
+        assert result.status == "TIMEOUT"
+        assert result.total_filled_qty == 1
+        assert result.remaining_qty == 3
+
+    def test_disconnect_returns_none(self, standin, stream):
+        """Losing the stream while waiting signals the caller to poll."""
+        standin.drop_connections()
+        deadline = time.time() + 5
+        while stream.is_connected and time.time() < deadline:
+            time.sleep(0.05)
+
+        assert stream.wait_for_fill(order_id="order-5", timeout_s=2) is None
+        assert stream.disconnects >= 1
+
+    def test_register_requires_identifier(self, stream):
+        """Registering without any order identifier is an error."""
+        with pytest.raises(ValueError):
+            stream.register()
+
+
+class TestPollFillWithStream:
+    """Test poll_fill() stream path and polling fallback."""
+
+    def test_poll_fill_uses_stream(self, standin, stream):
+        """Fills arrive via the stream without touching the REST client."""
+        trader = _trader_with(stream)
+        order = make_order("order-6", qty=1, filled_qty=1, filled_avg_price=3.20)
+
+        standin.publish_order_update("fill", order)
+        result = trader.poll_fill(order_id="order-6", timeout_s=5)
+
+        assert result.status == "FILLED"
+        assert result.avg_price == pytest.approx(3.20)
+        trader.client.get_order_by_id.assert_not_called()
+
+    def test_poll_fill_falls_back_when_stream_down(self):
+        """A disconnected stream falls back to REST polling."""
+        order = Mock()
+        order.id = "order-7"
+        order.client_order_id = "cid-7"
+        order.status = OrderStatus.FILLED
+        order.qty = "1"
+        order.filled_qty = "1"
+        order.filled_avg_price = "1.50"
+        client = Mock()
+        client.get_order_by_id.return_value = order
+
+        events = Mock()
+        events.is_connected = False
+        trader = _trader_with(events, client)
+
+        result = trader.poll_fill(order_id="order-7", timeout_s=5, interval_s=0)
+
+        assert result.status == "FILLED"
+        assert result.avg_price == pytest.approx(1.50)
+        events.wait_for_fill.assert_not_called()
+        client.get_order_by_id.assert_called_once_with("order-7")
+
+    def test_poll_fill_falls_back_after_stream_loss(self):
+        """Stream loss mid-wait polls for the remaining time."""
+        order = Mock()
+        order.id = "order-8"
+        order.client_order_id = "cid-8"
+        order.status = OrderStatus.FILLED
+        order.qty = "2"
+        order.filled_qty = "2"
+        order.filled_avg_price = "0.80"
+        client = Mock()
+        client.get_order_by_id.return_value = order
+
+        events = Mock()
+        events.is_connected = True
+        events.wait_for_fill.return_value = None
+        trader = _trader_with(events, client)
+
+        result = trader.poll_fill(order_id="order-8", timeout_s=5, interval_s=0)
+
+        assert result.status == "FILLED"
+        assert result.filled_qty == 2
+        client.get_order_by_id.assert_called_once_with("order-8")
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Test concurrent execution of top-ranked multi-symbol opportunities.
+
+Verifies that capital is reserved before dispatch, trades run in parallel,
+and reservations are committed on fill and rolled back on failure.
+"""
+
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from main import execute_opportunities_concurrently
+from utils.bankroll import BankrollManager
+
+
+def _opportunity(symbol):
+    return {
+        "symbol": symbol,
+        "decision": "CALL",
+        "confidence": 0.8,
+        "current_price": 100.0,
+        "reason": "test breakout",
+    }
+
+
+class TestConcurrentExecution:
+    """Test suite for the concurrent execution stage."""
+
+    def setup_method(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.bankroll = BankrollManager(
+            str(Path(self.temp_dir.name) / "bankroll.json"), start_capital=1000.0
+        )
+        self.config = {"ALPACA_ENV": "paper", "RISK_FRACTION": 0.3}
+        self.args = Mock()
+        self.args.unattended = True
+        self.portfolio = Mock()
+        self.portfolio.load_positions.return_value = []
+
+    def teardown_method(self):
+        self.temp_dir.cleanup()
+
+    def _run(self, opportunities, max_trades, fake_execute):
+        with patch("main.sync_before_trade", return_value=True) as mock_sync, \
+             patch("main.execute_multi_symbol_trade", side_effect=fake_execute):
+            results = execute_opportunities_concurrently(
+                opportunities=opportunities,
+                config=self.config,
+                args=self.args,
+                env_vars={},
+                bankroll_manager=self.bankroll,
+                portfolio_manager=self.portfolio,
+                slack_notifier=None,
+                max_trades=max_trades,
+            )
+        mock_sync.assert_called_once()
+        return results
+
+    def test_trades_run_in_parallel(self):
+        """Top-K opportunities execute concurrently, each with a reservation."""
+        barrier = threading.Barrier(3, timeout=5)
+        reserved = []
+
+        def fake_execute(opportunity, reservation_id=None, **kwargs):
+            reserved.append(self.bankroll.get_reservation(reservation_id))
+            barrier.wait()  # Deadlocks unless all three run at once
+            return {"success": True, "symbol": opportunity["symbol"], "total_cost": 150.0}
+
+        results = self._run([_opportunity(s) for s in ("SPY", "QQQ", "IWM")], 3, fake_execute)
+
+        assert len(results) == 3
+        assert all(r["success"] for r in results)
+        assert reserved == [300.0, 300.0, 300.0]
+        assert self.bankroll.get_reserved_capital() == 0.0
+
+    def test_failure_rolls_back_and_spills_over(self):
+        """Failed trades release their reservation and the next opportunity is tried."""
+        def fake_execute(opportunity, reservation_id=None, **kwargs):
+            if opportunity["symbol"] == "QQQ":
+                return {"success": False, "error_type": "no_fill", "reason": "Order not_filled"}
+            return {"success": True, "symbol": opportunity["symbol"], "total_cost": 100.0}
+
+        results = self._run([_opportunity(s) for s in ("SPY", "QQQ", "IWM")], 2, fake_execute)
+
+        executed = {r["symbol"]: r["success"] for r in results}
+        assert executed == {"SPY": True, "QQQ": False, "IWM": True}
+        assert self.bankroll.get_reserved_capital() == 0.0
+
+    def test_exception_releases_reservation(self):
+        """An exception inside a worker still rolls back its reservation."""
+        def fake_execute(opportunity, reservation_id=None, **kwargs):
+            raise RuntimeError("broker unavailable")
+
+        results = self._run([_opportunity("SPY")], 2, fake_execute)
+
+        assert results[0]["success"] is False
+        assert "broker unavailable" in results[0]["reason"]
+        assert self.bankroll.get_reserved_capital() == 0.0
+
+    def test_dispatch_stops_when_capital_exhausted(self):
+        """Opportunities beyond available capital are not dispatched."""
+        self.config["RISK_FRACTION"] = 0.6
+        dispatched = []
+
+        def fake_execute(opportunity, reservation_id=None, **kwargs):
+            dispatched.append(opportunity["symbol"])
+            time.sleep(0.05)
+            return {"success": True, "symbol": opportunity["symbol"], "total_cost": 500.0}
+
+        results = self._run([_opportunity(s) for s in ("SPY", "QQQ")], 2, fake_execute)
+
+        assert dispatched == ["SPY"]
+        assert len(results) == 1
+
+    def test_wave_capped_by_open_positions(self):
+        """Concurrent workers cannot together exceed MAX_POSITIONS."""
+        self.config["MAX_POSITIONS"] = 3
+        self.config["RISK_FRACTION"] = 0.1
+        self.portfolio.load_positions.return_value = [Mock(), Mock()]
+        dispatched = []
+
+        def fake_execute(opportunity, reservation_id=None, **kwargs):
+            dispatched.append(opportunity["symbol"])
+            return {"success": True, "symbol": opportunity["symbol"], "total_cost": 50.0}
+
+        self._run([_opportunity(s) for s in ("SPY", "QQQ", "IWM")], 3, fake_execute)
+
+        assert dispatched == ["SPY"]
+
+    def test_failed_slot_reused_within_position_cap(self):
+        """A failed trade frees its position slot for the next-ranked opportunity."""
+        self.config["MAX_POSITIONS"] = 3
+        self.config["RISK_FRACTION"] = 0.1
+        self.portfolio.load_positions.return_value = [Mock()]
+        dispatched = []
+
+        def fake_execute(opportunity, reservation_id=None, **kwargs):
+            dispatched.append(opportunity["symbol"])
+            if opportunity["symbol"] == "QQQ":
+                return {"success": False, "error_type": "no_fill", "reason": "Order not_filled"}
+            return {"success": True, "symbol": opportunity["symbol"], "total_cost": 50.0}
+
+        results = self._run([_opportunity(s) for s in ("SPY", "QQQ", "IWM", "DIA")], 3, fake_execute)
+
+        assert sorted(dispatched) == ["IWM", "QQQ", "SPY"]
+        assert sum(r["success"] for r in results) == 2
+
+
+class TestAlpacaFillSettlement:
+    """Test that orders left working after poll_fill are cancelled before settling."""
+
+    def _execute(self, poll_result, final_result):
+        from main import execute_alpaca_multi_symbol_trade
+        from utils.alpaca_options import FillResult
+
+        trader = Mock()
+        trader.is_market_open_and_valid_time.return_value = (True, "")
+        trader.find_atm_contract.return_value = Mock(symbol="SPY261016C00580000", strike=580.0, expiry="2026-10-16")
+        trader.get_latest_quote.return_value = Mock(ask=1.0)
+        trader.check_contract_feasibility.return_value = {"feasible": True}
+        trader.place_market_order.return_value = "order-1"
+        trader.poll_fill.return_value = FillResult(*poll_result)
+        trader.cancel_and_get_fill.return_value = FillResult(*final_result)
+        bankroll = Mock()
+        bankroll.calculate_position_size.return_value = 3
+        bankroll.get_reservation.return_value = 1000.0
+        config = {"RISK_FRACTION": 0.3, "SIZE_RULE": "fixed-qty", "CONTRACT_QTY": 3, "MIN_CONFIDENCE": 0.6}
+        args = Mock(unattended=True)
+
+        with patch("utils.trade_confirmation.TradeConfirmationManager"):
+            result = execute_alpaca_multi_symbol_trade(
+                trader, {**_opportunity("SPY"), "expiry_date": "2026-10-16"}, config, bankroll, Mock(), None,
+                "OPEN", args, reservation_id="SPY-1",
+            )
+        return trader, result
+
+    def test_partial_timeout_cancels_remainder(self):
+        trader, result = self._execute(
+            ("TIMEOUT", 1, 1.2, 1, 2, "order-1"), ("PARTIAL", 2, 1.25, 2, 0, "order-1")
+        )
+        trader.cancel_and_get_fill.assert_called_once()
+        assert result["success"] is True
+        assert result["total_cost"] == pytest.approx(2 * 1.25 * 100)
+
+    def test_unfilled_timeout_cancels_and_fails(self):
+        trader, result = self._execute(
+            ("TIMEOUT", 0, 0.0, 0, 3, "order-1"), ("CANCELED", 0, 0.0, 0, 0, "order-1")
+        )
+        trader.cancel_and_get_fill.assert_called_once()
+        assert result["success"] is False and result["error_type"] == "no_fill"
+
+    def test_full_fill_not_cancelled(self):
+        trader, result = self._execute(
+            ("FILLED", 3, 1.1, 3, 0, "order-1"), ("FILLED", 3, 1.1, 3, 0, "order-1")
+        )
+        trader.cancel_and_get_fill.assert_not_called()
+        assert result["total_cost"] == pytest.approx(3 * 1.1 * 100)
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Tests for the cached position store.
+
+Covers parse-once caching keyed on file version, reloads on rewrite and on
+in-process change notifications, normalization of the supported CSV schemas,
+and the monitor/portfolio integration.
+"""
+
+import csv
+import dataclasses
+import os
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from utils.position_store import (
+    PositionRecord,
+    PositionStore,
+    get_position_store,
+    notify_positions_changed,
+    parse_occ_symbol,
+)
+
+HEADER = [
+    "symbol", "occ_symbol", "strike", "option_type", "expiry", "quantity", "contracts",
+    "entry_price", "status", "close_time", "market_value", "unrealized_pnl", "entry_time",
+]
+
+
+def _write(path, rows, header=HEADER):
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=header)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+
+
+def _row(**kwargs):
+    row = {"symbol": "SPY", "strike": "580", "option_type": "CALL", "expiry": "2026-10-16",
+           "quantity": "2", "entry_price": "1.25", "status": "open", "entry_time": "2026-10-16T10:00:00"}
+    row.update(kwargs)
+    return row
+
+
+class TestCaching:
+    """Test parse-once behaviour."""
+
+    def test_unchanged_file_parsed_once(self, tmp_path):
+        """Repeated reads of an unchanged file are served from cache."""
+        path = tmp_path / "positions_alpaca_paper.csv"
+        _write(path, [_row(), _row(symbol="QQQ", strike="500")])
+        store = PositionStore(path)
+
+        with patch("utils.position_store.PositionRecord.from_row", wraps=PositionRecord.from_row) as from_row:
+            for _ in range(10):
+                assert len(store.records()) == 2
+
+        assert from_row.call_count == 2
+        assert store.loads == 1
+        assert store.hits == 9
+
+    def test_rewrite_reloads(self, tmp_path):
+        """A rewrite (new size/mtime) is picked up without notification."""
+        path = tmp_path / "positions.csv"
+        _write(path, [_row()])
+        store = PositionStore(path)
+        assert [r.symbol for r in store.records()] == ["SPY"]
+
+        _write(path, [_row(), _row(symbol="IWM", strike="220")])
+        st = os.stat(path)
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+        assert [r.symbol for r in store.records()] == ["SPY", "IWM"]
+        assert store.loads == 2
+
+    def test_notify_reloads_same_stat(self, tmp_path):
+        """notify_positions_changed() invalidates even when stat() looks identical."""
+        path = tmp_path / "positions.csv"
+        _write(path, [_row(entry_price="1.25")])
+        store = PositionStore(path)
+        assert store.records()[0].entry_price == 1.25
+
+        st = os.stat(path)
+        _write(path, [_row(entry_price="1.75")])  # Same size
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+        notify_positions_changed(path)
+
+        assert store.records()[0].entry_price == 1.75
+
+    def test_missing_file_raises(self, tmp_path):
+        """A missing file raises FileNotFoundError rather than serving stale data."""
+        path = tmp_path / "positions.csv"
+        _write(path, [_row()])
+        store = PositionStore(path)
+        store.records()
+        path.unlink()
+
+        with pytest.raises(FileNotFoundError):
+            store.records()
+
+    def test_shared_store_per_path(self, tmp_path):
+        """get_position_store() returns one store per resolved path."""
+        path = tmp_path / "positions.csv"
+        assert get_position_store(path) is get_position_store(str(path))
+
+    def test_positions_are_fresh_dicts(self, tmp_path):
+        """Mutating a returned dict does not affect the cache."""
+        path = tmp_path / "positions.csv"
+        _write(path, [_row()])
+        store = PositionStore(path)
+
+        store.positions()[0]["quantity"] = 99
+
+        assert store.positions()[0]["quantity"] == 2
+
+
+class TestNormalization:
+    """Test row normalization."""
+
+    def test_canonical_row(self):
+        record = PositionRecord.from_row(_row())
+        assert record.to_dict() == {
+            "symbol": "SPY", "occ_symbol": "", "strike": 580.0, "option_type": "CALL",
+            "expiry": "2026-10-16", "quantity": 2, "entry_price": 1.25,
+            "entry_time": "2026-10-16T10:00:00",
+        }
+
+    def test_timestamp_first_schema(self):
+        """Rows shifted right by a leading timestamp are remapped."""
+        row = {"symbol": "2025-09-11T09:44:44.197176", "strike": "XLF", "option_type": "2025-09-12",
+               "expiry": "53.5", "quantity": "CALL", "contracts": "1", "entry_price": "0.22"}
+        record = PositionRecord.from_row(row)
+        assert (record.symbol, record.expiry, record.strike, record.option_type, record.quantity) == (
+            "XLF", "2025-09-12", 53.5, "CALL", 1
+        )
+
+    def test_occ_symbol_row(self):
+        """OCC-only rows derive strike/expiry/type and entry price from market value."""
+        row = {"symbol": "XLF250912C00053000", "quantity": "2", "market_value": "60", "unrealized_pnl": "10"}
+        record = PositionRecord.from_row(row)
+        assert (record.symbol, record.occ_symbol, record.strike, record.expiry, record.option_type) == (
+            "XLF", "XLF250912C00053000", 53.0, "2025-09-12", "CALL"
+        )
+        assert record.entry_price == pytest.approx(0.25)
+
+    def test_closed_and_incomplete_rows_skipped(self):
+        assert PositionRecord.from_row(_row(status="closed_sync")) is None
+        assert PositionRecord.from_row(_row(close_time="2026-10-16T15:00:00")) is None
+        assert PositionRecord.from_row(_row(option_type="STRADDLE")) is None
+
+    def test_records_immutable_with_slots(self):
+        record = PositionRecord.from_row(_row())
+        assert not hasattr(record, "__dict__")
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            record.quantity = 5
+
+    def test_parse_occ_symbol(self):
+        assert parse_occ_symbol("SPY261016P00580500") == {
+            "underlying": "SPY", "expiry": "2026-10-16", "option_type": "PUT", "strike": 580.5,
+        }
+        assert parse_occ_symbol("SPY") is None
+
+
+class TestIntegration:
+    """Test monitor and portfolio wiring."""
+
+    def test_monitor_load_positions_uses_store(self, tmp_path):
+        from monitor_alpaca import EnhancedPositionMonitor
+
+        path = tmp_path / "positions_alpaca_paper.csv"
+        _write(path, [_row(), _row(symbol="QQQ", status="closed")])
+        monitor = EnhancedPositionMonitor.__new__(EnhancedPositionMonitor)
+        monitor.positions_file = str(path)
+
+        first = monitor.load_positions()
+        second = monitor.load_positions()
+
+        assert [p["symbol"] for p in first] == ["SPY"]
+        assert first == second and first is not second
+        assert get_position_store(path).loads == 1
+
+    def test_monitor_missing_file_returns_empty(self, tmp_path):
+        from monitor_alpaca import EnhancedPositionMonitor
+
+        monitor = EnhancedPositionMonitor.__new__(EnhancedPositionMonitor)
+        monitor.positions_file = str(tmp_path / "missing.csv")
+
+        assert monitor.load_positions() == []
+
+    def test_portfolio_writes_notify_store(self, tmp_path):
+        """PortfolioManager writes are visible to the monitor's store immediately."""
+        from utils.portfolio import PortfolioManager, Position
+
+        path = tmp_path / "positions_alpaca_paper.csv"
+        portfolio = PortfolioManager(str(path))
+        store = get_position_store(path)
+        assert store.records() == ()
+
+        position = Position("2026-10-16T10:00:00", "SPY", "2026-10-16", 580.0, "CALL", 1, 1.25)
+        portfolio.add_position(position)
+        assert [r.symbol for r in store.records()] == ["SPY"]
+
+        portfolio.remove_position(position)
+        assert store.records() == ()
+
+    def test_portfolio_load_cached_and_normalized_once(self, tmp_path):
+        """Portfolio reads are cached per file version; re-init skips normalization of an unchanged file."""
+        from utils.portfolio import PortfolioManager, Position
+
+        path = tmp_path / "positions_alpaca_paper.csv"
+        portfolio = PortfolioManager(str(path))
+        portfolio.add_position(Position("2026-10-16T10:00:00", "SPY", "2026-10-16", 580.0, "CALL", 1, 1.25))
+
+        first = portfolio.load_positions()
+        with patch("utils.portfolio.csv.DictReader") as reader:
+            second = portfolio.load_positions()
+        reader.assert_not_called()
+        assert first == second and first[0] is not second[0]
+
+        PortfolioManager(str(path))  # File changed since the first init: normalized again
+        with patch.object(PortfolioManager, "_normalize_alpaca_positions_file") as normalize:
+            PortfolioManager(str(path))
+        normalize.assert_not_called()
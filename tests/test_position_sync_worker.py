@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Tests for the background position sync worker.
+
+Uses a fake syncer that rewrites a positions CSV (optionally slowly) to check
+that syncs run off the caller's thread, publish a fresh snapshot to the
+position store, and report duration and staleness metrics.
+"""
+
+import csv
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from utils.position_store import get_position_store, notify_positions_changed
+from utils.position_sync_worker import PositionSyncWorker
+
+HEADER = ["symbol", "occ_symbol", "strike", "option_type", "expiry", "quantity", "entry_price", "status", "entry_time"]
+
+
+def _write_positions(path, symbols):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=HEADER)
+        writer.writeheader()
+        for symbol in symbols:
+            writer.writerow({"symbol": symbol, "strike": "100", "option_type": "CALL", "expiry": "2026-10-16",
+                             "quantity": "1", "entry_price": "1.00", "status": "open",
+                             "entry_time": "2026-10-16T10:00:00"})
+    os.replace(tmp, path)
+    notify_positions_changed(path)
+
+
+class FakeSync:
+    """Stands in for AlpacaSync: each sync publishes the next broker snapshot."""
+
+    def __init__(self, path, snapshots, delay=0.0, fail=False):
+        self.positions_file = str(path)
+        self.snapshots = list(snapshots)
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+        self.started = threading.Event()
+
+    def sync_positions(self):
+        self.calls += 1
+        self.started.set()
+        time.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError("broker unreachable")
+        if self.snapshots:
+            _write_positions(self.positions_file, self.snapshots.pop(0))
+        return True
+
+
+def _symbols(path):
+    return [r.symbol for r in get_position_store(path).records()]
+
+
+class TestWorker:
+    """Test the worker thread."""
+
+    def test_first_sync_runs_on_start_and_is_published(self, tmp_path):
+        path = tmp_path / "positions_alpaca_paper.csv"
+        _write_positions(path, [])
+        syncer = FakeSync(path, [["SPY", "QQQ"]])
+        worker = PositionSyncWorker(interval_seconds=60, sync_factory=lambda: syncer).start()
+        try:
+            assert worker.wait_for_sync(timeout=5)
+        finally:
+            worker.stop()
+
+        assert _symbols(path) == ["SPY", "QQQ"]
+        # Pre-parsed by the worker: the reader's first call is a cache hit
+        store = get_position_store(path)
+        loads = store.loads
+        store.records()
+        assert store.loads == loads
+
+    def test_request_sync_wakes_worker(self, tmp_path):
+        path = tmp_path / "positions.csv"
+        _write_positions(path, [])
+        syncer = FakeSync(path, [["SPY"], ["SPY", "IWM"]])
+        worker = PositionSyncWorker(interval_seconds=3600, sync_factory=lambda: syncer).start()
+        try:
+            worker.wait_for_sync(timeout=5)
+            worker.request_sync()
+            deadline = time.time() + 5
+            while worker.stats.syncs < 2 and time.time() < deadline:
+                time.sleep(0.01)
+        finally:
+            worker.stop()
+
+        assert worker.stats.syncs == 2
+        assert _symbols(path) == ["SPY", "IWM"]
+
+    def test_failure_metrics_and_syncer_rebuilt(self, tmp_path):
+        path = tmp_path / "positions.csv"
+        built = []
+
+        def factory():
+            built.append(FakeSync(path, [], fail=True))
+            return built[-1]
+
+        worker = PositionSyncWorker(interval_seconds=60, sync_factory=factory)
+        assert worker.sync_once() is False
+        assert worker.sync_once() is False
+
+        metrics = worker.metrics()
+        assert metrics["failures"] == 2 and metrics["syncs"] == 0
+        assert "broker unreachable" in metrics["last_error"]
+        assert metrics["staleness_seconds"] is None
+        assert len(built) == 2  # Client rebuilt after each error
+
+    def test_duration_and_staleness(self, tmp_path):
+        path = tmp_path / "positions.csv"
+        _write_positions(path, [])
+        worker = PositionSyncWorker(interval_seconds=60, sync_factory=lambda: FakeSync(path, [["SPY"]], delay=0.05))
+
+        assert worker.sync_once() is True
+        metrics = worker.metrics()
+        assert metrics["last_duration_ms"] >= 50
+        assert 0 <= metrics["staleness_seconds"] < 5
+
+    def test_rejects_non_positive_interval(self):
+        with pytest.raises(ValueError):
+            PositionSyncWorker(interval_seconds=0)
+
+
+class TestMonitorIntegration:
+    """Test that monitoring cycles never wait on a sync."""
+
+    def _monitor(self, path):
+        from monitor_alpaca import EnhancedPositionMonitor
+
+        monitor = EnhancedPositionMonitor.__new__(EnhancedPositionMonitor)
+        monitor.positions_file = str(path)
+        monitor.config = {"BROKER": "alpaca", "ALPACA_ENV": "paper"}
+        monitor.auto_sync_enabled = True
+        monitor.auto_sync_background = True
+        monitor.auto_sync_interval_seconds = 60
+        monitor._sync_worker = None
+        monitor._sync_stale_warned = False
+        return monitor
+
+    def test_cycle_reads_last_snapshot_while_sync_in_flight(self, tmp_path):
+        path = tmp_path / "positions_alpaca_paper.csv"
+        _write_positions(path, ["SPY"])
+        syncer = FakeSync(path, [["SPY"], ["SPY", "QQQ"]], delay=0.5)
+        monitor = self._monitor(path)
+        monitor._sync_worker = PositionSyncWorker(interval_seconds=3600, sync_factory=lambda: syncer).start()
+        try:
+            monitor._sync_worker.wait_for_sync(timeout=5)
+            syncer.started.clear()
+            monitor._sync_worker.request_sync()
+            assert syncer.started.wait(5)
+
+            # Sync in flight: the cycle's sync hook and position read return at once
+            start = time.perf_counter()
+            monitor._maybe_auto_sync_positions()
+            positions = monitor.load_positions()
+            assert time.perf_counter() - start < 0.25
+            assert [p["symbol"] for p in positions] == ["SPY"]
+
+            deadline = time.time() + 5
+            while monitor._sync_worker.stats.syncs < 2 and time.time() < deadline:
+                time.sleep(0.01)
+            assert [p["symbol"] for p in monitor.load_positions()] == ["SPY", "QQQ"]
+            assert monitor.position_sync_metrics()["syncs"] == 2
+        finally:
+            monitor.stop_position_sync()
+        assert monitor._sync_worker is None
+
+    def test_non_alpaca_broker_syncs_inline(self, tmp_path):
+        monitor = self._monitor(tmp_path / "positions.csv")
+        monitor.config["BROKER"] = "robinhood"
+        monitor._maybe_auto_sync_positions = Mock()
+
+        assert monitor.start_position_sync() is False
+        monitor._maybe_auto_sync_positions.assert_called_once_with(force=True)
+        assert monitor.position_sync_metrics() is None
+
+    def test_stale_snapshot_warns_once(self, tmp_path, caplog):
+        monitor = self._monitor(tmp_path / "positions.csv")
+        worker = Mock(interval_seconds=10)
+        worker.staleness_seconds.return_value = 45.0
+
+        with caplog.at_level("WARNING"):
+            monitor._check_sync_staleness(worker)
+            monitor._check_sync_staleness(worker)
+
+        assert sum("stale" in r.message for r in caplog.records) == 1
+
+
+class TestAtomicSave:
+    """Test AlpacaSync's positions write."""
+
+    def test_save_replaces_file_atomically(self, tmp_path):
+        from utils.alpaca_sync import AlpacaSync
+
+        path = tmp_path / "positions_alpaca_paper.csv"
+        _write_positions(path, ["OLD"])
+        get_position_store(path).records()
+        sync = AlpacaSync.__new__(AlpacaSync)
+        sync.positions_file = str(path)
+
+        sync._save_local_positions([{"symbol": "SPY", "strike": 600.0, "option_type": "CALL",
+                                     "expiry": "2026-10-16", "quantity": 1, "entry_price": 1.0,
+                                     "status": "open"}])
+
+        assert not os.path.exists(f"{path}.tmp")
+        assert _symbols(path) == ["SPY"]
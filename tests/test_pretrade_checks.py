@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the pre-trade check pipeline.
+
+Tests concurrent execution of independent checks, dependency ordering,
+short-circuiting on hard failures and latency recording.
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from utils.pretrade_checks import PreTradeCheck, PreTradePipeline
+
+
+class TestPreTradePipeline:
+    """Test pre-trade check pipeline functionality."""
+
+    def test_independent_checks_run_concurrently(self):
+        """Independent checks overlap instead of running back to back."""
+        barrier = threading.Barrier(3, timeout=5)
+
+        def check(_):
+            barrier.wait()  # Deadlocks unless all three run at once
+            return True
+
+        pipeline = PreTradePipeline([PreTradeCheck(f"c{i}", check) for i in range(3)])
+        result = pipeline.run()
+
+        assert result.passed
+        assert set(result.values) == {"c0", "c1", "c2"}
+
+    def test_dependencies_receive_upstream_values(self):
+        """Dependent checks run after, and receive values of, their dependencies."""
+        order = []
+
+        def upstream(_):
+            order.append("vix")
+            return "high"
+
+        def downstream(values):
+            order.append("llm")
+            return {"approved": values["vix"] == "high", "reason": "ok"}
+
+        pipeline = PreTradePipeline([
+            PreTradeCheck("llm", downstream, depends_on=("vix",),
+                          passes=lambda r: r["approved"], reason=lambda r: r["reason"]),
+            PreTradeCheck("vix", upstream, hard=False),
+        ])
+        result = pipeline.run()
+
+        assert result.passed
+        assert order == ["vix", "llm"]
+        assert result.values["llm"]["approved"] is True
+
+    def test_hard_failure_short_circuits(self):
+        """A hard failure returns immediately and skips dependent checks."""
+        called = []
+
+        def slow(_):
+            time.sleep(1.0)
+            return True
+
+        pipeline = PreTradePipeline([
+            PreTradeCheck("feasibility", lambda _: {"feasible": False, "reason": "Spread too wide"},
+                          passes=lambda r: r["feasible"], reason=lambda r: r["reason"]),
+            PreTradeCheck("slow", slow),
+            PreTradeCheck("llm", lambda _: called.append("llm") or True, depends_on=("feasibility", "slow")),
+        ])
+        start = time.perf_counter()
+        result = pipeline.run()
+        elapsed = time.perf_counter() - start
+
+        assert not result.passed
+        assert result.failed.name == "feasibility"
+        assert result.failed.reason == "Spread too wide"
+        assert result.results["llm"].skipped
+        assert result.results["slow"].skipped
+        assert called == []
+        assert elapsed < 0.9
+
+    def test_soft_failure_does_not_block(self):
+        """Soft checks that fail or raise do not block the trade."""
+        def broken(_):
+            raise RuntimeError("VIX feed down")
+
+        pipeline = PreTradePipeline([
+            PreTradeCheck("vix_bucket", broken, hard=False),
+            PreTradeCheck("account_risk_ok", lambda _: True),
+        ])
+        result = pipeline.run()
+
+        assert result.passed
+        assert not result.results["vix_bucket"].passed
+        assert "VIX feed down" in result.results["vix_bucket"].reason
+
+    def test_hard_check_exception_blocks(self):
+        """A hard check that raises fails closed."""
+        def broken(_):
+            raise ValueError("quote timeout")
+
+        result = PreTradePipeline([PreTradeCheck("feasibility", broken)]).run()
+
+        assert not result.passed
+        assert "quote timeout" in result.failed.reason
+
+    def test_latency_recorded(self):
+        """Each check records its latency, and the total is the critical path."""
+        def slow(_):
+            time.sleep(0.1)
+            return True
+
+        result = PreTradePipeline([PreTradeCheck("a", slow), PreTradeCheck("b", slow)]).run()
+
+        assert result.results["a"].latency_ms >= 90
+        assert result.results["b"].latency_ms >= 90
+        assert result.total_ms < 190
+        assert "total=" in result.latency_summary()
+
+    def test_invalid_dependencies_rejected(self):
+        """Unknown dependencies and cycles are rejected at construction."""
+        with pytest.raises(ValueError):
+            PreTradePipeline([PreTradeCheck("a", bool, depends_on=("missing",))])
+
+        with pytest.raises(ValueError):
+            PreTradePipeline([
+                PreTradeCheck("a", bool, depends_on=("b",)),
+                PreTradeCheck("b", bool, depends_on=("a",)),
+            ])
+
+
+class TestAlpacaEntryPipeline:
+    """Test the checks main.py runs before an Alpaca entry order."""
+
+    def _run(self, contracts=1):
+        from unittest.mock import Mock, patch
+        import main
+
+        contract = Mock(symbol="SPY261016C00580000", mid=1.25, bid=1.2, ask=1.3)
+        with patch.object(main, "_check_account_risk", return_value=False), \
+                patch.object(main, "_validate_fair_pricing", return_value=False), \
+                patch.object(main, "_validate_greeks", return_value=False), \
+                patch.object(main, "_get_vix_bucket", return_value="normal"):
+            pipeline = main._build_pretrade_pipeline(
+                {"MAX_CONTRACTS_PER_TRADE": 2}, contract, contracts, 125.0, "CALL", "SPY", llm_entry=False
+            )
+            return pipeline.run()
+
+    def test_only_position_limit_blocks(self):
+        """Placeholder risk checks are LLM inputs; feasibility is not re-checked here."""
+        result = self._run()
+
+        assert result.passed
+        assert "feasibility" not in result.results
+        for name in ("account_risk_ok", "price_fair_vs_mid", "greeks_ok"):
+            assert result.values[name] is False
+            assert not result.results[name].hard
+
+    def test_position_limit_blocks(self):
+        """Too many contracts blocks the order before the LLM is asked."""
+        result = self._run(contracts=5)
+
+        assert not result.passed
+        assert result.failed.name == "position_limits_ok"
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Tests for the typed trade and position records.
+
+Covers parse-once constructors (blanks, NaN, legacy and timestamp-first
+rows), canonical serialization, and the bankroll, portfolio and Alpaca sync
+paths built on them.
+"""
+
+import csv
+import json
+import sqlite3
+import sys
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from utils.ledger.constants import POSITIONS_SCHEMA_ALPACA_V1
+from utils.records import LedgerPosition, TradeRecord, parse_float, parse_int, parse_text
+
+
+def _read(path):
+    with open(path, newline="") as f:
+        return list(csv.DictReader(f))
+
+
+class TestParsing:
+    """Test the shared parse helpers and record constructors."""
+
+    def test_parse_helpers(self):
+        assert parse_float(" 1.25 ") == 1.25
+        assert parse_float(float("nan")) is None
+        assert parse_float("nan") is None
+        assert parse_float("") is None and parse_float("abc") is None
+        assert parse_int("2.0") == 2
+        assert parse_text(None) == "" and parse_text("NaN") == "" and parse_text(" SPY ") == "SPY"
+
+    def test_trade_record_from_details(self):
+        trade = TradeRecord.from_details(
+            {"symbol": "QQQ", "direction": "PUT", "strike": "500", "quantity": "2", "premium": "1.10",
+             "confidence": 0.7, "reason": "Breakdown", "realized_pnl": "-12.5"},
+            timestamp="2026-10-16T10:00:00",
+        )
+        assert (trade.strike, trade.quantity, trade.premium, trade.realized_pnl) == (500.0, 2, 1.1, -12.5)
+        assert list(trade.to_dict()) == [
+            "timestamp", "symbol", "direction", "strike", "expiry", "quantity", "premium", "total_cost",
+            "decision_confidence", "llm_reason", "realized_pnl", "status",
+        ]
+        assert TradeRecord.from_dict(trade.to_dict()) == trade
+        assert not hasattr(trade, "__dict__")
+
+    def test_position_row_round_trip(self):
+        row = {name: "" for name in POSITIONS_SCHEMA_ALPACA_V1}
+        row.update({"symbol": "SPY", "strike": "580.0", "option_type": "call", "expiry": "2026-10-16",
+                    "quantity": "1.0", "entry_price": "1.25", "sync_detected": "True"})
+        position = LedgerPosition.from_row(row)
+
+        assert (position.strike, position.option_type, position.quantity) == (580.0, "CALL", 1)
+        assert position.sync_detected is True and position.current_price is None
+        assert list(position.to_dict()) == POSITIONS_SCHEMA_ALPACA_V1
+        assert LedgerPosition.from_row(position.to_dict()) == position
+
+    def test_timestamp_first_row_remapped(self):
+        row = dict(zip(POSITIONS_SCHEMA_ALPACA_V1,
+                       ["2025-09-11T09:44:44.197176", "", "XLF", "2025-09-12", "53.5", "CALL", "1", "0.22"]))
+        position = LedgerPosition.from_row(row)
+        assert (position.symbol, position.expiry, position.strike, position.option_type, position.quantity) == (
+            "XLF", "2025-09-12", 53.5, "CALL", 1
+        )
+        assert position.status == "normalized"
+
+    def test_position_record_is_monitor_view(self):
+        from utils.position_store import PositionRecord
+
+        row = dict(zip(POSITIONS_SCHEMA_ALPACA_V1,
+                       ["2025-09-11T09:44:44.197176", "", "XLF", "2025-09-12", "53.5", "CALL", "1", "0.22"]))
+        row["entry_time"] = "2025-09-11T09:44:44"
+        record = PositionRecord.from_ledger(LedgerPosition.from_row(row))
+        assert record == PositionRecord.from_row(row)
+        assert (record.symbol, record.expiry, record.strike, record.option_type, record.quantity) == (
+            "XLF", "2025-09-12", 53.5, "CALL", 1
+        )
+        assert PositionRecord.from_ledger(LedgerPosition.from_row({"symbol": "SPY", "status": "closed"})) is None
+
+    def test_closed_state(self):
+        assert LedgerPosition.from_row({"symbol": "SPY", "status": "closed_sync"}).is_closed
+        assert LedgerPosition.from_row({"symbol": "SPY", "close_time": "2026-10-16T15:00:00"}).is_closed
+        assert not LedgerPosition.from_row({"symbol": "SPY", "status": "open", "close_time": "nan"}).is_closed
+
+
+class TestCallers:
+    """Test the modules that use the records."""
+
+    def test_bankroll_records_canonical_trade(self, tmp_path):
+        from utils.bankroll import BankrollManager
+
+        manager = BankrollManager(str(tmp_path / "bankroll.json"), start_capital=1000.0)
+        manager.record_trade({"symbol": "SPY", "direction": "CALL", "strike": 580, "quantity": 1,
+                              "premium": "1.25", "realized_pnl": "-20", "status": "CLOSED",
+                              "position_id": "SPY_580_1"})
+
+        data = json.loads((tmp_path / "bankroll.json").read_text())
+        trade = data["trade_history"][0]
+        assert trade["premium"] == 1.25 and trade["position_id"] == "SPY_580_1"
+        assert data["current_bankroll"] == 980.0
+
+    def test_portfolio_loads_typed_rows(self, tmp_path):
+        from utils.portfolio import Position, PortfolioManager
+
+        portfolio = PortfolioManager(str(tmp_path / "positions_alpaca_paper.csv"))
+        portfolio.add_position(Position(entry_time="2026-10-16T10:00:00", symbol="SPY", expiry="2026-10-16",
+                                        strike=580.0, side="CALL", contracts=2, entry_premium=1.25))
+
+        rows = _read(tmp_path / "positions_alpaca_paper.csv")
+        assert list(rows[0]) == POSITIONS_SCHEMA_ALPACA_V1
+        [position] = portfolio.load_positions()
+        assert (position.symbol, position.strike, position.contracts, position.entry_premium) == (
+            "SPY", 580.0, 2, 1.25
+        )
+
+    def test_sync_updates_typed_rows(self, tmp_path):
+        from utils.alpaca_sync import AlpacaSync
+
+        path = tmp_path / "positions_alpaca_paper.csv"
+        sync = AlpacaSync.__new__(AlpacaSync)
+        sync.positions_file = str(path)
+        sync._log_sync_event = Mock()
+        sync._save_local_positions([
+            {"symbol": "SPY", "strike": 580.0, "option_type": "CALL", "expiry": "2026-10-16", "quantity": 1},
+            {"symbol": "QQQ", "strike": 500.0, "option_type": "PUT", "expiry": "2026-10-16", "quantity": 1},
+        ])
+        alpaca_pos = Mock(symbol="SPY261016C00580000", qty="3", market_value="390", unrealized_pl="15",
+                          asset_class="us_option")
+        sync._get_positions_with_retry = Mock(return_value=[alpaca_pos])
+
+        assert sync.sync_positions()
+        spy, qqq = sync._load_local_positions()
+        assert (spy.quantity, spy.market_value, spy.occ_symbol) == (3, 390.0, "SPY261016C00580000")
+        assert qqq.status == "closed_sync" and qqq.is_closed
+
+    def test_apply_fill_parses_stored_trade(self, tmp_path, monkeypatch):
+        from utils.bankroll import BankrollManager
+
+        monkeypatch.chdir(tmp_path)  # apply_fill appends bankroll_history.csv to the working directory
+        manager = BankrollManager(str(tmp_path / "bankroll.json"), start_capital=1000.0, backend="json")
+        manager.record_trade({"symbol": "QQQ", "direction": "PUT", "strike": 500, "quantity": 1,
+                              "premium": 1.25, "total_cost": "125", "position_id": "QQQ_500_1"})
+        data = json.loads((tmp_path / "bankroll.json").read_text())
+        data["trade_history"][0]["total_cost"] = "125.0"  # Hand-edited or legacy string value
+        (tmp_path / "bankroll.json").write_text(json.dumps(data))
+
+        updated = manager.apply_fill("QQQ_500_1", fill_price=1.30, contracts=1)
+        assert updated["current_bankroll"] == pytest.approx(data["current_bankroll"] - 5.0)
+
+    def test_sqlite_index_columns_from_record(self, tmp_path):
+        from utils.bankroll import BankrollManager
+        from utils.bankroll_ledger import open_bankroll_ledger
+
+        BankrollManager(str(tmp_path / "bankroll.json"), start_capital=1000.0, backend="sqlite")
+        ledger = open_bankroll_ledger(tmp_path / "bankroll.json", backend="sqlite")
+        with ledger.transaction() as txn:
+            txn.add_trade({"timestamp": "2026-10-16T10:00:00", "symbol": "SPY", "realized_pnl": "12.5",
+                           "status": "CLOSED", "position_id": "SPY_580_1", "note": "kept"})
+        conn = sqlite3.connect(tmp_path / "bankroll.db")
+        try:
+            (pnl, status, record), = conn.execute("SELECT realized_pnl, status, record FROM trades").fetchall()
+        finally:
+            conn.close()
+        assert (pnl, status) == (12.5, "CLOSED")
+        assert json.loads(record)["note"] == "kept"
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Tests for the append-only signal journal behind the rapid flip guard.
+
+Covers the bounded ring buffer, append-only persistence, compaction,
+recovery (including torn lines and the legacy JSON log), and the scanner's
+guard and signal logging on top of it.
+"""
+
+import json
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from utils.signal_journal import COMPACT_FACTOR, SignalEntry, SignalJournal
+
+
+def _lines(path: Path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+class TestRingBuffer:
+    """Test the in-memory buffer and journal appends."""
+
+    def test_entries_bounded_and_slotted(self, tmp_path):
+        journal = SignalJournal(tmp_path, maxlen=3)
+        for i in range(5):
+            journal.record("SPY", "NO_TRADE", reason=str(i))
+
+        assert [e.reason for e in journal.entries("SPY")] == ["2", "3", "4"]
+        assert not hasattr(journal.entries("SPY")[0], "__dict__")
+
+    def test_record_appends_one_line(self, tmp_path):
+        journal = SignalJournal(tmp_path)
+        journal.record("SPY", "CALL", confidence=0.7, price=581.0, scanner_env="paper")
+        journal.record("SPY", "NO_TRADE")
+
+        rows = _lines(journal.journal_path("SPY"))
+        assert [r["decision"] for r in rows] == ["CALL", "NO_TRADE"]
+        assert rows[0]["scanner_env"] == "paper" and rows[0]["price"] == 581.0
+
+    def test_last_trade_signal_skips_no_trade(self, tmp_path):
+        journal = SignalJournal(tmp_path)
+        assert journal.last_trade_signal("SPY") is None
+
+        journal.record("SPY", "PUT")
+        journal.record("SPY", "NO_TRADE")
+        assert journal.last_trade_signal("SPY").decision == "PUT"
+
+    def test_journal_compacted(self, tmp_path):
+        journal = SignalJournal(tmp_path, maxlen=5)
+        for i in range(5 * COMPACT_FACTOR + 2):
+            journal.record("SPY", "NO_TRADE", reason=str(i))
+
+        rows = _lines(journal.journal_path("SPY"))
+        assert len(rows) < 5 * COMPACT_FACTOR
+        assert rows[-1]["reason"] == str(5 * COMPACT_FACTOR + 1)
+        assert journal.compactions == 1
+
+
+class TestRecovery:
+    """Test rebuilding the buffer after a restart."""
+
+    def test_recovered_after_restart(self, tmp_path):
+        journal = SignalJournal(tmp_path, maxlen=3)
+        for decision in ("CALL", "NO_TRADE", "PUT", "NO_TRADE"):
+            journal.record("QQQ", decision)
+
+        restarted = SignalJournal(tmp_path, maxlen=3)
+        assert [e.decision for e in restarted.entries("QQQ")] == ["NO_TRADE", "PUT", "NO_TRADE"]
+        assert restarted.last_trade_signal("QQQ").decision == "PUT"
+
+    def test_torn_line_skipped(self, tmp_path):
+        journal = SignalJournal(tmp_path)
+        journal.record("SPY", "CALL")
+        with open(journal.journal_path("SPY"), "a") as f:
+            f.write('{"timestamp": "2026-10-16T10:0')
+
+        assert [e.decision for e in SignalJournal(tmp_path).entries("SPY")] == ["CALL"]
+
+    def test_legacy_log_migrated_on_first_record(self, tmp_path):
+        legacy = [{"timestamp": "2026-10-16T10:00:00", "decision": "CALL", "confidence": 0.7,
+                   "reason": "breakout", "price": 500.0}]
+        (tmp_path / "signal_log_SPY.json").write_text(json.dumps(legacy, indent=2))
+        journal = SignalJournal(tmp_path)
+
+        assert journal.last_trade_signal("SPY").reason == "breakout"
+        assert not journal.journal_path("SPY").exists()  # Reads never write
+
+        journal.record("SPY", "NO_TRADE")
+        assert [r["decision"] for r in _lines(journal.journal_path("SPY"))] == ["CALL", "NO_TRADE"]
+        assert SignalEntry.from_dict(legacy[0]).scanner_env == "unknown"
+
+
+class TestScannerGuard:
+    """Test MultiSymbolScanner signal logging and the rapid flip guard."""
+
+    @pytest.fixture
+    def scanner(self, tmp_path):
+        from utils.multi_symbol_scanner import MultiSymbolScanner
+
+        scanner = MultiSymbolScanner({"SYMBOLS": ["SPY"]}, llm_client=None)
+        scanner._signal_journal = SignalJournal(tmp_path)
+        return scanner
+
+    def test_guard_reads_ring_buffer(self, scanner):
+        scanner._log_signal_event("SPY", "CALL", 0.7, "breakout", 581.0)
+        scanner._log_signal_event("SPY", "NO_TRADE", 0.3, "chop", 581.1)
+
+        proceed, reason = scanner._recent_signal_guard("SPY", "PUT", {"trend_direction": "NEUTRAL",
+                                                                       "vwap_deviation_pct": 0.1})
+        assert proceed is False and "rapid flip blocked" in reason.lower()
+        assert scanner._recent_signal_guard("SPY", "CALL", {})[1].startswith("Same direction")
+
+    def test_guard_ignores_stale_signal(self, scanner):
+        stale = (datetime.now() - timedelta(minutes=10)).isoformat()
+        scanner._signal_journal.record("SPY", "CALL", timestamp=stale)
+
+        proceed, reason = scanner._recent_signal_guard("SPY", "PUT", {})
+        assert proceed is True and "no recent trade signals" in reason.lower()
+
+    def test_guard_without_history(self, scanner):
+        assert scanner._recent_signal_guard("IWM", "CALL", {})[1] == "No signal history for rapid flip check"
@@ -0,0 +1,405 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared state daemon.
+
+Covers the in-process service (cached reads, writes, change notifications),
+the Unix-socket daemon and its client, the fallback when no daemon is
+running, and the dashboard readers built on it.
+"""
+
+import csv
+import io
+import json
+import os
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from utils.state_daemon import (
+    LocalStateService,
+    StateClient,
+    StateDaemon,
+    StateDaemonUnavailable,
+    StateServiceError,
+    connect_state_service,
+)
+
+needs_unix_socket = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="Unix domain sockets unavailable")
+
+FIELDS = ["symbol", "strike", "quantity", "entry_price"]
+
+
+def _write_positions(path, rows):
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def _touch_later(path):
+    """Bump mtime so a same-size rewrite is still detected on coarse clocks."""
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    daemon = StateDaemon(tmp_path / "state.sock", poll_interval_s=0.05, root=tmp_path).start()
+    yield daemon
+    daemon.stop()
+
+
+class TestLocalService:
+    """Test the in-process service."""
+
+    def test_json_parsed_once_until_changed(self, tmp_path):
+        path = tmp_path / "bankroll.json"
+        path.write_text(json.dumps({"current_bankroll": 500.0}))
+        service = LocalStateService()
+
+        for _ in range(10):
+            assert service.read_json(path)["current_bankroll"] == 500.0
+        assert service.stats()["files"][str(path)]["loads"] == 1
+
+        path.write_text(json.dumps({"current_bankroll": 612.5}))
+        _touch_later(path)
+        assert service.read_json(path)["current_bankroll"] == 612.5
+        assert service.stats()["files"][str(path)]["version"] == 1
+
+    def test_reads_return_fresh_copies(self, tmp_path):
+        path = tmp_path / "positions.csv"
+        _write_positions(path, [{"symbol": "SPY", "strike": 580, "quantity": 1, "entry_price": 1.25}])
+        service = LocalStateService()
+
+        rows = service.read_csv(path)
+        rows[0]["quantity"] = 99
+        assert service.read_csv(path)[0]["quantity"] == "1"
+
+    def test_missing_files(self, tmp_path):
+        service = LocalStateService()
+        assert service.read_json(tmp_path / "missing.json", default={}) == {}
+        assert service.read_csv(tmp_path / "missing.csv") == []
+
+    def test_write_json_and_notify(self, tmp_path):
+        path = tmp_path / "state.json"
+        service = LocalStateService()
+        events = []
+        service.subscribe(lambda p, v: events.append((p, v)), paths=[path])
+
+        version = service.write_json(path, {"is_active": True})
+        assert json.loads(path.read_text()) == {"is_active": True}
+        assert service.read_json(path) == {"is_active": True}
+        assert events == [(str(path), version)]
+
+    def test_append_csv_creates_header_and_updates_cache(self, tmp_path):
+        path = tmp_path / "trades.csv"
+        service = LocalStateService()
+
+        service.append_csv(path, {"symbol": "SPY", "strike": 580, "quantity": 1, "entry_price": 1.25}, FIELDS)
+        service.append_csv(path, {"symbol": "QQQ", "strike": 500, "quantity": 2, "entry_price": 0.8})
+
+        with open(path, newline="") as f:
+            on_disk = list(csv.DictReader(f))
+        assert service.read_csv(path) == on_disk
+        assert [r["symbol"] for r in on_disk] == ["SPY", "QQQ"]
+        assert service.stats()["files"][str(path)]["loads"] == 1
+
+    def test_write_csv_notifies_position_store(self, tmp_path):
+        from utils.position_store import get_position_store
+
+        path = tmp_path / "positions.csv"
+        fields = FIELDS + ["expiry", "option_type"]
+        row = {"symbol": "SPY", "strike": 580, "quantity": 1, "entry_price": 1.25,
+               "expiry": "2026-10-16", "option_type": "CALL"}
+        service = LocalStateService()
+        service.write_csv(path, [row], fields)
+        store = get_position_store(str(path))
+        assert len(store.records()) == 1
+
+        service.write_csv(path, [], fields)
+        assert store.records() == ()
+
+    def test_invalidate_reloads_same_signature_rewrite(self, tmp_path):
+        path = tmp_path / "bankroll.json"
+        path.write_text(json.dumps({"current_bankroll": 500.0}))
+        service = LocalStateService()
+        service.read_json(path)
+        st = os.stat(path)
+        path.write_text(json.dumps({"current_bankroll": 600.0}))
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))  # Same size, same tick
+
+        assert service.read_json(path) == {"current_bankroll": 500.0}
+        service.invalidate(path)
+        assert service.read_json(path) == {"current_bankroll": 600.0}
+
+    def test_poll_reports_external_changes(self, tmp_path):
+        path = tmp_path / "state.json"
+        path.write_text("{}")
+        service = LocalStateService()
+        service.read_json(path)
+        events = []
+        service.subscribe(lambda p, v: events.append(p))
+
+        assert service.poll() == []
+        path.write_text(json.dumps({"changed": True}))
+        _touch_later(path)
+        assert service.poll() == [str(path)]
+        assert events == [str(path)]
+
+
+@needs_unix_socket
+class TestDaemon:
+    """Test the Unix-socket daemon and client."""
+
+    def test_client_reads_through_daemon(self, daemon, tmp_path):
+        path = tmp_path / "bankroll.json"
+        path.write_text(json.dumps({"current_bankroll": 500.0}))
+        client = StateClient(daemon.socket_path)
+        try:
+            for _ in range(5):
+                assert client.read_json(path) == {"current_bankroll": 500.0}
+            assert client.requests == 1  # Later reads validated locally by stat
+            assert daemon.service.stats()["files"][str(path)]["loads"] == 1
+        finally:
+            client.close()
+
+    def test_writes_serialized_and_pushed(self, daemon, tmp_path):
+        path = tmp_path / "positions.csv"
+        writer, reader = StateClient(daemon.socket_path), StateClient(daemon.socket_path)
+        received = threading.Event()
+        reader.subscribe(lambda p, v: received.set(), paths=[path])
+        try:
+            threads = [
+                threading.Thread(target=writer.append_csv, args=(path, {"symbol": f"S{i}", "quantity": i}, FIELDS))
+                for i in range(10)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            assert received.wait(2.0)
+            assert sorted(r["symbol"] for r in reader.read_csv(path)) == sorted(f"S{i}" for i in range(10))
+        finally:
+            writer.close()
+            reader.close()
+
+    def test_external_write_picked_up_by_poll(self, daemon, tmp_path):
+        path = tmp_path / "state.json"
+        path.write_text("{}")
+        client = StateClient(daemon.socket_path)
+        received = threading.Event()
+        try:
+            client.read_json(path)
+            client.subscribe(lambda p, v: received.set())
+            path.write_text(json.dumps({"owner": "sync"}))
+            _touch_later(path)
+            assert received.wait(2.0)
+            assert client.read_json(path) == {"owner": "sync"}
+        finally:
+            client.close()
+
+    def test_errors_reported(self, daemon, tmp_path):
+        (tmp_path / "bad.json").write_text("{not json")
+        client = StateClient(daemon.socket_path)
+        try:
+            with pytest.raises(StateServiceError):
+                client.read_json(tmp_path / "bad.json")
+            assert client._call("ping")["ok"]  # Connection still usable
+        finally:
+            client.close()
+
+    def test_writes_limited_to_owned_files(self, daemon, tmp_path):
+        client = StateClient(daemon.socket_path)
+        try:
+            (tmp_path / "logs").mkdir()
+            client.write_json(tmp_path / "bankroll_alpaca_paper.json", {"current_bankroll": 1.0})
+            client.append_csv(tmp_path / "positions_alpaca_paper.csv", {"symbol": "SPY"}, FIELDS)
+            for path in (tmp_path / "config.json", tmp_path.parent / "bankroll.json",
+                         tmp_path / "logs" / ".." / ".." / "positions.csv"):
+                with pytest.raises(StateServiceError):
+                    client.write_json(path, {})
+            with pytest.raises(StateServiceError):
+                client.write_csv(tmp_path / "notes.csv", [], FIELDS)
+            assert not (tmp_path / "config.json").exists()
+            assert not (tmp_path.parent / "bankroll.json").exists()
+        finally:
+            client.close()
+
+    def test_trade_log_not_served(self, daemon, tmp_path):
+        path = tmp_path / "logs" / "trade_history_alpaca_paper.csv"
+        path.parent.mkdir()
+        _write_positions(path, [{"symbol": "SPY", "strike": 580, "quantity": 1, "entry_price": 1.25}])
+        client = StateClient(daemon.socket_path)
+        try:
+            assert client.read_csv(path)[0]["symbol"] == "SPY"  # Read in-process
+            client.append_csv(path, {"symbol": "QQQ"}, FIELDS)
+            assert [r["symbol"] for r in client.read_csv(path)] == ["SPY", "QQQ"]
+            assert client.requests == 0
+            with pytest.raises(StateServiceError):
+                client._call("read", path=str(path), kind="csv")
+            with pytest.raises(StateServiceError):
+                client._call("append_csv", path=str(path), row={"symbol": "IWM"}, fieldnames=FIELDS)
+        finally:
+            client.close()
+
+    def test_timeout_replaces_connection(self, daemon, tmp_path, monkeypatch):
+        dispatch, calls = daemon.dispatch, []
+
+        def stalled(request, handler):
+            calls.append(request["op"])
+            if len(calls) == 1:
+                time.sleep(0.5)  # First reply arrives after the client gave up on it
+            return dispatch(request, handler)
+
+        monkeypatch.setattr(daemon, "dispatch", stalled)
+        path = tmp_path / "bankroll.json"
+        path.write_text(json.dumps({"current_bankroll": 500.0}))
+        client = StateClient(daemon.socket_path, request_timeout=0.2)
+        try:
+            assert client._call("ping")["ok"]  # Sent again on a new connection
+            time.sleep(0.5)
+            assert client.read_json(path) == {"current_bankroll": 500.0}  # Not the late ping reply
+            assert calls == ["ping", "ping", "read"]
+        finally:
+            client.close()
+
+    def test_reply_for_other_request_replaces_connection(self, daemon, tmp_path):
+        path = tmp_path / "bankroll.json"
+        path.write_text(json.dumps({"current_bankroll": 500.0}))
+        client = StateClient(daemon.socket_path)
+        try:
+            client._rfile = io.BytesIO(b'{"id": 99, "ok": true, "pid": 1}\n')  # Left over from an earlier request
+            assert client.read_json(path) == {"current_bankroll": 500.0}
+        finally:
+            client.close()
+
+    def test_append_not_repeated_after_timeout(self, daemon, tmp_path, monkeypatch):
+        dispatch = daemon.dispatch
+
+        def stalled(request, handler):
+            if request.get("op") == "append_csv":
+                time.sleep(0.5)
+            return dispatch(request, handler)
+
+        monkeypatch.setattr(daemon, "dispatch", stalled)
+        path = tmp_path / "positions.csv"
+        client = StateClient(daemon.socket_path, request_timeout=0.2)
+        try:
+            with pytest.raises(StateDaemonUnavailable) as raised:
+                client.append_csv(path, {"symbol": "SPY"}, FIELDS)
+            assert raised.value.maybe_applied
+            time.sleep(0.5)
+            assert [r["symbol"] for r in client.read_csv(path)] == ["SPY"]
+        finally:
+            client.close()
+
+    def test_process_service_falls_back_when_daemon_dies(self, daemon, tmp_path, monkeypatch):
+        import utils.state_daemon as state_daemon
+
+        monkeypatch.setattr(state_daemon, "_service", None)
+        monkeypatch.setattr(state_daemon, "_daemon_settings",
+                            lambda: {"enabled": True, "socket": daemon.socket_path, "poll_seconds": 0.05})
+        path = tmp_path / "bankroll_alpaca_paper.json"
+        path.write_text(json.dumps({"current_bankroll": 500.0}))
+        service = state_daemon.get_state_service()
+        events = []
+        service.subscribe(lambda p, v: events.append(p), paths=[path])
+        assert service.read_json(path) == {"current_bankroll": 500.0}
+        assert service.stats()["mode"] == "daemon"
+
+        client = service.service
+        daemon.stop()
+        client._sock.shutdown(socket.SHUT_RDWR)  # Connections die with the daemon process
+        path.write_text(json.dumps({"current_bankroll": 750.0}))
+        _touch_later(path)
+
+        assert service.read_json(path) == {"current_bankroll": 750.0}
+        assert isinstance(service.service, LocalStateService)
+        assert state_daemon.get_state_service() is service
+        service.write_json(path, {"current_bankroll": 800.0})
+        assert json.loads(path.read_text()) == {"current_bankroll": 800.0}
+        assert events and events[-1] == str(path)  # Subscribers moved to the in-process service
+
+    def test_second_daemon_refused_and_stale_socket_replaced(self, daemon, tmp_path):
+        with pytest.raises(StateServiceError):
+            StateDaemon(daemon.socket_path).start()
+
+        daemon.stop()
+        Path(daemon.socket_path).touch()  # Left behind by a crash
+        replacement = StateDaemon(daemon.socket_path).start()
+        try:
+            assert isinstance(connect_state_service(daemon.socket_path), StateClient)
+        finally:
+            replacement.stop()
+
+
+class TestFallback:
+    """Test the in-process fallback and the dashboard readers."""
+
+    def test_no_daemon_falls_back(self, tmp_path):
+        assert isinstance(connect_state_service(tmp_path / "absent.sock"), LocalStateService)
+        assert isinstance(connect_state_service(tmp_path / "absent.sock", use_daemon=False), LocalStateService)
+
+    def test_dashboard_readers(self, tmp_path):
+        from trading_dashboard import load_bankroll_data, load_positions
+
+        bankroll = tmp_path / "bankroll.json"
+        bankroll.write_text(json.dumps({"current_bankroll": 750.0, "start_capital": 500.0}))
+        positions = tmp_path / "positions.csv"
+        _write_positions(positions, [{"symbol": "SPY", "strike": 580, "quantity": 2, "entry_price": 1.25}])
+        paths = {"bankroll": str(bankroll), "positions": str(positions)}
+
+        assert load_bankroll_data(paths)["current_bankroll"] == 750.0
+        assert load_positions(paths) == [{"symbol": "SPY", "strike": 580.0, "quantity": 2, "entry_price": 1.25}]
+        assert load_bankroll_data({"bankroll": str(tmp_path / "none.json")})["start_capital"] == 500.0
+        assert load_positions({"positions": str(tmp_path / "none.csv")}) == []
+
+
+class TestConsumers:
+    """Test that the trader, monitor and sync readers go through the service."""
+
+    def test_bankroll_balance_served_from_cache(self, tmp_path):
+        from utils.bankroll import BankrollManager
+        from utils.state_daemon import get_state_service
+
+        path = tmp_path / "bankroll.json"
+        manager = BankrollManager(str(path), start_capital=1000.0, backend="json")
+        for _ in range(3):
+            assert manager.get_current_bankroll() == 1000.0
+        loads = get_state_service().stats()["files"][str(path)]["loads"]
+        assert loads == 1
+
+        manager.update_bankroll(1250.0, "test")  # Saved directly; drops the cached copy
+        assert manager.get_current_bankroll() == 1250.0
+
+    def test_positions_and_sync_share_rows(self, tmp_path):
+        from utils.alpaca_sync import AlpacaSync
+        from utils.portfolio import PortfolioManager
+        from utils.position_store import get_position_store
+        from utils.state_daemon import get_state_service
+
+        path = tmp_path / "positions_alpaca_paper.csv"
+        sync = AlpacaSync.__new__(AlpacaSync)
+        sync.positions_file = str(path)
+        sync._save_local_positions([
+            {"symbol": "SPY", "strike": 580.0, "option_type": "CALL", "expiry": "2026-10-16",
+             "quantity": 1, "entry_price": 1.25},
+        ])
+
+        portfolio = PortfolioManager(str(path))  # May normalize (rewrite) the file once
+
+        [local] = sync._load_local_positions()
+        loads = get_state_service().stats()["files"][str(path)]["loads"]
+        [position] = portfolio.load_positions()
+        [record] = get_position_store(str(path)).records()
+        assert local.symbol == position.symbol == record.symbol == "SPY"
+        assert get_state_service().stats()["files"][str(path)]["loads"] == loads
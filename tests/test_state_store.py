@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared state store.
+
+Covers in-memory reads, dirty tracking, coalesced background writes, the
+cross-process lock file, recovery from interrupted writes, and the modules
+persisting their state through it.
+"""
+
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from utils.state_store import LOCK_STALE_SECONDS, StateStore, get_state_store
+
+
+@pytest.fixture
+def store():
+    store = StateStore(flush_delay_s=0.05, lock_timeout_s=0.1)
+    yield store
+    store.close()
+
+
+def _wait_clean(ns, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while ns.dirty and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+class TestReadsAndWrites:
+    """Test loading, saving and dirty tracking."""
+
+    def test_missing_file_returns_default(self, store, tmp_path):
+        ns = store.namespace("test", tmp_path / "state.json")
+        assert ns.load() is None
+        assert ns.load(default={}) == {}
+
+    def test_flush_writes_existing_format(self, store, tmp_path):
+        path = tmp_path / "state.json"
+        ns = store.namespace("test", path)
+
+        assert ns.save({"is_active": True, "count": 1}, flush=True)
+        assert path.read_text() == json.dumps({"is_active": True, "count": 1}, indent=2)
+        assert not ns.dirty
+        assert not list(tmp_path.glob("*.tmp")) and not list(tmp_path.glob("*.lock"))
+
+    def test_load_returns_fresh_copy(self, store, tmp_path):
+        ns = store.namespace("test", tmp_path / "state.json")
+        ns.save({"items": [1]}, flush=True)
+
+        value = ns.load()
+        value["items"].append(2)
+        assert ns.load() == {"items": [1]}
+
+    def test_unchanged_save_skipped(self, store, tmp_path):
+        ns = store.namespace("test", tmp_path / "state.json")
+        ns.save({"a": 1}, flush=True)
+        ns.load()
+
+        assert ns.save({"a": 1}, flush=True) is False
+        assert ns.writes == 1
+        assert ns.skipped == 1
+
+    def test_pending_value_visible_before_write(self, store, tmp_path):
+        ns = store.namespace("test", tmp_path / "state.json")
+        ns.save({"a": 1})
+
+        assert ns.dirty
+        assert ns.load() == {"a": 1}
+
+    def test_namespace_cached_per_path(self, store, tmp_path):
+        assert store.namespace("a", tmp_path / "x.json") is store.namespace("a", tmp_path / "x.json")
+        assert store.namespace("a", tmp_path / "x.json") is not store.namespace("a", tmp_path / "y.json")
+
+    def test_get_and_set_by_name(self, store, tmp_path):
+        store.namespace("limits", tmp_path / "limits.json")
+        store.set("limits", {"max": 3}, flush=True)
+
+        assert store.get("limits") == {"max": 3}
+        assert store.get("unknown", default=0) == 0
+        with pytest.raises(KeyError):
+            store.set("unknown", {})
+
+    def test_external_change_reloaded(self, store, tmp_path):
+        path = tmp_path / "state.json"
+        ns = store.namespace("test", path)
+        ns.save({"owner": "this process"}, flush=True)
+        assert ns.load()["owner"] == "this process"
+
+        path.write_text(json.dumps({"owner": "another process", "extra": True}))
+        assert ns.load()["owner"] == "another process"
+        assert ns.reloads == 1
+
+    def test_delete(self, store, tmp_path):
+        path = tmp_path / "state.json"
+        ns = store.namespace("test", path)
+        ns.save({"a": 1}, flush=True)
+
+        assert ns.delete()
+        assert not path.exists()
+        assert ns.load() is None
+
+
+class TestCoalescing:
+    """Test the background flusher."""
+
+    def test_burst_coalesced_into_few_writes(self, store, tmp_path):
+        path = tmp_path / "state.json"
+        ns = store.namespace("test", path)
+        for i in range(100):
+            ns.save({"checks": i})
+
+        _wait_clean(ns)
+        assert json.loads(path.read_text()) == {"checks": 99}
+        assert 1 <= ns.writes <= 3
+
+    def test_close_flushes_pending(self, tmp_path):
+        path = tmp_path / "state.json"
+        store = StateStore(flush_delay_s=60)
+        ns = store.namespace("test", path)
+        ns.save({"a": 1})
+        assert not path.exists()
+
+        store.close()
+        assert json.loads(path.read_text()) == {"a": 1}
+
+    def test_save_after_close_writes_through(self, tmp_path):
+        path = tmp_path / "state.json"
+        store = StateStore(flush_delay_s=60)
+        ns = store.namespace("test", path)
+        store.close()
+
+        ns.save({"late": True})
+        assert json.loads(path.read_text()) == {"late": True}
+
+
+class TestLockingAndRecovery:
+    """Test the cross-process lock file and crash recovery."""
+
+    def test_write_deferred_while_locked(self, store, tmp_path):
+        path = tmp_path / "state.json"
+        ns = store.namespace("test", path)
+        lock = tmp_path / "state.json.lock"
+        lock.write_text("12345")
+
+        assert ns.save({"a": 1}, flush=True) is False
+        assert ns.dirty and not path.exists()
+
+        lock.unlink()
+        ns.flush()  # The background writer may have written it first
+        assert not ns.dirty
+        assert json.loads(path.read_text()) == {"a": 1}
+
+    def test_stale_lock_broken(self, store, tmp_path):
+        path = tmp_path / "state.json"
+        lock = tmp_path / "state.json.lock"
+        lock.write_text("12345")
+        old = time.time() - LOCK_STALE_SECONDS - 5
+        os.utime(lock, (old, old))
+
+        assert store.namespace("test", path).save({"a": 1}, flush=True)
+        assert not lock.exists()
+
+    def test_recovers_interrupted_write(self, store, tmp_path):
+        path = tmp_path / "state.json"
+        (tmp_path / "state.json.4242.tmp").write_text(json.dumps({"is_active": True}))
+
+        assert store.namespace("test", path).load() == {"is_active": True}
+        assert json.loads(path.read_text()) == {"is_active": True}
+        assert not list(tmp_path.glob("*.tmp"))
+
+    def test_torn_temp_file_ignored(self, store, tmp_path):
+        path = tmp_path / "state.json"
+        path.write_text("{not json")
+        (tmp_path / "state.json.4242.tmp").write_text('{"is_act')
+
+        ns = store.namespace("test", path)
+        assert ns.load(default={}) == {}
+        assert not list(tmp_path.glob("*.tmp"))
+        assert ns.save({"fresh": True}, flush=True)
+
+
+class TestModulesOnStore:
+    """Test modules persisting their state through the shared store."""
+
+    def test_symbol_states_coalesced(self, tmp_path):
+        from utils.symbol_state_manager import SymbolStateManager
+
+        path = tmp_path / "symbol_states.json"
+        manager = SymbolStateManager(str(path))
+        manager.quarantine_symbol("SPY", "test", 500.0, 250.0)
+        manager.record_clean_scan("SPY")
+        get_state_store().flush()
+
+        saved = json.loads(path.read_text())
+        assert saved["SPY"]["state"] == "quarantined"
+        assert SymbolStateManager(str(path)).is_quarantined("SPY")
+
+    def test_kill_switch_written_through(self, tmp_path):
+        from utils.kill_switch import KillSwitch
+
+        kill_switch = KillSwitch(project_root=str(tmp_path))
+        kill_switch.activate("test halt", source="api")
+        stop_file = tmp_path / "EMERGENCY_STOP.txt"
+        assert json.loads(stop_file.read_text())["reason"] == "test halt"
+
+        assert KillSwitch(project_root=str(tmp_path)).is_active()
+        kill_switch.deactivate()
+        assert not stop_file.exists()
+
+    def test_staleness_metrics_appended_in_memory(self, tmp_path):
+        from datetime import datetime
+        from utils.staleness_monitor import StalenessLevel, StalenessMetrics, StalenessMonitor
+
+        monitor = StalenessMonitor({"STALENESS_MONITORING_ENABLED": True})
+        monitor.metrics_file = tmp_path / "staleness_metrics.json"
+        monitor.metrics_file.write_text(json.dumps([{"symbol": "QQQ"}]))
+        now = datetime.now()
+        for symbol in ("SPY", "IWM"):
+            monitor._log_metrics(StalenessMetrics(
+                symbol=symbol, last_update=now, age_seconds=5.0, staleness_level=StalenessLevel.FRESH,
+                retry_count=0, next_retry_time=None, consecutive_failures=0, total_failures=0,
+                success_rate=1.0, timestamp=now,
+            ))
+        get_state_store().flush()
+
+        logged = json.loads(monitor.metrics_file.read_text())
+        assert [m["symbol"] for m in logged] == ["QQQ", "SPY", "IWM"]
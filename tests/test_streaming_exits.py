@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+"""
+Tests for streaming tick-driven exit monitoring.
+
+Drives QuoteStream and StreamingExitEvaluator against the local market data
+stand-in: subscriptions follow open positions, stop losses are confirmed in
+ticks or seconds, evaluations are debounced per position, and recorded ticks
+can be replayed through the whole path.
+"""
+
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from utils.alpaca_standin import MarketDataStandin, load_ticks
+from utils.exit_strategies import ExitReason, ExitStrategyConfig, ExitStrategyManager
+from utils.streaming_exits import LastQuote, QuoteStream, QuoteTable, StreamingExitEvaluator
+
+OCC_SPY = "SPY261218C00600000"
+OCC_QQQ = "QQQ261218P00500000"
+
+
+def _position(symbol, occ, entry_price=1.00):
+    return {
+        "symbol": symbol,
+        "strike": 600.0,
+        "option_type": "CALL",
+        "expiry": "2026-12-18",
+        "entry_price": entry_price,
+        "quantity": 1,
+        "occ_symbol": occ,
+    }
+
+
+def _exit_manager():
+    return ExitStrategyManager(
+        ExitStrategyConfig(trailing_stop_enabled=False, time_based_exit_enabled=False, stop_loss_pct=25.0)
+    )
+
+
+class _Recorder:
+    """Collects dispatched decisions and lets tests wait on them."""
+
+    def __init__(self):
+        self.decisions = []
+        self._event = threading.Event()
+
+    def __call__(self, position, stock_price, option_price, decision):
+        self.decisions.append((position, stock_price, option_price, decision))
+        self._event.set()
+
+    def wait(self, timeout=5.0):
+        return self._event.wait(timeout)
+
+
+@pytest.fixture
+def market():
+    with MarketDataStandin() as server:
+        yield server
+
+
+@pytest.fixture
+def streaming(market):
+    recorder = _Recorder()
+    evaluator = StreamingExitEvaluator(
+        _exit_manager(), on_decision=recorder, debounce_ms=0, confirm_ticks=3, confirm_seconds=0
+    )
+    stream = QuoteStream("test_key", "test_secret", on_quote=evaluator.on_quote, url_override=market.url)
+    evaluator.quotes = stream.quotes
+    yield stream, evaluator, recorder
+    stream.stop()
+    evaluator.close()
+
+
+def _track(stream, evaluator, market, positions):
+    evaluator.set_positions(positions)
+    stream.set_symbols(evaluator.underlyings, evaluator.occ_symbols)
+    assert market.wait_for_subscription(evaluator.underlyings | evaluator.occ_symbols)
+    # alpaca-py only sends (un)subscribe messages once the stream reports running
+    assert _wait_for(lambda: all(s._running for s in stream._streams.values()))
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+
+class TestQuoteTable:
+    """Test the last-quote table."""
+
+    def test_mid_rules(self):
+        """Mid follows the polling monitor's rules for one-sided quotes."""
+        assert LastQuote(1.0, 1.2, 0).mid == pytest.approx(1.1)
+        assert LastQuote(0.0, 1.0, 0).mid == pytest.approx(0.95)
+        assert LastQuote(0.8, 0.0, 0).mid == pytest.approx(0.8)
+        assert LastQuote(0.0, 0.0, 0).mid is None
+
+    def test_update_and_discard(self):
+        """Quotes are replaced on update and dropped on discard."""
+        table = QuoteTable()
+        table.update("SPY", 599.0, 601.0)
+        table.update("SPY", 600.0, 602.0)
+        assert table.mid("SPY") == pytest.approx(601.0)
+        table.discard(["SPY"])
+        assert table.get("SPY") is None
+        assert len(table) == 0
+
+
+class TestSubscriptions:
+    """Test that subscriptions follow open positions."""
+
+    def test_subscribes_only_open_positions(self, market, streaming):
+        """Underlying and contract of each open position are subscribed; closed ones are dropped."""
+        stream, evaluator, _ = streaming
+        _track(stream, evaluator, market, [_position("SPY", OCC_SPY), _position("QQQ", OCC_QQQ)])
+        assert stream.subscribed == {"SPY", OCC_SPY, "QQQ", OCC_QQQ}
+
+        # QQQ position closes
+        evaluator.set_positions([_position("SPY", OCC_SPY)])
+        stream.set_symbols(evaluator.underlyings, evaluator.occ_symbols)
+
+        assert market.wait_for_subscription({"QQQ", OCC_QQQ}, subscribed=False)
+        assert market.subscribed_symbols == {"SPY", OCC_SPY}
+        assert market.publish_quote("QQQ", 499.0, 501.0) == 0
+
+    def test_quotes_land_in_table(self, market, streaming):
+        """Published quotes update the shared last-quote table."""
+        stream, evaluator, _ = streaming
+        _track(stream, evaluator, market, [_position("SPY", OCC_SPY)])
+
+        assert market.publish_quote(OCC_SPY, 1.10, 1.20) == 1
+        assert _wait_for(lambda: stream.quotes.get(OCC_SPY) is not None)
+        assert stream.quotes.mid(OCC_SPY) == pytest.approx(1.15)
+
+
+class TestConfirmation:
+    """Test tick- and time-based confirmation of stop losses."""
+
+    def test_stop_loss_confirmed_after_ticks(self, market, streaming):
+        """A stop loss is dispatched only after confirm_ticks breaching ticks."""
+        stream, evaluator, recorder = streaming
+        _track(stream, evaluator, market, [_position("SPY", OCC_SPY)])
+        market.publish_quote("SPY", 599.0, 601.0)
+
+        for i in range(2):
+            market.publish_quote(OCC_SPY, 0.65, 0.70)
+            assert _wait_for(lambda: evaluator.evaluations == i + 1)
+        assert recorder.decisions == []
+
+        market.publish_quote(OCC_SPY, 0.64, 0.69)
+        assert recorder.wait()
+        position, stock_price, option_price, decision = recorder.decisions[0]
+        assert position["occ_symbol"] == OCC_SPY
+        assert stock_price == pytest.approx(600.0)
+        assert option_price == pytest.approx(0.665)
+        assert decision.reason == ExitReason.STOP_LOSS
+        assert evaluator.last_decision_latency_ms is not None
+
+        # Latched: further ticks do not dispatch again until released
+        market.publish_quote(OCC_SPY, 0.60, 0.65)
+        time.sleep(0.1)
+        assert len(recorder.decisions) == 1
+
+    def test_recovery_resets_confirmation(self, market, streaming):
+        """A non-breaching tick resets the breach count."""
+        stream, evaluator, recorder = streaming
+        _track(stream, evaluator, market, [_position("SPY", OCC_SPY)])
+        market.publish_quote("SPY", 599.0, 601.0)
+
+        for bid, ask in [(0.65, 0.70), (0.65, 0.70), (0.95, 1.00), (0.65, 0.70), (0.65, 0.70)]:
+            count = evaluator.evaluations
+            market.publish_quote(OCC_SPY, bid, ask)
+            assert _wait_for(lambda: evaluator.evaluations == count + 1)
+        assert recorder.decisions == []
+
+    def test_stop_loss_confirmed_after_seconds(self, market):
+        """With tick confirmation off, a single breach confirms once the window elapses."""
+        recorder = _Recorder()
+        evaluator = StreamingExitEvaluator(
+            _exit_manager(), on_decision=recorder, debounce_ms=0, confirm_ticks=0, confirm_seconds=0.3
+        )
+        stream = QuoteStream("test_key", "test_secret", on_quote=evaluator.on_quote, url_override=market.url)
+        evaluator.quotes = stream.quotes
+        try:
+            _track(stream, evaluator, market, [_position("SPY", OCC_SPY)])
+            market.publish_quote("SPY", 599.0, 601.0)
+            start = time.monotonic()
+            market.publish_quote(OCC_SPY, 0.65, 0.70)
+
+            # No further ticks: the re-check timer confirms it
+            assert recorder.wait()
+            assert time.monotonic() - start >= 0.3
+            assert recorder.decisions[0][3].reason == ExitReason.STOP_LOSS
+        finally:
+            stream.stop()
+            evaluator.close()
+
+    def test_profit_target_dispatches_immediately(self, market, streaming):
+        """Reasons outside confirm_reasons act on the first tick."""
+        stream, evaluator, recorder = streaming
+        _track(stream, evaluator, market, [_position("SPY", OCC_SPY)])
+        market.publish_quote("SPY", 599.0, 601.0)
+
+        market.publish_quote(OCC_SPY, 1.25, 1.35)
+
+        assert recorder.wait()
+        assert recorder.decisions[0][3].reason == ExitReason.PROFIT_TARGET
+        assert evaluator.evaluations == 1
+
+    def test_release_rearms_position(self):
+        """release() lets a latched position dispatch again."""
+        recorder = _Recorder()
+        quotes = QuoteTable()
+        evaluator = StreamingExitEvaluator(
+            _exit_manager(), on_decision=recorder, quotes=quotes, debounce_ms=0, confirm_reasons=()
+        )
+        evaluator.set_positions([_position("SPY", OCC_SPY)])
+        quotes.update("SPY", 599.0, 601.0)
+        quotes.update(OCC_SPY, 0.60, 0.70)
+        try:
+            evaluator.on_quote(OCC_SPY)
+            evaluator.on_quote(OCC_SPY)
+            assert evaluator.decisions_dispatched == 1
+            evaluator.release(OCC_SPY)
+            evaluator.on_quote(OCC_SPY)
+            assert evaluator.decisions_dispatched == 2
+        finally:
+            evaluator.close()
+
+
+class TestDebounce:
+    """Test per-position debouncing."""
+
+    def test_burst_is_coalesced(self):
+        """A burst of ticks inside the debounce window costs one extra evaluation."""
+        exit_manager = Mock(wraps=_exit_manager())
+        quotes = QuoteTable()
+        evaluator = StreamingExitEvaluator(exit_manager, on_decision=Mock(), quotes=quotes, debounce_ms=200)
+        evaluator.set_positions([_position("SPY", OCC_SPY)])
+        quotes.update("SPY", 599.0, 601.0)
+        try:
+            for i in range(50):
+                quotes.update(OCC_SPY, 1.00 + i * 0.001, 1.02 + i * 0.001)
+                evaluator.on_quote(OCC_SPY)
+            assert evaluator.evaluations == 1
+
+            assert _wait_for(lambda: evaluator.evaluations == 2, timeout=2)
+            # The deferred evaluation saw the latest quote
+            _, _, option_price = exit_manager.evaluate_exit.call_args[0]
+            assert option_price == pytest.approx(1.059)
+        finally:
+            evaluator.close()
+
+    def test_underlying_tick_evaluates_its_positions(self):
+        """An underlying tick evaluates every position on that underlying."""
+        quotes = QuoteTable()
+        evaluator = StreamingExitEvaluator(_exit_manager(), on_decision=Mock(), quotes=quotes, debounce_ms=0)
+        evaluator.set_positions([
+            _position("SPY", OCC_SPY),
+            _position("SPY", "SPY261218P00590000"),
+            _position("QQQ", OCC_QQQ),
+        ])
+        for symbol in ("SPY", "QQQ"):
+            quotes.update(symbol, 599.0, 601.0)
+        for occ in (OCC_SPY, "SPY261218P00590000", OCC_QQQ):
+            quotes.update(occ, 0.95, 1.05)
+        try:
+            evaluator.on_quote("SPY")
+            assert evaluator.evaluations == 2
+        finally:
+            evaluator.close()
+
+
+class TestReplay:
+    """Test recorded tick replay through the stream."""
+
+    def test_replay_triggers_stop_loss(self, market, streaming, tmp_path):
+        """A recorded slide through the stop is confirmed and dispatched."""
+        stream, evaluator, recorder = streaming
+        _track(stream, evaluator, market, [_position("SPY", OCC_SPY)])
+        ticks = [{"t": 0.0, "symbol": "SPY", "bid": 599.0, "ask": 601.0}]
+        for i, price in enumerate([1.00, 0.90, 0.80, 0.72, 0.70, 0.68, 0.66]):
+            ticks.append({"t": 0.02 * (i + 1), "symbol": OCC_SPY, "bid": price - 0.02, "ask": price + 0.02})
+        path = tmp_path / "ticks.json"
+        path.write_text(json.dumps(list(reversed(ticks))))
+
+        assert load_ticks(str(path)) == ticks
+        assert market.replay(str(path), speed=1.0) == len(ticks)
+
+        assert recorder.wait()
+        assert len(recorder.decisions) == 1
+        assert recorder.decisions[0][2] == pytest.approx(0.68)
+        assert _wait_for(lambda: stream.ticks_received == len(ticks))
+
+
+class TestMonitorStreaming:
+    """Test the monitor's streaming-mode wiring."""
+
+    def _monitor(self):
+        from monitor_alpaca import EnhancedPositionMonitor
+
+        monitor = EnhancedPositionMonitor.__new__(EnhancedPositionMonitor)
+        monitor.last_alerts = {}
+        monitor.alert_cooldown = 300
+        monitor.stop_loss_grace_seconds = 120
+        monitor._seconds_since_entry = Mock(return_value=600)
+        monitor.handle_exit_decision = Mock()
+        monitor._stream_evaluator = Mock()
+        return monitor
+
+    def test_decision_handled_once_per_cooldown(self):
+        """Confirmed decisions go to handle_exit_decision, rate-limited by the alert cooldown."""
+        monitor = self._monitor()
+        position = _position("SPY", OCC_SPY)
+        decision = _exit_manager().evaluate_exit(position, 600.0, 0.70)
+
+        monitor._on_stream_decision(position, 600.0, 0.70, decision)
+        monitor._on_stream_decision(position, 600.0, 0.68, decision)
+
+        monitor.handle_exit_decision.assert_called_once()
+        args = monitor.handle_exit_decision.call_args[0]
+        assert args[3] == pytest.approx(-30.0)  # pnl
+        assert args[4] == pytest.approx(-30.0)  # pnl_pct
+        assert monitor._stream_evaluator.release.call_count == 2
+
+    def test_stop_loss_inside_grace_window_is_held(self):
+        """Stop losses inside the post-entry grace window are not acted on."""
+        monitor = self._monitor()
+        monitor._seconds_since_entry = Mock(return_value=10)
+        position = _position("SPY", OCC_SPY)
+        decision = _exit_manager().evaluate_exit(position, 600.0, 0.70)
+
+        monitor._on_stream_decision(position, 600.0, 0.70, decision)
+
+        monitor.handle_exit_decision.assert_not_called()
+        monitor._stream_evaluator.release.assert_called_once_with(OCC_SPY)
+
+    def test_refresh_tracks_open_positions(self):
+        """refresh_stream_positions feeds loaded positions (with OCC symbols) to both sides."""
+        monitor = self._monitor()
+        monitor._maybe_auto_sync_positions = Mock()
+        monitor.load_positions = Mock(return_value=[_position("SPY", None)])
+        monitor._build_occ_symbol = Mock(return_value=OCC_SPY)
+        evaluator = StreamingExitEvaluator(_exit_manager(), on_decision=Mock())
+        stream = Mock()
+        try:
+            assert monitor.refresh_stream_positions(stream, evaluator) == 1
+        finally:
+            evaluator.close()
+
+        stream.set_symbols.assert_called_once_with({"SPY"}, {OCC_SPY})
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Tests for the incremental trade-log aggregates.
+
+Covers per-symbol totals and streaks, incremental catch-up on appended rows,
+rewrite detection, the persisted store, rebuild, and BankrollManager serving
+LLM context from the aggregates.
+"""
+
+import csv
+import json
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from utils.trade_aggregates import TradeAggregates
+
+HEADER = ["timestamp", "symbol", "decision", "reason", "status", "pnl_pct", "pnl_amount"]
+
+
+def _write(path: Path, rows, mode="w"):
+    with open(path, mode, newline="") as f:
+        writer = csv.writer(f)
+        if mode == "w":
+            writer.writerow(HEADER)
+        for row in rows:
+            writer.writerow(row)
+
+
+def _row(symbol, pnl, reason="breakout", decision="CALL"):
+    pct = "" if pnl == "" else pnl / 2
+    return ["2026-10-16T10:00:00", symbol, decision, reason, "CLOSED", pct, pnl]
+
+
+@pytest.fixture
+def trade_log(tmp_path):
+    path = tmp_path / "trade_history_test.csv"
+    _write(path, [_row("SPY", 20.0), _row("SPY", -10.0), _row("QQQ", 5.0), _row("SPY", "")])
+    return path
+
+
+class TestAggregates:
+    """Test aggregation and incremental refresh."""
+
+    def test_symbol_totals(self, trade_log):
+        aggregates = TradeAggregates(trade_log)
+        assert aggregates.refresh() == 3  # Row without PnL is an open trade
+
+        perf = aggregates.symbol_performance()
+        assert perf["SPY"] == {"win_rate": 0.5, "total_trades": 2, "avg_pnl": 5.0}
+        assert perf["QQQ"]["total_trades"] == 1
+        assert aggregates.streak("SPY") == -1
+        assert aggregates.recent_outcomes("SPY") == [True, False]
+
+    def test_recent_patterns(self, trade_log):
+        aggregates = TradeAggregates(trade_log)
+        aggregates.refresh()
+
+        patterns = aggregates.recent_patterns(2)
+        assert [p["symbol"] for p in patterns] == ["SPY", "QQQ"]
+        assert patterns[1] == {"symbol": "QQQ", "option_type": "CALL", "outcome": "WIN",
+                               "pnl_pct": 2.5, "reason": "breakout"}
+
+    def test_appended_rows_folded_in(self, trade_log):
+        aggregates = TradeAggregates(trade_log)
+        aggregates.refresh()
+        offset = aggregates.offset
+
+        assert aggregates.refresh() == 0
+        _write(trade_log, [_row("SPY", 7.0), _row("SPY", 3.0)], mode="a")
+
+        assert aggregates.refresh() == 2
+        assert aggregates.offset > offset
+        assert aggregates.symbol_performance()["SPY"]["total_trades"] == 4
+        assert aggregates.streak("SPY") == 2
+        assert aggregates.rebuilds == 0
+
+    def test_partial_line_left_for_next_refresh(self, trade_log):
+        aggregates = TradeAggregates(trade_log)
+        aggregates.refresh()
+        with open(trade_log, "a") as f:
+            f.write("2026-10-16T11:00:00,IWM,PUT,fade,CLOSED,1.0")
+
+        assert aggregates.refresh() == 0
+        with open(trade_log, "a") as f:
+            f.write(",2.0\r\n")
+        assert aggregates.refresh() == 1
+        assert aggregates.symbol_performance()["IWM"]["avg_pnl"] == 2.0
+
+    def test_rewritten_log_rebuilds(self, trade_log):
+        aggregates = TradeAggregates(trade_log)
+        aggregates.refresh()
+
+        _write(trade_log, [_row("DIA", -4.0), _row("DIA", -1.0), _row("DIA", 9.0), _row("DIA", 2.0),
+                           _row("DIA", 1.0)])
+
+        aggregates.refresh()
+        assert set(aggregates.symbol_performance()) == {"DIA"}
+        assert aggregates.rebuilds == 1
+
+    def test_store_resumes_after_restart(self, trade_log):
+        TradeAggregates(trade_log).refresh()
+        store = trade_log.with_suffix(".aggregates.json")
+        assert json.loads(store.read_text())["rows"] == 3
+
+        restarted = TradeAggregates(trade_log)
+        assert restarted.refresh() == 0
+        assert restarted.symbol_performance()["SPY"]["total_trades"] == 2
+
+    def test_rebuild(self, trade_log):
+        aggregates = TradeAggregates(trade_log)
+        aggregates.refresh()
+        aggregates.symbols["SPY"].wins = 99  # Corrupted aggregate
+
+        assert aggregates.rebuild() == 3
+        assert aggregates.symbol_performance()["SPY"]["win_rate"] == 0.5
+
+    def test_reads_during_refresh(self, trade_log):
+        _write(trade_log, [_row(f"S{i}", 1.0) for i in range(3000)], mode="a")
+        aggregates = TradeAggregates(trade_log)
+        refresh = threading.Thread(target=aggregates.refresh)
+        refresh.start()
+        while refresh.is_alive():
+            aggregates.symbol_performance()  # Must not see the symbol dict change size
+        refresh.join()
+
+        assert len(aggregates.symbol_performance()) == 3002
+
+
+class TestBankrollContext:
+    """Test BankrollManager reading LLM context from the aggregates."""
+
+    def test_context_from_aggregates(self, trade_log, tmp_path):
+        from utils.bankroll import BankrollManager
+
+        manager = BankrollManager(str(tmp_path / "bankroll_test.json"), start_capital=500.0)
+        manager._trade_log_path = str(trade_log)
+
+        assert manager._get_symbol_performance()["SPY"]["total_trades"] == 2
+        _write(trade_log, [_row("QQQ", -2.0, reason="range consolidation")], mode="a")
+
+        patterns = manager._get_recent_trade_patterns(last_n=2)
+        assert [(p["symbol"], p["outcome"]) for p in patterns] == [("QQQ", "WIN"), ("QQQ", "LOSS")]
+        assert patterns[-1]["market_condition"] == "CONSOLIDATION"
+        assert manager._get_symbol_performance()["QQQ"]["total_trades"] == 2
+
+    def test_missing_trade_log(self, tmp_path):
+        from utils.bankroll import BankrollManager
+
+        manager = BankrollManager(str(tmp_path / "bankroll_test.json"))
+        manager._trade_log_path = str(tmp_path / "missing.csv")
+
+        assert manager._get_symbol_performance() == {}
+        assert manager._get_recent_trade_patterns() == []
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Tests for the date/symbol-partitioned columnar trade archive.
+
+Covers batched appends, partition and column pruning, compaction (including
+recovery from an interrupted one), CSV backfill, the log_trade_decision hook,
+and the trading dashboard reading from the archive.
+"""
+
+import csv
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import utils.trade_archive as trade_archive
+from utils.trade_archive import REPLACES_SUFFIX, TradeArchive, archive_root_for, open_trade_archive
+
+
+def _row(day, symbol, decision="NO_TRADE", pnl="", reason="flat", minute=0):
+    return {"timestamp": f"{day}T10:{minute:02d}:00", "symbol": symbol, "decision": decision,
+            "confidence": 0.42, "reason": reason, "pnl_amount": pnl}
+
+
+@pytest.fixture
+def archive(tmp_path):
+    return TradeArchive(tmp_path / "archive", fmt="npz", flush_rows=4, flush_seconds=3600, compact_parts=0)
+
+
+class TestWrites:
+    """Test batching and the partition layout."""
+
+    def test_rows_buffered_until_batch_full(self, archive):
+        for i in range(3):
+            archive.append(_row("2026-10-15", "SPY", minute=i))
+        assert archive.partitions() == []
+
+        archive.append(_row("2026-10-16", "QQQ"))
+
+        assert [(d, s) for d, s, _ in archive.partitions()] == [("2026-10-15", "SPY"), ("2026-10-16", "QQQ")]
+        assert archive.metrics()["parts"] == 2 and archive.rows_written == 4
+
+    def test_column_types(self, archive):
+        archive.append(_row("2026-10-16", "SPY", decision="CALL", pnl=12.5))
+        archive.append(_row("2026-10-16", "SPY", pnl=""))
+        archive.flush()
+
+        (_, _, directory), = archive.partitions()
+        with np.load(archive._parts(directory)[0]) as npz:
+            assert npz["pnl_amount"].dtype == np.float64
+            assert npz["decision"].dtype == np.int32  # Dictionary-encoded strings
+            assert list(npz["__values__.decision"]) == ["CALL", "NO_TRADE"]
+
+    def test_column_type_fixed_across_parts(self, archive):
+        archive.append({**_row("2026-10-15", "SPY", reason="1"), "order_id": "abc-1"})
+        archive.flush()
+        archive.append({**_row("2026-10-16", "SPY", pnl="n/a"), "order_id": "0042"})
+        archive.flush()
+
+        df = archive.read(columns=["reason", "order_id", "pnl_amount"])
+        assert list(df["reason"]) == ["1", "flat"]
+        assert list(df["order_id"]) == ["abc-1", "0042"]  # Not 42.0
+        assert df["pnl_amount"].isna().all()
+
+    def test_age_triggers_flush(self, tmp_path):
+        archive = TradeArchive(tmp_path / "archive", fmt="npz", flush_rows=1000, flush_seconds=0)
+        archive.append(_row("2026-10-16", "SPY"))
+        assert archive.rows_written == 1
+
+    def test_parquet_parts(self, tmp_path):
+        pytest.importorskip("pyarrow")
+        archive = TradeArchive(tmp_path / "archive", fmt="parquet", flush_rows=1)
+        archive.append(_row("2026-10-16", "SPY", pnl=1.5))
+
+        assert archive._parts(archive.partition_dir("2026-10-16", "SPY"))[0].suffix == ".parquet"
+        assert archive.read(columns=["pnl_amount"])["pnl_amount"].tolist() == [1.5]
+
+    def test_unknown_format_rejected(self, tmp_path):
+        with pytest.raises(ValueError):
+            TradeArchive(tmp_path / "archive", fmt="orc")
+
+
+class TestReads:
+    """Test pruned reads."""
+
+    @pytest.fixture
+    def filled(self, archive):
+        for day in ("2026-10-14", "2026-10-15", "2026-10-16"):
+            for minute, symbol in enumerate(("SPY", "QQQ", "IWM")):
+                archive.append(_row(day, symbol, decision="CALL", pnl=float(minute), minute=minute))
+        archive.flush()
+        return archive
+
+    def test_date_and_symbol_pruning(self, filled):
+        df = filled.read(start="2026-10-15", end="2026-10-15", symbols=["spy", "IWM"])
+
+        assert sorted(df["symbol"]) == ["IWM", "SPY"]
+        assert set(df["timestamp"].str[:10]) == {"2026-10-15"}
+
+    def test_column_pruning_and_order(self, filled):
+        df = filled.read(columns=["symbol", "pnl_amount", "not_a_column"], start="2026-10-16")
+
+        assert list(df.columns) == ["symbol", "pnl_amount"]
+        assert list(df["symbol"]) == ["SPY", "QQQ", "IWM"]  # Trade-log (timestamp) order
+
+    def test_blank_strings_read_as_nan(self, archive):
+        archive.append({**_row("2026-10-16", "SPY"), "exit_reason": ""})
+        archive.append({**_row("2026-10-16", "SPY"), "exit_reason": "tp"})
+        df = archive.read()
+
+        assert df["exit_reason"].isna().tolist() == [True, False]
+
+    def test_empty_archive(self, archive):
+        assert archive.read(columns=["symbol"]).empty
+
+
+class TestCompaction:
+    """Test merging fragmented partitions."""
+
+    def test_compact_merges_parts(self, archive):
+        for i in range(12):
+            archive.append(_row("2026-10-16", "SPY", minute=i))
+        before = archive.read()
+
+        assert archive.compact() == {"partitions": 1, "parts_merged": 3}
+        assert archive.metrics()["parts"] == 1
+        assert archive.read().equals(before)
+
+    def test_automatic_compaction(self, tmp_path):
+        archive = TradeArchive(tmp_path / "archive", fmt="npz", flush_rows=1, compact_parts=3)
+        for i in range(7):
+            archive.append(_row("2026-10-16", "SPY", minute=i))
+
+        assert archive.metrics()["parts"] < 3
+        assert len(archive.read()) == 7
+
+    def test_interrupted_compaction_recovered(self, archive):
+        for i in range(8):
+            archive.append(_row("2026-10-16", "SPY", minute=i))
+        (_, _, directory), = archive.partitions()
+        parts = archive._parts(directory)
+
+        # Crash after the merged part was renamed into place, before inputs were removed
+        merged = directory / (parts[-1].stem + "-c.npz")
+        archive._dump(merged, trade_archive._merge_columns(archive._read_part(p) for p in parts), parquet=False)
+        (directory / (merged.name + REPLACES_SUFFIX)).write_text(json.dumps([p.name for p in parts]))
+
+        assert len(archive.read()) == 8  # Replaced parts are already ignored
+        archive.compact()
+        assert [p.name for p in directory.iterdir()] == [merged.name]
+
+
+class TestBackfillAndHook:
+    """Test CSV import and the trade-log writer hook."""
+
+    def _trade_log(self, tmp_path, rows):
+        path = tmp_path / "logs" / "trade_history_test.csv"
+        path.parent.mkdir()
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+        return path
+
+    def test_import_once_and_rebuild(self, tmp_path):
+        trade_log = self._trade_log(tmp_path, [_row("2026-10-15", "SPY"), _row("2026-10-16", "QQQ", reason="a\nb")])
+        archive = TradeArchive(archive_root_for(trade_log), fmt="npz")
+
+        assert archive.import_csv(trade_log) == 2
+        assert archive.import_csv(trade_log) == 0
+        assert archive.import_csv(trade_log, replace=True) == 2
+        assert list(archive.read()["reason"]) == ["flat", "a\nb"]
+
+    def test_import_types_whole_column(self, tmp_path):
+        rows = [{**_row("2026-10-15", "SPY", minute=i), "order_id": str(i)} for i in range(3)]
+        rows[-1]["order_id"] = "x-2"
+        trade_log = self._trade_log(tmp_path, rows)
+        archive = TradeArchive(archive_root_for(trade_log), fmt="npz", flush_rows=1)
+
+        assert archive.import_csv(trade_log) == 3
+        assert list(archive.read()["order_id"]) == ["0", "1", "x-2"]
+        assert json.loads(archive.manifest_path.read_text())["columns"]["order_id"] == "str"
+
+    def test_log_trade_decision_mirrors_rows(self, tmp_path, monkeypatch):
+        from utils.logging_utils import log_trade_decision
+
+        monkeypatch.setattr(trade_archive, "_settings", {"enabled": True, "format": "npz", "flush_rows": 1,
+                                                        "flush_seconds": 30, "compact_parts": 0})
+        monkeypatch.setattr(trade_archive, "_instances", {})
+        trade_log = self._trade_log(tmp_path, [_row("2026-10-15", "SPY")])
+
+        log_trade_decision(str(trade_log), _row("2026-10-16", "QQQ", decision="CALL"))  # Backfills both rows
+        log_trade_decision(str(trade_log), _row("2026-10-16", "IWM", pnl=-3.0, minute=5))
+
+        assert trade_archive.get_trade_archive(trade_log).wait_for_backfill(timeout=10)
+        df = open_trade_archive(trade_log).read(columns=["symbol", "decision", "pnl_amount"])
+        assert list(df["symbol"]) == ["SPY", "QQQ", "IWM"]
+        assert df["pnl_amount"].iloc[-1] == -3.0
+
+    def test_backfill_off_the_logging_path(self, tmp_path, monkeypatch):
+        from utils.logging_utils import log_trade_decision
+
+        monkeypatch.setattr(trade_archive, "_settings", {"enabled": True, "format": "npz", "flush_rows": 1,
+                                                        "flush_seconds": 30, "compact_parts": 0})
+        monkeypatch.setattr(trade_archive, "_instances", {})
+        trade_log = self._trade_log(tmp_path, [_row("2026-10-15", "SPY")])
+        archive = trade_archive.get_trade_archive(trade_log)
+        with archive._exclusive() as acquired:  # Held by "another process": the backfill has to wait
+            assert acquired
+            log_trade_decision(str(trade_log), _row("2026-10-16", "QQQ"))
+            log_trade_decision(str(trade_log), _row("2026-10-16", "IWM", minute=5))
+            assert not archive.initialized and archive.partitions() == []  # Live rows held back
+
+        assert archive.wait_for_backfill(timeout=10)
+        assert list(archive.read()["symbol"]) == ["SPY", "QQQ", "IWM"]
+
+    def test_disabled_hook_writes_nothing(self, tmp_path, monkeypatch):
+        from utils.logging_utils import log_trade_decision
+
+        monkeypatch.setattr(trade_archive, "_settings", {"enabled": False})
+        trade_log = tmp_path / "trade_history_test.csv"
+        log_trade_decision(str(trade_log), _row("2026-10-16", "SPY"))
+
+        assert open_trade_archive(trade_log) is None
+
+    def test_dashboard_reads_archive(self, tmp_path):
+        pytest.importorskip("yaml")
+        from trading_dashboard import load_trade_history
+
+        rows = [_row("2026-10-14", "SPY", decision="CLOSE_CALL", pnl=5.0),
+                _row("2026-10-15", "SPY"),
+                _row("2026-10-16", "QQQ", decision="CLOSE_PUT", pnl=-2.0)]
+        trade_log = self._trade_log(tmp_path, rows)
+        paths = {"trade_history": str(trade_log)}
+        csv_trades = load_trade_history(paths, since="2026-10-15")
+
+        TradeArchive(archive_root_for(trade_log), fmt="npz").import_csv(trade_log)
+        trades = load_trade_history(paths, since="2026-10-15")
+
+        assert [(t["symbol"], t["pnl_amount"]) for t in trades] == [("QQQ", -2.0)]
+        assert [(t["symbol"], t["pnl_amount"]) for t in csv_trades] == [("QQQ", -2.0)]
+        assert "reason" not in trades[0]  # Column-pruned
@@ -10,7 +10,6 @@ Shows all important financial data including:
 - Position tracking and exposure
 """
 
-import json
 import csv
 import os
 import argparse
@@ -25,6 +24,7 @@ import math
 from utils.scoped_files import get_scoped_paths, ensure_scoped_files
 from utils.enhanced_slack import EnhancedSlackIntegration
 from utils.drawdown_circuit_breaker import DrawdownCircuitBreaker
+from utils.trade_archive import open_trade_archive
 
 
 def _load_config() -> Dict:
@@ -71,8 +71,16 @@ def load_bankroll_data(paths: Dict) -> Dict:
     """Load current bankroll and financial data using scoped path."""
     bankroll_file = paths.get("bankroll", "bankroll.json")
     try:
-        with open(bankroll_file, "r", encoding="utf-8") as f:
-            return json.load(f)
+        from utils.bankroll_ledger import SqliteBankrollLedger, sqlite_path_for
+        from utils.state_daemon import get_state_service
+
+        ledger_db = sqlite_path_for(bankroll_file)
+        if ledger_db.exists():
+            return SqliteBankrollLedger(ledger_db).summary()
+        data = get_state_service().read_json(bankroll_file)
+        if data is None:
+            raise FileNotFoundError(bankroll_file)
+        return data
     except FileNotFoundError:
         start_capital = 500.0
         return {
@@ -92,41 +100,46 @@ def load_positions(paths: Dict) -> List[Dict]:
     """Load current open positions using scoped positions file."""
     positions = []
     try:
+        from utils.state_daemon import get_state_service
+
         positions_file = paths.get("positions", "positions.csv")
-        with open(positions_file, "r", newline="", encoding="utf-8") as file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                try:
-                    row["quantity"] = int(float(row.get("quantity", 0)))
-                except Exception:
-                    row["quantity"] = 0
-                try:
-                    row["entry_price"] = float(row.get("entry_price", 0) or 0)
-                except Exception:
-                    row["entry_price"] = 0.0
-                try:
-                    row["strike"] = float(row.get("strike", 0) or 0)
-                except Exception:
-                    row["strike"] = 0.0
-                positions.append(row)
-    except FileNotFoundError:
-        pass
+        for row in get_state_service().read_csv(positions_file):
+            try:
+                row["quantity"] = int(float(row.get("quantity", 0)))
+            except Exception:
+                row["quantity"] = 0
+            try:
+                row["entry_price"] = float(row.get("entry_price", 0) or 0)
+            except Exception:
+                row["entry_price"] = 0.0
+            try:
+                row["strike"] = float(row.get("strike", 0) or 0)
+            except Exception:
+                row["strike"] = 0.0
+            positions.append(row)
     except Exception as e:
         print(f"Error loading positions: {e}")
 
     return positions
 
 
-def load_trade_history(paths: Dict) -> List[Dict]:
-    """Load trade history from scoped CSV (15-field schema) with robust fallbacks."""
-    trade_file = paths.get("trade_history", "logs/trade_history.csv")
+# Trade-history columns used by load_trade_history/analyze_trades (archive column pruning)
+TRADE_HISTORY_COLUMNS = [
+    "timestamp", "symbol", "decision", "action", "direction", "option_type", "status",
+    "pnl_amount", "pnl", "pnl_pct", "fill_price", "price", "total_cost", "premium",
+    "current_price", "quantity", "strike", "confidence",
+]
+
+
+def _read_trade_csv(trade_file: str) -> Optional[pd.DataFrame]:
+    """Read the trade-history CSV with progressively more forgiving parsers."""
     # Try fast path
     try:
-        df = pd.read_csv(trade_file, encoding="utf-8")
+        return pd.read_csv(trade_file, encoding="utf-8")
     except Exception as e1:
         # Retry with python engine and skip bad lines
         try:
-            df = pd.read_csv(
+            return pd.read_csv(
                 trade_file,
                 engine="python",
                 on_bad_lines="skip",
@@ -145,10 +158,31 @@ def load_trade_history(paths: Dict) -> List[Dict]:
                         if None in r:
                             r.pop(None, None)
                         rows.append(r)
-                df = pd.DataFrame(rows)
+                return pd.DataFrame(rows)
             except Exception as e3:
                 print(f"Error loading trade history from {trade_file}: {e1}")
-                return []
+                return None
+
+
+def load_trade_history(paths: Dict, since: Optional[str] = None) -> List[Dict]:
+    """Load trade history (15-field schema) from the columnar archive or the scoped CSV.
+
+    Args:
+        paths: Scoped file paths
+        since: Only include trades on or after this date (YYYY-MM-DD)
+    """
+    trade_file = paths.get("trade_history", "logs/trade_history.csv")
+    archive = open_trade_archive(trade_file)
+    if archive is not None:
+        # Date-partition and column pruned read
+        df = archive.read(columns=TRADE_HISTORY_COLUMNS, start=since)
+    else:
+        df = _read_trade_csv(trade_file)
+        if df is None:
+            return []
+        if since and "timestamp" in df.columns:
+            timestamps = pd.to_datetime(df["timestamp"], errors="coerce", format="mixed")
+            df = df[timestamps >= pd.Timestamp(since[:10])].copy()
 
     # Map legacy columns to new schema where possible
     if "decision" not in df.columns:
@@ -421,7 +455,8 @@ def send_slack_summary(metrics: Dict, paths: Dict) -> bool:
         return False
 
 
-def display_dashboard(export_csv: bool = False, export_html: bool = False, slack: bool = False, limit: Optional[int] = None):
+def display_dashboard(export_csv: bool = False, export_html: bool = False, slack: bool = False, limit: Optional[int] = None,
+                      since: Optional[str] = None):
     """Display comprehensive trading dashboard with optional exports/Slack."""
     print("=" * 60)
     print("         COMPREHENSIVE TRADING DASHBOARD")
@@ -432,7 +467,7 @@ def display_dashboard(export_csv: bool = False, export_html: bool = False, slack
     paths = _load_config()
     bankroll_data = load_bankroll_data(paths)
     positions = load_positions(paths)
-    trades = load_trade_history(paths)
+    trades = load_trade_history(paths, since=since)
 
     # Calculate metrics
     portfolio_value = calculate_portfolio_value(positions)
@@ -628,6 +663,8 @@ if __name__ == "__main__":
     parser.add_argument("--export-html", action="store_true", help="Export HTML report to reports/")
     parser.add_argument("--slack", action="store_true", help="Send summary to Slack")
     parser.add_argument("--limit", type=int, default=None, help="Limit closed trades considered (most recent N)")
+    parser.add_argument("--since", default=None, help="Only include trades on or after this date (YYYY-MM-DD)")
     args = parser.parse_args()
 
-    display_dashboard(export_csv=args.export_csv, export_html=args.export_html, slack=args.slack, limit=args.limit)
+    display_dashboard(export_csv=args.export_csv, export_html=args.export_html, slack=args.slack, limit=args.limit,
+                      since=args.since)
@@ -29,7 +29,7 @@ Usage:
 
 import os
 import logging
-from typing import Dict, Optional, Literal
+from typing import Dict, List, Optional, Literal
 from datetime import datetime, timedelta
 import pandas as pd
 import hashlib
@@ -46,6 +46,25 @@ load_dotenv()
 logger = logging.getLogger(__name__)
 
 
+def get_url_override() -> Optional[str]:
+    """REST base URL override (e.g. a local stand-in), from ALPACA_URL_OVERRIDE.
+
+    When set, every Alpaca REST client (trading and market data) is pointed
+    at this URL instead of the paper/live endpoints.
+    """
+    return os.getenv("ALPACA_URL_OVERRIDE") or None
+
+
+def get_stream_url_override() -> Optional[str]:
+    """trade_updates websocket URL override, from ALPACA_STREAM_URL_OVERRIDE."""
+    return os.getenv("ALPACA_STREAM_URL_OVERRIDE") or None
+
+
+def get_data_stream_url_override() -> Optional[str]:
+    """Stock/option quote websocket URL override, from ALPACA_DATA_STREAM_URL_OVERRIDE."""
+    return os.getenv("ALPACA_DATA_STREAM_URL_OVERRIDE") or None
+
+
 class AlpacaClient:
     """
     Alpaca API client for real-time market data and options information.
@@ -102,7 +121,9 @@ class AlpacaClient:
         if self._data_client is None:
             try:
                 self._data_client = StockHistoricalDataClient(
-                    api_key=self.api_key, secret_key=self.secret_key
+                    api_key=self.api_key,
+                    secret_key=self.secret_key,
+                    url_override=get_url_override(),
                 )
             except Exception as e:
                 logger.error(f"[ALPACA] Failed to initialize data client: {e}")
@@ -121,6 +142,7 @@ class AlpacaClient:
                     api_key=self.api_key,
                     secret_key=self.secret_key,
                     paper=self.is_paper,
+                    url_override=get_url_override(),
                 )
                 # Test connection only once and only when trading client is actually used
                 if not self._connection_tested:
@@ -174,6 +196,38 @@ class AlpacaClient:
 
         return None
 
+    def get_current_prices(self, symbols: List[str]) -> Dict[str, float]:
+        """
+        Get real-time mid prices for several symbols in one quote request.
+
+        Args:
+            symbols: Stock symbols (duplicates are ignored)
+
+        Returns:
+            Dict of symbol -> mid price; symbols without a quote are omitted
+        """
+        if not self.enabled or not symbols:
+            return {}
+
+        unique = list(dict.fromkeys(symbols))
+        prices: Dict[str, float] = {}
+        try:
+            request = StockLatestQuoteRequest(symbol_or_symbols=unique)
+            quotes = self.data_client.get_stock_latest_quote(request)
+
+            for symbol in unique:
+                quote = quotes.get(symbol)
+                if quote is None:
+                    continue
+                # Use mid-price (average of bid and ask)
+                prices[symbol] = float((quote.bid_price + quote.ask_price) / 2)
+
+            logger.debug(f"[ALPACA] Batch quote: {len(prices)}/{len(unique)} symbols priced")
+        except Exception as e:
+            logger.error(f"[ALPACA] Failed to get batch prices for {unique}: {e}")
+
+        return prices
+
     def get_market_data(
         self, symbol: str, period: str = "1d"
     ) -> Optional[pd.DataFrame]:
@@ -8,7 +8,7 @@ for the Robinhood HA Breakout trading system using Alpaca-py SDK.
 Key Features:
 - ATM contract selection with liquidity filters
 - Time-based expiry selection (0DTE vs weekly)
-- Market order placement with fill polling
+- Market order placement with stream-driven fill confirmation (polling fallback)
 - Risk sizing with 100x options multiplier
 - Paper/live environment safety interlocks
 - Comprehensive error handling and timeouts
@@ -25,7 +25,7 @@ Order Workflow:
 2. Contract selection per liquidity rules
 3. Manual approval via TradeConfirmationManager
 4. Market order placement (fallback to limit if rejected)
-5. Fill polling every 2s up to 90s timeout
+5. Fill confirmation via trade_updates stream, polling every 2s as fallback (90s timeout)
 6. Trade recording with actual fill price and quantity
 
 Safety Features:
@@ -273,44 +273,24 @@ except ImportError as e:
 
 logger = logging.getLogger(__name__)
 
-# Fail-closed cooldown tracking
+# Fail-closed cooldown tracking (shared in-memory registry, persisted write-behind)
 COOLDOWN_FILE = ".cache/alpaca_api_cooldowns.json"
 COOLDOWN_DURATION_MINUTES = 30
+API_COOLDOWN_NAMESPACE = "api"
+EXPIRY_COOLDOWN_NAMESPACE = "expiry"
 
-def _load_cooldowns():
-    """Load API cooldown state from cache file."""
-    if os.path.exists(COOLDOWN_FILE):
-        try:
-            with open(COOLDOWN_FILE, 'r') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError):
-            pass
-    return {}
-
-def _save_cooldowns(cooldowns):
-    """Save API cooldown state to cache file."""
-    os.makedirs(os.path.dirname(COOLDOWN_FILE), exist_ok=True)
-    try:
-        with open(COOLDOWN_FILE, 'w') as f:
-            json.dump(cooldowns, f)
-    except IOError:
-        pass
+def _cooldowns():
+    """Shared cooldown registry for API-error and expiry cooldowns."""
+    from .cooldown_registry import get_cooldown_registry
+    return get_cooldown_registry(COOLDOWN_FILE)
 
 def _is_symbol_in_cooldown(symbol):
     """Check if symbol is in API error cooldown."""
-    cooldowns = _load_cooldowns()
-    if symbol not in cooldowns:
-        return False
-    
-    cooldown_until = datetime.fromisoformat(cooldowns[symbol])
-    return datetime.now() < cooldown_until
+    return _cooldowns().is_active(API_COOLDOWN_NAMESPACE, symbol)
 
 def _add_symbol_to_cooldown(symbol):
     """Add symbol to API error cooldown."""
-    cooldowns = _load_cooldowns()
-    cooldown_until = datetime.now() + timedelta(minutes=COOLDOWN_DURATION_MINUTES)
-    cooldowns[symbol] = cooldown_until.isoformat()
-    _save_cooldowns(cooldowns)
+    cooldown_until = _cooldowns().add(API_COOLDOWN_NAMESPACE, symbol, COOLDOWN_DURATION_MINUTES * 60)
     logger.warning(f"Added {symbol} to API cooldown until {cooldown_until.strftime('%H:%M:%S')}")
 
 
@@ -371,7 +351,7 @@ class AlpacaOptionsTrader:
         from datetime import datetime, timedelta
         
         self.paper = paper
-        self.expiry_cooldowns = {}  # Track symbols with expiry failures
+        self.order_events = None  # Optional OrderEventStream for push-based fill confirmation
         
         # Get API credentials from environment
         api_key = os.getenv("ALPACA_API_KEY")
@@ -381,30 +361,21 @@ class AlpacaOptionsTrader:
             raise ValueError("Alpaca API credentials not found in environment variables")
         
         # Initialize clients
-        self.client = TradingClient(api_key, secret_key, paper=paper)
-        self.data_client = OptionHistoricalDataClient(api_key, secret_key)
+        from .alpaca_client import get_url_override
+        url_override = get_url_override()
+        self.client = TradingClient(api_key, secret_key, paper=paper, url_override=url_override)
+        self.data_client = OptionHistoricalDataClient(api_key, secret_key, url_override=url_override)
         
         logger.info(f"Initialized AlpacaOptionsTrader (paper={paper})")
     
     def _add_expiry_cooldown(self, symbol: str, minutes: int = 60):
         """Add symbol to expiry cooldown to prevent repeated failures."""
-        from datetime import datetime, timedelta
-        cooldown_until = datetime.now() + timedelta(minutes=minutes)
-        self.expiry_cooldowns[symbol] = cooldown_until
+        cooldown_until = _cooldowns().add(EXPIRY_COOLDOWN_NAMESPACE, symbol, minutes * 60)
         logger.info(f"Added {minutes}min expiry cooldown for {symbol} until {cooldown_until.strftime('%H:%M:%S')}")
     
     def _is_expiry_cooldown_active(self, symbol: str) -> bool:
         """Check if symbol is in expiry cooldown."""
-        from datetime import datetime
-        if symbol not in self.expiry_cooldowns:
-            return False
-        
-        if datetime.now() >= self.expiry_cooldowns[symbol]:
-            # Cooldown expired, remove it
-            del self.expiry_cooldowns[symbol]
-            return False
-        
-        return True
+        return _cooldowns().is_active(EXPIRY_COOLDOWN_NAMESPACE, symbol)
     
     def _infer_strike_scale(self, underlying: float, strikes: list) -> float:
         """
@@ -569,8 +540,9 @@ class AlpacaOptionsTrader:
         
         try:
             # Check if symbol is in expiry cooldown
-            if self._is_expiry_cooldown_active(symbol):
-                logger.info(f"Skipping {symbol} - expiry cooldown active until {self.expiry_cooldowns[symbol].strftime('%H:%M:%S')}")
+            cooldown_until = _cooldowns().expires_at(EXPIRY_COOLDOWN_NAMESPACE, symbol)
+            if cooldown_until:
+                logger.info(f"Skipping {symbol} - expiry cooldown active until {cooldown_until.strftime('%H:%M:%S')}")
                 return None
                 
             logger.info(f"Finding {side} contract for {symbol}: {get_filter_summary(symbol)}")
@@ -660,7 +632,7 @@ class AlpacaOptionsTrader:
                 underlying_symbols=[symbol],  # Try underlying_symbols parameter instead of symbol
                 status="active",
                 expiration_date=expiry_date,
-                exercise_style=ExerciseStyle.AMERICAN
+                style=ExerciseStyle.AMERICAN
             )
             logger.debug(f"Quote sanity check API request: symbol='{symbol}', expiry='{expiry_date}'")
             contracts = self.client.get_option_contracts(request)
@@ -867,8 +839,8 @@ class AlpacaOptionsTrader:
                 underlying_symbols=[symbol],  # CRITICAL: Filter by underlying symbol using underlying_symbols parameter
                 status="active",
                 expiration_date=expiry_date,
-                contract_type=contract_type,
-                exercise_style=ExerciseStyle.AMERICAN
+                type=contract_type,
+                style=ExerciseStyle.AMERICAN
             )
             
             try:
@@ -1339,11 +1311,11 @@ class AlpacaOptionsTrader:
                 
                 # Quick check: try to get contracts for this expiry
                 request = GetOptionContractsRequest(
-                    symbol=symbol,
+                    underlying_symbols=[symbol],
                     status="active",
                     expiration_date=expiry_str,
-                    contract_type=contract_type,
-                    exercise_style=ExerciseStyle.AMERICAN
+                    type=contract_type,
+                    style=ExerciseStyle.AMERICAN
                 )
                 
                 try:
@@ -1429,11 +1401,11 @@ class AlpacaOptionsTrader:
                     contract_type = ContractType.CALL if side == 'CALL' else ContractType.PUT
                     
                     request = GetOptionContractsRequest(
-                        symbol=symbol,  # FIXED: Use 'symbol' parameter instead of 'underlying_symbols'
+                        underlying_symbols=[symbol],  # 'symbol'/'contract_type' are not request fields and were dropped
                         status="active",
                         expiration_date=fallback_expiry,
-                        contract_type=contract_type,
-                        exercise_style=ExerciseStyle.AMERICAN
+                        type=contract_type,
+                        style=ExerciseStyle.AMERICAN
                     )
                     
                     try:
@@ -1523,7 +1495,7 @@ class AlpacaOptionsTrader:
                     spread_pct = (spread / mid * 100) if mid > 0 else float('inf')
                     
                     # Apply filters
-                    if contract.open_interest < min_oi:
+                    if int(contract.open_interest or 0) < min_oi:
                         continue
                     if spread_pct > max_spread_pct:
                         continue
@@ -1591,6 +1563,7 @@ class AlpacaOptionsTrader:
         client_order_id: Optional[str] = None
     ) -> Optional[str]:
         """Place market order for option contract."""
+        from .recovery import retry_with_recovery
         
         def _submit_order():
             order_side = OrderSide.BUY if side == "BUY" else OrderSide.SELL
@@ -1689,7 +1662,11 @@ class AlpacaOptionsTrader:
         timeout_s: int = 90,
         interval_s: int = 2
     ) -> FillResult:
-        """Poll for order fill status with timeout.
+        """Wait for order fill status with timeout.
+        
+        Uses the trade_updates stream (self.order_events) when it is connected
+        and falls back to REST polling for the remaining time if the stream is
+        unavailable or drops while waiting.
         
         Args:
             order_id: Alpaca order ID
@@ -1711,6 +1688,17 @@ class AlpacaOptionsTrader:
                 client_order_id=client_order_id
             )
         
+        if self.order_events is not None and self.order_events.is_connected:
+            stream_start = time.time()
+            logger.info(f"[ORDER-EVENTS] Waiting for fill via trade updates stream (timeout: {timeout_s}s)")
+            result = self.order_events.wait_for_fill(
+                order_id=order_id, client_order_id=client_order_id, timeout_s=timeout_s
+            )
+            if result is not None:
+                return result
+            timeout_s = max(0, timeout_s - (time.time() - stream_start))
+            logger.warning(f"[ORDER-EVENTS] Falling back to polling for remaining {timeout_s:.0f}s")
+        
         start_time = time.time()
         total_filled_qty = 0
         total_filled_value = 0.0
@@ -1813,6 +1801,72 @@ class AlpacaOptionsTrader:
             logger.error(f"Error cancelling order {order_id}: {e}")
             return False
 
+    def cancel_and_get_fill(
+        self,
+        order_id: str,
+        last_result: Optional[FillResult] = None,
+        timeout_s: float = 10.0,
+        interval_s: float = 0.5,
+    ) -> FillResult:
+        """Cancel the unfilled remainder of an order and return its final fill.
+
+        Used when poll_fill() ends without a complete fill, so no part of the
+        order is left working (a late fill would spend capital that has
+        already been released). The order is re-read until it reaches a
+        terminal state or timeout_s passes.
+
+        Args:
+            order_id: Alpaca order ID
+            last_result: Last known fill, used if the order cannot be re-read
+            timeout_s: Seconds to wait for the cancel to settle
+            interval_s: Re-read interval in seconds
+
+        Returns:
+            FillResult with the order's final filled quantity
+        """
+        self.cancel_order(order_id)
+
+        terminal = (OrderStatus.FILLED, OrderStatus.CANCELED, OrderStatus.REJECTED, OrderStatus.EXPIRED)
+        deadline = time.time() + timeout_s
+        order = None
+        while True:
+            try:
+                order = self.client.get_order_by_id(order_id)
+                if order.status in terminal:
+                    break
+            except Exception as e:
+                logger.error(f"Error reading order {order_id} after cancel: {e}")
+            if time.time() >= deadline:
+                break
+            time.sleep(interval_s)
+
+        if order is None:
+            logger.error(f"Final fill for order {order_id} unknown - using last known fill")
+            return last_result or FillResult(
+                status="UNKNOWN", filled_qty=0, avg_price=0.0, total_filled_qty=0, remaining_qty=0, order_id=order_id
+            )
+        if order.status not in terminal:
+            logger.warning(f"Order {order_id} still {order.status} after cancel - using current fill")
+
+        filled_qty = int(order.filled_qty) if order.filled_qty else 0
+        avg_price = float(order.filled_avg_price) if filled_qty > 0 and order.filled_avg_price else 0.0
+        if order.status == OrderStatus.FILLED:
+            status = "FILLED"
+        elif filled_qty > 0:
+            status = "PARTIAL"
+        else:
+            status = getattr(order.status, "value", str(order.status)).upper()
+        logger.info(f"Order {order_id} final: {status}, filled {filled_qty}/{order.qty} @ ${avg_price:.2f}")
+        return FillResult(
+            status=status,
+            filled_qty=filled_qty,
+            avg_price=avg_price,
+            total_filled_qty=filled_qty,
+            remaining_qty=0,
+            order_id=order_id,
+            client_order_id=getattr(order, "client_order_id", None),
+        )
+
     def close_position(self, contract_symbol: str, qty: int) -> Optional[str]:
         """Close an option position.
         
@@ -1907,10 +1961,21 @@ def create_alpaca_trader(paper: bool = True) -> Optional[AlpacaOptionsTrader]:
         return None
     
     try:
-        return AlpacaOptionsTrader(paper=paper)
+        trader = AlpacaOptionsTrader(paper=paper)
     except Exception as e:
         logger.error(f"Error creating Alpaca trader: {e}")
         return None
+    
+    # Attach the shared trade_updates stream for event-driven fill confirmation
+    try:
+        config = load_config()
+        if config.get("ALPACA_ORDER_EVENTS_ENABLED", False):
+            from .order_events import get_order_event_stream
+            trader.order_events = get_order_event_stream(paper=paper)
+    except Exception as e:
+        logger.warning(f"[ORDER-EVENTS] Stream unavailable, using fill polling: {e}")
+    
+    return trader
 
 
 if __name__ == "__main__":
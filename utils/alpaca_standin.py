@@ -0,0 +1,1200 @@
+#!/usr/bin/env python3
+"""
+Local Alpaca Stand-in Server
+
+Offline stand-in for the parts of the Alpaca API used by the execution stack,
+so order flow can be exercised in tests and load tests without the paper
+environment (no rate limits, faster than real time).
+
+Implements:
+- REST: account, positions, orders (submit/get/list/cancel), option
+  contracts, clock, stock latest quotes, stock bars, option latest quotes
+- trade_updates websocket stream (same authenticate/listen handshake that
+  alpaca-py's TradingStream speaks)
+- Simulated fills at the current ask/bid, published on the stream
+- Configurable latency/jitter and injected 429 responses
+- Seeding from recorded JSON fixtures plus synthetic option chains
+- Stock/option quote streams (msgpack protocol) with recorded tick replay
+
+Usage:
+    from utils.alpaca_standin import AlpacaStandin
+
+    with AlpacaStandin.from_fixture("tests/fixtures/alpaca_standin.json") as standin:
+        client = TradingClient("key", "secret", url_override=standin.url)
+        ...
+
+    # Or point the whole system at a standalone instance:
+    python -m utils.alpaca_standin --port 8765 --latency-ms 40
+    export ALPACA_URL_OVERRIDE=http://127.0.0.1:8765
+    export ALPACA_STREAM_URL_OVERRIDE=ws://127.0.0.1:8766/stream
+
+The TradeUpdatesStandin class can also be used on its own when only the
+stream is needed.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from datetime import date, datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Set, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import msgpack
+import websockets
+
+logger = logging.getLogger(__name__)
+
+# Order status reported for each trade_updates event type
+EVENT_ORDER_STATUS = {
+    "new": "new",
+    "accepted": "accepted",
+    "partial_fill": "partially_filled",
+    "fill": "filled",
+    "canceled": "canceled",
+    "expired": "expired",
+    "rejected": "rejected",
+    "done_for_day": "done_for_day",
+    "replaced": "replaced",
+}
+
+
+def make_order(
+    order_id: Optional[str] = None,
+    symbol: str = "SPY250117C00450000",
+    qty: int = 1,
+    filled_qty: int = 0,
+    filled_avg_price: Optional[float] = None,
+    side: str = "buy",
+    status: str = "new",
+    client_order_id: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Build an order payload shaped like Alpaca's REST/stream order object."""
+    now = datetime.now(timezone.utc).isoformat()
+    return {
+        "id": order_id or str(uuid.uuid4()),
+        "client_order_id": client_order_id or str(uuid.uuid4()),
+        "created_at": now,
+        "updated_at": now,
+        "submitted_at": now,
+        "filled_at": now if filled_qty and filled_qty >= qty else None,
+        "symbol": symbol,
+        "asset_class": "us_option",
+        "qty": str(qty),
+        "filled_qty": str(filled_qty),
+        "filled_avg_price": None if filled_avg_price is None else str(filled_avg_price),
+        "order_class": "simple",
+        "order_type": "market",
+        "type": "market",
+        "side": side,
+        "time_in_force": "day",
+        "status": status,
+        "extended_hours": False,
+    }
+
+
+class TradeUpdatesStandin:
+    """Local websocket server emulating Alpaca's trade_updates stream."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, require_auth: bool = True):
+        """Initialize the stand-in (call start() or use as a context manager).
+
+        Args:
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+            require_auth: Reject clients that send empty credentials
+        """
+        self.host = host
+        self.port = port
+        self.require_auth = require_auth
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._server = None
+        self._ready = threading.Event()
+        self._stop_event: Optional[asyncio.Event] = None
+        self._listeners: Set[Any] = set()
+        self._listening = threading.Condition()
+
+        self.connections_total = 0
+        self.events_published = 0
+
+    @property
+    def url(self) -> str:
+        """Websocket URL to pass as TradingStream url_override."""
+        return f"ws://{self.host}:{self.port}/stream"
+
+    @property
+    def listener_count(self) -> int:
+        """Number of clients currently subscribed to trade_updates."""
+        return len(self._listeners)
+
+    def start(self, timeout: float = 5.0) -> "TradeUpdatesStandin":
+        """Start the server on a background thread."""
+        self._thread = threading.Thread(target=self._run, name="alpaca-standin-stream", daemon=True)
+        self._thread.start()
+        if not self._ready.wait(timeout):
+            raise RuntimeError("Trade updates stand-in failed to start")
+        logger.info(f"[STANDIN] Trade updates stream listening on {self.url}")
+        return self
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the server and disconnect all clients."""
+        if self._loop is None or self._stop_event is None:
+            return
+        self._loop.call_soon_threadsafe(self._stop_event.set)
+        if self._thread:
+            self._thread.join(timeout)
+        logger.info("[STANDIN] Trade updates stream stopped")
+
+    def __enter__(self) -> "TradeUpdatesStandin":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def wait_for_listeners(self, count: int = 1, timeout: float = 5.0) -> bool:
+        """Block until at least `count` clients have subscribed to trade_updates."""
+        with self._listening:
+            return self._listening.wait_for(lambda: len(self._listeners) >= count, timeout)
+
+    def publish_order_update(self, event: str, order: Dict[str, Any], **extra: Any) -> None:
+        """Broadcast a trade_updates event for an order to all listeners.
+
+        Args:
+            event: Trade update event ('new', 'partial_fill', 'fill', 'canceled', ...)
+            order: Order payload (see make_order)
+            **extra: Additional event fields (price, qty, position_qty, ...)
+        """
+        order = dict(order)
+        order["status"] = EVENT_ORDER_STATUS.get(event, order.get("status", event))
+        data = {
+            "event": event,
+            "execution_id": str(uuid.uuid4()),
+            "order": order,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+        }
+        if event in ("fill", "partial_fill"):
+            data.setdefault("price", order.get("filled_avg_price"))
+            data.setdefault("qty", order.get("filled_qty"))
+        data.update(extra)
+        self._call(self._broadcast({"stream": "trade_updates", "data": data}))
+        self.events_published += 1
+
+    def drop_connections(self) -> None:
+        """Close every client connection (simulates a stream outage)."""
+        self._call(self._close_all())
+
+    def _call(self, coro) -> None:
+        if self._loop is None:
+            raise RuntimeError("Stand-in not started")
+        asyncio.run_coroutine_threadsafe(coro, self._loop).result(timeout=5)
+
+    def _run(self) -> None:
+        asyncio.run(self._serve())
+
+    async def _serve(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._stop_event = asyncio.Event()
+        async with websockets.serve(self._handle, self.host, self.port) as server:
+            self._server = server
+            self.port = next(iter(server.sockets)).getsockname()[1]
+            self._ready.set()
+            await self._stop_event.wait()
+            await self._close_all()
+
+    async def _handle(self, ws, *_args) -> None:
+        self.connections_total += 1
+        try:
+            auth = json.loads(await ws.recv())
+            creds = auth.get("data") or {}
+            authorized = auth.get("action") in ("auth", "authenticate") and (
+                not self.require_auth or (creds.get("key_id") and creds.get("secret_key"))
+            )
+            await ws.send(json.dumps({
+                "stream": "authorization",
+                "data": {
+                    "status": "authorized" if authorized else "unauthorized",
+                    "action": "authenticate",
+                },
+            }))
+            if not authorized:
+                return
+
+            async for raw in ws:
+                msg = json.loads(raw)
+                if msg.get("action") != "listen":
+                    continue
+                streams = (msg.get("data") or {}).get("streams", [])
+                await ws.send(json.dumps({"stream": "listening", "data": {"streams": streams}}))
+                with self._listening:
+                    if "trade_updates" in streams:
+                        self._listeners.add(ws)
+                    else:
+                        self._listeners.discard(ws)
+                    self._listening.notify_all()
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            with self._listening:
+                self._listeners.discard(ws)
+
+    async def _broadcast(self, message: Dict[str, Any]) -> None:
+        payload = json.dumps(message)
+        for ws in list(self._listeners):
+            try:
+                await ws.send(payload)
+            except websockets.ConnectionClosed:
+                self._listeners.discard(ws)
+
+    async def _close_all(self) -> None:
+        for ws in list(self._listeners):
+            try:
+                await ws.close()
+            except Exception:
+                pass
+        with self._listening:
+            self._listeners.clear()
+
+
+class MarketDataStandin:
+    """Local websocket server emulating Alpaca's stock/option quote streams.
+
+    Speaks the msgpack protocol used by alpaca-py's StockDataStream and
+    OptionDataStream (connected/auth handshake, subscribe/unsubscribe), so one
+    instance can stand in for both. Quotes are published on demand or
+    replayed from a recorded tick file.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        """Initialize the stand-in (call start() or use as a context manager).
+
+        Args:
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+        """
+        self.host = host
+        self.port = port
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+        self._stop_event: Optional[asyncio.Event] = None
+        # connection -> quote symbols it is subscribed to
+        self._subscriptions: Dict[Any, Set[str]] = {}
+        self._changed = threading.Condition()
+
+        self.connections_total = 0
+        self.quotes_published = 0
+
+    @property
+    def url(self) -> str:
+        """Websocket URL to pass as StockDataStream/OptionDataStream url_override."""
+        return f"ws://{self.host}:{self.port}/marketdata"
+
+    @property
+    def subscribed_symbols(self) -> Set[str]:
+        """Union of quote symbols subscribed by all clients."""
+        with self._changed:
+            return set().union(*self._subscriptions.values()) if self._subscriptions else set()
+
+    def start(self, timeout: float = 5.0) -> "MarketDataStandin":
+        """Start the server on a background thread."""
+        self._thread = threading.Thread(target=self._run, name="alpaca-standin-marketdata", daemon=True)
+        self._thread.start()
+        if not self._ready.wait(timeout):
+            raise RuntimeError("Market data stand-in failed to start")
+        logger.info(f"[STANDIN] Market data stream listening on {self.url}")
+        return self
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the server and disconnect all clients."""
+        if self._loop is None or self._stop_event is None:
+            return
+        self._loop.call_soon_threadsafe(self._stop_event.set)
+        if self._thread:
+            self._thread.join(timeout)
+        logger.info("[STANDIN] Market data stream stopped")
+
+    def __enter__(self) -> "MarketDataStandin":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def wait_for_subscription(self, symbols: Any, timeout: float = 5.0, subscribed: bool = True) -> bool:
+        """Block until every symbol is subscribed (or, with subscribed=False, unsubscribed)."""
+        wanted = {symbols} if isinstance(symbols, str) else set(symbols)
+
+        def _done() -> bool:
+            current = set().union(*self._subscriptions.values()) if self._subscriptions else set()
+            return wanted <= current if subscribed else not (wanted & current)
+
+        with self._changed:
+            return self._changed.wait_for(_done, timeout)
+
+    def publish_quote(self, symbol: str, bid: float, ask: float, bid_size: int = 10, ask_size: int = 10) -> int:
+        """Send a quote to every client subscribed to the symbol.
+
+        Returns:
+            Number of clients the quote was delivered to
+        """
+        message = {
+            "T": "q",
+            "S": symbol,
+            "bp": float(bid),
+            "bs": bid_size,
+            "ap": float(ask),
+            "as": ask_size,
+            "bx": "C",
+            "ax": "C",
+            "c": "R",
+            "t": msgpack.Timestamp.from_datetime(datetime.now(timezone.utc)),
+        }
+        if self._loop is None:
+            raise RuntimeError("Stand-in not started")
+        delivered = asyncio.run_coroutine_threadsafe(self._send_quote(message), self._loop).result(timeout=5)
+        self.quotes_published += 1
+        return delivered
+
+    def replay(self, ticks: Any, speed: float = 1.0) -> int:
+        """Replay recorded ticks, preserving their spacing (scaled by speed).
+
+        Args:
+            ticks: Path to a JSON/CSV tick file, or an iterable of dicts with
+                t (seconds from start), symbol, bid, ask
+            speed: Playback speed multiplier (0 sends as fast as possible)
+
+        Returns:
+            Number of ticks sent
+        """
+        if isinstance(ticks, str):
+            ticks = load_ticks(ticks)
+        start = time.monotonic()
+        sent = 0
+        for tick in ticks:
+            if speed > 0:
+                delay = float(tick["t"]) / speed - (time.monotonic() - start)
+                if delay > 0:
+                    time.sleep(delay)
+            self.publish_quote(tick["symbol"], tick["bid"], tick["ask"])
+            sent += 1
+        return sent
+
+    def _run(self) -> None:
+        asyncio.run(self._serve())
+
+    async def _serve(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._stop_event = asyncio.Event()
+        async with websockets.serve(self._handle, self.host, self.port) as server:
+            self.port = next(iter(server.sockets)).getsockname()[1]
+            self._ready.set()
+            await self._stop_event.wait()
+            for ws in list(self._subscriptions):
+                await ws.close()
+
+    async def _handle(self, ws, *_args) -> None:
+        self.connections_total += 1
+        try:
+            await ws.send(msgpack.packb([{"T": "success", "msg": "connected"}]))
+            auth = msgpack.unpackb(await ws.recv())
+            if auth.get("action") != "auth" or not (auth.get("key") and auth.get("secret")):
+                await ws.send(msgpack.packb([{"T": "error", "code": 402, "msg": "auth failed"}]))
+                return
+            await ws.send(msgpack.packb([{"T": "success", "msg": "authenticated"}]))
+            with self._changed:
+                self._subscriptions[ws] = set()
+
+            buffer = b""
+            async for raw in ws:
+                # alpaca-py fragments large subscribe messages across frames
+                buffer += raw if isinstance(raw, bytes) else raw.encode()
+                try:
+                    msg = msgpack.unpackb(buffer)
+                except (msgpack.ExtraData, ValueError):
+                    continue
+                buffer = b""
+                quotes = msg.get("quotes", [])
+                with self._changed:
+                    if msg.get("action") == "subscribe":
+                        self._subscriptions[ws].update(quotes)
+                    elif msg.get("action") == "unsubscribe":
+                        self._subscriptions[ws].difference_update(quotes)
+                    current = sorted(self._subscriptions[ws])
+                    self._changed.notify_all()
+                await ws.send(msgpack.packb([
+                    {"T": "subscription", "trades": [], "quotes": current, "bars": []}
+                ]))
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            with self._changed:
+                self._subscriptions.pop(ws, None)
+                self._changed.notify_all()
+
+    async def _send_quote(self, message: Dict[str, Any]) -> int:
+        payload = msgpack.packb([message])
+        delivered = 0
+        for ws, symbols in list(self._subscriptions.items()):
+            if message["S"] not in symbols:
+                continue
+            try:
+                await ws.send(payload)
+                delivered += 1
+            except websockets.ConnectionClosed:
+                pass
+        return delivered
+
+
+def load_ticks(path: str) -> List[Dict[str, Any]]:
+    """Load recorded ticks from JSON (list of dicts) or CSV (t,symbol,bid,ask)."""
+    with open(path, "r", encoding="utf-8") as f:
+        if path.endswith(".json"):
+            rows = json.load(f)
+        else:
+            import csv
+            rows = list(csv.DictReader(f))
+    ticks = [
+        {"t": float(r["t"]), "symbol": r["symbol"], "bid": float(r["bid"]), "ask": float(r["ask"])}
+        for r in rows
+    ]
+    return sorted(ticks, key=lambda tick: tick["t"])
+
+
+# Bar timeframe strings used by alpaca-py -> bar spacing
+_TIMEFRAME_UNITS = {"Min": 60, "Hour": 3600, "Day": 86400, "Week": 604800}
+
+
+def _iso(dt: datetime) -> str:
+    return dt.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+def _parse_time(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _timeframe_seconds(timeframe: str) -> int:
+    for unit, seconds in _TIMEFRAME_UNITS.items():
+        if timeframe.endswith(unit):
+            amount = timeframe[: -len(unit)] or "1"
+            return int(amount) * seconds
+    return 60
+
+
+def occ_symbol(root: str, expiry: date, option_type: str, strike: float) -> str:
+    """Build an OCC option symbol (ROOT + YYMMDD + C/P + 8-digit strike)."""
+    return f"{root}{expiry.strftime('%y%m%d')}{option_type[0].upper()}{int(round(strike * 1000)):08d}"
+
+
+def upcoming_expiries(trading_days: int = 5, weeks: int = 3, today: Optional[date] = None) -> List[date]:
+    """Daily expiries for the next `trading_days` weekdays (from today) plus `weeks` Fridays."""
+    today = today or date.today()
+    expiries: List[date] = []
+    day = today
+    while len(expiries) < trading_days:
+        if day.weekday() < 5:
+            expiries.append(day)
+        day += timedelta(days=1)
+    friday = today + timedelta(days=(4 - today.weekday()) % 7)
+    for _ in range(weeks):
+        if friday not in expiries:
+            expiries.append(friday)
+        friday += timedelta(days=7)
+    return sorted(expiries)
+
+
+class AlpacaStandin:
+    """Local REST + trade_updates stand-in for the Alpaca API."""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        rate_limit_every: int = 0,
+        fill_delay_s: float = 0.05,
+        auto_fill: bool = True,
+        market_open: bool = True,
+        starting_cash: float = 100000.0,
+        seed: int = 7,
+    ):
+        """Initialize the stand-in (call start() or use as a context manager).
+
+        Args:
+            host: Interface to bind
+            port: REST port (0 picks a free port); the stream uses its own port
+            latency_ms: Added latency per REST request
+            jitter_ms: Uniform random jitter added on top of latency_ms
+            rate_limit_every: Answer every Nth request with HTTP 429 (0 disables)
+            fill_delay_s: Delay before submitted orders are filled
+            auto_fill: Fill orders automatically (False leaves them open)
+            market_open: Value reported by /v2/clock
+            starting_cash: Account cash
+            seed: Random seed for synthetic quotes and bars
+        """
+        self.host = host
+        self.port = port
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.rate_limit_every = rate_limit_every
+        self.fill_delay_s = fill_delay_s
+        self.auto_fill = auto_fill
+        self.market_open = market_open
+
+        self._lock = threading.RLock()
+        self._random = random.Random(seed)
+        self._seed = seed
+        self._forced_errors: List[int] = []
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+        self.account: Dict[str, Any] = {
+            "id": str(uuid.uuid4()),
+            "account_number": "PA0STANDIN",
+            "status": "ACTIVE",
+            "currency": "USD",
+            "cash": str(starting_cash),
+            "buying_power": str(starting_cash),
+            "options_buying_power": str(starting_cash),
+            "equity": str(starting_cash),
+            "last_equity": str(starting_cash),
+            "portfolio_value": str(starting_cash),
+            "pattern_day_trader": False,
+            "trading_blocked": False,
+            "transfers_blocked": False,
+            "account_blocked": False,
+            "shorting_enabled": False,
+            "options_approved_level": 2,
+            "options_trading_level": 2,
+        }
+        self.stock_prices: Dict[str, float] = {}
+        self.contracts: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._contracts_by_underlying: Dict[str, List[str]] = {}
+        self.option_quotes: Dict[str, Tuple[float, float]] = {}
+        self.orders: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.positions: Dict[str, Dict[str, Any]] = {}
+
+        self.stream = TradeUpdatesStandin(host=host)
+        self.request_counts: Counter = Counter()
+        self.requests_total = 0
+        self.rate_limited_total = 0
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    @property
+    def url(self) -> str:
+        """REST base URL to pass as url_override / ALPACA_URL_OVERRIDE."""
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def stream_url(self) -> str:
+        """trade_updates websocket URL (ALPACA_STREAM_URL_OVERRIDE)."""
+        return self.stream.url
+
+    def start(self) -> "AlpacaStandin":
+        """Start REST and stream servers on background threads."""
+        self.stream.start()
+        handler = type("_Handler", (_StandinRequestHandler,), {"standin": self})
+        self._server = ThreadingHTTPServer((self.host, self.port), handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="alpaca-standin-rest", daemon=True
+        )
+        self._thread.start()
+        logger.info(f"[STANDIN] Alpaca REST stand-in listening on {self.url}")
+        return self
+
+    def stop(self) -> None:
+        """Stop both servers."""
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        self.stream.stop()
+        logger.info("[STANDIN] Alpaca REST stand-in stopped")
+
+    def __enter__(self) -> "AlpacaStandin":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    # ------------------------------------------------------------------
+    # Seeding
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def from_fixture(cls, path: str, **kwargs: Any) -> "AlpacaStandin":
+        """Create a stand-in seeded from a recorded JSON fixture file."""
+        standin = cls(**kwargs)
+        standin.load_fixture(path)
+        return standin
+
+    def load_fixture(self, path_or_data: Any) -> None:
+        """Seed state from a fixture file path or an already-parsed dict.
+
+        Recognized keys: account (merged), stocks ({symbol: price}),
+        option_chains ({symbol: {strikes_each_side, strike_step, expiries}}),
+        contracts (recorded option contract payloads), option_quotes
+        ({occ: [bid, ask]}), positions (recorded position payloads),
+        market_open.
+        """
+        if isinstance(path_or_data, dict):
+            data = path_or_data
+        else:
+            with open(path_or_data, "r", encoding="utf-8") as f:
+                data = json.load(f)
+
+        with self._lock:
+            self.account.update(data.get("account", {}))
+            if "market_open" in data:
+                self.market_open = bool(data["market_open"])
+            for symbol, price in data.get("stocks", {}).items():
+                self.stock_prices[symbol] = float(price)
+            for contract in data.get("contracts", []):
+                self._add_contract(dict(contract))
+            for occ, (bid, ask) in data.get("option_quotes", {}).items():
+                self.option_quotes[occ] = (float(bid), float(ask))
+            for position in data.get("positions", []):
+                self.positions[position["symbol"]] = dict(position)
+
+        for symbol, chain in data.get("option_chains", {}).items():
+            self.add_option_chain(symbol, **chain)
+
+    def add_symbol(self, symbol: str, price: float, option_chain: bool = True, **chain: Any) -> None:
+        """Add an underlying with a price and (optionally) a synthetic option chain."""
+        with self._lock:
+            self.stock_prices[symbol] = float(price)
+        if option_chain:
+            self.add_option_chain(symbol, **chain)
+
+    def add_option_chain(
+        self,
+        symbol: str,
+        strikes_each_side: int = 5,
+        strike_step: Optional[float] = None,
+        expiries: Optional[List[str]] = None,
+        open_interest: int = 25000,
+    ) -> int:
+        """Generate liquid call/put contracts and quotes around the current price.
+
+        Returns:
+            Number of contracts created
+        """
+        price = self.stock_prices[symbol]
+        step = strike_step or (1.0 if price < 200 else 5.0)
+        atm = round(price / step) * step
+        expiry_dates = (
+            [date.fromisoformat(e) for e in expiries] if expiries else upcoming_expiries()
+        )
+
+        created = 0
+        with self._lock:
+            for expiry in expiry_dates:
+                days = max((expiry - date.today()).days, 0)
+                for i in range(-strikes_each_side, strikes_each_side + 1):
+                    strike = round(atm + i * step, 2)
+                    if strike <= 0:
+                        continue
+                    for option_type in ("call", "put"):
+                        occ = occ_symbol(symbol, expiry, option_type, strike)
+                        self._add_contract({
+                            "id": str(uuid.uuid4()),
+                            "symbol": occ,
+                            "name": f"{symbol} {expiry.strftime('%b %d %Y')} {strike:g} {option_type.title()}",
+                            "status": "active",
+                            "tradable": True,
+                            "expiration_date": expiry.isoformat(),
+                            "root_symbol": symbol,
+                            "underlying_symbol": symbol,
+                            "underlying_asset_id": str(uuid.uuid5(uuid.NAMESPACE_DNS, symbol)),
+                            "type": option_type,
+                            "style": "american",
+                            "strike_price": str(strike),
+                            "size": "100",
+                            "open_interest": str(open_interest),
+                            "open_interest_date": date.today().isoformat(),
+                            "close_price": None,
+                        })
+                        intrinsic = max(price - strike, 0) if option_type == "call" else max(strike - price, 0)
+                        extrinsic = max(price * 0.004 * (1 + days) ** 0.5 - abs(price - strike) * 0.05, 0.05)
+                        mid = round(intrinsic + extrinsic, 2)
+                        spread = max(0.01, round(mid * 0.02, 2))
+                        self.option_quotes[occ] = (round(max(mid - spread / 2, 0.01), 2), round(mid + spread / 2, 2))
+                        created += 1
+        return created
+
+    def _add_contract(self, contract: Dict[str, Any]) -> None:
+        # Caller holds self._lock
+        occ = contract["symbol"]
+        if occ not in self.contracts:
+            self._contracts_by_underlying.setdefault(contract["underlying_symbol"], []).append(occ)
+        self.contracts[occ] = contract
+
+    def set_option_quote(self, occ: str, bid: float, ask: float) -> None:
+        """Set the latest quote for an option contract."""
+        with self._lock:
+            self.option_quotes[occ] = (float(bid), float(ask))
+
+    def set_stock_price(self, symbol: str, price: float) -> None:
+        """Set the latest price for an underlying."""
+        with self._lock:
+            self.stock_prices[symbol] = float(price)
+
+    def fail_next(self, count: int = 1, status: int = 429) -> None:
+        """Answer the next `count` REST requests with the given HTTP status."""
+        with self._lock:
+            self._forced_errors.extend([status] * count)
+
+    # ------------------------------------------------------------------
+    # Order simulation
+    # ------------------------------------------------------------------
+
+    def submit_order(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        """Accept an order (POST /v2/orders) and schedule its fill."""
+        symbol = body["symbol"]
+        qty = int(float(body.get("qty") or 0))
+        order = make_order(
+            symbol=symbol,
+            qty=qty,
+            side=body.get("side", "buy"),
+            status="accepted",
+            client_order_id=body.get("client_order_id"),
+        )
+        order["type"] = order["order_type"] = body.get("type", "market")
+        order["time_in_force"] = body.get("time_in_force", "day")
+        order["limit_price"] = body.get("limit_price")
+        order["asset_class"] = "us_option" if symbol in self.contracts else "us_equity"
+        with self._lock:
+            self.orders[order["id"]] = order
+        self.stream.publish_order_update("new", order)
+        if self.auto_fill:
+            timer = threading.Timer(self.fill_delay_s, self.fill_order, args=(order["id"],))
+            timer.daemon = True
+            timer.start()
+        return order
+
+    def fill_order(self, order_id: str, qty: Optional[int] = None, price: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Fill an open order (fully, or partially when qty < order qty)."""
+        with self._lock:
+            order = self.orders.get(order_id)
+            if not order or order["status"] in ("filled", "canceled", "rejected", "expired"):
+                return None
+            total_qty = int(order["qty"])
+            already = int(order["filled_qty"])
+            fill_qty = min(qty if qty is not None else total_qty - already, total_qty - already)
+            if fill_qty <= 0:
+                return None
+            fill_price = price if price is not None else self._execution_price(order)
+            prev_value = already * float(order["filled_avg_price"] or 0)
+            filled = already + fill_qty
+            order["filled_qty"] = str(filled)
+            order["filled_avg_price"] = str(round((prev_value + fill_qty * fill_price) / filled, 4))
+            now = datetime.now(timezone.utc).isoformat()
+            order["updated_at"] = now
+            complete = filled >= total_qty
+            order["status"] = "filled" if complete else "partially_filled"
+            if complete:
+                order["filled_at"] = now
+            self._apply_fill(order, fill_qty, fill_price)
+            snapshot = dict(order)
+
+        self.stream.publish_order_update(
+            "fill" if complete else "partial_fill", snapshot, price=str(fill_price), qty=str(fill_qty)
+        )
+        return snapshot
+
+    def cancel_order(self, order_id: str, event: str = "canceled") -> Optional[Dict[str, Any]]:
+        """Cancel (or reject/expire, via event) an open order."""
+        with self._lock:
+            order = self.orders.get(order_id)
+            if not order or order["status"] in ("filled", "canceled", "rejected", "expired"):
+                return None
+            order["status"] = EVENT_ORDER_STATUS.get(event, event)
+            order["updated_at"] = datetime.now(timezone.utc).isoformat()
+            snapshot = dict(order)
+        self.stream.publish_order_update(event, snapshot)
+        return snapshot
+
+    def _execution_price(self, order: Dict[str, Any]) -> float:
+        symbol = order["symbol"]
+        if symbol in self.option_quotes:
+            bid, ask = self.option_quotes[symbol]
+        else:
+            price = self.stock_prices.get(symbol, 100.0)
+            bid, ask = price - 0.01, price + 0.01
+        return ask if order["side"] == "buy" else bid
+
+    def _apply_fill(self, order: Dict[str, Any], qty: int, price: float) -> None:
+        # Caller holds self._lock
+        symbol = order["symbol"]
+        is_option = order["asset_class"] == "us_option"
+        multiplier = 100 if is_option else 1
+        signed = qty if order["side"] == "buy" else -qty
+        cash = float(self.account["cash"]) - signed * price * multiplier
+        self.account["cash"] = self.account["buying_power"] = self.account["options_buying_power"] = f"{cash:.2f}"
+
+        position = self.positions.get(symbol)
+        current_qty = int(float(position["qty"])) if position else 0
+        new_qty = current_qty + signed
+        if new_qty == 0:
+            self.positions.pop(symbol, None)
+            return
+        if position and signed > 0:
+            avg = (current_qty * float(position["avg_entry_price"]) + qty * price) / new_qty
+        elif position:
+            avg = float(position["avg_entry_price"])
+        else:
+            avg = price
+        self.positions[symbol] = {
+            "asset_id": str(uuid.uuid5(uuid.NAMESPACE_DNS, symbol)),
+            "symbol": symbol,
+            "exchange": "",
+            "asset_class": order["asset_class"],
+            "avg_entry_price": f"{avg:.4f}",
+            "qty": str(new_qty),
+            "qty_available": str(new_qty),
+            "side": "long" if new_qty > 0 else "short",
+            "cost_basis": f"{avg * new_qty * multiplier:.2f}",
+        }
+
+    def _position_payload(self, position: Dict[str, Any]) -> Dict[str, Any]:
+        payload = dict(position)
+        symbol = payload["symbol"]
+        if symbol in self.option_quotes:
+            bid, ask = self.option_quotes[symbol]
+            current = (bid + ask) / 2
+            multiplier = 100
+        else:
+            current = self.stock_prices.get(symbol, float(payload["avg_entry_price"]))
+            multiplier = 1
+        qty = float(payload["qty"])
+        cost_basis = float(payload["cost_basis"])
+        market_value = current * qty * multiplier
+        payload.update({
+            "current_price": f"{current:.4f}",
+            "lastday_price": f"{current:.4f}",
+            "change_today": "0",
+            "market_value": f"{market_value:.2f}",
+            "unrealized_pl": f"{market_value - cost_basis:.2f}",
+            "unrealized_plpc": f"{(market_value - cost_basis) / cost_basis if cost_basis else 0:.4f}",
+            "unrealized_intraday_pl": f"{market_value - cost_basis:.2f}",
+            "unrealized_intraday_plpc": f"{(market_value - cost_basis) / cost_basis if cost_basis else 0:.4f}",
+        })
+        return payload
+
+    # ------------------------------------------------------------------
+    # Request handling
+    # ------------------------------------------------------------------
+
+    def _before_request(self, key: str) -> Optional[int]:
+        """Record the request, apply latency; return an error status to send, if any."""
+        delay = self.latency_ms + (self._random.uniform(0, self.jitter_ms) if self.jitter_ms else 0.0)
+        if delay > 0:
+            time.sleep(delay / 1000.0)
+        with self._lock:
+            self.requests_total += 1
+            self.request_counts[key] += 1
+            if self._forced_errors:
+                status = self._forced_errors.pop(0)
+            elif self.rate_limit_every and self.requests_total % self.rate_limit_every == 0:
+                status = 429
+            else:
+                return None
+            if status == 429:
+                self.rate_limited_total += 1
+            return status
+
+    def handle(self, method: str, path: str, query: Dict[str, str], body: Any) -> Tuple[int, Any]:
+        """Route a REST request; returns (status, json payload)."""
+        parts = [p for p in path.split("/") if p]
+        with self._lock:
+            if method == "GET" and path == "/v2/account":
+                return 200, self._account_payload()
+            if method == "GET" and path == "/v2/clock":
+                return 200, self._clock_payload()
+            if method == "GET" and path == "/v2/positions":
+                return 200, [self._position_payload(p) for p in self.positions.values()]
+            if method == "DELETE" and parts[:2] == ["v2", "positions"] and len(parts) == 3:
+                return self._close_position(parts[2])
+            if method == "GET" and path == "/v2/orders":
+                return 200, self._list_orders(query)
+            if method == "GET" and path == "/v2/orders:by_client_order_id":
+                for order in self.orders.values():
+                    if order["client_order_id"] == query.get("client_order_id"):
+                        return 200, order
+                return 404, {"code": 40410000, "message": "order not found"}
+            if method == "GET" and parts[:2] == ["v2", "orders"] and len(parts) == 3:
+                order = self.orders.get(parts[2])
+                return (200, order) if order else (404, {"code": 40410000, "message": "order not found"})
+            if method == "GET" and path == "/v2/options/contracts":
+                return 200, self._option_contracts(query)
+            if method == "GET" and path == "/v2/stocks/quotes/latest":
+                return 200, {"quotes": self._stock_quotes(query)}
+            if method == "GET" and path == "/v2/stocks/bars":
+                return 200, {"bars": self._stock_bars(query), "next_page_token": None}
+            if method == "GET" and path == "/v1beta1/options/quotes/latest":
+                return 200, {"quotes": self._option_latest_quotes(query)}
+
+        if method == "POST" and path == "/v2/orders":
+            if not body or "symbol" not in body:
+                return 422, {"code": 42210000, "message": "symbol is required"}
+            return 200, self.submit_order(body)
+        if method == "DELETE" and parts[:2] == ["v2", "orders"] and len(parts) == 3:
+            if parts[2] not in self.orders:
+                return 404, {"code": 40410000, "message": "order not found"}
+            self.cancel_order(parts[2])
+            return 204, None
+        return 404, {"code": 40400000, "message": f"endpoint not found: {method} {path}"}
+
+    def _account_payload(self) -> Dict[str, Any]:
+        positions_value = sum(
+            float(self._position_payload(p)["market_value"]) for p in self.positions.values()
+        )
+        equity = float(self.account["cash"]) + positions_value
+        payload = dict(self.account)
+        payload.update({
+            "equity": f"{equity:.2f}",
+            "portfolio_value": f"{equity:.2f}",
+            "long_market_value": f"{positions_value:.2f}",
+        })
+        return payload
+
+    def _clock_payload(self) -> Dict[str, Any]:
+        now = datetime.now(timezone.utc)
+        return {
+            "timestamp": _iso(now),
+            "is_open": self.market_open,
+            "next_open": _iso(now + timedelta(hours=16)),
+            "next_close": _iso(now + timedelta(hours=6)),
+        }
+
+    def _list_orders(self, query: Dict[str, str]) -> List[Dict[str, Any]]:
+        status = query.get("status", "open")
+        closed = {"filled", "canceled", "rejected", "expired"}
+        orders = list(self.orders.values())
+        if status == "open":
+            orders = [o for o in orders if o["status"] not in closed]
+        elif status == "closed":
+            orders = [o for o in orders if o["status"] in closed]
+        if query.get("symbols"):
+            symbols = set(query["symbols"].split(","))
+            orders = [o for o in orders if o["symbol"] in symbols]
+        orders.reverse()  # newest first, like the API
+        return orders[: int(query.get("limit", 50))]
+
+    def _close_position(self, symbol: str) -> Tuple[int, Any]:
+        position = self.positions.get(symbol)
+        if not position:
+            return 404, {"code": 40410000, "message": "position not found"}
+        qty = abs(int(float(position["qty"])))
+        side = "sell" if float(position["qty"]) > 0 else "buy"
+        return 200, self.submit_order({"symbol": symbol, "qty": qty, "side": side, "type": "market"})
+
+    def _option_contracts(self, query: Dict[str, str]) -> Dict[str, Any]:
+        underlyings = set(filter(None, query.get("underlying_symbols", "").split(",")))
+        if underlyings:
+            candidates = [
+                self.contracts[occ]
+                for underlying in sorted(underlyings)
+                for occ in self._contracts_by_underlying.get(underlying, [])
+            ]
+        else:
+            candidates = list(self.contracts.values())
+
+        contracts = []
+        for contract in candidates:
+            expiry = contract["expiration_date"]
+            if query.get("expiration_date") and expiry != query["expiration_date"]:
+                continue
+            if query.get("expiration_date_gte") and expiry < query["expiration_date_gte"]:
+                continue
+            if query.get("expiration_date_lte") and expiry > query["expiration_date_lte"]:
+                continue
+            if query.get("type") and contract["type"] != query["type"]:
+                continue
+            if query.get("style") and contract.get("style") != query["style"]:
+                continue
+            strike = float(contract["strike_price"])
+            if query.get("strike_price_gte") and strike < float(query["strike_price_gte"]):
+                continue
+            if query.get("strike_price_lte") and strike > float(query["strike_price_lte"]):
+                continue
+            contracts.append(contract)
+
+        start = int(query.get("page_token") or 0)
+        limit = int(query.get("limit") or 100)
+        page = contracts[start:start + limit]
+        next_token = str(start + limit) if start + limit < len(contracts) else None
+        return {"option_contracts": page, "next_page_token": next_token}
+
+    def _quote_payload(self, bid: float, ask: float) -> Dict[str, Any]:
+        return {
+            "t": _iso(datetime.now(timezone.utc)),
+            "bp": bid, "bs": 10, "bx": "C",
+            "ap": ask, "as": 10, "ax": "C",
+            "c": ["R"], "z": "B",
+        }
+
+    def _stock_quotes(self, query: Dict[str, str]) -> Dict[str, Any]:
+        quotes = {}
+        for symbol in filter(None, query.get("symbols", "").split(",")):
+            price = self.stock_prices.get(symbol)
+            if price is not None:
+                quotes[symbol] = self._quote_payload(round(price - 0.01, 2), round(price + 0.01, 2))
+        return quotes
+
+    def _option_latest_quotes(self, query: Dict[str, str]) -> Dict[str, Any]:
+        quotes = {}
+        for occ in filter(None, query.get("symbols", "").split(",")):
+            if occ in self.option_quotes:
+                bid, ask = self.option_quotes[occ]
+                quotes[occ] = self._quote_payload(bid, ask)
+        return quotes
+
+    def _stock_bars(self, query: Dict[str, str]) -> Dict[str, List[Dict[str, Any]]]:
+        step = _timeframe_seconds(query.get("timeframe", "1Min"))
+        end = _parse_time(query.get("end")) or datetime.now(timezone.utc)
+        start = _parse_time(query.get("start")) or end - timedelta(seconds=step * 100)
+        limit = int(query.get("limit") or 1000)
+        count = max(0, min(int((end - start).total_seconds() // step), limit))
+
+        bars = {}
+        for symbol in filter(None, query.get("symbols", "").split(",")):
+            price = self.stock_prices.get(symbol)
+            if price is None:
+                continue
+            rng = random.Random(f"{self._seed}:{symbol}:{step}")
+            series = []
+            close = price
+            # Walk backwards from the current price so the last close matches it
+            for i in range(count):
+                ts = end - timedelta(seconds=step * (count - i))
+                drift = rng.uniform(-0.001, 0.001) * price
+                open_ = close - drift
+                high = max(open_, close) + abs(drift) * 0.5
+                low = min(open_, close) - abs(drift) * 0.5
+                series.append({
+                    "t": _iso(ts), "o": round(open_, 2), "h": round(high, 2), "l": round(low, 2),
+                    "c": round(close, 2), "v": rng.randint(1000, 50000), "n": rng.randint(10, 500),
+                    "vw": round((high + low + close) / 3, 2),
+                })
+                close = open_
+            series.reverse()
+            # Re-stamp in chronological order after reversing the walk
+            for i, bar in enumerate(series):
+                bar["t"] = _iso(end - timedelta(seconds=step * (count - i)))
+            bars[symbol] = series
+        return bars
+
+
+class _StandinRequestHandler(BaseHTTPRequestHandler):
+    """HTTP handler delegating to AlpacaStandin.handle()."""
+
+    standin: AlpacaStandin = None  # set on the per-server subclass
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; without this, Nagle plus
+    # delayed ACKs add ~40ms to every keep-alive response
+    disable_nagle_algorithm = True
+
+    def _dispatch(self, method: str) -> None:
+        parsed = urlparse(self.path)
+        query = {k: v[-1] for k, v in parse_qs(parsed.query).items()}
+        body = None
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            try:
+                body = json.loads(self.rfile.read(length))
+            except json.JSONDecodeError:
+                body = None
+
+        error = self.standin._before_request(f"{method} {parsed.path}")
+        if error is not None:
+            status, payload = error, {"code": error * 100000, "message": "too many requests" if error == 429 else "error"}
+        elif not self.headers.get("APCA-API-KEY-ID"):
+            status, payload = 401, {"code": 40110000, "message": "request is not authorized"}
+        else:
+            try:
+                status, payload = self.standin.handle(method, parsed.path, query, body)
+            except Exception as e:
+                logger.error(f"[STANDIN] Error handling {method} {parsed.path}: {e}")
+                status, payload = 500, {"code": 50000000, "message": str(e)}
+
+        data = b"" if payload is None else json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        if data:
+            self.wfile.write(data)
+
+    def do_GET(self) -> None:
+        self._dispatch("GET")
+
+    def do_POST(self) -> None:
+        self._dispatch("POST")
+
+    def do_DELETE(self) -> None:
+        self._dispatch("DELETE")
+
+    def do_PATCH(self) -> None:
+        self._dispatch("PATCH")
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug(f"[STANDIN] {self.address_string()} {format % args}")
+
+
+def main():
+    """Run a standalone stand-in for manual and end-to-end testing."""
+    parser = argparse.ArgumentParser(description="Local Alpaca API stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--stream-port", type=int, default=8766)
+    parser.add_argument("--fixture", default="tests/fixtures/alpaca_standin.json")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--rate-limit-every", type=int, default=0)
+    parser.add_argument("--fill-delay", type=float, default=0.25)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    standin = AlpacaStandin(
+        host=args.host,
+        port=args.port,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        rate_limit_every=args.rate_limit_every,
+        fill_delay_s=args.fill_delay,
+    )
+    standin.stream.port = args.stream_port
+    standin.load_fixture(args.fixture)
+    standin.start()
+
+    print(f"export ALPACA_URL_OVERRIDE={standin.url}")
+    print(f"export ALPACA_STREAM_URL_OVERRIDE={standin.stream_url}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        standin.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -25,7 +25,6 @@ Usage:
 import os
 import logging
 import json
-import csv
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 from decimal import Decimal
@@ -47,6 +46,12 @@ try:
     from .scoped_files import get_scoped_paths
     from .llm import load_config
     from .slack import SlackNotifier
+    from .alpaca_client import get_url_override
+    from .state_daemon import get_state_service
+    from .bankroll import BankrollManager
+    from .bankroll_ledger import open_bankroll_ledger, resolve_backend
+    from .records import LedgerPosition, parse_int
+    from .ledger.constants import POSITIONS_SCHEMA_ALPACA_V1
 except ImportError:
     import sys as _sys
     import os as _os
@@ -54,6 +59,12 @@ except ImportError:
     from utils.scoped_files import get_scoped_paths  # type: ignore
     from utils.llm import load_config  # type: ignore
     from utils.slack import SlackNotifier  # type: ignore
+    from utils.alpaca_client import get_url_override  # type: ignore
+    from utils.state_daemon import get_state_service  # type: ignore
+    from utils.bankroll import BankrollManager  # type: ignore
+    from utils.bankroll_ledger import open_bankroll_ledger, resolve_backend  # type: ignore
+    from utils.records import LedgerPosition, parse_int  # type: ignore
+    from utils.ledger.constants import POSITIONS_SCHEMA_ALPACA_V1  # type: ignore
 
 # Load environment variables
 load_dotenv()
@@ -122,6 +133,8 @@ class AlpacaSync:
         self.bankroll_file = scoped_paths["bankroll"]
         self.positions_file = scoped_paths["positions"]
         self.trade_history_file = scoped_paths["trade_history"]
+        # Ledger backend, resolved the same way BankrollManager resolves it
+        self.bankroll_backend = resolve_backend(self.bankroll_file, self.config.get("BANKROLL_BACKEND"))
         
         # Sync configuration
         self.sync_enabled = self.config.get("ALPACA_SYNC_ENABLED", True)
@@ -142,7 +155,9 @@ class AlpacaSync:
                 return
             
             paper = (self.env == "paper")
-            self.trading_client = TradingClient(api_key, secret_key, paper=paper)
+            self.trading_client = TradingClient(
+                api_key, secret_key, paper=paper, url_override=get_url_override()
+            )
             
             # Test connection
             account = self.trading_client.get_account()
@@ -210,33 +225,11 @@ class AlpacaSync:
         except Exception:
             return None
 
-    def _safe_float(self, v: Optional[object]) -> Optional[float]:
-        try:
-            if v in (None, ""):
-                return None
-            return float(v)
-        except Exception:
-            return None
-
-    def _is_nonempty(self, v: Optional[object]) -> bool:
-        """Return True when v is meaningfully filled (not None/empty/NaN-like)."""
-        try:
-            if v is None:
-                return False
-            s = str(v).strip()
-            if s == "":
-                return False
-            if s.lower() in ("nan", "none", "null", "nat", "na", "n/a"):
-                return False
-            return True
-        except Exception:
-            return False
-
-    def _local_matches_alpaca(self, local_pos: Dict, alpaca_symbol: str) -> bool:
+    def _local_matches_alpaca(self, local_pos: LedgerPosition, alpaca_symbol: str) -> bool:
         """Determine if a local position row represents the given Alpaca OCC symbol."""
         try:
             parsed = self._parse_occ_symbol(alpaca_symbol)
-            sym = str(local_pos.get("symbol", "")).strip()
+            sym = local_pos.symbol
             if sym == alpaca_symbol:
                 return True
 
@@ -245,9 +238,9 @@ class AlpacaSync:
 
             # If local symbol is itself OCC, parse it; else treat as underlying
             local_underlying = sym
-            local_strike = self._safe_float(local_pos.get("strike"))
-            local_expiry = str(local_pos.get("expiry", "")).strip()
-            local_type = str(local_pos.get("option_type", "")).upper().strip()
+            local_strike = local_pos.strike
+            local_expiry = local_pos.expiry
+            local_type = local_pos.option_type
 
             if len(sym) > 8 and any(c.isdigit() for c in sym):
                 parsed_local = self._parse_occ_symbol(sym)
@@ -306,23 +299,11 @@ class AlpacaSync:
             if needs_format_update:
                 logger.info("[ALPACA-SYNC] Bankroll format update needed - adding missing fields")
             
-            # Update local bankroll with compatible format
-            updated_bankroll = {
-                "current_bankroll": alpaca_equity,  # Compatible with BankrollManager
+            # Sync details stored alongside the ledger totals
+            sync_fields = {
                 "balance": alpaca_equity,           # Alpaca sync tracking
                 "cash": alpaca_cash,
                 "buying_power": alpaca_buying_power,
-                "start_capital": local_bankroll.get("start_capital", alpaca_equity),
-                "total_trades": local_bankroll.get("total_trades", 0),
-                "winning_trades": local_bankroll.get("winning_trades", 0),
-                "losing_trades": local_bankroll.get("losing_trades", 0),
-                "total_pnl": local_bankroll.get("total_pnl", 0.0),
-                "max_drawdown": local_bankroll.get("max_drawdown", 0.0),
-                "peak_bankroll": max(local_bankroll.get("peak_bankroll", alpaca_equity), alpaca_equity),
-                "created_at": local_bankroll.get("created_at", datetime.now().isoformat()),
-                "last_updated": datetime.now().isoformat(),
-                "trade_history": local_bankroll.get("trade_history", []),
-                "win_loss_history": local_bankroll.get("win_loss_history", []),
                 "last_sync": datetime.now().isoformat(),
                 "sync_source": "alpaca_account",
                 "previous_balance": local_balance,
@@ -330,10 +311,7 @@ class AlpacaSync:
             }
             
             # Save updated bankroll
-            bankroll_dir = os.path.dirname(self.bankroll_file) if os.path.dirname(self.bankroll_file) else "."
-            os.makedirs(bankroll_dir, exist_ok=True)
-            with open(self.bankroll_file, 'w') as f:
-                json.dump(updated_bankroll, f, indent=2)
+            self._save_bankroll(alpaca_equity, sync_fields)
             
             logger.info(f"[ALPACA-SYNC] Bankroll synchronized - Updated from ${local_balance:.2f} to ${alpaca_equity:.2f}")
             
@@ -386,7 +364,7 @@ class AlpacaSync:
             
             for alpaca_pos in options_positions:
                 symbol = alpaca_pos.symbol
-                quantity = float(alpaca_pos.qty)
+                quantity = parse_int(alpaca_pos.qty) or 0
                 market_value = float(alpaca_pos.market_value) if getattr(alpaca_pos, 'market_value', None) else 0.0
                 # Alpaca SDK uses 'unrealized_pl' (not 'unrealized_pnl'); handle both and intraday variant
                 _upl = (
@@ -401,10 +379,7 @@ class AlpacaSync:
                 local_pos_closed = None
                 for p in local_positions:
                     if self._local_matches_alpaca(p, symbol):
-                        status_str = str(p.get("status", "")).strip().lower()
-                        close_time_val = p.get("close_time", "")
-                        is_closed = status_str.startswith("closed") or self._is_nonempty(close_time_val)
-                        if is_closed:
+                        if p.is_closed:
                             if local_pos_closed is None:
                                 local_pos_closed = p
                         else:
@@ -418,23 +393,20 @@ class AlpacaSync:
 
                     # Derive components to help downstream monitoring
                     parsed = self._parse_occ_symbol(symbol)
-                    new_rec = {
-                        "symbol": symbol,
-                        "quantity": quantity,
-                        "market_value": market_value,
-                        "unrealized_pnl": unrealized_pnl,
-                        "entry_time": datetime.now().isoformat(),
-                        "source": "manual_trade_detected",
-                        "sync_detected": True,
-                    }
+                    new_rec = LedgerPosition(
+                        symbol=symbol,
+                        quantity=quantity,
+                        market_value=market_value,
+                        unrealized_pnl=unrealized_pnl,
+                        entry_time=datetime.now().isoformat(),
+                        source="manual_trade_detected",
+                        sync_detected=True,
+                    )
                     if parsed:
-                        new_rec.update({
-                            "underlying": parsed["underlying"],
-                            "strike": parsed["strike"],
-                            "expiry": parsed["expiry"],
-                            "option_type": parsed["option_type"],
-                            "occ_symbol": symbol,
-                        })
+                        new_rec.strike = parsed["strike"]
+                        new_rec.expiry = parsed["expiry"]
+                        new_rec.option_type = parsed["option_type"]
+                        new_rec.occ_symbol = symbol
                     new_positions.append(new_rec)
 
                 else:
@@ -443,34 +415,28 @@ class AlpacaSync:
                     was_closed = (local_pos_open is None)
                     if was_closed:
                         logger.info(f"[ALPACA-SYNC] Reopening position from closed state: {symbol}")
-                        target["status"] = ""
-                        target["close_time"] = ""
-                        target["reopened_by_sync"] = True
+                        target.status = ""
+                        target.close_time = ""
                     # Update core fields
-                    if abs(float(target.get("quantity", 0)) - quantity) > 0.01 or was_closed:
-                        logger.warning(f"[ALPACA-SYNC] Position update for {symbol}: LocalQty={target.get('quantity')}, AlpacaQty={quantity}")
+                    if (target.quantity or 0) != quantity or was_closed:
+                        logger.warning(f"[ALPACA-SYNC] Position update for {symbol}: LocalQty={target.quantity}, AlpacaQty={quantity}")
                         sync_needed = True
-                    target["quantity"] = quantity
-                    target["market_value"] = market_value
-                    target["unrealized_pnl"] = unrealized_pnl
-                    target["last_sync"] = datetime.now().isoformat()
-                    target["occ_symbol"] = symbol
-                    target["sync_adjusted"] = True
+                    target.quantity = quantity
+                    target.market_value = market_value
+                    target.unrealized_pnl = unrealized_pnl
+                    target.occ_symbol = symbol
             
             # Close local positions that are OPEN but have no matching Alpaca position
             alpaca_symbols = [pos.symbol for pos in options_positions]
             for local_pos in local_positions:
-                status_str = str(local_pos.get("status", "")).strip().lower()
-                close_time_val = local_pos.get("close_time", "")
-                is_closed = status_str.startswith("closed") or self._is_nonempty(close_time_val)
-                if is_closed:
+                if local_pos.is_closed:
                     continue  # already closed
                 # If this local row doesn't match any current Alpaca position, mark closed
                 if not any(self._local_matches_alpaca(local_pos, s) for s in alpaca_symbols):
-                    logger.warning(f"[ALPACA-SYNC] Position closed (detected via Alpaca): {local_pos.get('symbol')} {local_pos.get('strike')} {local_pos.get('option_type')} {local_pos.get('expiry')}")
+                    logger.warning(f"[ALPACA-SYNC] Position closed (detected via Alpaca): {local_pos.symbol} {local_pos.strike} {local_pos.option_type} {local_pos.expiry}")
                     sync_needed = True
-                    local_pos["status"] = "closed_sync"
-                    local_pos["close_time"] = datetime.now().isoformat()
+                    local_pos.status = "closed_sync"
+                    local_pos.close_time = datetime.now().isoformat()
             
             if sync_needed:
                 # Add new positions to local tracking
@@ -483,7 +449,7 @@ class AlpacaSync:
                 
                 # Log sync events
                 for pos in new_positions:
-                    self._log_sync_event("position_detected", pos)
+                    self._log_sync_event("position_detected", pos.to_dict())
             else:
                 logger.info("[ALPACA-SYNC] Position sync not needed - all positions match")
             
@@ -585,9 +551,13 @@ class AlpacaSync:
         return self.trading_client.get_orders(request)
     
     def _load_local_bankroll(self) -> Dict:
-        """Load local bankroll data."""
+        """Load local bankroll data (the ledger summary on the SQLite backend)."""
         try:
-            if os.path.exists(self.bankroll_file):
+            if getattr(self, "bankroll_backend", "json") != "json":
+                ledger = open_bankroll_ledger(self.bankroll_file, self.bankroll_backend)
+                if ledger.exists():
+                    return ledger.summary()
+            elif os.path.exists(self.bankroll_file):
                 with open(self.bankroll_file, 'r') as f:
                     return json.load(f)
         except Exception as e:
@@ -595,99 +565,50 @@ class AlpacaSync:
         
         return {"balance": 0.0}
     
-    def _load_local_positions(self) -> List[Dict]:
-        """Load local positions data."""
+    def _save_bankroll(self, equity: float, sync_fields: Dict):
+        """Set the ledger's bankroll to the account equity through BankrollManager.
+
+        The update runs in a ledger transaction on the configured backend and
+        notifies balance listeners; the adjustment is recorded as a balance update.
+        """
+        manager = BankrollManager(
+            str(self.bankroll_file),
+            start_capital=equity,
+            broker="alpaca",
+            env=self.env,
+            backend=self.bankroll_backend,
+        )
+        manager.update_bankroll(equity, reason="Alpaca account sync", fields=sync_fields)
+    
+    def _load_local_positions(self) -> List[LedgerPosition]:
+        """Load local positions data (parsed once into typed rows)."""
         try:
-            if os.path.exists(self.positions_file):
-                df = pd.read_csv(self.positions_file)
-                return df.to_dict('records')
+            rows = get_state_service().read_csv(self.positions_file, copy=False)
+            return [LedgerPosition.from_row(row) for row in rows if any(row.values())]
         except Exception as e:
             logger.warning(f"[ALPACA-SYNC] Failed to load local positions: {e}")
         
         return []
     
-    def _save_local_positions(self, positions: List[Dict]):
-        """Save local positions data."""
+    def _save_local_positions(self, positions: List):
+        """Save local positions data (LedgerPosition rows or dicts) in the canonical schema.
+
+        Rows written with the legacy timestamp-first mapping are remapped by
+        LedgerPosition.from_row() and marked 'normalized'.
+        """
         try:
             positions_dir = os.path.dirname(self.positions_file) if os.path.dirname(self.positions_file) else "."
             os.makedirs(positions_dir, exist_ok=True)
-            df = pd.DataFrame(positions)
-            # Enforce canonical column order for compatibility with monitor/loader
-            CANONICAL_COLUMNS = [
-                'symbol','occ_symbol','strike','option_type','expiry','quantity','contracts','entry_price',
-                'current_price','pnl_pct','pnl_amount','timestamp','status','close_time',
-                'market_value','unrealized_pnl','entry_time','source','sync_detected'
-            ]
-            
-            # Fix rows that were written with a legacy/timestamp-first mapping
-            # Example bad row under canonical header:
-            #   symbol=<ISO timestamp>, strike=UNDERLYING, option_type=EXPIRY, expiry=STRIKE, quantity=CALL/PUT, contracts=QTY, entry_price=ENTRY
-            def _is_iso_like(val: str) -> bool:
-                try:
-                    datetime.fromisoformat(str(val))
-                    return True
-                except Exception:
-                    return False
-            
-            if not df.empty and 'symbol' in df.columns:
-                # Ensure target columns can hold strings
-                for col in ['symbol', 'option_type', 'expiry', 'status', 'close_time']:
-                    if col in df.columns:
-                        try:
-                            df[col] = df[col].astype('object')
-                        except Exception:
-                            pass
-                mask = df['symbol'].apply(_is_iso_like)
-                if mask.any():
-                    # Prepare safe accessors
-                    def _safe_num(x):
-                        try:
-                            return float(x)
-                        except Exception:
-                            return None
-                    def _safe_int(x):
-                        try:
-                            return int(float(x))
-                        except Exception:
-                            return None
-                    # Perform remap for affected rows using original values
-                    idx = df[mask].index
-                    old_underlying = df.loc[idx, 'strike'] if 'strike' in df.columns else None
-                    old_expiry = df.loc[idx, 'option_type'] if 'option_type' in df.columns else None
-                    old_strike = df.loc[idx, 'expiry'] if 'expiry' in df.columns else None
-                    old_opt_from_qty = df.loc[idx, 'quantity'] if 'quantity' in df.columns else None
-                    old_contracts = df.loc[idx, 'contracts'] if 'contracts' in df.columns else None
-                    
-                    # underlying (symbol)
-                    if old_underlying is not None:
-                        df.loc[idx, 'symbol'] = old_underlying
-                    # expiry
-                    if old_expiry is not None:
-                        df.loc[idx, 'expiry'] = old_expiry
-                    # strike
-                    if old_strike is not None:
-                        df.loc[idx, 'strike'] = old_strike.apply(_safe_num)
-                    # option_type (from quantity column, which holds CALL/PUT)
-                    if old_opt_from_qty is not None:
-                        df.loc[idx, 'option_type'] = old_opt_from_qty.astype(str).str.upper().str[:1].map({'C':'CALL','P':'PUT'}).fillna(old_opt_from_qty)
-                    # quantity (from contracts)
-                    if old_contracts is not None:
-                        df.loc[idx, 'quantity'] = old_contracts.apply(_safe_int).fillna(1)
-                    # mark normalized status
-                    df.loc[idx, 'status'] = df.loc[idx, 'status'].where(~df.loc[idx, 'status'].isna(), other='normalized')
-                    # Optional: clear close_time if it's not meaningful
-                    # df.loc[idx, 'close_time'] = None
-            # Ensure all canonical columns exist (incl. new occ_symbol column)
-            for col in CANONICAL_COLUMNS:
-                if col not in df.columns:
-                    df[col] = None
-            df = df[CANONICAL_COLUMNS]
-            df.to_csv(self.positions_file, index=False, columns=CANONICAL_COLUMNS)
+            records = [p if isinstance(p, LedgerPosition) else LedgerPosition.from_row(p) for p in positions]
+            # Atomic replace through the state service (also notifies position readers)
+            get_state_service().write_csv(
+                self.positions_file, [record.to_dict() for record in records], POSITIONS_SCHEMA_ALPACA_V1
+            )
         except Exception as e:
             logger.error(f"[ALPACA-SYNC] Failed to save local positions: {e}")
     
     def _load_local_trades(self) -> List[Dict]:
-        """Load local trade history."""
+        """Load local trade history (read here; the trade log is not served by the state daemon)."""
         try:
             if os.path.exists(self.trade_history_file):
                 df = pd.read_csv(self.trade_history_file)
@@ -795,7 +716,7 @@ class AlpacaSync:
             # Treat any status starting with 'closed' as closed
             open_local_positions = [
                 p for p in local_positions
-                if not str(p.get("status", "")).lower().startswith("closed")
+                if not p.status.lower().startswith("closed")
             ]
             positions_need_sync = len(options_positions) != len(open_local_positions)
             
@@ -13,6 +13,7 @@ Key Features:
 - Trade history and P&L calculations
 - Maximum drawdown protection
 - Conservative capital preservation
+- Atomic capital reservations for concurrently executing trades
 
 Risk Management:
 - Risk fraction limits (default: 20% of bankroll per trade)
@@ -28,9 +29,11 @@ Tracking Capabilities:
 - Maximum drawdown from peak
 - Average win/loss amounts
 - Recent performance history
+- Per-symbol performance from incrementally maintained trade-log aggregates
 
 Persistence:
 - JSON file storage for bankroll state
+- Optional SQLite (WAL) ledger backend with atomic updates (utils.bankroll_ledger)
 - Automatic backup and recovery
 - Trade history logging
 - Performance metrics retention
@@ -64,14 +67,70 @@ Version: 2.0.0
 License: MIT
 """
 
-import json
 import logging
-from typing import Dict, Optional, List
+import threading
+import uuid
+import weakref
+from typing import Callable, Dict, Optional, List, Tuple
 from pathlib import Path
 from datetime import datetime
 
+from .bankroll_ledger import open_bankroll_ledger
+from .records import TradeRecord
+
 logger = logging.getLogger(__name__)
 
+# In-process balance listeners: callback(bankroll_manager, balance), called after every ledger write
+BalanceListener = Callable[["BankrollManager", float], None]
+_balance_listeners: List[Callable[[], Optional[BalanceListener]]] = []
+_balance_listeners_lock = threading.Lock()
+
+
+def add_balance_listener(callback: BalanceListener) -> None:
+    """Call callback(bankroll_manager, balance) whenever any BankrollManager in this process writes its ledger.
+
+    Bound methods are held weakly, so a listening object can be garbage collected.
+    """
+    ref = weakref.WeakMethod(callback) if hasattr(callback, "__self__") else (lambda: callback)
+    with _balance_listeners_lock:
+        _balance_listeners.append(ref)
+
+
+def remove_balance_listener(callback: BalanceListener) -> None:
+    with _balance_listeners_lock:
+        _balance_listeners[:] = [ref for ref in _balance_listeners if ref() not in (None, callback)]
+
+
+def _publish_balance(bankroll_manager: "BankrollManager", balance: float) -> None:
+    with _balance_listeners_lock:
+        callbacks = [ref() for ref in _balance_listeners]
+        if None in callbacks:
+            _balance_listeners[:] = [ref for ref in _balance_listeners if ref() is not None]
+    for callback in callbacks:
+        if callback is None:
+            continue
+        try:
+            callback(bankroll_manager, balance)
+        except Exception as e:
+            logger.warning(f"[BANKROLL] Balance listener failed for {bankroll_manager.ledger_id()}: {e}")
+
+
+def _new_bankroll(start_capital: float) -> Dict:
+    """Bankroll document for a new ledger."""
+    return {
+        "current_bankroll": start_capital,
+        "start_capital": start_capital,
+        "total_trades": 0,
+        "winning_trades": 0,
+        "total_pnl": 0.0,
+        "max_drawdown": 0.0,
+        "peak_bankroll": start_capital,
+        "created_at": datetime.now().isoformat(),
+        "last_updated": datetime.now().isoformat(),
+        "trade_history": [],
+        "win_loss_history": [],  # List of True/False for last 20 trades
+    }
+
 
 class BankrollManager:
     """Manages trading bankroll with risk controls and persistence."""
@@ -81,8 +140,19 @@ class BankrollManager:
         bankroll_file: str = "bankroll.json", 
         start_capital: float = 40.0,
         broker: str = "robinhood",
-        env: str = "live"
+        env: str = "live",
+        backend: Optional[str] = None,
     ):
+        """Initialize bankroll manager.
+
+        Args:
+            bankroll_file: Bankroll JSON path ("bankroll.json" selects the scoped file)
+            start_capital: Seed capital when no ledger exists yet
+            broker: Broker name for scoped ledgers
+            env: Environment for scoped ledgers
+            backend: "json" or "sqlite" (default: BANKROLL_BACKEND env var, else
+                BANKROLL_BACKEND in config.yaml, else json)
+        """
         # Support scoped ledgers for v0.9.0 broker/environment separation
         if bankroll_file == "bankroll.json":
             # Use scoped filename: bankroll_{broker}_{env}.json
@@ -94,6 +164,12 @@ class BankrollManager:
         self.start_capital = start_capital
         self.broker = broker
         self.env = env
+        # In-flight capital holds for trades being executed concurrently
+        self._reservation_lock = threading.Lock()
+        self._reservations: Dict[str, float] = {}
+        # Storage backend; the SQLite ledger migrates the JSON file on first open
+        self._ledger = open_bankroll_ledger(self.bankroll_file, backend)
+        self.backend = self._ledger.backend
         self._ensure_bankroll_file()
 
     def ledger_id(self) -> str:
@@ -107,51 +183,129 @@ class BankrollManager:
     def _ensure_bankroll_file(self):
         """Create bankroll file if it doesn't exist."""
         # ✅ YAML seed used only when bankroll.json missing – verified 2025-08-05
-        if not self.bankroll_file.exists():
-            initial_data = {
-                "current_bankroll": self.start_capital,
-                "start_capital": self.start_capital,
-                "total_trades": 0,
-                "winning_trades": 0,
-                "total_pnl": 0.0,
-                "max_drawdown": 0.0,
-                "peak_bankroll": self.start_capital,
-                "created_at": datetime.now().isoformat(),
-                "last_updated": datetime.now().isoformat(),
-                "trade_history": [],
-                "win_loss_history": [],  # List of True/False for last 20 trades
-            }
+        if not self._ledger.exists():
+            initial_data = _new_bankroll(self.start_capital)
             self._save_bankroll(initial_data)
             logger.info(f"Created new bankroll file with ${self.start_capital}")
 
     def _load_bankroll(self) -> Dict:
-        """Load bankroll data from file."""
+        """Load full bankroll data (including trade history) from the ledger."""
         try:
-            with open(self.bankroll_file, "r") as f:
-                return json.load(f)
+            return self._ledger.load()
         except Exception as e:
             logger.error(f"Error loading bankroll file: {e}")
             raise
 
     def _save_bankroll(self, data: Dict):
-        """Save bankroll data to file."""
+        """Replace bankroll data in the ledger."""
         try:
             data["last_updated"] = datetime.now().isoformat()
-            with open(self.bankroll_file, "w") as f:
-                json.dump(data, f, indent=2)
+            self._ledger.save(data)
         except Exception as e:
             logger.error(f"Error saving bankroll file: {e}")
             raise
+        _publish_balance(self, data["current_bankroll"])
+
+    def _load_summary(self) -> Dict:
+        """Load bankroll totals; the SQLite ledger skips trade history."""
+        try:
+            return self._ledger.summary()
+        except Exception as e:
+            logger.error(f"Error loading bankroll file: {e}")
+            raise
 
     def get_current_bankroll(self) -> float:
         """Get current bankroll amount."""
-        data = self._load_bankroll()
-        return data["current_bankroll"]
+        if self.backend == "json":
+            return self._load_bankroll()["current_bankroll"]
+        return self._ledger.balance()  # Single-row read
+
+    def ledger_version(self) -> Tuple:
+        """Cheap change token for the ledger (stat only); differs after a write by any process."""
+        return self._ledger.version()
 
     def get_bankroll_stats(self) -> Dict:
         """Get comprehensive bankroll statistics."""
         return self._load_bankroll()
 
+    def get_reserved_capital(self) -> float:
+        """Get total capital held by in-flight reservations."""
+        with self._reservation_lock:
+            return sum(self._reservations.values())
+
+    def get_available_capital(self) -> float:
+        """Get bankroll not held by in-flight reservations."""
+        with self._reservation_lock:
+            return self.get_current_bankroll() - sum(self._reservations.values())
+
+    def reserve_capital(self, amount: float, label: str = "trade") -> Optional[str]:
+        """
+        Atomically reserve capital for a trade before it is dispatched.
+
+        Concurrent executions each reserve their risk budget up front so the
+        combined exposure can never exceed the bankroll.
+
+        Args:
+            amount: Dollar amount to hold
+            label: Prefix for the reservation ID (e.g. symbol)
+
+        Returns:
+            Reservation ID, or None if unreserved capital is insufficient
+        """
+        with self._reservation_lock:
+            available = self.get_current_bankroll() - sum(self._reservations.values())
+            if amount <= 0 or amount > available:
+                logger.warning(
+                    f"[BANKROLL] Cannot reserve ${amount:.2f} for {label}: "
+                    f"${available:.2f} available"
+                )
+                return None
+
+            reservation_id = f"{label}-{uuid.uuid4().hex[:8]}"
+            self._reservations[reservation_id] = amount
+
+        logger.info(
+            f"[BANKROLL] Reserved ${amount:.2f} for {label} ({reservation_id}), "
+            f"${available - amount:.2f} remaining"
+        )
+        return reservation_id
+
+    def get_reservation(self, reservation_id: str) -> float:
+        """Get the amount held by a reservation (0.0 if unknown)."""
+        with self._reservation_lock:
+            return self._reservations.get(reservation_id, 0.0)
+
+    def release_reservation(self, reservation_id: str, reason: str = "") -> float:
+        """
+        Roll back a reservation (trade failed or did not fill).
+
+        Returns:
+            Amount released (0.0 if the reservation was unknown)
+        """
+        with self._reservation_lock:
+            amount = self._reservations.pop(reservation_id, 0.0)
+        if amount:
+            logger.info(f"[BANKROLL] Released ${amount:.2f} ({reservation_id}){f': {reason}' if reason else ''}")
+        return amount
+
+    def commit_reservation(self, reservation_id: str, actual_cost: float = 0.0) -> float:
+        """
+        Settle a reservation once its trade has filled.
+
+        The hold is dropped; the trade itself is tracked through the ledger.
+
+        Returns:
+            Amount that had been reserved
+        """
+        with self._reservation_lock:
+            amount = self._reservations.pop(reservation_id, 0.0)
+        if amount:
+            logger.info(
+                f"[BANKROLL] Committed {reservation_id}: reserved ${amount:.2f}, "
+                f"filled ${actual_cost:.2f}"
+            )
+        return amount
+
     def calculate_position_size(
         self,
         premium: float,
@@ -258,30 +412,26 @@ class BankrollManager:
         Returns:
             Updated bankroll data
         """
-        data = self._load_bankroll()
-
-        # Add trade to history
-        trade_record = {
-            "timestamp": datetime.now().isoformat(),
-            "symbol": trade_details.get("symbol", "SPY"),
-            "direction": trade_details.get("direction", ""),
-            "strike": trade_details.get("strike", 0),
-            "expiry": trade_details.get("expiry", ""),
-            "quantity": trade_details.get("quantity", 0),
-            "premium": trade_details.get("premium", 0),
-            "total_cost": trade_details.get("total_cost", 0),
-            "decision_confidence": trade_details.get("confidence", 0),
-            "llm_reason": trade_details.get("reason", ""),
-            "realized_pnl": trade_details.get("realized_pnl", 0),  # Will be 0 initially
-            "status": trade_details.get("status", "OPEN"),
-        }
+        # Parse once; realized_pnl is 0 for entries
+        trade = TradeRecord.from_details(trade_details)
 
-        data["trade_history"].append(trade_record)
+        with self._ledger.transaction() as txn:
+            data = txn.summary
+            txn.add_trade(trade.to_dict())
+            self._apply_trade_totals(data, trade.realized_pnl)
+        _publish_balance(self, data["current_bankroll"])
+
+        logger.info(f"Recorded trade: {trade.direction or 'UNKNOWN'} {trade.symbol}")
+
+        return data
+
+    @staticmethod
+    def _apply_trade_totals(data: Dict, pnl: float) -> None:
+        """Update counters, P/L, win/loss history and drawdown for a recorded trade."""
         data["total_trades"] += 1
 
         # Update bankroll if realized P/L is provided
-        if "realized_pnl" in trade_details and trade_details["realized_pnl"] != 0:
-            pnl = trade_details["realized_pnl"]
+        if pnl != 0:
             data["current_bankroll"] += pnl
             data["total_pnl"] += pnl
 
@@ -310,13 +460,6 @@ class BankrollManager:
             if current_drawdown > data["max_drawdown"]:
                 data["max_drawdown"] = current_drawdown
 
-        self._save_bankroll(data)
-        logger.info(
-            f"Recorded trade: {trade_details.get('direction', 'UNKNOWN')} {trade_details.get('symbol', 'SPY')}"
-        )
-
-        return data
-
     def get_recent_outcomes(self, n: int = 2) -> List[bool]:
         """
         Get recent trade outcomes for consecutive loss throttle.
@@ -328,7 +471,7 @@ class BankrollManager:
             List of boolean outcomes (True=win, False=loss) for last n trades
         """
         try:
-            data = self._load_bankroll()
+            data = self._load_summary()
             win_loss_history = data.get("win_loss_history", [])
             
             # Return last n outcomes, or empty list if insufficient history
@@ -341,54 +484,103 @@ class BankrollManager:
             logger.warning(f"Error getting recent outcomes: {e}")
             return []  # Fail-safe: return empty list
 
-    def update_bankroll(self, new_amount: float, reason: str = "Manual update") -> Dict:
+    def update_bankroll(
+        self, new_amount: float, reason: str = "Manual update", fields: Optional[Dict] = None
+    ) -> Dict:
         """
         Update bankroll amount (typically after realized P/L).
 
         Args:
             new_amount: New bankroll amount
             reason: Reason for the update
+            fields: Other top-level fields to store with the update (e.g. broker sync details)
 
         Returns:
             Updated bankroll data
         """
-        data = self._load_bankroll()
-        old_amount = data["current_bankroll"]
-        pnl_change = new_amount - old_amount
-
-        data["current_bankroll"] = new_amount
-        data["total_pnl"] += pnl_change
+        with self._ledger.transaction() as txn:
+            data = txn.summary
+            # Documents written by older tools may lack the totals; fill them as a new ledger would
+            for key, value in _new_bankroll(data.get("current_bankroll", data.get("balance", new_amount))).items():
+                data.setdefault(key, value)
+            old_amount = data["current_bankroll"]
+            if fields:
+                data.update(fields)
+            pnl_change = new_amount - old_amount
+
+            data["current_bankroll"] = new_amount
+            data["total_pnl"] += pnl_change
 
-        # Update peak bankroll and drawdown
-        if new_amount > data["peak_bankroll"]:
-            data["peak_bankroll"] = new_amount
+            # Update peak bankroll and drawdown
+            if new_amount > data["peak_bankroll"]:
+                data["peak_bankroll"] = new_amount
 
-        current_drawdown = (
-            (data["peak_bankroll"] - new_amount) / data["peak_bankroll"] * 100
-        )
-        if current_drawdown > data["max_drawdown"]:
-            data["max_drawdown"] = current_drawdown
-
-        # Add update record
-        update_record = {
-            "timestamp": datetime.now().isoformat(),
-            "old_amount": old_amount,
-            "new_amount": new_amount,
-            "change": pnl_change,
-            "reason": reason,
-        }
+            current_drawdown = (
+                (data["peak_bankroll"] - new_amount) / data["peak_bankroll"] * 100
+            )
+            if current_drawdown > data["max_drawdown"]:
+                data["max_drawdown"] = current_drawdown
 
-        if "bankroll_updates" not in data:
-            data["bankroll_updates"] = []
-        data["bankroll_updates"].append(update_record)
+            # Add update record
+            txn.add_balance_update({
+                "timestamp": datetime.now().isoformat(),
+                "old_amount": old_amount,
+                "new_amount": new_amount,
+                "change": pnl_change,
+                "reason": reason,
+            })
+        _publish_balance(self, new_amount)
 
-        self._save_bankroll(data)
         logger.info(
             f"Updated bankroll: ${old_amount:.2f} -> ${new_amount:.2f} ({reason})"
         )
 
         return data
 
+    def sync_account_balance(self, account_balance: float, reason: str = "Broker balance sync") -> Dict:
+        """
+        Record the broker account's cash balance; an increase is treated as a deposit.
+
+        A deposit raises the trading bankroll and start capital to the account
+        balance (it is not counted as P&L). A decrease only updates the tracked
+        account balance.
+
+        Args:
+            account_balance: Account cash balance reported by the broker
+            reason: Reason recorded with the balance update
+
+        Returns:
+            Dict with old_balance, new_balance, change and current_bankroll
+        """
+        with self._ledger.transaction() as txn:
+            data = txn.summary
+            old_balance = float(data.get("current_balance", 0.0) or 0.0)
+            change = account_balance - old_balance
+            data["current_balance"] = account_balance
+            old_amount = data["current_bankroll"]
+            if change > 0:
+                data["current_bankroll"] = account_balance
+                data["start_capital"] = account_balance
+                data["peak_bankroll"] = max(data.get("peak_bankroll", account_balance), account_balance)
+                txn.add_balance_update({
+                    "timestamp": datetime.now().isoformat(),
+                    "old_amount": old_amount,
+                    "new_amount": account_balance,
+                    "change": account_balance - old_amount,
+                    "reason": reason,
+                })
+            current_bankroll = data["current_bankroll"]
+        if current_bankroll != old_amount:
+            _publish_balance(self, current_bankroll)
+            logger.info(f"[BANKROLL] Deposit synced: ${old_amount:.2f} -> ${current_bankroll:.2f} ({reason})")
+
+        return {
+            "old_balance": old_balance,
+            "new_balance": account_balance,
+            "change": change,
+            "current_bankroll": current_bankroll,
+        }
+
     def get_win_history(self, last_n: int = 20) -> list:
         """
         Get recent win/loss history for LLM confidence calibration.
@@ -403,12 +595,13 @@ class BankrollManager:
             List of boolean values (True for wins, False for losses) for up to last_n trades.
             Empty list if no trade history exists.
         """
-        data = self._load_bankroll()
+        data = self._load_summary()
 
         # Ensure win_loss_history exists (for backward compatibility)
         if "win_loss_history" not in data:
-            data["win_loss_history"] = []
-            self._save_bankroll(data)
+            with self._ledger.transaction() as txn:
+                data = txn.summary
+                data.setdefault("win_loss_history", [])
             logger.info(
                 "[BANKROLL] Initialized empty win/loss history for LLM confidence calibration"
             )
@@ -522,6 +715,30 @@ class BankrollManager:
         # Return positive for wins, negative for losses
         return streak if current_outcome else -streak
 
+    def _trade_log_file(self) -> str:
+        """Scoped trade log path (resolved from config once per manager)."""
+        trade_log_file = getattr(self, "_trade_log_path", None)
+        if trade_log_file is None:
+            try:
+                from utils.llm import load_config  # type: ignore
+
+                trade_log_file = load_config().get(
+                    "TRADE_LOG_FILE", "logs/trade_history_robinhood_live.csv"
+                )
+            except Exception:
+                trade_log_file = "logs/trade_history_robinhood_live.csv"
+            self._trade_log_path = trade_log_file
+        return trade_log_file
+
+    def _trade_aggregates(self):
+        """Incrementally maintained trade-log aggregates, or None if there is no trade log."""
+        from .trade_aggregates import get_trade_aggregates
+
+        trade_log_path = Path(self._trade_log_file())
+        if not trade_log_path.exists():
+            return None
+        return get_trade_aggregates(trade_log_path)
+
     def _get_recent_trade_patterns(self, last_n: int = 5) -> list:
         """
         Extract recent trade patterns from trade log for LLM learning.
@@ -533,78 +750,14 @@ class BankrollManager:
             List of trade pattern dictionaries
         """
         try:
-            import csv
-            from pathlib import Path
-
-            # Resolve scoped trade log file from config; fallback to default scoped path
-            try:
-                from utils.llm import load_config  # type: ignore
-
-                trade_log_file = load_config().get(
-                    "TRADE_LOG_FILE", "logs/trade_history_robinhood_live.csv"
-                )
-            except Exception:
-                trade_log_file = "logs/trade_history_robinhood_live.csv"
-
-            trade_log_path = Path(trade_log_file)
-            if not trade_log_path.exists():
+            aggregates = self._trade_aggregates()
+            if aggregates is None:
                 return []
 
             patterns = []
-            with open(trade_log_path, "r", newline="") as f:
-                reader = csv.DictReader(f)
-                trades = list(reader)
-
-                # Get last N completed trades (those with any PnL data)
-                def has_pnl(t: dict) -> bool:
-                    return any(
-                        (t.get(k) is not None and str(t.get(k)).strip() != "")
-                        for k in ("pnl_amount", "pnl", "pnl_dollars")
-                    )
-
-                recent_trades = [t for t in trades if has_pnl(t)][-last_n:]
-
-                for trade in recent_trades:
-                    try:
-                        pnl = float(
-                            trade.get("pnl_amount")
-                            or trade.get("pnl")
-                            or trade.get("pnl_dollars")
-                            or 0
-                        )
-                        pnl_pct = 0.0
-                        if trade.get("pnl_pct") not in (None, ""):
-                            pnl_pct = float(trade.get("pnl_pct", 0))
-                        elif trade.get("pnl_percent") not in (None, ""):
-                            pnl_pct = float(trade.get("pnl_percent", 0))
-
-                        pattern = {
-                            "symbol": trade.get("symbol", "UNKNOWN"),
-                            "option_type": (
-                                trade.get("option_type")
-                                or (
-                                    "CALL"
-                                    if "CALL"
-                                    in str(trade.get("decision", "")).upper()
-                                    else (
-                                        "PUT"
-                                        if "PUT"
-                                        in str(trade.get("decision", "")).upper()
-                                        else "UNKNOWN"
-                                    )
-                                )
-                            ),
-                            "outcome": "WIN" if pnl > 0 else "LOSS",
-                            "pnl_pct": pnl_pct,
-                            "reason": trade.get("reason", ""),
-                            "market_condition": self._classify_market_condition(
-                                trade.get("reason", "")
-                            ),
-                        }
-                        patterns.append(pattern)
-                    except (ValueError, TypeError):
-                        continue
-
+            for pattern in aggregates.recent_patterns(last_n):
+                pattern["market_condition"] = self._classify_market_condition(pattern["reason"])
+                patterns.append(pattern)
             return patterns
 
         except Exception as e:
@@ -619,60 +772,10 @@ class BankrollManager:
             Dict with symbol-specific win rates and trade counts
         """
         try:
-            import csv
-            from pathlib import Path
-            from collections import defaultdict
-
-            # Resolve scoped trade log file from config; fallback to default scoped path
-            try:
-                from utils.llm import load_config  # type: ignore
-
-                trade_log_file = load_config().get(
-                    "TRADE_LOG_FILE", "logs/trade_history_robinhood_live.csv"
-                )
-            except Exception:
-                trade_log_file = "logs/trade_history_robinhood_live.csv"
-
-            trade_log_path = Path(trade_log_file)
-            if not trade_log_path.exists():
+            aggregates = self._trade_aggregates()
+            if aggregates is None:
                 return {}
-
-            symbol_stats = defaultdict(
-                lambda: {"wins": 0, "total": 0, "total_pnl": 0.0}
-            )
-
-            with open(trade_log_path, "r", newline="") as f:
-                reader = csv.DictReader(f)
-                for trade in reader:
-                    # Consider row if any PnL field present
-                    pnl_field = (
-                        trade.get("pnl_amount")
-                        or trade.get("pnl")
-                        or trade.get("pnl_dollars")
-                    )
-                    if pnl_field not in (None, ""):
-                        try:
-                            symbol = trade.get("symbol", "UNKNOWN")
-                            pnl = float(pnl_field)
-
-                            symbol_stats[symbol]["total"] += 1
-                            symbol_stats[symbol]["total_pnl"] += pnl
-                            if pnl > 0:
-                                symbol_stats[symbol]["wins"] += 1
-                        except (ValueError, TypeError):
-                            continue
-
-            # Convert to final format
-            performance = {}
-            for symbol, stats in symbol_stats.items():
-                if stats["total"] > 0:
-                    performance[symbol] = {
-                        "win_rate": stats["wins"] / stats["total"],
-                        "total_trades": stats["total"],
-                        "avg_pnl": stats["total_pnl"] / stats["total"],
-                    }
-
-            return performance
+            return aggregates.symbol_performance()
 
         except Exception as e:
             logger.warning(f"[BANKROLL] Error calculating symbol performance: {e}")
@@ -785,23 +888,19 @@ class BankrollManager:
         Args:
             is_win: True if the trade was profitable, False otherwise
         """
-        data = self._load_bankroll()
-
-        # Ensure win_loss_history exists (for backward compatibility)
-        if "win_loss_history" not in data:
-            data["win_loss_history"] = []
-
-        # Add the new outcome
-        data["win_loss_history"].append(is_win)
+        with self._ledger.transaction() as txn:
+            data = txn.summary
 
-        # Keep only the last 20 trades for LLM confidence calibration
-        if len(data["win_loss_history"]) > 20:
-            data["win_loss_history"] = data["win_loss_history"][-20:]
+            # Ensure win_loss_history exists (for backward compatibility)
+            if "win_loss_history" not in data:
+                data["win_loss_history"] = []
 
-        # Update last_updated timestamp
-        data["last_updated"] = datetime.now().isoformat()
+            # Add the new outcome
+            data["win_loss_history"].append(is_win)
 
-        self._save_bankroll(data)
+            # Keep only the last 20 trades for LLM confidence calibration
+            if len(data["win_loss_history"]) > 20:
+                data["win_loss_history"] = data["win_loss_history"][-20:]
 
         # Log the outcome with current win rate
         win_count = sum(data["win_loss_history"])
@@ -847,7 +946,7 @@ class BankrollManager:
 
     def get_performance_summary(self) -> Dict:
         """Get performance summary for reporting."""
-        data = self._load_bankroll()
+        data = self._load_summary()
 
         total_trades = data["total_trades"]
         winning_trades = data["winning_trades"]
@@ -909,69 +1008,73 @@ class BankrollManager:
             # Calculate actual premium cost
             actual_cost = fill_price * contracts * 100  # Options are per 100 shares
 
-            # Load current bankroll
-            data = self._load_bankroll()
-
-            # Find and update the position in trade history
-            position_found = False
-            old_cost = 0
-
-            for trade in data.get("trade_history", []):
-                if trade.get("position_id") == position_id:
-                    old_cost = trade.get("total_cost", 0)
-                    trade["entry_premium"] = fill_price
-                    trade["total_cost"] = actual_cost
-                    trade["fill_updated"] = True
-                    trade["fill_timestamp"] = datetime.now().isoformat()
-                    position_found = True
-                    break
-
-            if not position_found:
-                logger.warning(f"Position {position_id} not found in trade history")
-                return data
-
-            # Calculate the difference and adjust bankroll
-            cost_difference = actual_cost - old_cost
-            new_bankroll = data["current_bankroll"] - cost_difference
-
-            # Update bankroll
-            data["current_bankroll"] = new_bankroll
-            data["last_updated"] = datetime.now().isoformat()
-
-            # Write undo record to bankroll_history.csv
-            history_file = "bankroll_history.csv"
-            file_exists = os.path.exists(history_file)
-
-            with open(history_file, "a", newline="", encoding="utf-8") as f:
-                writer = csv.writer(f)
+            with self._ledger.transaction() as txn:
+                data = txn.summary
+
+                # Find and update the position in trade history
+                stored = txn.find_trade(position_id)
+                if stored is None:
+                    logger.warning(f"Position {position_id} not found in trade history")
+                    return data
+                trade = TradeRecord.from_dict(stored)
+
+                old_cost = trade.total_cost
+                fill_timestamp = datetime.now().isoformat()
+                txn.update_trade(position_id, {
+                    "entry_premium": fill_price,
+                    "total_cost": actual_cost,
+                    "fill_updated": True,
+                    "fill_timestamp": fill_timestamp,
+                })
+
+                # Calculate the difference and adjust bankroll
+                cost_difference = actual_cost - old_cost
+                new_bankroll = data["current_bankroll"] - cost_difference
+
+                # Update bankroll
+                data["current_bankroll"] = new_bankroll
+                txn.add_fill({
+                    "timestamp": fill_timestamp,
+                    "position_id": position_id,
+                    "symbol": trade.symbol,
+                    "fill_price": fill_price,
+                    "contracts": contracts,
+                    "cost_delta": -cost_difference,
+                    "new_bankroll": new_bankroll,
+                })
+
+                # Write undo record to bankroll_history.csv
+                history_file = "bankroll_history.csv"
+                file_exists = os.path.exists(history_file)
+
+                with open(history_file, "a", newline="", encoding="utf-8") as f:
+                    writer = csv.writer(f)
+
+                    # Write header if file doesn't exist
+                    if not file_exists:
+                        writer.writerow(
+                            [
+                                "timestamp",
+                                "position_id",
+                                "delta",
+                                "new_bankroll",
+                                "action",
+                                "fill_price",
+                            ]
+                        )
 
-                # Write header if file doesn't exist
-                if not file_exists:
+                    # Write undo record
                     writer.writerow(
                         [
-                            "timestamp",
-                            "position_id",
-                            "delta",
-                            "new_bankroll",
-                            "action",
-                            "fill_price",
+                            datetime.now().isoformat(),
+                            position_id,
+                            -cost_difference,  # Negative because we're subtracting more cost
+                            new_bankroll,
+                            "fill_adjustment",
+                            fill_price,
                         ]
                     )
-
-                # Write undo record
-                writer.writerow(
-                    [
-                        datetime.now().isoformat(),
-                        position_id,
-                        -cost_difference,  # Negative because we're subtracting more cost
-                        new_bankroll,
-                        "fill_adjustment",
-                        fill_price,
-                    ]
-                )
-
-            # Save updated bankroll
-            self._save_bankroll(data)
+            _publish_balance(self, new_bankroll)
 
             logger.info(
                 f"[BANKROLL] Applied fill ${fill_price:.2f} for {position_id}: "
@@ -0,0 +1,498 @@
+#!/usr/bin/env python3
+"""
+Bankroll Ledger Backends
+
+Storage backends for BankrollManager. The JSON backend keeps the original
+single-document bankroll file. The SQLite backend stores the same ledger in a
+WAL-mode database: one balance row, plus trades, fills and balance-update
+tables indexed by timestamp and symbol. Balance reads touch a single row
+regardless of trade history size, and every update runs in one
+BEGIN IMMEDIATE transaction so concurrent writers (trader, monitors, sync)
+cannot lose each other's updates.
+
+Key Features:
+- Pluggable backends behind one transaction API (summary + history appends)
+- SQLite WAL mode with single-row balance reads
+- Atomic read-modify-write updates across threads and processes
+- One-time migration from the existing bankroll JSON file
+- Backend chosen by configuration (BANKROLL_BACKEND), never by which files exist
+- Full-document load/save kept for backward compatibility
+
+Usage:
+    from utils.bankroll_ledger import open_bankroll_ledger
+
+    ledger = open_bankroll_ledger("bankroll_alpaca_paper.json", backend="sqlite")
+    print(ledger.balance())
+    with ledger.transaction() as txn:
+        txn.summary["current_bankroll"] += 12.50
+        txn.add_trade({"timestamp": "...", "symbol": "SPY", "realized_pnl": 12.50})
+
+Author: Robinhood HA Breakout System
+Version: 1.0.0
+License: MIT
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from utils.records import TradeRecord
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ("json", "sqlite")
+
+# Balance-row columns; other top-level keys are kept in the row's "extra" JSON
+SUMMARY_FIELDS = (
+    "current_bankroll",
+    "start_capital",
+    "total_trades",
+    "winning_trades",
+    "total_pnl",
+    "max_drawdown",
+    "peak_bankroll",
+    "created_at",
+    "last_updated",
+    "win_loss_history",
+)
+HISTORY_FIELDS = ("trade_history", "bankroll_updates")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS balance (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    current_bankroll REAL,
+    start_capital REAL,
+    total_trades INTEGER,
+    winning_trades INTEGER,
+    total_pnl REAL,
+    max_drawdown REAL,
+    peak_bankroll REAL,
+    created_at TEXT,
+    last_updated TEXT,
+    win_loss_history TEXT,
+    extra TEXT NOT NULL DEFAULT '{}'
+);
+CREATE TABLE IF NOT EXISTS trades (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT,
+    symbol TEXT,
+    position_id TEXT,
+    status TEXT,
+    realized_pnl REAL,
+    record TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_trades_timestamp ON trades(timestamp);
+CREATE INDEX IF NOT EXISTS idx_trades_symbol ON trades(symbol);
+CREATE INDEX IF NOT EXISTS idx_trades_position_id ON trades(position_id);
+CREATE TABLE IF NOT EXISTS fills (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT,
+    position_id TEXT,
+    symbol TEXT,
+    fill_price REAL,
+    contracts INTEGER,
+    cost_delta REAL,
+    new_bankroll REAL
+);
+CREATE INDEX IF NOT EXISTS idx_fills_timestamp ON fills(timestamp);
+CREATE INDEX IF NOT EXISTS idx_fills_symbol ON fills(symbol);
+CREATE TABLE IF NOT EXISTS balance_updates (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT,
+    old_amount REAL,
+    new_amount REAL,
+    change REAL,
+    reason TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_balance_updates_timestamp ON balance_updates(timestamp);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def _file_signature(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def sqlite_path_for(json_path: Union[str, Path]) -> Path:
+    """SQLite ledger path that sits next to a bankroll JSON file."""
+    return Path(json_path).with_suffix(".db")
+
+
+# config.yaml BANKROLL_BACKEND, cached by the file's stat signature
+_configured: Dict[str, Tuple[Optional[Tuple[int, int]], str]] = {}
+
+
+def configured_backend(config_path: Union[str, Path] = "config.yaml") -> str:
+    """BANKROLL_BACKEND from config.yaml ("json" if unset or unreadable)."""
+    path = Path(config_path)
+    if not path.exists():
+        path = Path(__file__).parent.parent / config_path
+    key = str(path)
+    signature = _file_signature(path)
+    cached = _configured.get(key)
+    if cached is not None and signature is not None and cached[0] == signature:
+        return cached[1]
+    try:
+        import yaml
+
+        with open(path, "r") as f:
+            config = yaml.safe_load(f) or {}
+        choice = str(config.get("BANKROLL_BACKEND") or "json")
+    except Exception as e:
+        logger.debug(f"[LEDGER] Could not read BANKROLL_BACKEND from {path}: {e}")
+        choice = "json"
+    _configured[key] = (signature, choice)
+    return choice
+
+
+def resolve_backend(json_path: Union[str, Path], backend: Optional[str] = None) -> str:
+    """Pick the ledger backend.
+
+    Explicit argument, then the BANKROLL_BACKEND environment variable, then
+    BANKROLL_BACKEND in config.yaml (default "json"). An existing database
+    file next to the JSON file never selects the backend on its own, so every
+    process reads and writes the same ledger.
+    """
+    choice = (backend or os.getenv("BANKROLL_BACKEND") or configured_backend()).strip().lower()
+    if choice not in BACKENDS:
+        raise ValueError(f"Unknown bankroll backend: {choice} (expected one of {BACKENDS})")
+    return choice
+
+
+def open_bankroll_ledger(json_path: Union[str, Path], backend: Optional[str] = None):
+    """Open the ledger for a bankroll JSON path with the resolved backend."""
+    if resolve_backend(json_path, backend) == "sqlite":
+        return SqliteBankrollLedger(sqlite_path_for(json_path), migrate_from=json_path)
+    return JsonBankrollLedger(json_path)
+
+
+# ----------------------------------------------------------------------
+# JSON backend
+# ----------------------------------------------------------------------
+
+_json_locks: Dict[str, threading.Lock] = {}
+_json_locks_guard = threading.Lock()
+
+
+class _JsonTransaction:
+    """Read-modify-write view of the whole JSON document."""
+
+    def __init__(self, data: Dict):
+        self.summary = data
+
+    def add_trade(self, record: Dict) -> None:
+        self.summary.setdefault("trade_history", []).append(record)
+
+    def add_balance_update(self, record: Dict) -> None:
+        self.summary.setdefault("bankroll_updates", []).append(record)
+
+    def find_trade(self, position_id: str) -> Optional[Dict]:
+        for trade in self.summary.get("trade_history", []):
+            if trade.get("position_id") == position_id:
+                return dict(trade)
+        return None
+
+    def update_trade(self, position_id: str, fields: Dict) -> bool:
+        for trade in self.summary.get("trade_history", []):
+            if trade.get("position_id") == position_id:
+                trade.update(fields)
+                return True
+        return False
+
+    def add_fill(self, record: Dict) -> None:
+        pass  # Fill details live on the trade record (and bankroll_history.csv)
+
+
+class JsonBankrollLedger:
+    """Original single-document bankroll JSON file."""
+
+    backend = "json"
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        with _json_locks_guard:
+            self._lock = _json_locks.setdefault(str(self.path.resolve()), threading.Lock())
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def _read(self, copy: bool = True) -> Dict:
+        """Document from the state service (stat-validated cache shared across readers)."""
+        from utils.state_daemon import get_state_service
+
+        data = get_state_service().read_json(self.path, copy=copy)
+        if data is None:
+            raise FileNotFoundError(self.path)
+        return data
+
+    def load(self) -> Dict:
+        return self._read()
+
+    def save(self, data: Dict) -> None:
+        from utils.state_daemon import invalidate_state
+
+        with open(self.path, "w") as f:
+            json.dump(data, f, indent=2)
+        invalidate_state(self.path)  # A same-size rewrite may keep the stat signature
+
+    def summary(self) -> Dict:
+        return self._read()
+
+    def balance(self) -> float:
+        return self._read(copy=False)["current_bankroll"]
+
+    def version(self) -> Tuple:
+        """Cheap change token (file stat signature); differs after any write by any process."""
+        return (_file_signature(self.path),)
+
+    @contextmanager
+    def transaction(self) -> Iterator[_JsonTransaction]:
+        """Load, yield for modification, save (serialized within this process)."""
+        with self._lock:
+            txn = _JsonTransaction(self.load())
+            yield txn
+            txn.summary["last_updated"] = datetime.now().isoformat()
+            self.save(txn.summary)
+
+
+# ----------------------------------------------------------------------
+# SQLite backend
+# ----------------------------------------------------------------------
+
+
+class _SqliteTransaction:
+    """Balance row as a dict plus history writes inside one SQLite transaction."""
+
+    def __init__(self, conn: sqlite3.Connection, summary: Dict):
+        self._conn = conn
+        self.summary = summary
+
+    def add_trade(self, record: Dict) -> None:
+        _insert_trades(self._conn, [record])
+
+    def add_balance_update(self, record: Dict) -> None:
+        _insert_balance_updates(self._conn, [record])
+
+    def _trade_row(self, position_id: str):
+        return self._conn.execute(
+            "SELECT id, record FROM trades WHERE position_id = ? ORDER BY id LIMIT 1", (position_id,)
+        ).fetchone()
+
+    def find_trade(self, position_id: str) -> Optional[Dict]:
+        row = self._trade_row(position_id)
+        return json.loads(row[1]) if row else None
+
+    def update_trade(self, position_id: str, fields: Dict) -> bool:
+        row = self._trade_row(position_id)
+        if row is None:
+            return False
+        record = json.loads(row[1])
+        record.update(fields)
+        trade = TradeRecord.from_dict(record)
+        self._conn.execute(
+            "UPDATE trades SET status = ?, realized_pnl = ?, record = ? WHERE id = ?",
+            (trade.status, trade.realized_pnl, json.dumps(record), row[0]),
+        )
+        return True
+
+    def add_fill(self, record: Dict) -> None:
+        self._conn.execute(
+            "INSERT INTO fills (timestamp, position_id, symbol, fill_price, contracts, cost_delta, new_bankroll) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                record.get("timestamp"),
+                record.get("position_id"),
+                record.get("symbol"),
+                record.get("fill_price"),
+                record.get("contracts"),
+                record.get("cost_delta"),
+                record.get("new_bankroll"),
+            ),
+        )
+
+
+def _insert_trades(conn: sqlite3.Connection, records: List[Dict]) -> None:
+    # Indexed columns come from the parsed record; the stored JSON keeps every field
+    rows = []
+    for r in records:
+        trade = TradeRecord.from_dict(r)
+        rows.append(
+            (trade.timestamp, trade.symbol, trade.position_id or None, trade.status, trade.realized_pnl, json.dumps(r))
+        )
+    conn.executemany(
+        "INSERT INTO trades (timestamp, symbol, position_id, status, realized_pnl, record) VALUES (?, ?, ?, ?, ?, ?)",
+        rows,
+    )
+
+
+def _insert_balance_updates(conn: sqlite3.Connection, records: List[Dict]) -> None:
+    conn.executemany(
+        "INSERT INTO balance_updates (timestamp, old_amount, new_amount, change, reason) VALUES (?, ?, ?, ?, ?)",
+        [(r.get("timestamp"), r.get("old_amount"), r.get("new_amount"), r.get("change"), r.get("reason")) for r in records],
+    )
+
+
+class SqliteBankrollLedger:
+    """Bankroll ledger in a WAL-mode SQLite database."""
+
+    backend = "sqlite"
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        migrate_from: Optional[Union[str, Path]] = None,
+        timeout: float = 30.0,
+    ):
+        """Open (and create/migrate) the ledger database.
+
+        Args:
+            path: Database file
+            migrate_from: Bankroll JSON file imported when the database has no
+                balance row yet
+            timeout: Seconds to wait for another writer's lock
+        """
+        self.path = Path(path)
+        self.timeout = timeout
+        self._local = threading.local()
+
+        conn = self._conn()
+        conn.executescript(_SCHEMA)
+        if migrate_from is not None and not self.exists() and Path(migrate_from).exists():
+            self.migrate_from_json(migrate_from)
+
+    def _conn(self) -> sqlite3.Connection:
+        # One connection per thread; autocommit mode with explicit BEGIN IMMEDIATE for writes
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.path), timeout=self.timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def exists(self) -> bool:
+        return self._conn().execute("SELECT 1 FROM balance WHERE id = 1").fetchone() is not None
+
+    # -- reads ---------------------------------------------------------
+
+    def balance(self) -> float:
+        row = self._conn().execute("SELECT current_bankroll FROM balance WHERE id = 1").fetchone()
+        if row is None:
+            raise KeyError("current_bankroll")
+        return row[0]
+
+    def summary(self) -> Dict:
+        return self._read_summary(self._conn())
+
+    def version(self) -> Tuple:
+        """Cheap change token (database and WAL stat signatures); differs after any commit by any process."""
+        return (_file_signature(self.path), _file_signature(self.path.with_name(self.path.name + "-wal")))
+
+    @staticmethod
+    def _read_summary(conn: sqlite3.Connection) -> Dict:
+        row = conn.execute(f"SELECT {', '.join(SUMMARY_FIELDS)}, extra FROM balance WHERE id = 1").fetchone()
+        if row is None:
+            raise KeyError("bankroll ledger has no balance row")
+        summary = json.loads(row[-1] or "{}")
+        for name, value in zip(SUMMARY_FIELDS, row):
+            if value is not None:
+                summary[name] = json.loads(value) if name == "win_loss_history" else value
+        return summary
+
+    def load(self) -> Dict:
+        """Full document in the JSON backend's shape (includes all history)."""
+        conn = self._conn()
+        data = self._read_summary(conn)
+        data["trade_history"] = [json.loads(r[0]) for r in conn.execute("SELECT record FROM trades ORDER BY id")]
+        data["bankroll_updates"] = [
+            {"timestamp": r[0], "old_amount": r[1], "new_amount": r[2], "change": r[3], "reason": r[4]}
+            for r in conn.execute(
+                "SELECT timestamp, old_amount, new_amount, change, reason FROM balance_updates ORDER BY id"
+            )
+        ]
+        return data
+
+    def fills(self, position_id: Optional[str] = None) -> List[Dict]:
+        query = "SELECT timestamp, position_id, symbol, fill_price, contracts, cost_delta, new_bankroll FROM fills"
+        args: tuple = ()
+        if position_id is not None:
+            query += " WHERE position_id = ?"
+            args = (position_id,)
+        columns = ("timestamp", "position_id", "symbol", "fill_price", "contracts", "cost_delta", "new_bankroll")
+        return [dict(zip(columns, row)) for row in self._conn().execute(query + " ORDER BY id", args)]
+
+    # -- writes --------------------------------------------------------
+
+    @contextmanager
+    def _immediate(self) -> Iterator[sqlite3.Connection]:
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")  # Take the write lock before reading
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    @staticmethod
+    def _write_summary(conn: sqlite3.Connection, summary: Dict) -> None:
+        values = [summary.get(name) for name in SUMMARY_FIELDS]
+        wl_index = SUMMARY_FIELDS.index("win_loss_history")
+        if values[wl_index] is not None:
+            values[wl_index] = json.dumps(values[wl_index])
+        extra = {k: v for k, v in summary.items() if k not in SUMMARY_FIELDS and k not in HISTORY_FIELDS}
+        conn.execute(
+            f"INSERT OR REPLACE INTO balance (id, {', '.join(SUMMARY_FIELDS)}, extra) "
+            f"VALUES (1, {', '.join('?' * len(SUMMARY_FIELDS))}, ?)",
+            (*values, json.dumps(extra)),
+        )
+
+    @contextmanager
+    def transaction(self) -> Iterator[_SqliteTransaction]:
+        """Atomic update: the balance row and history writes commit together."""
+        with self._immediate() as conn:
+            txn = _SqliteTransaction(conn, self._read_summary(conn))
+            yield txn
+            txn.summary["last_updated"] = datetime.now().isoformat()
+            self._write_summary(conn, txn.summary)
+
+    def save(self, data: Dict) -> None:
+        """Replace the whole ledger with a JSON-shaped document."""
+        with self._immediate() as conn:
+            conn.execute("DELETE FROM trades")
+            conn.execute("DELETE FROM balance_updates")
+            self._write_summary(conn, data)
+            _insert_trades(conn, data.get("trade_history") or [])
+            _insert_balance_updates(conn, data.get("bankroll_updates") or [])
+
+    def migrate_from_json(self, json_path: Union[str, Path]) -> int:
+        """Import a bankroll JSON file; returns the number of trades imported."""
+        with open(json_path, "r") as f:
+            data = json.load(f)
+        self.save(data)
+        trades = len(data.get("trade_history") or [])
+        self._conn().execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('migrated_from', ?)",
+            (json.dumps({"path": str(json_path), "trades": trades, "at": datetime.now().isoformat()}),),
+        )
+        logger.info(f"[BANKROLL] Migrated {json_path} ({trades} trades) to SQLite ledger {self.path}")
+        return trades
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Cooldown Registry
+
+In-memory registry for short-lived trading cooldowns (API-error cooldowns,
+expiry-selection cooldowns) shared by every caller in the process.
+
+Key Features:
+- Lookups served from memory; no disk I/O on the hot path
+- Expiry tracked on the monotonic clock (immune to wall-clock jumps)
+- Thread-safe access
+- Write-behind persistence: changes are coalesced and written atomically
+  by a background thread, and flushed on interpreter exit
+- Unexpired cooldowns reloaded from disk at startup
+
+Cooldowns are grouped by namespace (e.g. "api", "expiry"). The legacy flat
+{symbol: iso_timestamp} file format is read as the "api" namespace.
+
+Author: Robinhood HA Breakout System
+Version: 1.0.0
+License: MIT
+"""
+
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_COOLDOWN_FILE = ".cache/alpaca_api_cooldowns.json"
+
+# Namespace used for entries loaded from the legacy flat file format
+LEGACY_NAMESPACE = "api"
+
+
+class CooldownRegistry:
+    """Thread-safe in-memory cooldown registry with write-behind persistence."""
+
+    def __init__(self, path: Optional[str] = DEFAULT_COOLDOWN_FILE, flush_delay_s: float = 1.0):
+        """Initialize registry and reload unexpired cooldowns from disk.
+
+        Args:
+            path: Persistence file (None keeps cooldowns in memory only)
+            flush_delay_s: Coalescing delay before dirty state is written
+        """
+        self.path = path
+        self.flush_delay_s = flush_delay_s
+        self._lock = threading.Lock()
+        # namespace -> key -> (monotonic deadline, wall-clock expiry)
+        self._entries: Dict[str, Dict[str, Tuple[float, datetime]]] = {}
+        self._dirty = False
+        self._wake = threading.Event()
+        self._closed = False
+        self._writer: Optional[threading.Thread] = None
+
+        self._load()
+
+    def add(self, namespace: str, key: str, seconds: float) -> datetime:
+        """Start (or extend) a cooldown.
+
+        Args:
+            namespace: Cooldown category (e.g. "api", "expiry")
+            key: Cooldown key, usually a symbol
+            seconds: Cooldown duration
+
+        Returns:
+            Wall-clock time the cooldown ends
+        """
+        until = datetime.now() + timedelta(seconds=seconds)
+        with self._lock:
+            self._entries.setdefault(namespace, {})[key] = (time.monotonic() + seconds, until)
+            self._mark_dirty()
+        return until
+
+    def is_active(self, namespace: str, key: str) -> bool:
+        """Check whether a cooldown is active, dropping it if it has expired."""
+        return self.remaining(namespace, key) > 0
+
+    def remaining(self, namespace: str, key: str) -> float:
+        """Seconds left on a cooldown (0.0 if none)."""
+        with self._lock:
+            entry = self._entries.get(namespace, {}).get(key)
+            if entry is None:
+                return 0.0
+            left = entry[0] - time.monotonic()
+            if left <= 0:
+                del self._entries[namespace][key]
+                self._mark_dirty()
+                return 0.0
+            return left
+
+    def expires_at(self, namespace: str, key: str) -> Optional[datetime]:
+        """Wall-clock end of an active cooldown, or None."""
+        if not self.is_active(namespace, key):
+            return None
+        with self._lock:
+            entry = self._entries.get(namespace, {}).get(key)
+            return entry[1] if entry else None
+
+    def clear(self, namespace: str, key: Optional[str] = None) -> None:
+        """Clear one cooldown, or every cooldown in a namespace."""
+        with self._lock:
+            if key is None:
+                removed = self._entries.pop(namespace, None) is not None
+            else:
+                removed = self._entries.get(namespace, {}).pop(key, None) is not None
+            if removed:
+                self._mark_dirty()
+
+    def active(self, namespace: str) -> Dict[str, datetime]:
+        """Snapshot of active cooldowns in a namespace (key -> wall-clock expiry)."""
+        now = time.monotonic()
+        with self._lock:
+            return {
+                key: until
+                for key, (deadline, until) in self._entries.get(namespace, {}).items()
+                if deadline > now
+            }
+
+    def flush(self) -> None:
+        """Write pending changes to disk immediately."""
+        if not self.path:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            now = time.monotonic()
+            snapshot = {
+                namespace: {
+                    key: until.isoformat()
+                    for key, (deadline, until) in entries.items()
+                    if deadline > now
+                }
+                for namespace, entries in self._entries.items()
+            }
+            self._dirty = False
+
+        tmp_path = f"{self.path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({k: v for k, v in snapshot.items() if v}, f)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.warning(f"[COOLDOWN] Failed to persist cooldowns: {e}")
+            with self._lock:
+                self._dirty = True
+
+    def close(self) -> None:
+        """Flush pending changes and stop the background writer."""
+        self._closed = True
+        self._wake.set()
+        if self._writer and self._writer.is_alive():
+            self._writer.join(timeout=self.flush_delay_s + 1)
+        self.flush()
+
+    def _mark_dirty(self) -> None:
+        # Caller holds self._lock
+        self._dirty = True
+        if not self.path:
+            return
+        if self._writer is None or not self._writer.is_alive():
+            self._writer = threading.Thread(target=self._write_loop, name="cooldown-writer", daemon=True)
+            self._writer.start()
+        self._wake.set()
+
+    def _write_loop(self) -> None:
+        while not self._closed:
+            self._wake.wait()
+            if self._closed:
+                break
+            # Coalesce bursts of changes into one write
+            time.sleep(self.flush_delay_s)
+            self._wake.clear()
+            self.flush()
+
+    def _load(self) -> None:
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                raw = json.load(f)
+        except (json.JSONDecodeError, IOError) as e:
+            logger.warning(f"[COOLDOWN] Ignoring unreadable cooldown file {self.path}: {e}")
+            return
+
+        if any(isinstance(v, str) for v in raw.values()):
+            raw = {LEGACY_NAMESPACE: {k: v for k, v in raw.items() if isinstance(v, str)}}
+
+        now_wall = datetime.now()
+        now_mono = time.monotonic()
+        loaded = 0
+        for namespace, entries in raw.items():
+            if not isinstance(entries, dict):
+                continue
+            for key, value in entries.items():
+                try:
+                    until = datetime.fromisoformat(value)
+                except (TypeError, ValueError):
+                    continue
+                left = (until - now_wall).total_seconds()
+                if left > 0:
+                    self._entries.setdefault(namespace, {})[key] = (now_mono + left, until)
+                    loaded += 1
+        if loaded:
+            logger.info(f"[COOLDOWN] Restored {loaded} active cooldown(s) from {self.path}")
+
+
+# Global registry instance
+_global_cooldown_registry: Optional[CooldownRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_cooldown_registry(path: str = DEFAULT_COOLDOWN_FILE) -> CooldownRegistry:
+    """Get global cooldown registry instance.
+
+    Args:
+        path: Persistence file (only used on first call)
+
+    Returns:
+        Global CooldownRegistry instance
+    """
+    global _global_cooldown_registry
+    with _registry_lock:
+        if _global_cooldown_registry is None:
+            _global_cooldown_registry = CooldownRegistry(path)
+            atexit.register(_global_cooldown_registry.close)
+        return _global_cooldown_registry
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+CSV Tail Reader
+
+Reads the last N rows of a CSV log without reading the whole file. The file
+is scanned backwards from the end in fixed-size blocks until enough record
+boundaries are found, then only that tail is parsed with the file's header
+row. A newline ends a record only if the number of quote characters after it
+is even, so quoted fields that span lines are never split. (CSV escapes
+quotes by doubling them, so they do not affect parity.) The cost depends on
+the size of the last N rows, not on the size of the file.
+
+Key Features:
+- Backward block scan from EOF (constant work for a fixed N)
+- Rows keyed by the file's own header (same shape as csv.DictReader)
+- Multiline quoted fields handled via quote parity
+- A row still being written (open quoted field at EOF) is ignored
+
+Usage:
+    from utils.csv_tail import tail_csv_rows
+
+    rows = tail_csv_rows("logs/trade_history_alpaca_paper.csv", 5)
+
+Author: Robinhood HA Breakout System
+Version: 1.0.0
+License: MIT
+"""
+
+import csv
+import io
+import os
+from pathlib import Path
+from typing import BinaryIO, Dict, List, Optional, Tuple, Union
+
+DEFAULT_BLOCK_SIZE = 64 * 1024
+_QUOTE = b'"'
+_NEWLINE = b"\n"
+_BOM = b"\xef\xbb\xbf"
+
+
+def _read_header(f: BinaryIO, size: int, block_size: int) -> Tuple[Optional[bytes], int]:
+    """Locate the header record.
+
+    Returns:
+        (header bytes without any UTF-8 BOM, or None if the file has no
+        complete header; offset of the first data byte)
+    """
+    f.seek(0)
+    buf = b""
+    quotes = 0
+    scanned = 0
+    while scanned < size:
+        block = f.read(min(block_size, size - scanned))
+        if not block:
+            break
+        start = len(buf)
+        buf += block
+        scanned += len(block)
+        pos = buf.find(_NEWLINE, start)
+        while pos != -1:
+            quotes_before = quotes + buf.count(_QUOTE, start, pos)
+            if quotes_before % 2 == 0:
+                skip = len(_BOM) if buf.startswith(_BOM) else 0
+                return buf[skip:pos + 1], pos + 1
+            quotes, start = quotes_before, pos
+            pos = buf.find(_NEWLINE, pos + 1)
+        quotes += buf.count(_QUOTE, start)
+    return None, size
+
+
+def _data_end(f: BinaryIO, size: int, data_start: int, block_size: int) -> int:
+    """End of the last complete record.
+
+    csv.writer terminates every row, so a missing final newline normally means
+    a row is being written. Whether that row sits inside an open quoted field
+    depends on the quote parity of everything before it, so this (rare) case
+    counts quotes forward once. A balanced last row is kept (as DictReader
+    would); an unterminated quoted field drops the whole unfinished row.
+    """
+    if size <= data_start:
+        return data_start
+    f.seek(size - 1)
+    if f.read(1) == _NEWLINE:
+        return size
+
+    f.seek(data_start)
+    quotes = 0
+    for block in iter(lambda: f.read(block_size), b""):
+        quotes += block.count(_QUOTE)
+    if quotes % 2 == 0:
+        return size
+
+    # Inside an open quote: the unfinished row starts at the last newline with
+    # an odd number of quotes after it
+    pos = size
+    quotes = 0
+    while pos > data_start:
+        lo = max(data_start, pos - block_size)
+        f.seek(lo)
+        block = f.read(pos - lo)
+        end = len(block)
+        nl = block.rfind(_NEWLINE)
+        while nl != -1:
+            quotes += block.count(_QUOTE, nl + 1, end)
+            if quotes % 2 == 1:
+                return lo + nl + 1
+            end = nl + 1
+            nl = block.rfind(_NEWLINE, 0, nl)
+        quotes += block.count(_QUOTE, 0, end)
+        pos = lo
+    return data_start
+
+
+def tail_csv_rows(
+    path: Union[str, Path],
+    n: int,
+    encoding: str = "utf-8",
+    block_size: int = DEFAULT_BLOCK_SIZE,
+) -> List[Dict[str, Optional[str]]]:
+    """Return the last *n* data rows of a CSV file as dicts keyed by its header.
+
+    Rows are shaped like csv.DictReader rows (missing fields are None, extra
+    fields are collected under the None key, blank lines are skipped).
+
+    Args:
+        path: CSV file with a header row
+        n: Number of rows to return
+        encoding: Text encoding of the file
+        block_size: Bytes read per backward step
+
+    Returns:
+        Up to n rows, oldest first; [] if the file is missing or has no data rows
+    """
+    if n <= 0:
+        return []
+    try:
+        size = os.path.getsize(path)
+    except OSError:
+        return []
+
+    with open(path, "rb") as f:
+        header_bytes, data_start = _read_header(f, size, block_size)
+        if header_bytes is None:
+            return []
+        fieldnames = next(csv.reader(io.StringIO(header_bytes.decode(encoding), newline="")), None)
+        if not fieldnames:
+            return []
+        data_end = _data_end(f, size, data_start, block_size)
+
+        # Record start offsets found so far, newest first
+        cuts: List[int] = []
+        quotes = 0  # Quote characters in [pos, data_end)
+        pos = data_end
+        want = n
+        while True:
+            while len(cuts) < want and pos > data_start:
+                lo = max(data_start, pos - block_size)
+                f.seek(lo)
+                block = f.read(pos - lo)
+                end = len(block)
+                nl = block.rfind(_NEWLINE)
+                while nl != -1:
+                    quotes += block.count(_QUOTE, nl + 1, end)
+                    end = nl + 1
+                    cut = lo + nl + 1
+                    if quotes % 2 == 0 and cut < data_end:
+                        cuts.append(cut)
+                    nl = block.rfind(_NEWLINE, 0, nl)
+                quotes += block.count(_QUOTE, 0, end)
+                pos = lo
+
+            start = cuts[want - 1] if len(cuts) >= want else data_start
+            f.seek(start)
+            text = f.read(data_end - start).decode(encoding)
+            rows = list(csv.DictReader(io.StringIO(text, newline=""), fieldnames=fieldnames))
+            if len(rows) >= n or start == data_start:
+                return rows[-n:]
+            want += n - len(rows)  # Blank lines yield no row: look further back
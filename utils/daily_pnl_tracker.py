@@ -3,17 +3,23 @@ Daily P&L Tracking System for US-FA-004 Daily Drawdown Circuit Breaker
 
 This module provides real-time daily P&L tracking across all broker environments
 to support the daily drawdown circuit breaker functionality.
+
+Current balances are cached in memory and driven by ledger events: every
+BankrollManager write in this process (fills, closes, manual updates) pushes
+the new balance here, and the running daily total is updated in O(1). Writes
+by other processes are caught by the ledger's stat-based version token, so a
+gate check costs one stat() instead of a ledger read.
 """
 
-import json
 import logging
 from datetime import datetime, time
 from pathlib import Path
 from typing import Dict, Tuple, Optional
 import pytz
 
-from .bankroll import BankrollManager
+from .bankroll import BankrollManager, add_balance_listener
 from .scoped_files import get_scoped_paths
+from .state_store import get_state_store
 
 logger = logging.getLogger(__name__)
 
@@ -36,6 +42,7 @@ class DailyPnLTracker:
     def __init__(self, config: Dict):
         self.config = config
         self.state_file = Path("daily_pnl_tracker.json")
+        self._store = get_state_store().namespace("daily_pnl", self.state_file)
         self.market_open_time = time(9, 30)  # 9:30 AM ET
         
         # Get current broker and environment from config
@@ -43,18 +50,24 @@ class DailyPnLTracker:
         self.current_env = config.get("ALPACA_ENV", "paper") if self.current_broker == "alpaca" else "live"
         
         self._state = self._load_state()
+        # One BankrollManager per ledger, reused for every balance read
+        self._bankroll_managers: Dict[Tuple[str, str], BankrollManager] = {}
+        # Cached balances by ledger ID, with the ledger version they were read at
+        self._balances: Dict[str, float] = {}
+        self._ledger_versions: Dict[str, Optional[Tuple]] = {}
+        self.balance_reads = 0
+        self.balance_events = 0
+        add_balance_listener(self._on_balance_change)
         
     def _load_state(self) -> Dict:
-        """Load daily P&L tracking state from file"""
+        """Load daily P&L tracking state (served from the state store)"""
         try:
-            if self.state_file.exists():
-                with open(self.state_file, 'r') as f:
-                    state = json.load(f)
-                    logger.debug(f"[DAILY-PNL] Loaded state: {state}")
-                    return state
-            else:
-                logger.info(f"[DAILY-PNL] No existing state file, creating new tracking state")
-                return self._create_new_state()
+            state = self._store.load()
+            if isinstance(state, dict):
+                logger.debug(f"[DAILY-PNL] Loaded state: {state}")
+                return state
+            logger.info(f"[DAILY-PNL] No usable state file, creating new tracking state")
+            return self._create_new_state()
         except Exception as e:
             logger.error(f"[DAILY-PNL] Error loading state: {e}, creating new state")
             return self._create_new_state()
@@ -73,10 +86,9 @@ class DailyPnLTracker:
         return state
     
     def _save_state(self, state: Dict):
-        """Save state to file"""
+        """Save state (coalesced write through the state store)"""
         try:
-            with open(self.state_file, 'w') as f:
-                json.dump(state, f, indent=2)
+            self._store.save(state)
             logger.debug(f"[DAILY-PNL] Saved state to {self.state_file}")
         except Exception as e:
             logger.error(f"[DAILY-PNL] Error saving state: {e}")
@@ -109,11 +121,45 @@ class DailyPnLTracker:
         # Only return the currently active environment to avoid logging inactive environments
         return [(self.current_broker, self.current_env)]
     
+    def _bankroll_manager(self, broker: str, env: str) -> BankrollManager:
+        bankroll_manager = self._bankroll_managers.get((broker, env))
+        if bankroll_manager is None:
+            bankroll_manager = BankrollManager(
+                broker=broker, env=env, backend=self.config.get("BANKROLL_BACKEND")
+            )
+            self._bankroll_managers[(broker, env)] = bankroll_manager
+        return bankroll_manager
+
+    @staticmethod
+    def _ledger_version(bankroll_manager: BankrollManager) -> Optional[Tuple]:
+        """Ledger change token, or None if unavailable (the balance is then always re-read)."""
+        try:
+            version = bankroll_manager.ledger_version()
+        except Exception:
+            return None
+        return version if isinstance(version, tuple) else None
+
+    def _on_balance_change(self, writer: BankrollManager, balance: float):
+        """Ledger event: a BankrollManager in this process wrote a new balance."""
+        bankroll_manager = self._bankroll_managers.get((writer.broker, writer.env))
+        if bankroll_manager is None or Path(writer.bankroll_file).resolve() != Path(bankroll_manager.bankroll_file).resolve():
+            return  # Not a ledger this tracker reads
+        ledger_id = writer.ledger_id()
+        self.balance_events += 1
+        self._balances[ledger_id] = float(balance)
+        self._ledger_versions[ledger_id] = self._ledger_version(bankroll_manager)
+
     def _get_current_balance(self, broker: str, env: str) -> float:
-        """Get current balance for a specific broker/environment"""
+        """Get current balance for a specific broker/environment (cached until the ledger changes)"""
+        ledger_id = f"{broker}:{env}"
         try:
-            bankroll_manager = BankrollManager(broker=broker, env=env)
+            bankroll_manager = self._bankroll_manager(broker, env)
+            version = self._ledger_version(bankroll_manager)
+            if version is not None and ledger_id in self._balances and version == self._ledger_versions.get(ledger_id):
+                return self._balances[ledger_id]
+
             current_balance = bankroll_manager.get_current_bankroll()
+            self.balance_reads += 1
             
             # Ensure balance is a float for formatting
             if isinstance(current_balance, str):
@@ -124,6 +170,8 @@ class DailyPnLTracker:
                     return 0.0
             
             logger.debug(f"[DAILY-PNL] {broker}:{env} current balance: ${current_balance:.2f}")
+            self._balances[ledger_id] = float(current_balance)
+            self._ledger_versions[ledger_id] = version
             return float(current_balance)
         except Exception as e:
             logger.warning(f"[DAILY-PNL] Error getting balance for {broker}:{env}: {e}")
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Buffered Decision Log
+
+Buffers NO_TRADE / blocked decision rows bound for the trade-history CSV.
+With 10+ symbols scanned every minute, most trade-log writes are rejected
+symbols, and each one used to open, append and close the file. Rows now
+collect in memory per trade log and are written with a single writerows()
+(and mirrored to the trade archive as one batch):
+
+- when a scan ends (the scanner wraps each scan in batch())
+- once DECISION_LOG_BUFFER_ROWS rows are pending
+- once the oldest pending row is DECISION_LOG_FLUSH_SECONDS old
+- before any unbuffered row (an executed trade) is appended to the same file
+- on interpreter exit, and when a batch() block exits with an error
+
+A failed write keeps the rows buffered for the next flush instead of
+dropping them.
+
+Key Features:
+- Per-file in-memory row buffers, one batched append per flush
+- Scan-scoped batches (nested and thread-safe)
+- Size and age thresholds with a background timer
+- Guaranteed flush on shutdown and on error
+
+Usage:
+    from utils.decision_log import get_decision_log
+
+    decisions = get_decision_log()
+    with decisions.batch():
+        decisions.log(log_file, {"symbol": "SPY", "decision": "NO_TRADE", ...})
+    # Rows are on disk here
+
+Author: Robinhood HA Breakout System
+Version: 1.0.0
+License: MIT
+"""
+
+import atexit
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ROWS = 200
+DEFAULT_MAX_AGE_S = 30.0
+
+
+class DecisionLogBuffer:
+    """In-memory buffers of trade-log rows, written in batches."""
+
+    def __init__(self, max_rows: int = DEFAULT_MAX_ROWS, max_age_s: float = DEFAULT_MAX_AGE_S):
+        """Initialize the buffer.
+
+        Args:
+            max_rows: Pending rows (across all files) that trigger a flush
+            max_age_s: Age of the oldest pending row that triggers a flush
+        """
+        self.max_rows = int(max_rows)
+        self.max_age_s = float(max_age_s)
+        self._lock = threading.RLock()
+        self._pending: Dict[str, List[List]] = {}  # log file -> rows
+        self._pending_rows = 0
+        self._oldest: Optional[float] = None
+        self._timer: Optional[threading.Timer] = None
+        self._batch_depth = 0
+        self._closed = False
+        self.logged = 0
+        self.flushes = 0
+        self.rows_written = 0
+        self.failed_flushes = 0
+
+    @property
+    def pending(self) -> int:
+        return self._pending_rows
+
+    def log(self, log_file: str, trade_data: Dict) -> None:
+        """Buffer one decision row for log_file."""
+        from .logging_utils import trade_log_row
+
+        row = trade_log_row(trade_data)
+        log_file = os.path.abspath(log_file)
+        with self._lock:
+            if self._closed:
+                # No flusher after shutdown, and the archive's exit flush may have run
+                if self._write(log_file, [row]):
+                    from .trade_archive import flush_trade_archives
+
+                    flush_trade_archives()
+                return
+            self._pending.setdefault(log_file, []).append(row)
+            self._pending_rows += 1
+            self.logged += 1
+            if self._oldest is None:
+                self._oldest = time.monotonic()
+                self._start_timer()
+            if self._pending_rows >= self.max_rows or time.monotonic() - self._oldest >= self.max_age_s:
+                self.flush()
+
+    @contextmanager
+    def batch(self) -> Iterator["DecisionLogBuffer"]:
+        """Scope of one scan: pending rows are flushed when the outermost batch exits."""
+        with self._lock:
+            self._batch_depth += 1
+        failed = True
+        try:
+            yield self
+            failed = False
+        finally:
+            with self._lock:
+                self._batch_depth -= 1
+                outermost = self._batch_depth == 0
+            if outermost or failed:
+                self.flush()  # On error: get whatever was logged before the failure onto disk
+
+    def flush(self, log_file: Optional[str] = None) -> int:
+        """Write pending rows (for one file, or all).
+
+        Returns:
+            Rows written
+        """
+        with self._lock:
+            files = [os.path.abspath(log_file)] if log_file is not None else list(self._pending)
+            written = 0
+            for path in files:
+                rows = self._pending.get(path)
+                if not rows:
+                    continue
+                if not self._write(path, rows):
+                    continue  # Kept for the next flush
+                del self._pending[path]
+                self._pending_rows -= len(rows)
+                written += len(rows)
+            if self._pending_rows == 0:
+                self._oldest = None
+                self._cancel_timer()
+            elif self._timer is None and not self._closed:
+                self._oldest = time.monotonic()  # Rows kept after a failed write: retry later
+                self._start_timer()
+            return written
+
+    def close(self) -> None:
+        """Flush everything; later rows are written through immediately.
+
+        The trade archive is flushed afterwards: at exit its own handler may
+        already have run (atexit is last-in first-out), and rows mirrored by
+        this final write would otherwise stay in its buffer.
+        """
+        from .trade_archive import flush_trade_archives
+
+        with self._lock:
+            written = self.flush()
+            self._closed = True
+            self._cancel_timer()
+            if self._pending_rows:
+                logger.error(
+                    f"[DECISION-LOG] {self._pending_rows} NO_TRADE row(s) could not be written at shutdown"
+                )
+        if written:
+            flush_trade_archives()
+
+    def _write(self, log_file: str, rows: List[List]) -> bool:
+        from .logging_utils import append_trade_rows
+
+        try:
+            append_trade_rows(log_file, rows)
+        except Exception as e:
+            self.failed_flushes += 1
+            logger.error(f"[DECISION-LOG] Could not write {len(rows)} row(s) to {log_file}: {e}")
+            return False
+        self.flushes += 1
+        self.rows_written += len(rows)
+        logger.debug(f"[DECISION-LOG] Wrote {len(rows)} decision row(s) to {log_file}")
+        return True
+
+    def _start_timer(self) -> None:
+        # Caller holds self._lock
+        self._cancel_timer()
+        self._timer = threading.Timer(self.max_age_s, self._on_timer)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _cancel_timer(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _on_timer(self) -> None:
+        with self._lock:
+            self._timer = None
+            self.flush()
+
+    def metrics(self) -> Dict[str, int]:
+        return {
+            "logged": self.logged,
+            "pending": self._pending_rows,
+            "flushes": self.flushes,
+            "rows_written": self.rows_written,
+            "failed_flushes": self.failed_flushes,
+        }
+
+
+# Global buffer instance
+_decision_log: Optional[DecisionLogBuffer] = None
+_decision_log_lock = threading.Lock()
+
+
+def get_decision_log() -> DecisionLogBuffer:
+    """Get global decision log buffer (thresholds from config, flushed at exit)."""
+    global _decision_log
+    with _decision_log_lock:
+        if _decision_log is None:
+            try:
+                from utils.llm import load_config
+
+                config = load_config()
+            except Exception:
+                config = {}
+            _decision_log = DecisionLogBuffer(
+                max_rows=config.get("DECISION_LOG_BUFFER_ROWS", DEFAULT_MAX_ROWS),
+                max_age_s=config.get("DECISION_LOG_FLUSH_SECONDS", DEFAULT_MAX_AGE_S),
+            )
+            atexit.register(_decision_log.close)
+        return _decision_log
+
+
+def log_no_trade(log_file: str, trade_data: Dict) -> None:
+    """Buffer a NO_TRADE / blocked decision row for the trade log."""
+    get_decision_log().log(log_file, trade_data)
+
+
+def flush_pending_decisions(log_file: Optional[str] = None) -> int:
+    """Write buffered rows (for one file, or all) if a buffer exists.
+
+    Returns:
+        Rows written
+    """
+    buffer = _decision_log
+    if buffer is None or not buffer.pending:
+        return 0
+    return buffer.flush(log_file)
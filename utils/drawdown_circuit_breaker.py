@@ -9,8 +9,7 @@ from utils.logging_utils import setup_logging
 from utils.llm import load_config
 from utils.enhanced_slack import EnhancedSlackIntegration
 from utils.weekly_pnl_tracker import WeeklyPnLTracker
-import json
-import os
+from utils.state_store import get_state_store
 import logging
 from datetime import datetime, time
 from typing import Dict, List, Optional, Tuple
@@ -56,6 +55,7 @@ class DrawdownCircuitBreaker:
         else:
             self.config = load_config(config_or_path)
         self.state_file = Path.cwd() / "circuit_breaker_state.json"
+        self._store = get_state_store().namespace("circuit_breaker", self.state_file)
         self.slack = EnhancedSlackIntegration()
         
         # Load daily configuration
@@ -91,16 +91,14 @@ class DrawdownCircuitBreaker:
         logger.info(f"[CIRCUIT-BREAKER] Initialized - Daily: {self.enabled} ({self.threshold_percent}%), Weekly: {self.weekly_enabled} ({self.weekly_threshold_percent}%)")
         
     def _load_state(self) -> Dict:
-        """Load circuit breaker state from file"""
+        """Load circuit breaker state from the state store"""
         try:
-            if os.path.exists(self.state_file):
-                with open(self.state_file, 'r') as f:
-                    state = json.load(f)
-                    logger.debug(f"[CIRCUIT-BREAKER] Loaded state: {state}")
-                    return state
-            else:
-                logger.info(f"[CIRCUIT-BREAKER] No existing state file, creating new state")
-                return self._create_new_state()
+            state = self._store.load()
+            if isinstance(state, dict):
+                logger.debug(f"[CIRCUIT-BREAKER] Loaded state: {state}")
+                return state
+            logger.info(f"[CIRCUIT-BREAKER] No usable state file, creating new state")
+            return self._create_new_state()
         except Exception as e:
             logger.error(f"[CIRCUIT-BREAKER] Error loading state: {e}, creating new state")
             return self._create_new_state()
@@ -122,10 +120,9 @@ class DrawdownCircuitBreaker:
         return state
     
     def _save_state(self, state: Dict):
-        """Save state to file"""
+        """Save state (written through: every change here is a trip, reset or alert)"""
         try:
-            with open(self.state_file, 'w') as f:
-                json.dump(state, f, indent=2)
+            self._store.save(state, flush=True)
             logger.debug(f"[CIRCUIT-BREAKER] Saved state to {self.state_file}")
         except Exception as e:
             logger.error(f"[CIRCUIT-BREAKER] Error saving state: {e}")
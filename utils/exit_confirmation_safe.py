@@ -28,6 +28,7 @@ from typing import Dict, Optional, Tuple, Any
 from dataclasses import dataclass
 
 from utils.exit_strategies import ExitDecision, ExitReason
+from utils.position_store import notify_positions_changed
 
 logger = logging.getLogger(__name__)
 
@@ -296,6 +297,7 @@ class SafeExitConfirmationWorkflow:
                     # Write empty file with header only
                     writer = csv.writer(f)
                     writer.writerow(['entry_time', 'symbol', 'expiry', 'strike', 'side', 'contracts', 'entry_premium'])
+            notify_positions_changed(positions_file)
             
             self.logger.info(f"[EXIT-CONFIRM] Position removed from tracking file")
             return True
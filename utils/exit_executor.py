@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+Exit Executor
+
+Submits close orders off the monitoring thread. Close orders for every open
+position are built and validated ahead of time (each monitoring cycle), so
+when an exit fires the only work left is the broker submit, which runs on a
+dedicated single-thread executor. Fill polling, Slack alerts, charts and LLM
+post-mortems run afterwards on a separate follow-up pool and never delay a
+submit.
+
+Key Features:
+- Pre-built, validated close orders per open position
+- Dedicated submit thread with a reused (pre-warmed) trader client
+- Duplicate-submit guard per position
+- Follow-up pool for notifications and post-exit work
+- Interactive confirmations serialized on their own thread
+- Trigger-to-submit latency metrics
+
+Usage:
+    from utils.exit_executor import CloseOrder, ExitExecutor
+
+    executor = ExitExecutor(lambda: create_alpaca_trader(paper=True))
+    executor.prepare([CloseOrder.build(key, "SPY261016C00600000", 1)])
+    executor.submit(key, reason="stop_loss", triggered_at=time.perf_counter(),
+                    on_submitted=handle_fill)
+    print(executor.metrics())
+
+Author: Robinhood HA Breakout System
+Version: 1.0.0
+License: MIT
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from .position_store import parse_occ_symbol
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class CloseOrder:
+    """Validated market order that closes one position."""
+
+    position_key: str
+    contract_symbol: str
+    quantity: int
+    side: str = "SELL"
+    built_at: float = field(default_factory=time.time)
+
+    @classmethod
+    def build(cls, position_key: str, contract_symbol: Optional[str], quantity: Any) -> "CloseOrder":
+        """Build a close order.
+
+        Raises:
+            ValueError: If the contract symbol is not a valid OCC symbol or
+                the quantity is not a positive integer
+        """
+        if not contract_symbol or parse_occ_symbol(contract_symbol) is None:
+            raise ValueError(f"invalid OCC contract symbol {contract_symbol!r} for {position_key}")
+        qty = int(quantity)
+        if qty <= 0:
+            raise ValueError(f"invalid close quantity {quantity!r} for {position_key}")
+        return cls(position_key, contract_symbol, qty)
+
+
+@dataclass
+class ExitSubmission:
+    """Outcome of one close-order submit, passed to the on_submitted callback."""
+
+    position_key: str
+    reason: str
+    order: Optional[CloseOrder] = None
+    order_id: Optional[str] = None
+    trigger_to_submit_ms: Optional[float] = None
+    error: Optional[str] = None
+
+    @property
+    def submitted(self) -> bool:
+        return self.order_id is not None
+
+
+@dataclass
+class ExitExecutorStats:
+    """Counters and trigger-to-submit latency for the executor."""
+
+    submits: int = 0
+    failures: int = 0
+    duplicates_skipped: int = 0
+    prebuilt_hits: int = 0
+    prebuilt_misses: int = 0
+    last_trigger_to_submit_ms: Optional[float] = None
+    max_trigger_to_submit_ms: float = 0.0
+    total_trigger_to_submit_ms: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["avg_trigger_to_submit_ms"] = (
+            round(self.total_trigger_to_submit_ms / self.submits, 1) if self.submits else None
+        )
+        return data
+
+
+class ExitExecutor:
+    """Pre-built close orders with a dedicated submit thread and a follow-up pool."""
+
+    def __init__(
+        self,
+        trader_factory: Callable[[], Any],
+        async_mode: bool = True,
+        follow_up_workers: int = 2,
+        name: str = "exit",
+    ):
+        """Initialize executor.
+
+        Args:
+            trader_factory: Builds the trader (needs place_market_order(symbol, qty, side));
+                called once on the submit thread and reused
+            async_mode: When False, submits and follow-ups run inline on the
+                caller's thread (previous blocking behaviour)
+            follow_up_workers: Threads for fills, notifications and post-mortems
+            name: Thread name prefix
+        """
+        self._trader_factory = trader_factory
+        self._trader = None
+        self._warmed = False
+        self.async_mode = async_mode
+        self.stats = ExitExecutorStats()
+
+        self._orders: Dict[str, CloseOrder] = {}
+        self._in_flight: set = set()
+        self._lock = threading.Lock()
+        self._submit_pool = self._follow_up_pool = self._prompt_pool = None
+        if async_mode:
+            self._submit_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"{name}-submit")
+            self._follow_up_pool = ThreadPoolExecutor(
+                max_workers=max(1, follow_up_workers), thread_name_prefix=f"{name}-follow-up"
+            )
+            # Interactive prompts share the console, so they run one at a time
+            self._prompt_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"{name}-prompt")
+
+    # ------------------------------------------------------------------
+    # Order book
+    # ------------------------------------------------------------------
+
+    def prepare(self, orders: Iterable[CloseOrder]) -> int:
+        """Replace the pre-built order book with orders for the current open positions."""
+        book = {order.position_key: order for order in orders}
+        with self._lock:
+            self._orders = book
+        return len(book)
+
+    def close_order(self, position_key: str) -> Optional[CloseOrder]:
+        with self._lock:
+            return self._orders.get(position_key)
+
+    def warm(self) -> None:
+        """Build the trader client ahead of the first exit (on the submit thread, once)."""
+        if self._warmed:
+            return
+        self._warmed = True
+        self._run(self._submit_pool, self._guarded, self.trader)
+
+    def trader(self):
+        """The shared trader client (built on first use)."""
+        if self._trader is None:
+            trader = self._trader_factory()
+            if trader is None:
+                raise RuntimeError("trader factory returned None")
+            self._trader = trader
+        return self._trader
+
+    # ------------------------------------------------------------------
+    # Submit
+    # ------------------------------------------------------------------
+
+    def submit(
+        self,
+        position_key: str,
+        reason: str,
+        triggered_at: Optional[float] = None,
+        fallback_order: Optional[Callable[[], CloseOrder]] = None,
+        on_submitted: Optional[Callable[[ExitSubmission], Any]] = None,
+    ) -> Optional[Future]:
+        """Submit the close order for a position.
+
+        Args:
+            position_key: Key the order was prepared under
+            reason: Exit reason (for logs and the callback)
+            triggered_at: time.perf_counter() when the exit fired (default: now)
+            fallback_order: Builds the order when none was pre-built
+            on_submitted: Called with the ExitSubmission on the follow-up pool
+                (fill polling, notifications)
+
+        Returns:
+            Future resolving to the ExitSubmission, or None if a close for
+            this position is already in flight
+        """
+        triggered_at = time.perf_counter() if triggered_at is None else triggered_at
+        with self._lock:
+            if position_key in self._in_flight:
+                self.stats.duplicates_skipped += 1
+                logger.info(f"[EXIT-EXEC] Close already in flight for {position_key}; skipping")
+                return None
+            self._in_flight.add(position_key)
+            order = self._orders.get(position_key)
+            if order is not None:
+                self.stats.prebuilt_hits += 1
+            else:
+                self.stats.prebuilt_misses += 1
+
+        return self._run(
+            self._submit_pool, self._submit, position_key, reason, triggered_at, order, fallback_order, on_submitted
+        )
+
+    def _submit(self, position_key, reason, triggered_at, order, fallback_order, on_submitted) -> ExitSubmission:
+        submission = ExitSubmission(position_key, reason, order)
+        try:
+            if order is None:
+                if fallback_order is None:
+                    raise ValueError(f"no close order prepared for {position_key}")
+                order = submission.order = fallback_order()
+            order_id = self.trader().place_market_order(order.contract_symbol, order.quantity, order.side)
+            latency_ms = round((time.perf_counter() - triggered_at) * 1000, 1)
+            submission.trigger_to_submit_ms = latency_ms
+            if order_id:
+                submission.order_id = order_id
+            else:
+                submission.error = "order placement failed"
+        except ValueError as e:  # Invalid order; nothing was sent
+            submission.error = str(e)
+        except Exception as e:
+            submission.error = str(e)
+            self._trader = None  # Rebuild the client on the next submit
+
+        with self._lock:
+            if submission.submitted:
+                stats = self.stats
+                stats.submits += 1
+                stats.last_trigger_to_submit_ms = submission.trigger_to_submit_ms
+                stats.max_trigger_to_submit_ms = max(stats.max_trigger_to_submit_ms, submission.trigger_to_submit_ms)
+                stats.total_trigger_to_submit_ms += submission.trigger_to_submit_ms
+            else:
+                self.stats.failures += 1
+                self._in_flight.discard(position_key)
+
+        if submission.submitted:
+            logger.info(
+                f"[EXIT-EXEC] Submitted {order.side} {order.contract_symbol} x{order.quantity} ({reason}) "
+                f"order={submission.order_id} trigger-to-submit {submission.trigger_to_submit_ms:.1f}ms"
+            )
+        else:
+            logger.error(f"[EXIT-EXEC] Close for {position_key} failed ({reason}): {submission.error}")
+
+        if on_submitted is not None:
+            self.follow_up(self._finish, submission, on_submitted)
+        else:
+            self._release(position_key)
+        return submission
+
+    def _finish(self, submission: ExitSubmission, on_submitted: Callable[[ExitSubmission], Any]) -> None:
+        try:
+            on_submitted(submission)
+        finally:
+            self._release(submission.position_key)
+
+    def _release(self, position_key: str) -> None:
+        with self._lock:
+            self._in_flight.discard(position_key)
+
+    def in_flight(self, position_key: str) -> bool:
+        with self._lock:
+            return position_key in self._in_flight
+
+    # ------------------------------------------------------------------
+    # Follow-up work
+    # ------------------------------------------------------------------
+
+    def follow_up(self, fn: Callable, *args, **kwargs) -> Future:
+        """Run notification/post-exit work on the follow-up pool; errors are logged."""
+        return self._run(self._follow_up_pool, self._guarded, fn, *args, **kwargs)
+
+    def exclusive(self, position_key: str, fn: Callable, *args, **kwargs) -> Optional[Future]:
+        """Run fn on the prompt thread unless work for this position is already pending.
+
+        Returns:
+            Future, or None if skipped as a duplicate
+        """
+        with self._lock:
+            if position_key in self._in_flight:
+                self.stats.duplicates_skipped += 1
+                return None
+            self._in_flight.add(position_key)
+
+        def run():
+            try:
+                return self._guarded(fn, *args, **kwargs)
+            finally:
+                self._release(position_key)
+
+        return self._run(self._prompt_pool, run)
+
+    @staticmethod
+    def _guarded(fn: Callable, *args, **kwargs):
+        try:
+            return fn(*args, **kwargs)
+        except Exception as e:
+            logger.error(f"[EXIT-EXEC] Follow-up {getattr(fn, '__name__', fn)} failed: {e}")
+            return None
+
+    @staticmethod
+    def _run(pool: Optional[ThreadPoolExecutor], fn: Callable, *args, **kwargs) -> Future:
+        if pool is not None:
+            return pool.submit(fn, *args, **kwargs)
+        future: Future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    # ------------------------------------------------------------------
+    # Metrics / lifecycle
+    # ------------------------------------------------------------------
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            data = self.stats.to_dict()
+            data["prepared_orders"] = len(self._orders)
+            data["in_flight"] = len(self._in_flight)
+        return data
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop accepting work; by default waits for submits, then follow-ups."""
+        for pool in (self._submit_pool, self._follow_up_pool, self._prompt_pool):
+            if pool is not None:
+                pool.shutdown(wait=wait)
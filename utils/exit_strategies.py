@@ -14,20 +14,26 @@ Key Features:
 - Configurable exit strategy parameters
 - Integration with Slack alerts and position monitoring
 - Real-time Alpaca data for accurate exit decisions
+- Array-backed per-position state, evaluated in one vectorized pass per batch
 
 Usage:
     from utils.exit_strategies import ExitStrategyManager
 
     exit_manager = ExitStrategyManager()
     exit_decision = exit_manager.evaluate_exit(position, current_price, option_price)
+
+    # All positions at once (same decisions as one evaluate_exit per position)
+    decisions = exit_manager.evaluate_exits(positions, stock_prices, option_prices)
 """
 
 import logging
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence
 from dataclasses import dataclass
 from enum import Enum
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
 
@@ -85,13 +91,25 @@ class ExitStrategyManager:
     Advanced exit strategy manager with trailing stops and time-based exits.
 
     Maximizes profits while protecting capital through sophisticated exit logic.
+
+    Peak and trailing-stop state lives in NumPy arrays indexed by a per-position
+    slot, so a batch of positions is updated and checked in one vectorized pass.
     """
 
+    _INITIAL_SLOTS = 16
+
     def __init__(self, config: Optional[ExitStrategyConfig] = None):
         """Initialize exit strategy manager with configuration."""
         self.config = config or ExitStrategyConfig()
-        self.position_peaks = {}  # Track peak profit for each position
-        self.trailing_stops = {}  # Track trailing stop levels
+
+        # Slot state: peak P&L/price and trailing stop level (NaN = not armed)
+        self._slots: Dict[str, int] = {}
+        self._free_slots: List[int] = []
+        self._peak_pnl = np.zeros(self._INITIAL_SLOTS)
+        self._peak_price = np.zeros(self._INITIAL_SLOTS)
+        self._trail_level = np.full(self._INITIAL_SLOTS, np.nan)
+        # Bumped whenever peak/trailing state changes (lets callers skip persisting unchanged state)
+        self.state_version = 0
 
         logger.info("[EXIT] Advanced exit strategy manager initialized")
         logger.info(
@@ -104,6 +122,26 @@ class ExitStrategyManager:
             f"(close by {self.config.market_close_time})"
         )
 
+    @property
+    def position_peaks(self) -> Dict[str, Dict[str, float]]:
+        """Peak profit per tracked position (snapshot)."""
+        return {
+            key: {
+                "peak_pnl_pct": float(self._peak_pnl[slot]),
+                "peak_price": float(self._peak_price[slot]),
+            }
+            for key, slot in self._slots.items()
+        }
+
+    @property
+    def trailing_stops(self) -> Dict[str, float]:
+        """Armed trailing stop level (P&L %) per position (snapshot)."""
+        return {
+            key: float(self._trail_level[slot])
+            for key, slot in self._slots.items()
+            if not np.isnan(self._trail_level[slot])
+        }
+
     def evaluate_exit(
         self, position: Dict, current_stock_price: float, current_option_price: float
     ) -> ExitDecision:
@@ -118,6 +156,8 @@ class ExitStrategyManager:
         Returns:
             ExitDecision with recommendation and reasoning
         """
+        # Scalar path over the same slot arrays; a one-element vectorized pass
+        # costs more in array setup than it saves
         position_key = self._get_position_key(position)
 
         # Calculate current P&L
@@ -125,16 +165,29 @@ class ExitStrategyManager:
         current_pnl_pct = ((current_option_price - entry_price) / entry_price) * 100
 
         # Update peak tracking
-        self._update_peak_tracking(position_key, current_pnl_pct, current_option_price)
+        slot, is_new = self._slot_for(position_key)
+        if is_new or current_pnl_pct > float(self._peak_pnl[slot]):
+            self.state_version += 1
+            self._peak_pnl[slot] = current_pnl_pct
+            self._peak_price[slot] = current_option_price
+            if (
+                not is_new
+                and self.config.trailing_stop_enabled
+                and current_pnl_pct >= self.config.trailing_stop_activation_pct
+            ):
+                self._trail_level[slot] = current_pnl_pct - self.config.trailing_stop_distance_pct
+                logger.debug(
+                    f"[EXIT] Updated trailing stop for {position_key}: {self._trail_level[slot]:.1f}%"
+                )
 
         # Check exit strategies in order of priority
 
-        # 1. Check trailing stop
-        trailing_decision = self._check_trailing_stop(
-            position_key, current_pnl_pct, current_option_price
-        )
-        if trailing_decision.should_exit:
-            return trailing_decision
+        # 1. Check trailing stop (an unarmed NaN level never compares true)
+        trailing_stop_level = float(self._trail_level[slot])
+        if self.config.trailing_stop_enabled and current_pnl_pct <= trailing_stop_level:
+            return self._trailing_stop_decision(
+                current_pnl_pct, current_option_price, trailing_stop_level, float(self._peak_pnl[slot])
+            )
 
         # 2. Check time-based exit
         time_decision = self._check_time_based_exit(current_pnl_pct)
@@ -159,78 +212,182 @@ class ExitStrategyManager:
             message=f"Hold position (P&L: {current_pnl_pct:+.1f}%)",
         )
 
+    def evaluate_exits(
+        self,
+        positions: Sequence[Dict],
+        current_stock_prices: Sequence[float],
+        current_option_prices: Sequence[float],
+    ) -> List[ExitDecision]:
+        """
+        Evaluate exits for many positions in one vectorized pass.
+
+        Produces the same decisions, and leaves the same tracking state, as
+        calling evaluate_exit() on each position in order.
+
+        Args:
+            positions: Position data (symbol, strike, entry_price, etc.)
+            current_stock_prices: Current underlying price per position
+            current_option_prices: Current option price per position
+
+        Returns:
+            ExitDecision per position, in input order
+        """
+        if not positions:
+            return []
+
+        keys = [self._get_position_key(p) for p in positions]
+        if len(keys) == 1 or len(set(keys)) < len(keys):
+            # A position repeated within a batch must see its own earlier update
+            return [
+                self.evaluate_exit(p, s, o)
+                for p, s, o in zip(positions, current_stock_prices, current_option_prices)
+            ]
+
+        entry = np.array([p["entry_price"] for p in positions], dtype=float)
+        price = np.asarray(current_option_prices, dtype=float)
+        if not np.all(entry):
+            raise ZeroDivisionError("float division by zero")  # As the scalar formula would
+
+        # Calculate current P&L
+        pnl = ((price - entry) / entry) * 100
+
+        # Update peak tracking
+        slots, is_new = self._allocate_slots(keys)
+        self._update_peak_tracking(keys, slots, is_new, pnl, price)
+
+        # Check exit strategies in order of priority
+        decisions: List[Optional[ExitDecision]] = [None] * len(keys)
+        decided = np.zeros(len(keys), dtype=bool)
+
+        # 1. Check trailing stop (an unarmed NaN level never compares true)
+        if self.config.trailing_stop_enabled:
+            trail = self._trail_level[slots]
+            hit = pnl <= trail
+            for i in np.flatnonzero(hit):
+                decisions[i] = self._trailing_stop_decision(
+                    float(pnl[i]), float(price[i]), float(trail[i]), float(self._peak_pnl[slots[i]])
+                )
+            decided |= hit
+
+        # 2. Check time-based exit (one clock read for the batch)
+        if self.config.time_based_exit_enabled and not decided.all():
+            time_to_close_minutes = self._minutes_to_close()
+            if time_to_close_minutes <= self.config.warning_minutes_before_close:
+                for i in np.flatnonzero(~decided):
+                    decisions[i] = self._check_time_based_exit(float(pnl[i]), time_to_close_minutes)
+                decided[:] = True
+
+        # 3. Check traditional stop loss
+        hit = ~decided & (pnl <= -self.config.stop_loss_pct)
+        for i in np.flatnonzero(hit):
+            decisions[i] = self._check_stop_loss(float(pnl[i]))
+        decided |= hit
+
+        # 4. Check profit targets (informational), first reached in configured order
+        for target in self.config.profit_targets:
+            hit = ~decided & (pnl >= target)
+            for i in np.flatnonzero(hit):
+                decisions[i] = self._profit_target_decision(float(pnl[i]), target)
+            decided |= hit
+
+        # No exit recommended
+        for i in np.flatnonzero(~decided):
+            decisions[i] = ExitDecision(
+                should_exit=False,
+                reason=ExitReason.NO_EXIT,
+                current_pnl_pct=float(pnl[i]),
+                message=f"Hold position (P&L: {pnl[i]:+.1f}%)",
+            )
+
+        return decisions
+
     def _get_position_key(self, position: Dict) -> str:
         """Generate unique key for position tracking."""
         return f"{position['symbol']}_{position['strike']}_{position['option_type']}_{position.get('entry_time', 'unknown')}"
 
+    def _slot_for(self, key: str):
+        """Slot index for a key (allocating one if new) and whether it is newly tracked."""
+        slot = self._slots.get(key)
+        if slot is not None:
+            return slot, False
+        slot = self._free_slots.pop() if self._free_slots else len(self._slots)
+        if slot >= len(self._peak_pnl):
+            self._grow(slot + 1)
+        self._slots[key] = slot
+        self._trail_level[slot] = np.nan
+        return slot, True
+
+    def _allocate_slots(self, keys: List[str]):
+        """Slot index per key (allocating new ones) and a mask of newly tracked keys."""
+        slots = np.empty(len(keys), dtype=np.intp)
+        is_new = np.zeros(len(keys), dtype=bool)
+        for i, key in enumerate(keys):
+            slots[i], is_new[i] = self._slot_for(key)
+        return slots, is_new
+
+    def _grow(self, needed: int) -> None:
+        size = len(self._peak_pnl)
+        while size < needed:
+            size *= 2
+        extra = size - len(self._peak_pnl)
+        self._peak_pnl = np.concatenate([self._peak_pnl, np.zeros(extra)])
+        self._peak_price = np.concatenate([self._peak_price, np.zeros(extra)])
+        self._trail_level = np.concatenate([self._trail_level, np.full(extra, np.nan)])
+
     def _update_peak_tracking(
-        self, position_key: str, current_pnl_pct: float, current_price: float
+        self, keys: List[str], slots: np.ndarray, is_new: np.ndarray, pnl: np.ndarray, price: np.ndarray
     ):
         """Update peak profit tracking for trailing stops."""
-        if position_key not in self.position_peaks:
-            self.position_peaks[position_key] = {
-                "peak_pnl_pct": current_pnl_pct,
-                "peak_price": current_price,
-            }
-        else:
-            # Update peak if current is higher
-            if current_pnl_pct > self.position_peaks[position_key]["peak_pnl_pct"]:
-                self.position_peaks[position_key]["peak_pnl_pct"] = current_pnl_pct
-                self.position_peaks[position_key]["peak_price"] = current_price
-
-                # Update trailing stop if position is profitable enough
-                if (
-                    self.config.trailing_stop_enabled
-                    and current_pnl_pct >= self.config.trailing_stop_activation_pct
-                ):
-
-                    # Calculate new trailing stop level
-                    trailing_stop_pct = (
-                        current_pnl_pct - self.config.trailing_stop_distance_pct
-                    )
-                    self.trailing_stops[position_key] = trailing_stop_pct
-
-                    logger.debug(
-                        f"[EXIT] Updated trailing stop for {position_key}: {trailing_stop_pct:.1f}%"
-                    )
-
-    def _check_trailing_stop(
-        self, position_key: str, current_pnl_pct: float, current_price: float
+        # First sighting seeds the peak; later ones raise it on a new high
+        improved = is_new | (pnl > self._peak_pnl[slots])
+        if improved.any():
+            self.state_version += 1
+        self._peak_pnl[slots[improved]] = pnl[improved]
+        self._peak_price[slots[improved]] = price[improved]
+
+        # Update trailing stop if position is profitable enough (never on the first sighting)
+        if self.config.trailing_stop_enabled:
+            arm = improved & ~is_new & (pnl >= self.config.trailing_stop_activation_pct)
+            if arm.any():
+                # Calculate new trailing stop level
+                self._trail_level[slots[arm]] = pnl[arm] - self.config.trailing_stop_distance_pct
+                if logger.isEnabledFor(logging.DEBUG):
+                    for i in np.flatnonzero(arm):
+                        logger.debug(
+                            f"[EXIT] Updated trailing stop for {keys[i]}: {self._trail_level[slots[i]]:.1f}%"
+                        )
+
+    def _trailing_stop_decision(
+        self, current_pnl_pct: float, current_price: float, trailing_stop_level: float, peak_pnl: float
     ) -> ExitDecision:
-        """Check if trailing stop should trigger."""
-        if not self.config.trailing_stop_enabled:
-            return ExitDecision(False, ExitReason.NO_EXIT, current_pnl_pct)
-
-        if position_key not in self.trailing_stops:
-            return ExitDecision(False, ExitReason.NO_EXIT, current_pnl_pct)
-
-        trailing_stop_level = self.trailing_stops[position_key]
-
-        if current_pnl_pct <= trailing_stop_level:
-            peak_pnl = self.position_peaks[position_key]["peak_pnl_pct"]
+        """Exit decision for a triggered trailing stop."""
+        return ExitDecision(
+            should_exit=True,
+            reason=ExitReason.TRAILING_STOP,
+            current_pnl_pct=current_pnl_pct,
+            trailing_stop_price=current_price,
+            message=f"Trailing stop triggered! Peak: +{peak_pnl:.1f}%, Current: {current_pnl_pct:+.1f}%, Stop: {trailing_stop_level:.1f}%",
+            urgency="high",
+        )
 
-            return ExitDecision(
-                should_exit=True,
-                reason=ExitReason.TRAILING_STOP,
-                current_pnl_pct=current_pnl_pct,
-                trailing_stop_price=current_price,
-                message=f"Trailing stop triggered! Peak: +{peak_pnl:.1f}%, Current: {current_pnl_pct:+.1f}%, Stop: {trailing_stop_level:.1f}%",
-                urgency="high",
-            )
+    def _minutes_to_close(self) -> float:
+        """Minutes until the configured market close time today."""
+        now = datetime.now()
+        market_close = datetime.strptime(
+            self.config.market_close_time, "%H:%M"
+        ).replace(year=now.year, month=now.month, day=now.day)
 
-        return ExitDecision(False, ExitReason.NO_EXIT, current_pnl_pct)
+        return (market_close - now).total_seconds() / 60
 
-    def _check_time_based_exit(self, current_pnl_pct: float) -> ExitDecision:
+    def _check_time_based_exit(
+        self, current_pnl_pct: float, time_to_close_minutes: Optional[float] = None
+    ) -> ExitDecision:
         """Check if time-based exit should trigger."""
         if not self.config.time_based_exit_enabled:
             return ExitDecision(False, ExitReason.NO_EXIT, current_pnl_pct)
 
-        now = datetime.now()
-        market_close = datetime.strptime(
-            self.config.market_close_time, "%H:%M"
-        ).replace(year=now.year, month=now.month, day=now.day)
-
-        time_to_close_minutes = (market_close - now).total_seconds() / 60
+        if time_to_close_minutes is None:
+            time_to_close_minutes = self._minutes_to_close()
 
         if time_to_close_minutes <= self.config.warning_minutes_before_close:
             urgency = "critical" if time_to_close_minutes <= 5 else "high"
@@ -263,22 +420,35 @@ class ExitStrategyManager:
         """Check profit targets (interactive exit prompts)."""
         for target in self.config.profit_targets:
             if current_pnl_pct >= target:
-                # Trigger interactive exit prompt for profit-taking decision
-                return ExitDecision(
-                    should_exit=True,  # Trigger interactive exit prompt
-                    reason=ExitReason.PROFIT_TARGET,
-                    current_pnl_pct=current_pnl_pct,
-                    message=f"🎯 PROFIT TARGET {target}% REACHED! Current profit: {current_pnl_pct:+.1f}% - Consider taking profits!",
-                    urgency="high",  # High urgency for profit-taking opportunities
-                )
+                return self._profit_target_decision(current_pnl_pct, target)
 
         return ExitDecision(False, ExitReason.NO_EXIT, current_pnl_pct)
 
+    def _profit_target_decision(self, current_pnl_pct: float, target: float) -> ExitDecision:
+        # Trigger interactive exit prompt for profit-taking decision
+        return ExitDecision(
+            should_exit=True,  # Trigger interactive exit prompt
+            reason=ExitReason.PROFIT_TARGET,
+            current_pnl_pct=current_pnl_pct,
+            message=f"🎯 PROFIT TARGET {target}% REACHED! Current profit: {current_pnl_pct:+.1f}% - Consider taking profits!",
+            urgency="high",  # High urgency for profit-taking opportunities
+        )
+
     def get_position_status(self, position_key: str) -> Dict:
         """Get current status of position tracking."""
+        slot = self._slots.get(position_key)
+        trailing_stop = None
+        if slot is not None and not np.isnan(self._trail_level[slot]):
+            trailing_stop = float(self._trail_level[slot])
+        peak_data = {}
+        if slot is not None:
+            peak_data = {
+                "peak_pnl_pct": float(self._peak_pnl[slot]),
+                "peak_price": float(self._peak_price[slot]),
+            }
         return {
-            "peak_data": self.position_peaks.get(position_key, {}),
-            "trailing_stop": self.trailing_stops.get(position_key, None),
+            "peak_data": peak_data,
+            "trailing_stop": trailing_stop,
             "config": {
                 "trailing_stop_enabled": self.config.trailing_stop_enabled,
                 "activation_threshold": self.config.trailing_stop_activation_pct,
@@ -287,12 +457,47 @@ class ExitStrategyManager:
             },
         }
 
+    def export_state(self) -> Dict[str, List]:
+        """Peak and trailing-stop state as columns, for persistence (see restore_state)."""
+        keys = list(self._slots)
+        slots = np.fromiter(self._slots.values(), dtype=np.intp, count=len(keys))
+        return {
+            "keys": keys,
+            "peak_pnl_pct": self._peak_pnl[slots].tolist(),
+            "peak_price": self._peak_price[slots].tolist(),
+            "trailing_stop": [None if np.isnan(level) else level for level in self._trail_level[slots].tolist()],
+        }
+
+    def restore_state(self, state: Dict[str, List]) -> int:
+        """Restore state saved by export_state() so trailing stops resume after a restart.
+
+        Returns:
+            Number of positions restored
+
+        Raises:
+            ValueError: If the columns have different lengths
+        """
+        keys = list(state.get("keys") or [])
+        if not keys:
+            return 0
+        columns = [state.get(name) or [] for name in ("peak_pnl_pct", "peak_price", "trailing_stop")]
+        if any(len(column) != len(keys) for column in columns):
+            raise ValueError("exit state columns do not match keys")
+
+        slots, _ = self._allocate_slots(keys)
+        self._peak_pnl[slots] = np.asarray(columns[0], dtype=float)
+        self._peak_price[slots] = np.asarray(columns[1], dtype=float)
+        self._trail_level[slots] = np.array([np.nan if v is None else v for v in columns[2]], dtype=float)
+        self.state_version += 1
+        return len(keys)
+
     def reset_position_tracking(self, position_key: str):
         """Reset tracking for a closed position."""
-        if position_key in self.position_peaks:
-            del self.position_peaks[position_key]
-        if position_key in self.trailing_stops:
-            del self.trailing_stops[position_key]
+        slot = self._slots.pop(position_key, None)
+        if slot is not None:
+            self._trail_level[slot] = np.nan
+            self._free_slots.append(slot)
+            self.state_version += 1
 
         logger.info(f"[EXIT] Reset tracking for {position_key}")
 
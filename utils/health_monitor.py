@@ -236,6 +236,9 @@ class SystemHealthMonitor:
             else:
                 alpaca_url = "https://api.alpaca.markets/v2/account"
                 alpaca_name = "alpaca_live"
+            # Local stand-in / proxy (see utils.alpaca_client.get_url_override)
+            if os.getenv("ALPACA_URL_OVERRIDE"):
+                alpaca_url = f"{os.getenv('ALPACA_URL_OVERRIDE').rstrip('/')}/v2/account"
             # Test Alpaca API with actual credentials
             try:
                 headers = {}
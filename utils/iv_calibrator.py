@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Implied Volatility Calibrator
+
+Calibrated option price fallback for the position monitor. Every real
+option quote is used to back out an implied volatility for its contract,
+which is cached. When a contract has no usable quote, it is repriced from the
+cached IV and the live underlying price with Black-Scholes. All affected
+contracts are priced in one vectorized call. Cached IVs older than an explicit
+staleness bound are not used. Each model price is scored against the next real
+quote for that contract.
+
+Key Features:
+- Vectorized IV back-out from quote mids (one call per cycle)
+- Vectorized Black-Scholes repricing of unquoted contracts
+- Explicit IV staleness bound (no estimate from stale calibrations)
+- Estimator error metrics against later real quotes
+
+Usage:
+    from utils.iv_calibrator import IVCalibrator
+
+    calibrator = IVCalibrator(max_age_seconds=900)
+    calibrator.observe({"SPY261016C00600000": 1.25}, {"SPY261016C00600000": 601.2})
+    prices = calibrator.estimate({"SPY261016C00600000": 603.0})
+    print(calibrator.metrics())
+
+Author: Robinhood HA Breakout System
+Version: 1.0.0
+License: MIT
+"""
+
+import logging
+import math
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Any, Dict, Mapping, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+from .option_math import black_scholes_price, implied_volatility
+from .position_store import parse_occ_symbol
+
+logger = logging.getLogger(__name__)
+
+ET = ZoneInfo("America/New_York")
+SECONDS_PER_YEAR = 365.0 * 24 * 3600
+
+
+@dataclass(slots=True)
+class IVSample:
+    """Cached calibration for one contract."""
+
+    sigma: float
+    underlying_price: float
+    option_price: float
+    observed_at: float  # time.time()
+
+
+@dataclass
+class EstimatorErrorStats:
+    """Model price vs the next real quote for the same contract."""
+
+    samples: int = 0
+    total_abs_error: float = 0.0
+    total_abs_pct_error: float = 0.0
+    max_abs_error: float = 0.0
+    last_abs_error: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["mean_abs_error"] = round(self.total_abs_error / self.samples, 4) if self.samples else None
+        data["mean_abs_pct_error"] = round(self.total_abs_pct_error / self.samples, 2) if self.samples else None
+        return data
+
+
+class IVCalibrator:
+    """Per-contract IV cache that reprices unquoted contracts with Black-Scholes."""
+
+    def __init__(
+        self,
+        max_age_seconds: float = 900.0,
+        risk_free_rate: float = 0.0,
+        min_time_seconds: float = 60.0,
+    ):
+        """Initialize calibrator.
+
+        Args:
+            max_age_seconds: Cached IVs older than this are not used for estimates
+            risk_free_rate: Annualised rate for Black-Scholes (0 suits intraday options)
+            min_time_seconds: Floor on time to expiry, so contracts expiring
+                today keep a small time value up to the close
+        """
+        self.max_age_seconds = float(max_age_seconds)
+        self.risk_free_rate = float(risk_free_rate)
+        self.min_time_seconds = float(min_time_seconds)
+        self.errors = EstimatorErrorStats()
+        self.estimates_made = 0
+        self.stale_skipped = 0
+
+        self._samples: Dict[str, IVSample] = {}
+        self._pending: Dict[str, Tuple[float, float]] = {}  # occ -> (model price, estimated_at)
+        self._contracts: Dict[str, Optional[Tuple[float, bool, float]]] = {}  # occ -> (strike, is_call, expiry ts)
+
+    def _contract(self, occ_symbol: str) -> Optional[Tuple[float, bool, float]]:
+        if occ_symbol not in self._contracts:
+            parsed = parse_occ_symbol(occ_symbol)
+            if parsed is None:
+                self._contracts[occ_symbol] = None
+            else:
+                expiry = datetime.strptime(parsed["expiry"], "%Y-%m-%d").replace(hour=16, tzinfo=ET)
+                self._contracts[occ_symbol] = (parsed["strike"], parsed["option_type"] == "CALL", expiry.timestamp())
+        return self._contracts[occ_symbol]
+
+    def _arrays(self, occ_symbols, underlying: Mapping[str, float], now: float):
+        contracts = [self._contract(occ) for occ in occ_symbols]
+        S = np.array([underlying[occ] for occ in occ_symbols], dtype=float)
+        K = np.array([c[0] for c in contracts], dtype=float)
+        is_call = np.array([c[1] for c in contracts], dtype=bool)
+        T = np.maximum(np.array([c[2] for c in contracts], dtype=float) - now, self.min_time_seconds) / SECONDS_PER_YEAR
+        return S, K, T, is_call
+
+    def observe(
+        self,
+        option_prices: Mapping[str, float],
+        underlying_prices: Mapping[str, float],
+        now: Optional[float] = None,
+    ) -> int:
+        """Calibrate IVs from real quotes and score pending model prices.
+
+        Args:
+            option_prices: OCC symbol -> quote mid
+            underlying_prices: OCC symbol -> underlying price at the same time
+
+        Returns:
+            Number of contracts calibrated
+        """
+        now = time.time() if now is None else now
+        occ_symbols = [
+            occ for occ, price in option_prices.items()
+            if price and underlying_prices.get(occ) and self._contract(occ) is not None
+        ]
+        if not occ_symbols:
+            return 0
+
+        for occ in occ_symbols:
+            pending = self._pending.pop(occ, None)
+            if pending is not None and now - pending[1] <= self.max_age_seconds:
+                self._record_error(pending[0], float(option_prices[occ]))
+
+        S, K, T, is_call = self._arrays(occ_symbols, underlying_prices, now)
+        prices = np.array([option_prices[occ] for occ in occ_symbols], dtype=float)
+        sigmas = implied_volatility(prices, S, K, T, self.risk_free_rate, is_call)
+
+        calibrated = 0
+        for occ, sigma, s, price in zip(occ_symbols, sigmas, S, prices):
+            if math.isnan(sigma):
+                continue  # Quote outside model bounds (e.g. below intrinsic); keep the previous IV
+            self._samples[occ] = IVSample(float(sigma), float(s), float(price), now)
+            calibrated += 1
+        return calibrated
+
+    def estimate(self, underlying_prices: Mapping[str, float], now: Optional[float] = None) -> Dict[str, float]:
+        """Model prices for contracts with a fresh cached IV.
+
+        Args:
+            underlying_prices: OCC symbol -> live underlying price for the
+                contracts that need a price
+
+        Returns:
+            OCC symbol -> model price; contracts with no IV, or an IV older than
+            max_age_seconds, are omitted
+        """
+        now = time.time() if now is None else now
+        occ_symbols = []
+        for occ, price in underlying_prices.items():
+            sample = self._samples.get(occ)
+            if sample is None or not price:
+                continue
+            if now - sample.observed_at > self.max_age_seconds:
+                del self._samples[occ]  # Recalibrated by the next real quote
+                self.stale_skipped += 1
+                continue
+            occ_symbols.append(occ)
+        if not occ_symbols:
+            return {}
+
+        S, K, T, is_call = self._arrays(occ_symbols, underlying_prices, now)
+        sigma = np.array([self._samples[occ].sigma for occ in occ_symbols], dtype=float)
+        prices = np.maximum(black_scholes_price(S, K, T, sigma, self.risk_free_rate, is_call), 0.01)
+
+        estimates = {occ: float(price) for occ, price in zip(occ_symbols, prices)}
+        for occ, price in estimates.items():
+            self._pending[occ] = (price, now)
+        self.estimates_made += len(estimates)
+        return estimates
+
+    def _record_error(self, model_price: float, quote_price: float) -> None:
+        abs_error = abs(model_price - quote_price)
+        errors = self.errors
+        errors.samples += 1
+        errors.total_abs_error += abs_error
+        errors.total_abs_pct_error += abs_error / quote_price * 100
+        errors.max_abs_error = max(errors.max_abs_error, abs_error)
+        errors.last_abs_error = round(abs_error, 4)
+
+    def implied_vol(self, occ_symbol: str) -> Optional[float]:
+        sample = self._samples.get(occ_symbol)
+        return sample.sigma if sample is not None else None
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "calibrated_contracts": len(self._samples),
+            "estimates_made": self.estimates_made,
+            "stale_skipped": self.stale_skipped,
+            "max_age_seconds": self.max_age_seconds,
+            "error": self.errors.to_dict(),
+        }
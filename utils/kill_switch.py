@@ -26,6 +26,8 @@ from datetime import datetime
 from pathlib import Path
 from typing import Dict, Optional, Any
 
+from .state_store import get_state_store
+
 logger = logging.getLogger(__name__)
 
 
@@ -40,6 +42,7 @@ class KillSwitch:
         """
         self.project_root = Path(project_root or os.getcwd())
         self.stop_file = self.project_root / "EMERGENCY_STOP.txt"
+        self._store = get_state_store().namespace("kill_switch", self.stop_file)
         self._lock = threading.Lock()
         
         # State variables
@@ -246,12 +249,9 @@ class KillSwitch:
                 "monitor_only": self._monitor_only
             }
             
-            # Atomic write using temporary file
-            temp_file = self.stop_file.with_suffix('.tmp')
-            temp_file.write_text(json.dumps(data, indent=2))
-            temp_file.replace(self.stop_file)
-            
-            return True
+            # Written through (atomic, under the cross-process lock)
+            self._store.save(data, flush=True)
+            return not self._store.dirty
             
         except Exception as e:
             logger.error(f"[KILL-SWITCH] Error persisting to disk: {e}")
@@ -264,9 +264,7 @@ class KillSwitch:
             True if successfully removed or file doesn't exist
         """
         try:
-            if self.stop_file.exists():
-                self.stop_file.unlink()
-            return True
+            return self._store.delete()
             
         except Exception as e:
             logger.error(f"[KILL-SWITCH] Error removing stop file: {e}")
@@ -9,7 +9,7 @@ import sys
 import re
 import json
 from pathlib import Path
-from typing import Dict
+from typing import Dict, List
 
 
 def mask_secrets(message: str) -> str:
@@ -130,67 +130,88 @@ def setup_logging(log_level: str = "INFO", log_file: str = "logs/app.log") -> No
             pass
 
 
-def log_trade_decision(log_file: str, trade_data: Dict):
+# Scoped ledger 18-field trade-log schema (with VIX data)
+TRADE_LOG_HEADER = [
+    "timestamp",
+    "symbol",
+    "decision",
+    "confidence",
+    "current_price",
+    "strike",
+    "premium",
+    "quantity",
+    "total_cost",
+    "reason",
+    "status",
+    "fill_price",
+    "pnl_pct",
+    "pnl_amount",
+    "exit_reason",
+    "vix_level",
+    "vix_adjustment_factor",
+    "vix_regime",
+]
+
+
+def trade_log_row(trade_data: Dict) -> List:
+    """Map incoming trade_data to the trade-log schema (one CSV row)."""
+    return [
+        trade_data.get("pnl_amount", trade_data.get("realized_pnl", ""))
+        if field == "pnl_amount"
+        else trade_data.get(field, "")
+        for field in TRADE_LOG_HEADER
+    ]
+
+
+def append_trade_rows(log_file: str, rows: List[List]) -> None:
     """
-    Log trade decision to CSV file using the scoped ledger 15-field schema.
+    Append pre-mapped rows to a trade log in one write (header first if the file is new).
 
     Args:
         log_file: Path to the trade log CSV file
-        trade_data: Dictionary containing trade decision data
+        rows: Rows built with trade_log_row()
     """
+    if not rows:
+        return
+
     # Ensure directory exists
     try:
         os.makedirs(os.path.dirname(log_file) or ".", exist_ok=True)
     except Exception:
         pass
 
-    header = [
-        "timestamp",
-        "symbol",
-        "decision",
-        "confidence",
-        "current_price",
-        "strike",
-        "premium",
-        "quantity",
-        "total_cost",
-        "reason",
-        "status",
-        "fill_price",
-        "pnl_pct",
-        "pnl_amount",
-        "exit_reason",
-        "vix_level",
-        "vix_adjustment_factor",
-        "vix_regime",
-    ]
-
     file_exists = os.path.exists(log_file)
     with open(log_file, "a", newline="", encoding="utf-8") as f:
         writer = csv.writer(f)
         if not file_exists:
-            writer.writerow(header)
-
-        # Map incoming trade_data to the 18-field scoped schema with VIX data
-        row = [
-            trade_data.get("timestamp", ""),
-            trade_data.get("symbol", ""),
-            trade_data.get("decision", ""),
-            trade_data.get("confidence", ""),
-            trade_data.get("current_price", ""),
-            trade_data.get("strike", ""),
-            trade_data.get("premium", ""),
-            trade_data.get("quantity", ""),
-            trade_data.get("total_cost", ""),
-            trade_data.get("reason", ""),
-            trade_data.get("status", ""),
-            trade_data.get("fill_price", ""),
-            trade_data.get("pnl_pct", ""),
-            trade_data.get("pnl_amount", trade_data.get("realized_pnl", "")),
-            trade_data.get("exit_reason", ""),
-            trade_data.get("vix_level", ""),
-            trade_data.get("vix_adjustment_factor", ""),
-            trade_data.get("vix_regime", ""),
-        ]
-
-        writer.writerow(row)
+            writer.writerow(TRADE_LOG_HEADER)
+        writer.writerows(rows)
+
+    # Mirror into the date/symbol-partitioned analytics archive (TRADE_ARCHIVE_ENABLED)
+    try:
+        from utils.trade_archive import archive_trade_rows
+
+        archive_trade_rows(log_file, [dict(zip(TRADE_LOG_HEADER, row)) for row in rows])
+    except ImportError:
+        pass
+
+
+def log_trade_decision(log_file: str, trade_data: Dict):
+    """
+    Log trade decision to CSV file using the scoped ledger 15-field schema.
+
+    NO_TRADE rows buffered by utils.decision_log for the same file are
+    written first, so the log stays in order.
+
+    Args:
+        log_file: Path to the trade log CSV file
+        trade_data: Dictionary containing trade decision data
+    """
+    try:
+        from utils.decision_log import flush_pending_decisions
+
+        flush_pending_decisions(log_file)
+    except ImportError:
+        pass
+
+    append_trade_rows(log_file, [trade_log_row(trade_data)])
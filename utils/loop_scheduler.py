@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Drift-Free Loop Scheduler
+
+Fixed-rate scheduling for the scanner and position monitor loops. Sleeping a
+full interval after each cycle lets the cadence drift by the cycle's own
+runtime; this scheduler instead fires on a fixed grid of tick times, so a 5m
+scan with a 5s offset runs at :00:05, :05:05, :10:05... regardless of how
+long each scan takes.
+
+Key Features:
+- Second-level (float) intervals
+- Ticks aligned to wall-clock boundaries (e.g. bar closes) plus an offset
+- Or anchored to the start time when alignment is off
+- Overrun detection: missed ticks are skipped, never bunched up
+- Bounded random jitter per tick without drifting the grid
+- Run-time, lateness and overrun metrics
+
+Usage:
+    from utils.loop_scheduler import LoopScheduler
+
+    scheduler = LoopScheduler(300, offset_seconds=5, name="scan")  # 5s after each 5m bar
+    while True:
+        run_scan()
+        scheduler.wait_next()
+
+Author: Robinhood HA Breakout System
+Version: 1.0.0
+License: MIT
+"""
+
+import logging
+import math
+import random
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SchedulerStats:
+    """Timing metrics for a scheduled loop."""
+    ticks: int = 0
+    overruns: int = 0
+    missed_ticks: int = 0
+    last_run_s: float = 0.0
+    max_run_s: float = 0.0
+    total_run_s: float = 0.0
+    last_lateness_s: float = 0.0
+    max_lateness_s: float = 0.0
+
+    @property
+    def avg_run_s(self) -> float:
+        return self.total_run_s / self.ticks if self.ticks else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "ticks": self.ticks,
+            "overruns": self.overruns,
+            "missed_ticks": self.missed_ticks,
+            "last_run_s": round(self.last_run_s, 3),
+            "avg_run_s": round(self.avg_run_s, 3),
+            "max_run_s": round(self.max_run_s, 3),
+            "last_lateness_ms": round(self.last_lateness_s * 1000, 1),
+            "max_lateness_ms": round(self.max_lateness_s * 1000, 1),
+        }
+
+
+class LoopScheduler:
+    """Fixed-rate tick scheduler with wall-clock alignment and overrun handling."""
+
+    def __init__(
+        self,
+        interval_seconds: float,
+        offset_seconds: float = 0.0,
+        align: bool = True,
+        jitter_seconds: float = 0.0,
+        name: str = "loop",
+        clock: Callable[[], float] = time.time,
+        sleep: Optional[Callable[[float], None]] = None,
+    ):
+        """Initialize scheduler.
+
+        Args:
+            interval_seconds: Tick period in seconds (fractions allowed)
+            offset_seconds: Delay after each aligned boundary (e.g. 5 = 5s after a bar close)
+            align: Align ticks to multiples of the interval since the epoch (UTC);
+                otherwise ticks are anchored to the scheduler's start time
+            jitter_seconds: Random delay in [0, jitter) added to each tick; the
+                grid itself does not move
+            name: Label used in logs
+            clock: Wall-clock source (epoch seconds)
+            sleep: Sleep function (defaults to an interruptible wait; see stop())
+        """
+        if interval_seconds <= 0:
+            raise ValueError("interval_seconds must be positive")
+        self.interval = float(interval_seconds)
+        self.offset = float(offset_seconds) % self.interval
+        self.align = align
+        self.jitter = max(0.0, float(jitter_seconds))
+        self.name = name
+        self._clock = clock
+        self._stop_event = threading.Event()
+        self._sleep = sleep or self._stop_event.wait
+
+        self.stats = SchedulerStats()
+        self._anchor = self._clock()
+        self._last_tick: Optional[float] = None  # scheduled time of the last tick
+        self._last_started: Optional[float] = None  # actual time the last tick fired
+
+    def next_tick(self, now: Optional[float] = None) -> float:
+        """Scheduled time of the next tick strictly after now (or the last tick)."""
+        now = self._clock() if now is None else now
+        if self.align:
+            base = self.offset
+        else:
+            base = self._anchor
+        k = math.floor((now - base) / self.interval) + 1
+        tick = base + k * self.interval
+        if self._last_tick is not None and tick <= self._last_tick:
+            tick = self._last_tick + self.interval
+        return tick
+
+    def seconds_until_next(self, now: Optional[float] = None) -> float:
+        now = self._clock() if now is None else now
+        return max(0.0, self.next_tick(now) - now)
+
+    def wait_next(self) -> Optional[float]:
+        """Record the cycle that just finished, then sleep until the next tick.
+
+        Returns:
+            Scheduled epoch time of the tick that fired, or None if stop() was called
+        """
+        now = self._clock()
+        if self._last_started is not None:
+            self._record_run(now)
+
+        tick = self.next_tick(now)
+        fire_at = tick + (random.uniform(0, self.jitter) if self.jitter else 0.0)
+        delay = fire_at - now
+        if delay > 0:
+            self._sleep(delay)
+        if self._stop_event.is_set():
+            return None
+
+        fired = self._clock()
+        lateness = max(0.0, fired - fire_at)
+        self.stats.ticks += 1
+        self.stats.last_lateness_s = lateness
+        self.stats.max_lateness_s = max(self.stats.max_lateness_s, lateness)
+        self._last_tick = tick
+        self._last_started = fired
+        return tick
+
+    def mark_started(self) -> None:
+        """Start timing a cycle that ran before the first wait_next() (e.g. at startup)."""
+        self._last_started = self._clock()
+        if self._last_tick is None:
+            self._last_tick = self._last_started
+
+    def stop(self) -> None:
+        """Interrupt a pending wait; wait_next() then returns None."""
+        self._stop_event.set()
+
+    @property
+    def stopped(self) -> bool:
+        return self._stop_event.is_set()
+
+    def describe(self) -> str:
+        """Human-readable schedule, e.g. 'every 300s at +5s past boundary'."""
+        if self.align:
+            schedule = f"every {self.interval:g}s at +{self.offset:g}s past boundary"
+        else:
+            schedule = f"every {self.interval:g}s from start"
+        if self.jitter:
+            schedule += f" (jitter ≤{self.jitter:g}s)"
+        return schedule
+
+    def next_tick_datetime(self, tz=None) -> datetime:
+        return datetime.fromtimestamp(self.next_tick(), tz)
+
+    def _record_run(self, now: float) -> None:
+        run_s = now - self._last_started
+        self.stats.last_run_s = run_s
+        self.stats.max_run_s = max(self.stats.max_run_s, run_s)
+        self.stats.total_run_s += run_s
+
+        due = self._last_tick + self.interval
+        if now > due:
+            missed = int((now - due) // self.interval) + 1
+            self.stats.overruns += 1
+            self.stats.missed_ticks += missed
+            logger.warning(
+                f"[SCHEDULER] {self.name} cycle took {run_s:.1f}s, overran its "
+                f"{self.interval:g}s interval; skipping {missed} tick(s)"
+            )
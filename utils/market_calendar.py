@@ -14,10 +14,11 @@ from datetime import datetime, time, date
 from typing import Dict, Optional, Tuple, List
 import pytz
 from dataclasses import dataclass
-import json
 import os
 from pathlib import Path
 
+from .state_store import get_state_store
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -47,6 +48,7 @@ class MarketCalendar:
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(exist_ok=True)
         self.cache_file = self.cache_dir / "market_calendar.json"
+        self._store = get_state_store().namespace("market_calendar", self.cache_file)
         self.et_tz = pytz.timezone('US/Eastern')
         
         # Standard market hours (Eastern Time)
@@ -61,24 +63,22 @@ class MarketCalendar:
     def _load_cache(self) -> Dict:
         """Load cached market calendar data"""
         try:
-            if self.cache_file.exists():
-                with open(self.cache_file, 'r') as f:
-                    data = json.load(f)
-                    # Check if cache is from today (refresh daily)
-                    cache_date = datetime.fromisoformat(data.get('updated', '2000-01-01'))
-                    if cache_date.date() == datetime.now().date():
-                        return data
+            data = self._store.load()
+            if isinstance(data, dict):
+                # Check if cache is from today (refresh daily)
+                cache_date = datetime.fromisoformat(data.get('updated', '2000-01-01'))
+                if cache_date.date() == datetime.now().date():
+                    return data
         except Exception as e:
             logger.warning(f"Failed to load market calendar cache: {e}")
         
         return {"updated": datetime.now().isoformat(), "holidays": {}, "early_closes": {}}
     
     def _save_cache(self):
-        """Save market calendar data to cache"""
+        """Save market calendar data to cache (coalesced write through the state store)"""
         try:
             self._cache["updated"] = datetime.now().isoformat()
-            with open(self.cache_file, 'w') as f:
-                json.dump(self._cache, f, indent=2)
+            self._store.save(self._cache)
         except Exception as e:
             logger.warning(f"Failed to save market calendar cache: {e}")
     
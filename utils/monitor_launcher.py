@@ -2,15 +2,18 @@
 """
 Monitor launcher utility for automatic exit-monitor management.
 
-Handles spawning and tracking of monitor_alpaca.py processes for each symbol.
+Handles spawning and tracking of monitor_alpaca.py processes for each symbol,
+or, with use_service (MONITOR_SERVICE_ENABLED), one shared monitor service
+that symbols are added to and removed from over local IPC.
 """
 
 import sys
 import subprocess
+import time
 import psutil
 import logging
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Optional
 import atexit
 
 # Import enhanced Slack for S1 breadcrumbs
@@ -24,15 +27,24 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Shared service cycle interval (MONITOR_SERVICE_INTERVAL_SECONDS)
+DEFAULT_SERVICE_INTERVAL_SECONDS = 15
+
 
 class MonitorLauncher:
     """Manages automatic launching and tracking of monitor processes."""
 
-    def __init__(self, project_root: Optional[Path] = None):
+    def __init__(self, project_root: Optional[Path] = None, use_service: bool = False,
+                 service_address: Optional[str] = None,
+                 service_interval_seconds: int = DEFAULT_SERVICE_INTERVAL_SECONDS):
         """Initialize monitor launcher.
 
         Args:
             project_root: Path to project root directory. If None, auto-detect.
+            use_service: Route symbols to one shared monitor service instead of
+                spawning a process per symbol
+            service_address: Service IPC address (default: get_service_address())
+            service_interval_seconds: Cycle interval passed to a spawned service
         """
         if project_root is None:
             # Auto-detect project root (directory containing main.py)
@@ -41,6 +53,14 @@ class MonitorLauncher:
 
         self.project_root = Path(project_root)
         self.pid_dir = self.project_root
+        self.use_service = use_service
+        self.service_interval_seconds = int(service_interval_seconds)
+        self._service_client = None
+        if use_service:
+            from .monitor_service import MonitorServiceClient, get_service_address
+            self._service_client = MonitorServiceClient(
+                service_address or get_service_address(project_root=self.project_root)
+            )
         
         # Initialize Slack integration for S1 breadcrumbs
         try:
@@ -129,6 +149,91 @@ class MonitorLauncher:
             logger.error(f"Failed to spawn monitor for {symbol}: {e}")
             return None
 
+    def _spawn_service(self, symbols: Iterable[str] = ()) -> Optional[int]:
+        """Spawn the shared monitor service (monitor_alpaca.py --service).
+
+        Args:
+            symbols: Symbols the service watches from the start
+        """
+        monitor_script = self.project_root / "monitor_alpaca.py"
+        if not monitor_script.exists():
+            logger.error(f"Monitor script not found: {monitor_script}")
+            return None
+
+        cmd = [sys.executable, str(monitor_script), "--service", "--interval", str(self.service_interval_seconds)]
+        for symbol in symbols:
+            cmd += ["--symbol", symbol.upper()]
+        try:
+            process = subprocess.Popen(
+                cmd,
+                cwd=str(self.project_root),
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                stdin=subprocess.DEVNULL,
+                start_new_session=True,  # Detach from parent
+            )
+            logger.info(f"Spawned monitor service: PID {process.pid}")
+            return process.pid
+        except Exception as e:
+            logger.error(f"Failed to spawn monitor service: {e}")
+            return None
+
+    def ensure_service_running(self, timeout: float = 20.0, symbols: Iterable[str] = ()) -> Optional[int]:
+        """Start the shared monitor service if it is not answering.
+
+        Args:
+            timeout: Seconds to wait for a spawned service to answer
+            symbols: Symbols a spawned service watches from the start
+
+        Returns:
+            Service PID, or None if it could not be started
+        """
+        pid = self._service_client.ping()
+        if pid:
+            return pid
+
+        new_pid = self._spawn_service(symbols)
+        if not new_pid:
+            return None
+        # Not .monitor_<SYMBOL>.pid: the service is stopped over IPC, not by PID
+        try:
+            (self.pid_dir / ".monitor-service.pid").write_text(str(new_pid))
+        except IOError as e:
+            logger.error(f"Failed to write monitor service PID file: {e}")
+
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            pid = self._service_client.ping()
+            if pid:
+                return pid
+            if not self._is_process_running(new_pid):
+                break
+            time.sleep(0.2)
+        logger.error("Monitor service did not come up")
+        return None
+
+    def _ensure_service_symbol(self, symbol: str) -> bool:
+        """Add a symbol to the shared monitor service, starting it if needed."""
+        was_running = self._service_client.ping() is not None
+        if not self.ensure_service_running(symbols=[symbol]):
+            return False
+        try:
+            reply = self._service_client.add_symbol(symbol)
+        except Exception as e:
+            logger.error(f"Failed to add {symbol} to monitor service: {e}")
+            return False
+        if not reply.get("ok"):
+            logger.error(f"Monitor service rejected {symbol}: {reply.get('error')}")
+            return False
+
+        logger.info(f"Monitor service watching {symbol} ({len(reply.get('symbols', []))} symbols)")
+        if (reply.get("added") or not was_running) and self.slack:
+            try:
+                self.slack.send_info(f"🟢 Exit-monitor watching {symbol} (shared service)")
+            except Exception as e:
+                logger.debug(f"Could not send monitor started breadcrumb: {e}")
+        return True
+
     def ensure_monitor_running(self, symbol: str) -> bool:
         """Ensure monitor is running for a symbol.
 
@@ -141,6 +246,9 @@ class MonitorLauncher:
         symbol = symbol.upper()
         logger.info(f"Ensuring monitor is running for {symbol}")
 
+        if self.use_service:
+            return self._ensure_service_symbol(symbol)
+
         # Check if PID file exists and process is running
         existing_pid = self._read_pid_file(symbol)
         if existing_pid and self._is_process_running(existing_pid):
@@ -187,6 +295,13 @@ class MonitorLauncher:
             True if monitor was stopped, False otherwise
         """
         symbol = symbol.upper()
+        if self.use_service:
+            try:
+                self._service_client.remove_symbol(symbol)
+            except OSError:
+                logger.info(f"Monitor service not running; nothing to stop for {symbol}")
+            return True
+
         pid = self._read_pid_file(symbol)
 
         if not pid:
@@ -242,6 +357,9 @@ class MonitorLauncher:
         stopped_count = 0
         logger.info("Killing all monitors...")
 
+        if self.use_service and self._service_client.shutdown():
+            stopped_count += 1
+
         # Find all PID files
         pid_files = list(self.pid_dir.glob(".monitor_*.pid"))
         for pid_file in pid_files:
@@ -264,6 +382,9 @@ class MonitorLauncher:
         stopped_count = 0
         logger.info("Cleaning up all monitors...")
 
+        if self.use_service and self._service_client.shutdown():
+            stopped_count += 1
+
         # Find all PID files
         pid_files = list(self.pid_dir.glob(".monitor_*.pid"))
         for pid_file in pid_files:
@@ -299,6 +420,15 @@ class MonitorLauncher:
             Dict mapping symbol to PID for running monitors
         """
         running = {}
+        if self.use_service:
+            pid = self._service_client.ping()
+            if pid:
+                try:
+                    running.update({symbol: pid for symbol in self._service_client.list_symbols()})
+                except Exception as e:
+                    logger.error(f"Error listing monitor service symbols: {e}")
+            return running
+
         pid_files = list(self.pid_dir.glob(".monitor_*.pid"))
 
         for pid_file in pid_files:
@@ -328,7 +458,16 @@ def get_monitor_launcher() -> MonitorLauncher:
     """Get global monitor launcher instance."""
     global _launcher
     if _launcher is None:
-        _launcher = MonitorLauncher()
+        use_service = False
+        interval = DEFAULT_SERVICE_INTERVAL_SECONDS
+        try:
+            from .llm import load_config
+            config = load_config()
+            use_service = bool(config.get("MONITOR_SERVICE_ENABLED", False))
+            interval = int(config.get("MONITOR_SERVICE_INTERVAL_SECONDS", DEFAULT_SERVICE_INTERVAL_SECONDS))
+        except Exception as e:
+            logger.debug(f"Could not read monitor service settings: {e}")
+        _launcher = MonitorLauncher(use_service=use_service, service_interval_seconds=interval)
     return _launcher
 
 
@@ -347,6 +486,11 @@ def cleanup_all_monitors() -> None:
     get_monitor_launcher().cleanup_all_monitors()
 
 
+def kill_all_monitors() -> int:
+    """Convenience function to kill all monitors (S1 shutdown path in main.py)."""
+    return get_monitor_launcher().kill_all_monitors()
+
+
 if __name__ == "__main__":
     # CLI interface for testing
     import argparse
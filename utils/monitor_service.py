@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+"""
+Multiplexed Position Monitor Service
+
+A single long-running monitor process that tracks every watched symbol in one
+event loop, replacing the one-monitor_alpaca.py-process-per-symbol model.
+All symbols share one EnhancedPositionMonitor, so one set of Alpaca/Slack
+clients, one positions file read and one batched quote request per cycle.
+
+The trader adds and removes symbols over a local IPC channel (Unix domain
+socket, or localhost TCP where Unix sockets are unavailable) speaking
+newline-delimited JSON.
+
+Key Features:
+- One process, one event loop, one quote feed for all symbols
+- add/remove/list/status/ping/shutdown commands over local IPC
+- Immediate cycle when a symbol is added (no wait for the next tick)
+- Open positions watched from startup, so a restarted service resumes
+- Fixed-rate cycles via LoopScheduler; cycles run off the IPC loop
+- Process memory and cycle metrics in status replies
+
+Usage:
+    # Service (normally spawned by MonitorLauncher)
+    python monitor_alpaca.py --service
+
+    # Trader side
+    from utils.monitor_service import MonitorServiceClient
+
+    client = MonitorServiceClient()
+    client.add_symbol("SPY")
+    print(client.status())
+
+Author: Robinhood HA Breakout System
+Version: 1.0.0
+License: MIT
+"""
+
+import asyncio
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_SOCKET_NAME = ".monitor_service.sock"
+DEFAULT_TCP_ADDRESS = "127.0.0.1:8765"
+
+
+def get_service_address(config: Optional[Dict] = None, project_root: Optional[Path] = None) -> str:
+    """Resolve the IPC address: ENV MONITOR_SERVICE_ADDRESS, config, then a default.
+
+    Addresses of the form host:port are TCP; anything else is a Unix socket path.
+    """
+    address = os.getenv("MONITOR_SERVICE_ADDRESS") or (config or {}).get("MONITOR_SERVICE_ADDRESS")
+    if address:
+        return str(address)
+    if hasattr(socket, "AF_UNIX"):
+        return str(Path(project_root or PROJECT_ROOT) / DEFAULT_SOCKET_NAME)
+    return DEFAULT_TCP_ADDRESS
+
+
+def _parse_tcp(address: str) -> Optional[Tuple[str, int]]:
+    host, sep, port = address.rpartition(":")
+    if sep and host and port.isdigit() and "/" not in address and "\\" not in address:
+        return host, int(port)
+    return None
+
+
+def _rss_mb() -> Optional[float]:
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    except Exception:
+        return None
+
+
+class MonitorService:
+    """Runs one EnhancedPositionMonitor for many symbols behind a local IPC server."""
+
+    def __init__(
+        self,
+        monitor,
+        address: Optional[str] = None,
+        interval_seconds: float = 15.0,
+        symbols: Optional[Iterable[str]] = None,
+    ):
+        """Initialize service.
+
+        Args:
+            monitor: EnhancedPositionMonitor (or compatible) shared by all symbols
+            address: Unix socket path or host:port (default: get_service_address())
+            interval_seconds: Seconds between monitoring cycles
+            symbols: Symbols to watch from the start
+        """
+        self.monitor = monitor
+        self.address = address or get_service_address(getattr(monitor, "config", None))
+        self.interval_seconds = float(interval_seconds)
+
+        self._symbols = {s.upper() for s in (symbols or [])}
+        self._symbols_lock = threading.Lock()
+        self._apply_filter()
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._stopping: Optional[asyncio.Event] = None
+        self._ready = threading.Event()
+        # Cycles do blocking I/O; keep them off the IPC loop, one at a time
+        self._cycle_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="monitor-cycle")
+
+        self.started_at = time.time()
+        self.cycles = 0
+        self.commands_handled = 0
+        self.last_cycle_ms: Optional[float] = None
+        self.last_cycle_error: Optional[str] = None
+
+    @property
+    def symbols(self) -> List[str]:
+        with self._symbols_lock:
+            return sorted(self._symbols)
+
+    def _apply_filter(self) -> None:
+        with self._symbols_lock:
+            self.monitor.symbol_filter = set(self._symbols)
+
+    def watch_open_positions(self) -> List[str]:
+        """Also watch the underlying of every open position.
+
+        Called at startup so a restarted service resumes watching the symbols
+        the previous one was watching.
+
+        Returns:
+            Symbols added
+        """
+        try:
+            positions = self.monitor.load_positions()
+        except Exception as e:
+            logger.warning(f"[MONITOR-SVC] Could not load open positions: {e}")
+            return []
+        symbols = {
+            str(p.get("symbol", "")).upper().strip()
+            for p in positions
+            if not str(p.get("status", "")).lower().startswith("closed")
+        }
+        symbols.discard("")
+        with self._symbols_lock:
+            added = sorted(symbols - self._symbols)
+            self._symbols.update(added)
+        self._apply_filter()
+        if added:
+            logger.info(f"[MONITOR-SVC] Watching open positions: {', '.join(added)}")
+        return added
+
+    # ------------------------------------------------------------------
+    # Commands
+    # ------------------------------------------------------------------
+
+    def handle_command(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Execute one IPC command and return the reply payload."""
+        self.commands_handled += 1
+        action = str(request.get("action", "")).lower()
+        symbol = str(request.get("symbol", "")).upper().strip()
+
+        if action == "ping":
+            return {"ok": True, "pid": os.getpid()}
+        if action == "add":
+            if not symbol:
+                return {"ok": False, "error": "symbol required"}
+            with self._symbols_lock:
+                added = symbol not in self._symbols
+                self._symbols.add(symbol)
+            self._apply_filter()
+            if added:
+                logger.info(f"[MONITOR-SVC] Watching {symbol} ({len(self.symbols)} symbols)")
+                self.wake()
+            return {"ok": True, "added": added, "symbols": self.symbols}
+        if action == "remove":
+            if not symbol:
+                return {"ok": False, "error": "symbol required"}
+            with self._symbols_lock:
+                removed = symbol in self._symbols
+                self._symbols.discard(symbol)
+            self._apply_filter()
+            if removed:
+                logger.info(f"[MONITOR-SVC] Stopped watching {symbol} ({len(self.symbols)} symbols)")
+            return {"ok": True, "removed": removed, "symbols": self.symbols}
+        if action == "list":
+            return {"ok": True, "symbols": self.symbols}
+        if action == "status":
+            return {"ok": True, **self.status()}
+        if action == "shutdown":
+            logger.info("[MONITOR-SVC] Shutdown requested over IPC")
+            self.stop()
+            return {"ok": True}
+        return {"ok": False, "error": f"unknown action: {action or '<none>'}"}
+
+    def status(self) -> Dict[str, Any]:
+        """Service metrics for the status command."""
+        return {
+            "pid": os.getpid(),
+            "symbols": self.symbols,
+            "cycles": self.cycles,
+            "last_cycle_ms": self.last_cycle_ms,
+            "last_cycle_error": self.last_cycle_error,
+            "interval_seconds": self.interval_seconds,
+            "uptime_seconds": round(time.time() - self.started_at, 1),
+            "rss_mb": _rss_mb(),
+            "position_sync": self._monitor_metrics("position_sync_metrics"),
+            "exit_execution": self._monitor_metrics("exit_execution_metrics"),
+            "iv_estimator": self._monitor_metrics("iv_estimator_metrics"),
+            "state_store": self._monitor_metrics("state_store_metrics"),
+        }
+
+    def _monitor_metrics(self, name: str) -> Optional[Dict[str, Any]]:
+        metrics = getattr(self.monitor, name, None)
+        try:
+            result = metrics() if callable(metrics) else None
+        except Exception:
+            return None
+        return result if isinstance(result, dict) else None
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def run(self) -> None:
+        """Serve until stop() or a shutdown command (blocking)."""
+        try:
+            asyncio.run(self.serve())
+        except KeyboardInterrupt:
+            logger.info("[MONITOR-SVC] Stopped by user")
+        finally:
+            self._cycle_executor.shutdown(wait=True)
+
+    def start_in_thread(self, timeout: float = 5.0) -> threading.Thread:
+        """Run the service on a daemon thread (tests, embedding)."""
+        thread = threading.Thread(target=self.run, name="monitor-service", daemon=True)
+        thread.start()
+        if not self._ready.wait(timeout):
+            raise RuntimeError("Monitor service failed to start")
+        return thread
+
+    def wake(self) -> None:
+        """Run a cycle now instead of waiting for the next tick."""
+        self._signal(self._wake)
+
+    def stop(self) -> None:
+        self._signal(self._stopping)
+
+    def _signal(self, event: Optional[asyncio.Event]) -> None:
+        if self._loop is None or event is None or self._loop.is_closed():
+            return
+        try:
+            self._loop.call_soon_threadsafe(event.set)
+        except RuntimeError:
+            pass  # Loop closed between the check and the call
+
+    async def serve(self) -> None:
+        from .loop_scheduler import LoopScheduler
+
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._stopping = asyncio.Event()
+        server = await self._start_server()
+        scheduler = LoopScheduler(self.interval_seconds, name="monitor-service")
+        logger.info(
+            f"[MONITOR-SVC] Serving on {self.address} ({scheduler.describe()}, "
+            f"symbols: {', '.join(self.symbols) or 'none'})"
+        )
+        self._ready.set()
+        try:
+            while not self._stopping.is_set():
+                if self.symbols:
+                    await self._run_cycle()
+                delay = scheduler.seconds_until_next()
+                waiters = [asyncio.ensure_future(self._wake.wait()), asyncio.ensure_future(self._stopping.wait())]
+                await asyncio.wait(waiters, timeout=delay, return_when=asyncio.FIRST_COMPLETED)
+                for waiter in waiters:
+                    waiter.cancel()
+                self._wake.clear()
+        finally:
+            server.close()
+            await server.wait_closed()
+            self._remove_socket_file()
+            logger.info(f"[MONITOR-SVC] Stopped after {self.cycles} cycles")
+
+    async def _run_cycle(self) -> None:
+        start = time.perf_counter()
+        try:
+            await self._loop.run_in_executor(self._cycle_executor, self.monitor.run_monitoring_cycle)
+            self.last_cycle_error = None
+        except Exception as e:
+            self.last_cycle_error = str(e)
+            logger.error(f"[MONITOR-SVC] Monitoring cycle failed: {e}")
+        self.cycles += 1
+        self.last_cycle_ms = round((time.perf_counter() - start) * 1000, 1)
+
+    async def _start_server(self):
+        tcp = _parse_tcp(self.address)
+        if tcp:
+            return await asyncio.start_server(self._handle_client, tcp[0], tcp[1])
+        self._remove_socket_file()
+        return await asyncio.start_unix_server(self._handle_client, path=self.address)
+
+    def _remove_socket_file(self) -> None:
+        if _parse_tcp(self.address) is None:
+            try:
+                os.unlink(self.address)
+            except OSError:
+                pass
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    reply = self.handle_command(request if isinstance(request, dict) else {})
+                except json.JSONDecodeError as e:
+                    reply = {"ok": False, "error": f"invalid JSON: {e}"}
+                writer.write((json.dumps(reply) + "\n").encode())
+                await writer.drain()
+        except (ConnectionResetError, BrokenPipeError):
+            pass
+        finally:
+            writer.close()
+
+
+class MonitorServiceClient:
+    """Trader-side client for the monitor service."""
+
+    def __init__(self, address: Optional[str] = None, timeout: float = 2.0):
+        """Initialize client.
+
+        Args:
+            address: Unix socket path or host:port (default: get_service_address())
+            timeout: Connect/read timeout in seconds
+        """
+        self.address = address or get_service_address()
+        self.timeout = timeout
+
+    def request(self, action: str, **params: Any) -> Dict[str, Any]:
+        """Send one command and return the reply.
+
+        Raises:
+            OSError: If the service is not reachable
+        """
+        payload = (json.dumps({"action": action, **params}) + "\n").encode()
+        tcp = _parse_tcp(self.address)
+        if tcp:
+            sock = socket.create_connection(tcp, timeout=self.timeout)
+        else:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            sock.connect(self.address)
+        with sock:
+            sock.sendall(payload)
+            with sock.makefile("rb") as stream:
+                line = stream.readline()
+        if not line:
+            raise ConnectionError("Monitor service closed the connection")
+        return json.loads(line)
+
+    def ping(self) -> Optional[int]:
+        """PID of the running service, or None if it is not reachable."""
+        try:
+            reply = self.request("ping")
+            return reply.get("pid") if reply.get("ok") else None
+        except (OSError, ValueError):
+            return None
+
+    def add_symbol(self, symbol: str) -> Dict[str, Any]:
+        return self.request("add", symbol=symbol)
+
+    def remove_symbol(self, symbol: str) -> Dict[str, Any]:
+        return self.request("remove", symbol=symbol)
+
+    def list_symbols(self) -> List[str]:
+        return self.request("list").get("symbols", [])
+
+    def status(self) -> Dict[str, Any]:
+        return self.request("status")
+
+    def shutdown(self) -> bool:
+        try:
+            return bool(self.request("shutdown").get("ok"))
+        except (OSError, ValueError):
+            return False
@@ -6,21 +6,52 @@ Persists small pieces of state across restarts, e.g.:
 - trailing_hits_count
 - stop_loss_breach_counts
 - eod_summary_sent_date
+- exit_manager (peak / trailing-stop state, see ExitStrategyManager.export_state)
 
 Uses atomic write (temp file + rename) and creates parent directory if missing.
+update() coalesces writes: unchanged state is never rewritten, and changed
+state is written at most every min_interval_seconds (flush() forces the
+pending write, e.g. at shutdown). Datetimes and dates round-trip as tagged
+ISO strings.
 """
 from __future__ import annotations
 
 import json
 import os
+import time
 from dataclasses import dataclass, field
-from typing import Any, Dict
+from datetime import date, datetime
+from typing import Any, Dict, Optional
+
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"__datetime__": value.isoformat()}
+    if isinstance(value, date):
+        return {"__date__": value.isoformat()}
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _decode(obj: Dict[str, Any]) -> Any:
+    if len(obj) == 1:
+        if "__datetime__" in obj:
+            return datetime.fromisoformat(obj["__datetime__"])
+        if "__date__" in obj:
+            return date.fromisoformat(obj["__date__"])
+    return obj
 
 
 @dataclass
 class MonitorState:
     path: str
     data: Dict[str, Any] = field(default_factory=dict)
+    min_interval_seconds: float = 0.0
+    writes: int = 0
+    skipped: int = 0
+    _written_text: Optional[str] = field(default=None, repr=False)
+    _pending_text: Optional[str] = field(default=None, repr=False)
+    _pending_data: Optional[Dict[str, Any]] = field(default=None, repr=False)
+    _last_write_at: float = field(default=float("-inf"), repr=False)
 
     def load(self) -> Dict[str, Any]:
         try:
@@ -28,14 +59,71 @@ class MonitorState:
                 self.data = {}
                 return self.data
             with open(self.path, "r", encoding="utf-8") as f:
-                self.data = json.load(f)
+                text = f.read()
+            self.data = json.loads(text, object_hook=_decode)
+            self._written_text = text
             return self.data
         except Exception:
             # Return empty state on failure
             self.data = {}
             return self.data
 
+    @staticmethod
+    def dumps(data: Dict[str, Any]) -> str:
+        return json.dumps(data, ensure_ascii=False, sort_keys=True, default=_encode)
+
+    @property
+    def dirty(self) -> bool:
+        """A changed state is waiting for its coalesced write."""
+        return self._pending_text is not None
+
     def save(self, data: Dict[str, Any]) -> None:
+        """Write immediately (atomic)."""
+        try:
+            self._write(self.dumps(data), data)
+        except Exception:
+            pass
+
+    def update(self, data: Dict[str, Any], force: bool = False) -> bool:
+        """Coalesced save: write only if data changed, at most every min_interval_seconds.
+
+        Args:
+            data: Full state payload
+            force: Write a changed payload now regardless of the interval
+
+        Returns:
+            True if the file was written
+        """
+        text = self.dumps(data)
+        if text == self._written_text:
+            self._pending_text = self._pending_data = None
+            self.skipped += 1
+            return False
+        self._pending_text, self._pending_data = text, data
+        if not force and time.monotonic() - self._last_write_at < self.min_interval_seconds:
+            return False
+        return self.flush()
+
+    def flush(self) -> bool:
+        """Write the pending change, if any."""
+        if self._pending_text is None:
+            return False
+        try:
+            self._write(self._pending_text, self._pending_data)
+        except Exception:
+            return False
+        self._pending_text = self._pending_data = None
+        return True
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "writes": self.writes,
+            "unchanged_skipped": self.skipped,
+            "dirty": self.dirty,
+            "min_interval_seconds": self.min_interval_seconds,
+        }
+
+    def _write(self, text: str, data: Dict[str, Any]) -> None:
         # Ensure directory
         try:
             os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
@@ -45,9 +133,8 @@ class MonitorState:
         tmp_path = f"{self.path}.tmp"
         try:
             with open(tmp_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False)
+                f.write(text)
             os.replace(tmp_path, self.path)
-            self.data = data
         except Exception:
             # Best-effort cleanup of tmp file
             try:
@@ -55,3 +142,8 @@ class MonitorState:
                     os.remove(tmp_path)
             except Exception:
                 pass
+            raise
+        self.data = data
+        self._written_text = text
+        self._last_write_at = time.monotonic()
+        self.writes += 1
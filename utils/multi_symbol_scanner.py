@@ -79,9 +79,18 @@ class MultiSymbolScanner:
         """
         Scan all configured symbols for breakout opportunities.
 
+        NO_TRADE rows logged during the scan are written in one batch when
+        it ends (or fails).
+
         Returns:
             List of trade opportunities sorted by priority/confidence
         """
+        from .decision_log import get_decision_log
+
+        with get_decision_log().batch():
+            return self._scan_all_symbols()
+
+    def _scan_all_symbols(self) -> List[Dict]:
         # Early market hours check - skip all processing if market is closed
         from datetime import datetime
         import pytz
@@ -1364,7 +1373,8 @@ class MultiSymbolScanner:
             bankroll = BankrollManager(
                 start_capital=1000.0,  # Dummy value, we're just reading history
                 broker=getattr(self, 'broker', 'robinhood'),
-                env=getattr(self, 'env', 'paper')
+                env=getattr(self, 'env', 'paper'),
+                backend=self.config.get('BANKROLL_BACKEND')
             )
             
             recent_outcomes = bankroll.get_recent_outcomes(n=2)
@@ -1426,57 +1436,35 @@ class MultiSymbolScanner:
             tuple[bool, str]: (proceed, reason)
         """
         try:
-            import json
-            from pathlib import Path
             from datetime import datetime, timedelta
             
             # Skip guard for NO_TRADE decisions
             if new_decision == "NO_TRADE":
                 return True, "NO_TRADE decisions not subject to rapid flip guard"
             
-            # Load recent signal log
-            cache_dir = Path(".cache")
-            log_file = cache_dir / f"signal_log_{symbol}.json"
-            
-            if not log_file.exists():
+            # Recent signals come from the in-memory ring buffer (journal-backed)
+            journal = self._get_signal_journal()
+            if not journal.entries(symbol):
                 return True, "No signal history for rapid flip check"
             
-            try:
-                with open(log_file, 'r') as f:
-                    signal_log = json.load(f)
-            except Exception as e:
-                logger.warning(f"Error reading signal log for {symbol}: {e}")
-                return True, "Signal log read error (allowing trade)"
-            
-            if not signal_log:
-                return True, "Empty signal history"
-            
-            # Find most recent trade signal (CALL or PUT, not NO_TRADE)
+            # Most recent trade signal (CALL or PUT, not NO_TRADE), if within the cooldown window
             recent_trade_signal = None
             current_time = datetime.now()
             
-            for entry in reversed(signal_log):
-                if entry.get("decision") in ["CALL", "PUT"]:
-                    try:
-                        entry_time = datetime.fromisoformat(entry["timestamp"])
-                        time_diff = current_time - entry_time
-                        
-                        # Check if within cooldown window
-                        if time_diff <= timedelta(minutes=window_min):
-                            recent_trade_signal = entry
-                            break
-                        else:
-                            # Outside window, no need to check further
-                            break
-                    except Exception as e:
-                        logger.warning(f"Error parsing timestamp in signal log: {e}")
-                        continue
+            last_signal = journal.last_trade_signal(symbol)
+            if last_signal is not None:
+                try:
+                    entry_time = datetime.fromisoformat(last_signal.timestamp)
+                    if current_time - entry_time <= timedelta(minutes=window_min):
+                        recent_trade_signal = last_signal
+                except Exception as e:
+                    logger.warning(f"Error parsing timestamp in signal log: {e}")
             
             if not recent_trade_signal:
                 return True, f"No recent trade signals within {window_min} minutes"
             
             # Check if new decision is opposite to recent signal
-            recent_decision = recent_trade_signal["decision"]
+            recent_decision = recent_trade_signal.decision
             is_opposite = (recent_decision == "CALL" and new_decision == "PUT") or \
                          (recent_decision == "PUT" and new_decision == "CALL")
             
@@ -1495,7 +1483,7 @@ class MultiSymbolScanner:
                 return True, f"Strong reversal detected: {trend_direction}, VWAP dev: {vwap_deviation_pct:.1%}"
             
             # Block weak opposite signal
-            time_since = current_time - datetime.fromisoformat(recent_trade_signal["timestamp"])
+            time_since = current_time - datetime.fromisoformat(recent_trade_signal.timestamp)
             minutes_ago = int(time_since.total_seconds() / 60)
             
             return False, f"Rapid flip blocked: {recent_decision} {minutes_ago}m ago, weak {new_decision} signal (trend: {trend_direction}, VWAP: {vwap_deviation_pct:.1%})"
@@ -1950,6 +1938,16 @@ class MultiSymbolScanner:
         else:
             return f"OTHER: {reason}"
 
+    def _get_signal_journal(self):
+        """Shared per-symbol signal ring buffers, persisted under .cache/ (recovered on first use)."""
+        journal = getattr(self, "_signal_journal", None)
+        if journal is None:
+            from pathlib import Path
+            from .signal_journal import get_signal_journal
+
+            journal = self._signal_journal = get_signal_journal(Path(".cache"))
+        return journal
+
     def _log_signal_event(self, symbol: str, decision: str, confidence: float, reason: str, price: float):
         """
         Log trading signal event for rapid flip protection and analytics.
@@ -1962,46 +1960,15 @@ class MultiSymbolScanner:
             price: Current stock price
         """
         try:
-            import json
-            import os
-            from pathlib import Path
-            
-            # Create .cache directory if it doesn't exist
-            cache_dir = Path(".cache")
-            cache_dir.mkdir(exist_ok=True)
-            
-            # Signal log file per symbol
-            log_file = cache_dir / f"signal_log_{symbol}.json"
-            
-            # Load existing log
-            signal_log = []
-            if log_file.exists():
-                try:
-                    with open(log_file, 'r') as f:
-                        signal_log = json.load(f)
-                except Exception as e:
-                    logger.warning(f"Error loading signal log for {symbol}: {e}")
-                    signal_log = []
-            
-            # Add new decision
-            signal_entry = {
-                "timestamp": datetime.now().isoformat(),
-                "decision": decision,
-                "confidence": confidence,
-                "reason": reason,
-                "price": price,
-                "scanner_env": getattr(self, 'env', 'unknown')
-            }
-            
-            signal_log.append(signal_entry)
-            
-            # Keep only last 50 entries for memory efficiency
-            if len(signal_log) > 50:
-                signal_log = signal_log[-50:]
-            
-            # Save updated log
-            with open(log_file, 'w') as f:
-                json.dump(signal_log, f, indent=2)
+            # Ring buffer append plus one journal line (no read/rewrite of the history)
+            self._get_signal_journal().record(
+                symbol,
+                decision=decision,
+                confidence=confidence,
+                reason=reason,
+                price=price,
+                scanner_env=getattr(self, 'env', 'unknown'),
+            )
                 
         except Exception as e:
             logger.warning(f"Error logging signal for {symbol}: {e}")
@@ -2088,6 +2055,9 @@ class MultiSymbolScanner:
         """
         Log individual symbol decision for analytics and debugging.
 
+        Rows are buffered and written in one batch when the scan ends
+        (see utils.decision_log).
+
         Args:
             symbol: Stock symbol
             decision: Trade decision (CALL, PUT, NO_TRADE)
@@ -2096,7 +2066,7 @@ class MultiSymbolScanner:
             current_price: Current stock price
         """
         try:
-            from .logging_utils import log_trade_decision
+            from .decision_log import log_no_trade
 
             trade_data = {
                 "timestamp": datetime.now().isoformat(),
@@ -2136,7 +2106,7 @@ class MultiSymbolScanner:
                         # Last resort legacy path
                         log_file = "logs/trade_history_robinhood_live.csv"
 
-            log_trade_decision(log_file, trade_data)
+            log_no_trade(log_file, trade_data)
             # Format confidence display properly for logging
             conf_display = f"{confidence:.3f}" if confidence is not None else "N/A"
             logger.debug(
@@ -1,8 +1,9 @@
 """Option math utilities (Black–Scholes).
 
-Currently only supports delta calculation for calls/puts and assumes
-continuous compounding, European style, risk-free rate r, time to
-expiration T (in years), volatility sigma, underlying price S, strike K.
+Supports delta, plus vectorized prices and implied volatility for
+calls/puts. Assumes continuous compounding, European style, risk-free rate
+r, time to expiration T (in years), volatility sigma, underlying price S,
+strike K.
 
 This lightweight helper avoids external dependencies beyond NumPy / SciPy.
 SciPy is not a hard requirement because we only need the standard normal
@@ -14,6 +15,8 @@ from __future__ import annotations
 import math
 from typing import Literal
 
+import numpy as np
+
 
 SQRT_2PI = math.sqrt(2.0 * math.pi)
 
@@ -57,3 +60,71 @@ def black_scholes_delta(
     else:
         # Put delta = Phi(d1) - 1
         return _Phi(d1) - 1.0
+
+
+def _norm_cdf(x: np.ndarray) -> np.ndarray:
+    """Vectorized standard normal CDF (Abramowitz & Stegun 7.1.26, |error| < 1.5e-7)."""
+    z = np.abs(x) / math.sqrt(2.0)
+    t = 1.0 / (1.0 + 0.3275911 * z)
+    poly = t * (0.254829592 + t * (-0.284496736 + t * (1.421413741 + t * (-1.453152027 + t * 1.061405429))))
+    return 0.5 * (1.0 + np.sign(x) * (1.0 - poly * np.exp(-z * z)))
+
+
+def black_scholes_price(S, K, T, sigma, r: float = 0.0, is_call=True) -> np.ndarray:
+    """Vectorized Black-Scholes price.
+
+    Args:
+        S, K, T, sigma: Scalars or arrays (broadcast together); T in years.
+        r: Risk-free rate (annualised, decimal).
+        is_call: Bool or bool array (False = put).
+
+    Returns:
+        Array of prices; where T or sigma is 0 the discounted intrinsic value.
+    """
+    S, K, T, sigma = np.broadcast_arrays(*(np.asarray(a, dtype=float) for a in (S, K, T, sigma)))
+    is_call = np.broadcast_to(np.asarray(is_call, dtype=bool), S.shape)
+    vol = sigma * np.sqrt(np.maximum(T, 0.0))
+    disc_k = K * np.exp(-r * T)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        d1 = (np.log(S / K) + (r + 0.5 * sigma * sigma) * T) / vol
+        call = S * _norm_cdf(d1) - disc_k * _norm_cdf(d1 - vol)
+    price = np.where(is_call, call, call - S + disc_k)  # Put via put-call parity
+    intrinsic = np.where(is_call, np.maximum(S - disc_k, 0.0), np.maximum(disc_k - S, 0.0))
+    return np.where(vol > 0, price, intrinsic)
+
+
+def implied_volatility(
+    price,
+    S,
+    K,
+    T,
+    r: float = 0.0,
+    is_call=True,
+    low: float = 1e-4,
+    high: float = 5.0,
+    tol: float = 1e-6,
+    max_iter: int = 100,
+) -> np.ndarray:
+    """Vectorized implied volatility by bisection.
+
+    Returns:
+        Array of sigmas; NaN where the price is outside the [low, high]
+        volatility range (e.g. below intrinsic) or inputs are not positive.
+    """
+    price, S, K, T = np.broadcast_arrays(*(np.asarray(a, dtype=float) for a in (price, S, K, T)))
+    is_call = np.broadcast_to(np.asarray(is_call, dtype=bool), S.shape)
+    lo = np.full(S.shape, low)
+    hi = np.full(S.shape, high)
+    valid = (
+        (price > 0) & (S > 0) & (K > 0) & (T > 0)
+        & (price >= black_scholes_price(S, K, T, lo, r, is_call) - tol)
+        & (price <= black_scholes_price(S, K, T, hi, r, is_call) + tol)
+    )
+    for _ in range(max_iter):
+        mid = 0.5 * (lo + hi)
+        above = black_scholes_price(S, K, T, mid, r, is_call) > price
+        hi = np.where(above, mid, hi)
+        lo = np.where(above, lo, mid)
+        if np.all(hi - lo < tol):
+            break
+    return np.where(valid, 0.5 * (lo + hi), np.nan)
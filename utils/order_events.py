@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+"""
+Order Event Stream
+
+Event-driven fill confirmation for Alpaca orders. Subscribes to the Alpaca
+trade_updates websocket stream on a background thread and resolves a future
+per order as soon as a terminal event (fill, canceled, expired, rejected)
+arrives, instead of polling the REST API every couple of seconds.
+
+Key Features:
+- One persistent trade_updates subscription shared by all orders
+- Future per order id / client order id, resolved with the same FillResult
+  that AlpacaOptionsTrader.poll_fill() returns
+- Bounded cache of recent terminal events so a fill that arrives before the
+  order is registered is never lost
+- Connection health tracking so callers fall back to REST polling whenever
+  the stream is down
+
+Usage:
+    from utils.order_events import get_order_event_stream
+
+    stream = get_order_event_stream(paper=True)
+    result = stream.wait_for_fill(order_id=order.id, timeout_s=90)
+    if result is None:
+        # stream unavailable - poll REST instead
+        ...
+
+Author: Robinhood HA Breakout System
+Version: 1.0.0
+License: MIT
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Any, Dict, List, Optional
+
+from alpaca.trading.stream import TradingStream
+
+from .alpaca_client import get_stream_url_override
+from .alpaca_options import FillResult
+
+logger = logging.getLogger(__name__)
+
+# trade_updates events that end an order's lifecycle, mapped to the status
+# string poll_fill() reports for the same outcome
+TERMINAL_EVENTS = {
+    "fill": "FILLED",
+    "canceled": "canceled",
+    "expired": "expired",
+    "rejected": "rejected",
+    "done_for_day": "done_for_day",
+}
+
+# How often wait_for_fill() re-checks stream health while blocked
+HEALTH_CHECK_INTERVAL_S = 0.5
+
+
+def _to_int(value: Any) -> int:
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return 0
+
+
+def _to_float(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class _TradeUpdatesClient(TradingStream):
+    """TradingStream that reports connection state changes."""
+
+    def __init__(self, *args, on_state=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._on_state = on_state
+
+    async def _start_ws(self):
+        await super()._start_ws()
+        if self._on_state:
+            self._on_state(True)
+
+    async def close(self) -> None:
+        try:
+            await super().close()
+        finally:
+            if self._on_state:
+                self._on_state(False)
+
+
+class OrderEventStream:
+    """Dispatches Alpaca trade_updates events to per-order futures."""
+
+    def __init__(
+        self,
+        api_key: str,
+        secret_key: str,
+        paper: bool = True,
+        url_override: Optional[str] = None,
+        cache_size: int = 500,
+    ):
+        """Initialize the stream (call start() to connect).
+
+        Args:
+            api_key: Alpaca API key
+            secret_key: Alpaca secret key
+            paper: Use the paper trading stream
+            url_override: Websocket URL override (e.g. local stand-in)
+            cache_size: Number of recent terminal events kept for late registrations
+        """
+        self.paper = paper
+        self.cache_size = cache_size
+        self._client = _TradeUpdatesClient(
+            api_key,
+            secret_key,
+            paper=paper,
+            raw_data=True,
+            url_override=url_override,
+            on_state=self._set_connected,
+        )
+        self._client.subscribe_trade_updates(self._on_trade_update)
+
+        self._lock = threading.Lock()
+        self._waiters: Dict[str, List[Future]] = {}
+        self._recent: "OrderedDict[str, FillResult]" = OrderedDict()
+        self._partials: Dict[str, FillResult] = {}
+        self._connected = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.events_received = 0
+        self.fills_dispatched = 0
+        self.disconnects = 0
+
+    @property
+    def is_connected(self) -> bool:
+        """True while the trade_updates websocket is authenticated and subscribed."""
+        return self._connected.is_set()
+
+    def start(self) -> "OrderEventStream":
+        """Start the stream on a daemon thread (idempotent)."""
+        if self._thread and self._thread.is_alive():
+            return self
+        self._thread = threading.Thread(
+            target=self._client.run, name="alpaca-trade-updates", daemon=True
+        )
+        self._thread.start()
+        logger.info(f"[ORDER-EVENTS] Trade updates stream started (paper={self.paper})")
+        return self
+
+    def wait_until_connected(self, timeout: float = 10.0) -> bool:
+        """Block until the stream is connected or the timeout expires."""
+        return self._connected.wait(timeout)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the stream and wait for the background thread to exit."""
+        try:
+            if self._client._loop is not None:
+                self._client.stop()
+        except Exception as e:
+            logger.debug(f"[ORDER-EVENTS] Error stopping stream: {e}")
+        if self._thread:
+            self._thread.join(timeout)
+        self._connected.clear()
+        logger.info("[ORDER-EVENTS] Trade updates stream stopped")
+
+    def register(
+        self, order_id: Optional[str] = None, client_order_id: Optional[str] = None
+    ) -> Future:
+        """Register interest in an order and return a future for its terminal FillResult.
+
+        The future resolves immediately if a terminal event for the order was
+        already received (fill-before-register race).
+        """
+        if not order_id and not client_order_id:
+            raise ValueError("order_id or client_order_id is required")
+
+        future: Future = Future()
+        keys = self._keys(order_id, client_order_id)
+        with self._lock:
+            for key in keys:
+                cached = self._recent.get(key)
+                if cached is not None:
+                    future.set_result(cached)
+                    return future
+            for key in keys:
+                self._waiters.setdefault(key, []).append(future)
+        return future
+
+    def unregister(self, future: Future) -> None:
+        """Drop a future that is no longer being waited on."""
+        with self._lock:
+            for key in list(self._waiters):
+                waiters = [f for f in self._waiters[key] if f is not future]
+                if waiters:
+                    self._waiters[key] = waiters
+                else:
+                    del self._waiters[key]
+
+    def wait_for_fill(
+        self,
+        order_id: Optional[str] = None,
+        client_order_id: Optional[str] = None,
+        timeout_s: float = 90,
+    ) -> Optional[FillResult]:
+        """Wait for an order's terminal event.
+
+        Args:
+            order_id: Alpaca order ID
+            client_order_id: Client order ID
+            timeout_s: Maximum time to wait in seconds
+
+        Returns:
+            FillResult on a terminal event, a TIMEOUT FillResult if the stream
+            stayed healthy but nothing arrived in time, or None if the stream
+            is (or became) unavailable and the caller should poll instead.
+        """
+        future = self.register(order_id, client_order_id)
+        deadline = time.monotonic() + timeout_s
+        try:
+            while True:
+                if future.done():
+                    return future.result()
+                if not self.is_connected:
+                    logger.warning("[ORDER-EVENTS] Stream unavailable while waiting for fill")
+                    return None
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    return future.result(timeout=min(HEALTH_CHECK_INTERVAL_S, remaining))
+                except FutureTimeoutError:
+                    continue
+        finally:
+            self.unregister(future)
+
+        partial = self._latest_partial(order_id, client_order_id)
+        logger.warning(f"[ORDER-EVENTS] Order {order_id or client_order_id} not filled within {timeout_s}s")
+        return FillResult(
+            status="TIMEOUT",
+            filled_qty=partial.filled_qty if partial else 0,
+            avg_price=partial.avg_price if partial else 0.0,
+            total_filled_qty=partial.total_filled_qty if partial else 0,
+            remaining_qty=partial.remaining_qty if partial else 0,
+            order_id=(partial.order_id if partial else order_id) or "",
+            client_order_id=client_order_id,
+        )
+
+    def _set_connected(self, connected: bool) -> None:
+        if connected:
+            if not self._connected.is_set():
+                logger.info("[ORDER-EVENTS] Connected to trade updates stream")
+            self._connected.set()
+        elif self._connected.is_set():
+            self.disconnects += 1
+            self._connected.clear()
+            logger.warning("[ORDER-EVENTS] Trade updates stream disconnected")
+
+    @staticmethod
+    def _keys(order_id: Optional[str], client_order_id: Optional[str]) -> List[str]:
+        keys = []
+        if order_id:
+            keys.append(f"id:{order_id}")
+        if client_order_id:
+            keys.append(f"cid:{client_order_id}")
+        return keys
+
+    @staticmethod
+    def _build_result(status: str, order: Dict[str, Any]) -> FillResult:
+        qty = _to_int(order.get("qty"))
+        filled_qty = _to_int(order.get("filled_qty"))
+        if status == "FILLED":
+            return FillResult(
+                status=status,
+                filled_qty=filled_qty,
+                avg_price=_to_float(order.get("filled_avg_price")),
+                total_filled_qty=filled_qty,
+                remaining_qty=0,
+                order_id=str(order.get("id", "")),
+                client_order_id=order.get("client_order_id"),
+            )
+        return FillResult(
+            status=status,
+            filled_qty=filled_qty,
+            avg_price=_to_float(order.get("filled_avg_price")),
+            total_filled_qty=filled_qty,
+            remaining_qty=max(qty - filled_qty, 0),
+            order_id=str(order.get("id", "")),
+            client_order_id=order.get("client_order_id"),
+        )
+
+    def _latest_partial(
+        self, order_id: Optional[str], client_order_id: Optional[str]
+    ) -> Optional[FillResult]:
+        with self._lock:
+            for key in self._keys(order_id, client_order_id):
+                if key in self._partials:
+                    return self._partials[key]
+        return None
+
+    async def _on_trade_update(self, msg: Dict[str, Any]) -> None:
+        data = msg.get("data") or {}
+        event = data.get("event")
+        order = data.get("order") or {}
+        keys = self._keys(order.get("id"), order.get("client_order_id"))
+        if not keys:
+            return
+        self.events_received += 1
+
+        if event == "partial_fill":
+            partial = self._build_result("PARTIAL", order)
+            with self._lock:
+                for key in keys:
+                    self._partials[key] = partial
+            logger.info(
+                f"[ORDER-EVENTS] Partial fill {order.get('id')}: "
+                f"{partial.filled_qty}/{_to_int(order.get('qty'))} @ ${partial.avg_price:.2f}"
+            )
+            return
+
+        status = TERMINAL_EVENTS.get(event)
+        if status is None:
+            return
+
+        result = self._build_result(status, order)
+        with self._lock:
+            for key in keys:
+                self._partials.pop(key, None)
+                self._recent[key] = result
+                self._recent.move_to_end(key)
+            while len(self._recent) > self.cache_size:
+                self._recent.popitem(last=False)
+            futures = []
+            for key in keys:
+                futures.extend(self._waiters.pop(key, []))
+
+        for future in {id(f): f for f in futures}.values():
+            if not future.done():
+                future.set_result(result)
+        if status == "FILLED":
+            self.fills_dispatched += 1
+        logger.info(
+            f"[ORDER-EVENTS] Order {result.order_id} {event}: "
+            f"{result.filled_qty} @ ${result.avg_price:.2f}"
+        )
+
+
+# Per-environment stream instances (paper / live)
+_order_event_streams: Dict[bool, OrderEventStream] = {}
+_streams_lock = threading.Lock()
+
+
+def get_order_event_stream(paper: bool = True) -> Optional[OrderEventStream]:
+    """Get the shared, started order event stream for an environment.
+
+    Returns None when Alpaca credentials are not configured.
+    """
+    with _streams_lock:
+        stream = _order_event_streams.get(paper)
+        if stream is None:
+            api_key = os.getenv("ALPACA_API_KEY") or os.getenv("ALPACA_KEY_ID")
+            secret_key = os.getenv("ALPACA_SECRET_KEY")
+            if not api_key or not secret_key:
+                logger.warning("[ORDER-EVENTS] Alpaca credentials not found - stream disabled")
+                return None
+            stream = OrderEventStream(
+                api_key, secret_key, paper=paper, url_override=get_stream_url_override()
+            ).start()
+            _order_event_streams[paper] = stream
+        return stream
@@ -84,16 +84,23 @@ import logging
 from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 from datetime import datetime
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from utils.ledger.constants import (
     POSITIONS_SCHEMA_ALPACA_V1,
     POSITIONS_SCHEMA_VERSION,
 )
+from utils.position_store import file_version, notify_positions_changed
+from utils.state_daemon import get_state_service
+from utils.records import LedgerPosition
 
 logger = logging.getLogger(__name__)
 
+# File version each Alpaca-scoped positions file had right after it was last
+# normalized in this process; an unchanged file is not normalized again.
+_normalized_versions: Dict[str, Tuple] = {}
 
-@dataclass
+
+@dataclass(slots=True)
 class Position:
     """Data class representing an open options position."""
 
@@ -167,14 +174,22 @@ class PortfolioManager:
                 "contracts",
                 "entry_premium",
             ]
+        # Parsed open positions, valid while the file version is unchanged
+        self._cache_version: Optional[Tuple] = None
+        self._cached_positions: List[Position] = []
         self._ensure_positions_file()
         # Normalize existing Alpaca-scoped files to canonical schema to prevent column misalignment
         if self.is_alpaca_scoped:
-            try:
-                self._normalize_alpaca_positions_file()
-                logger.info(f"[PORTFOLIO] Positions schema v{POSITIONS_SCHEMA_VERSION} normalized: {self.positions_file}")
-            except Exception as e:
-                logger.debug(f"[PORTFOLIO] Schema normalization skipped: {e}")
+            key = str(self.positions_file.resolve())
+            if _normalized_versions.get(key) == file_version(self.positions_file):
+                logger.debug(f"[PORTFOLIO] Positions file unchanged since last normalization: {self.positions_file}")
+            else:
+                try:
+                    self._normalize_alpaca_positions_file()
+                    _normalized_versions[key] = file_version(self.positions_file)
+                    logger.info(f"[PORTFOLIO] Positions schema v{POSITIONS_SCHEMA_VERSION} normalized: {self.positions_file}")
+                except Exception as e:
+                    logger.debug(f"[PORTFOLIO] Schema normalization skipped: {e}")
 
     def _ensure_positions_file(self):
         """Create positions file with headers if it doesn't exist."""
@@ -182,6 +197,7 @@ class PortfolioManager:
             with open(self.positions_file, "w", newline="") as f:
                 writer = csv.DictWriter(f, fieldnames=self.fieldnames)
                 writer.writeheader()
+            notify_positions_changed(self.positions_file)
             logger.info(f"Created new positions file: {self.positions_file}")
 
     def _position_to_row(self, position: "Position") -> Dict:
@@ -189,27 +205,20 @@ class PortfolioManager:
         if not self.is_alpaca_scoped:
             return position.to_dict()
         # Alpaca canonical schema mapping
-        return {
-            'symbol': position.symbol,
-            'occ_symbol': '',  # let sync/monitor infer OCC if needed
-            'strike': position.strike,
-            'option_type': position.side,  # CALL/PUT
-            'expiry': position.expiry,
-            'quantity': position.contracts,
-            'contracts': position.contracts,
-            'entry_price': position.entry_premium,
-            'current_price': None,
-            'pnl_pct': None,
-            'pnl_amount': None,
-            'timestamp': position.entry_time,
-            'status': 'open',
-            'close_time': None,
-            'market_value': None,
-            'unrealized_pnl': None,
-            'entry_time': position.entry_time,
-            'source': 'interactive_entry',
-            'sync_detected': False,
-        }
+        return LedgerPosition(
+            symbol=position.symbol,
+            strike=position.strike,
+            option_type=position.side,  # CALL/PUT; occ_symbol left for sync/monitor to infer
+            expiry=position.expiry,
+            quantity=position.contracts,
+            contracts=position.contracts,
+            entry_price=position.entry_premium,
+            timestamp=position.entry_time,
+            status="open",
+            entry_time=position.entry_time,
+            source="interactive_entry",
+            sync_detected=False,
+        ).to_dict()
 
     def _normalize_alpaca_positions_file(self) -> None:
         """Normalize Alpaca-scoped positions CSV to canonical schema with occ_symbol and fix misaligned rows.
@@ -386,6 +395,7 @@ class PortfolioManager:
             writer.writeheader()
             for nr in deduped:
                 writer.writerow(nr)
+        notify_positions_changed(path)
         logger.info(f"[PORTFOLIO] Normalized & de-duplicated positions file: {path}")
 
     def load_positions(self) -> List[Position]:
@@ -397,75 +407,59 @@ class PortfolioManager:
         """
         positions = []
 
+        # Unchanged file: hand out copies of the last parse
+        version = file_version(self.positions_file)
+        if version is not None and version == self._cache_version:
+            return [replace(pos) for pos in self._cached_positions]
+
+        if version is None:
+            logger.info("No positions file found, starting with empty positions")
+            return positions
+
         try:
-            with open(self.positions_file, "r", newline="") as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    # Skip empty rows entirely
-                    if not row or not any((v or "").strip() for v in row.values()):
-                        continue
-
-                    try:
-                        if self.is_alpaca_scoped:
-                            # Skip rows explicitly marked as closed or with a close_time set
-                            status_str = str(row.get("status", "")).strip().lower()
-                            if status_str.startswith("closed") or str(row.get("close_time", "")).strip():
-                                continue
-
-                            # Required fields with mapping
-                            symbol = (row.get("symbol") or "").strip()
-                            expiry = (row.get("expiry") or "").strip()
-                            strike_raw = (row.get("strike") or "").strip()
-                            side = (row.get("option_type") or row.get("side") or "").strip().upper()
-                            qty_raw = (row.get("quantity") or row.get("contracts") or "1").strip()
-                            entry_price_raw = (row.get("entry_price") or row.get("entry_premium") or "").strip()
-
-                            # Validate required string fields
-                            if not symbol or not expiry or side not in ("CALL", "PUT"):
-                                logger.warning(f"Skipping incomplete position row (missing symbol/expiry/side): {row}")
-                                continue
-
-                            # Coerce numerics safely
-                            try:
-                                strike = float(strike_raw)
-                            except Exception:
-                                logger.warning(f"Skipping position row with invalid strike: {row}")
-                                continue
-
-                            try:
-                                contracts = max(1, int(round(float(qty_raw or 1))))
-                            except Exception:
-                                contracts = 1
-
-                            try:
-                                entry_premium = float(entry_price_raw) if entry_price_raw not in ("", None) else 0.01
-                            except Exception:
-                                entry_premium = 0.01
-
-                            # entry_time fallback
-                            entry_time = (row.get("entry_time") or datetime.now().isoformat())
-
-                            positions.append(
-                                Position(
-                                    entry_time=entry_time,
-                                    symbol=symbol,
-                                    expiry=expiry,
-                                    strike=strike,
-                                    side=side,
-                                    contracts=contracts,
-                                    entry_premium=entry_premium,
-                                )
+            # Shared rows from the state service (read-only here)
+            for row in get_state_service().read_csv(self.positions_file, copy=False):
+                # Skip empty rows entirely
+                if not row or not any((v or "").strip() for v in row.values()):
+                    continue
+
+                try:
+                    if self.is_alpaca_scoped:
+                        record = LedgerPosition.from_row(row)
+                        # Skip rows explicitly marked as closed or with a close_time set
+                        if record.is_closed:
+                            continue
+
+                        # Validate required fields
+                        if not record.symbol or not record.expiry or record.option_type not in ("CALL", "PUT"):
+                            logger.warning(f"Skipping incomplete position row (missing symbol/expiry/side): {row}")
+                            continue
+                        if record.strike is None:
+                            logger.warning(f"Skipping position row with invalid strike: {row}")
+                            continue
+
+                        quantity = record.quantity if record.quantity is not None else record.contracts
+                        positions.append(
+                            Position(
+                                entry_time=record.entry_time or datetime.now().isoformat(),
+                                symbol=record.symbol,
+                                expiry=record.expiry,
+                                strike=record.strike,
+                                side=record.option_type,
+                                contracts=max(1, quantity or 1),
+                                entry_premium=record.entry_price if record.entry_price is not None else 0.01,
                             )
-                        else:
-                            # Legacy schema path
-                            if row.get("entry_time") and any(row.values()):
-                                positions.append(Position.from_dict(row))
-                    except KeyError as ke:
-                        logger.warning(f"Skipping position row missing column {ke}: {row}")
-                        continue
-                    except Exception as pe:
-                        logger.warning(f"Skipping malformed position row: {pe}")
-                        continue
+                        )
+                    else:
+                        # Legacy schema path
+                        if row.get("entry_time") and any(row.values()):
+                            positions.append(Position.from_dict(row))
+                except KeyError as ke:
+                    logger.warning(f"Skipping position row missing column {ke}: {row}")
+                    continue
+                except Exception as pe:
+                    logger.warning(f"Skipping malformed position row: {pe}")
+                    continue
 
             # Deduplicate identical open rows by (symbol, side, strike, expiry)
             try:
@@ -484,11 +478,10 @@ class PortfolioManager:
                 logger.debug(f"Deduplication skipped due to error: {e}")
 
             logger.info(f"Loaded {len(positions)} open positions")
+            self._cache_version = version
+            self._cached_positions = [replace(pos) for pos in positions]
             return positions
 
-        except FileNotFoundError:
-            logger.info("No positions file found, starting with empty positions")
-            return positions
         except Exception as e:
             logger.error(f"Error loading positions: {e}")
             return []
@@ -504,6 +497,7 @@ class PortfolioManager:
             with open(self.positions_file, "a", newline="") as f:
                 writer = csv.DictWriter(f, fieldnames=self.fieldnames)
                 writer.writerow(self._position_to_row(position))
+            notify_positions_changed(self.positions_file)
 
             logger.info(
                 f"Added position: {position.symbol} {position.side} "
@@ -553,6 +547,7 @@ class PortfolioManager:
                 writer.writeheader()
                 for pos in remaining_positions:
                     writer.writerow(self._position_to_row(pos))
+            notify_positions_changed(self.positions_file)
 
             logger.info(
                 f"Position removed. {len(remaining_positions)} positions remaining"
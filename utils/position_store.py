@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Cached Position Store
+
+Parses the positions CSV once and serves immutable, typed position records
+until the file changes. The monitor used to re-open and re-parse the file on
+every cycle, probing each row for the shifted timestamp-first schema; now a
+cycle costs one os.stat() unless the file was rewritten.
+
+Key Features:
+- Immutable PositionRecord objects with __slots__, a monitor view over
+  the LedgerPosition rows parsed by utils.records
+- Reload only when the file's mtime/size/inode changes
+- In-process change notifications from writers (notify_positions_changed)
+- One shared store per file path
+- Row normalization (legacy/shifted schemas, OCC parsing) done once per write
+
+Usage:
+    from utils.position_store import get_position_store, notify_positions_changed
+
+    store = get_position_store("positions_alpaca_paper.csv")
+    for position in store.positions():   # dicts, safe to modify
+        ...
+
+    # After rewriting the file
+    notify_positions_changed("positions_alpaca_paper.csv")
+
+Author: Robinhood HA Breakout System
+Version: 1.0.0
+License: MIT
+"""
+
+import logging
+import os
+import threading
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from utils.records import LedgerPosition
+
+logger = logging.getLogger(__name__)
+
+
+def parse_occ_symbol(occ: str) -> Optional[Dict]:
+    """Parse OCC option symbol like 'XLF250912C00053000' into components.
+
+    Returns dict with keys: underlying, expiry (YYYY-MM-DD), option_type (CALL/PUT), strike (float)
+    """
+    try:
+        if not occ or len(occ) < 10:
+            return None
+        # Underlying is letters until first digit
+        i = 0
+        while i < len(occ) and not occ[i].isdigit():
+            i += 1
+        underlying = occ[:i]
+        rest = occ[i:]
+        # Expect YYMMDD
+        y = int('20' + rest[0:2])
+        m = int(rest[2:4])
+        d = int(rest[4:6])
+        expiry = f"{y:04d}-{m:02d}-{d:02d}"
+        cp = rest[6].upper()
+        option_type = 'CALL' if cp == 'C' else 'PUT'
+        # Strike encoded to 1/1000 dollars
+        strike = float(int(rest[7:]) / 1000.0)
+        return {
+            'underlying': underlying,
+            'expiry': expiry,
+            'option_type': option_type,
+            'strike': strike,
+        }
+    except Exception:
+        return None
+
+
+@dataclass(frozen=True, slots=True)
+class PositionRecord:
+    """One open option position as the monitor sees it (built from a LedgerPosition)."""
+
+    symbol: str  # Underlying
+    occ_symbol: str
+    strike: float
+    option_type: str  # CALL/PUT
+    expiry: str  # YYYY-MM-DD
+    quantity: int
+    entry_price: float
+    entry_time: str
+
+    def to_dict(self) -> Dict:
+        """Position dict in the shape the monitor works with."""
+        return asdict(self)
+
+    @classmethod
+    def from_row(cls, row: Dict) -> Optional["PositionRecord"]:
+        """Normalize a CSV row; None for closed, empty or incomplete rows."""
+        if not any(row.values()):
+            return None
+        return cls.from_ledger(LedgerPosition.from_row(row))
+
+    @classmethod
+    def from_ledger(cls, position: LedgerPosition) -> Optional["PositionRecord"]:
+        """Monitor view of a parsed positions row; None for closed or incomplete positions.
+
+        LedgerPosition.from_row() has already remapped timestamp-first rows and
+        legacy column names; this fills in what the monitor needs from an OCC
+        symbol or the market value.
+        """
+        if position.is_closed:
+            return None
+
+        symbol = position.symbol
+        strike, expiry, option_type = position.strike, position.expiry, position.option_type
+
+        # Parse OCC symbol if needed
+        parsed = None
+        if symbol and (strike is None or not expiry or not option_type or len(symbol) > 8):
+            parsed = parse_occ_symbol(symbol)
+            if parsed:
+                strike = strike if strike is not None else parsed["strike"]
+                expiry = expiry or parsed["expiry"]
+                option_type = option_type or parsed["option_type"]
+        underlying = parsed["underlying"] if parsed else symbol
+
+        quantity = max(1, position.contracts or position.quantity or 1)
+
+        # Compute entry_price if missing and we have market_value + unrealized_pnl
+        entry_price = position.entry_price
+        if entry_price is None and position.market_value is not None:
+            entry_price = max(0.01, (position.market_value - (position.unrealized_pnl or 0.0)) / (quantity * 100.0))
+
+        if not underlying or not expiry or option_type not in ("CALL", "PUT") or strike is None:
+            logger.warning(f"[POSITIONS] Skipping incomplete position: {position}")
+            return None
+
+        return cls(
+            symbol=underlying,
+            # Prefer an explicit occ_symbol column; else only when the symbol parsed as OCC
+            occ_symbol=position.occ_symbol or (symbol if parsed else ""),
+            strike=strike,
+            option_type=option_type,
+            expiry=expiry,
+            quantity=quantity,
+            entry_price=entry_price if entry_price is not None else 0.01,
+            # Carry entry_time/timestamp forward for stability gating and tracking
+            entry_time=position.entry_time or position.timestamp or datetime.now().isoformat(),
+        )
+
+
+# Bumped by notify_positions_changed(); part of every store's cache key
+_generations: Dict[str, int] = {}
+_generations_lock = threading.Lock()
+
+
+def _key(path) -> str:
+    return os.path.abspath(os.fspath(path))
+
+
+def notify_positions_changed(path, invalidate_service: bool = True) -> None:
+    """Tell in-process readers that a positions file was rewritten.
+
+    Args:
+        path: Positions file
+        invalidate_service: Also drop the state service's cached rows (False when
+            the write went through the service itself)
+    """
+    key = _key(path)
+    with _generations_lock:
+        _generations[key] = _generations.get(key, 0) + 1
+    if invalidate_service:
+        from utils.state_daemon import invalidate_state
+
+        invalidate_state(key)
+
+
+def file_version(path) -> Optional[Tuple]:
+    """Cache key for a positions file: change generation plus stat signature (None if missing)."""
+    key = _key(path)
+    try:
+        st = os.stat(key)
+    except FileNotFoundError:
+        return None
+    with _generations_lock:
+        generation = _generations.get(key, 0)
+    return (generation, st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+class PositionStore:
+    """Open positions from one CSV file, parsed once per file version."""
+
+    def __init__(self, path):
+        self.path = _key(path)
+        self._lock = threading.Lock()
+        self._version: Optional[Tuple] = None
+        self._records: Tuple[PositionRecord, ...] = ()
+
+        self.loads = 0
+        self.hits = 0
+
+    def records(self) -> Tuple[PositionRecord, ...]:
+        """Current open positions.
+
+        Raises:
+            FileNotFoundError: If the positions file does not exist
+        """
+        version = file_version(self.path)
+        if version is None:
+            raise FileNotFoundError(self.path)
+        with self._lock:
+            if version == self._version:
+                self.hits += 1
+                return self._records
+            records = self._parse()
+            # Re-stat: a write during the parse must not be cached under the old version
+            self._version = version if file_version(self.path) == version else None
+            self._records = records
+            self.loads += 1
+        logger.debug(f"[POSITIONS] Parsed {len(records)} open positions from {self.path}")
+        return records
+
+    def positions(self) -> List[Dict]:
+        """Current open positions as fresh dicts."""
+        return [record.to_dict() for record in self.records()]
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._version = None
+
+    def _parse(self) -> Tuple[PositionRecord, ...]:
+        from utils.state_daemon import get_state_service
+
+        records = []
+        for row in get_state_service().read_csv(self.path, copy=False):
+            try:
+                record = PositionRecord.from_row(row)
+            except (ValueError, TypeError) as e:
+                logger.warning(f"[POSITIONS] Skipping invalid position row: {row} - Error: {e}")
+                continue
+            if record is not None:
+                records.append(record)
+        return tuple(records)
+
+
+_stores: Dict[str, PositionStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_position_store(path) -> PositionStore:
+    """Shared store for a positions file."""
+    key = _key(path)
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = _stores[key] = PositionStore(key)
+        return store
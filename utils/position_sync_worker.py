@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Background Position Sync Worker
+
+Runs the Alpaca position reconciliation (AlpacaSync.sync_positions) on its
+own thread so monitoring cycles never wait on broker API calls. Each sync
+rewrites the positions CSV atomically; the worker then parses the new file
+into the shared position store, so the monitor's next read is a cache hit on
+the fresh snapshot.
+
+Key Features:
+- Fixed-interval sync off the monitoring hot path
+- On-demand sync (request_sync) that wakes the worker immediately
+- One AlpacaSync instance reused across syncs (rebuilt after errors)
+- Sync duration and staleness metrics
+
+Usage:
+    from utils.position_sync_worker import PositionSyncWorker
+
+    worker = PositionSyncWorker(env="paper", interval_seconds=60).start()
+    worker.wait_for_sync(timeout=30)   # Optional: block until the first sync
+    ...
+    print(worker.metrics())
+    worker.stop()
+
+Author: Robinhood HA Breakout System
+Version: 1.0.0
+License: MIT
+"""
+
+import logging
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PositionSyncStats:
+    """Counters and timings for the sync worker."""
+
+    syncs: int = 0
+    failures: int = 0
+    last_attempt_at: Optional[float] = None  # Wall-clock time
+    last_success_at: Optional[float] = None  # Wall-clock time
+    last_duration_ms: Optional[float] = None
+    max_duration_ms: float = 0.0
+    last_error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class PositionSyncWorker:
+    """Reconciles the positions file with Alpaca on a background thread."""
+
+    def __init__(
+        self,
+        env: str = "paper",
+        interval_seconds: float = 60.0,
+        sync_factory: Optional[Callable[[], Any]] = None,
+        name: str = "position-sync",
+    ):
+        """Initialize worker.
+
+        Args:
+            env: Alpaca environment ("paper" or "live")
+            interval_seconds: Seconds between syncs
+            sync_factory: Builds the syncer (default: AlpacaSync(env=env)); the
+                result needs sync_positions() and a positions_file attribute
+            name: Thread name
+        """
+        if interval_seconds <= 0:
+            raise ValueError(f"interval_seconds must be positive, got {interval_seconds}")
+        self.env = env
+        self.interval_seconds = float(interval_seconds)
+        self.name = name
+        self._sync_factory = sync_factory or self._default_factory
+        self._syncer = None
+
+        self.stats = PositionSyncStats()
+        self._lock = threading.Lock()
+        self._completed = threading.Condition(self._lock)
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _default_factory(self):
+        from .alpaca_sync import AlpacaSync
+
+        return AlpacaSync(env=self.env)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> "PositionSyncWorker":
+        """Start the worker thread (first sync runs immediately)."""
+        if self.running:
+            return self
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+        logger.info(f"[POSITION-SYNC] Background sync started ({self.env}, every {self.interval_seconds:.0f}s)")
+        return self
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the worker; an in-flight sync is allowed to finish up to timeout."""
+        self._stopping.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def request_sync(self) -> None:
+        """Run a sync now instead of at the next interval."""
+        self._wake.set()
+
+    def wait_for_sync(self, timeout: Optional[float] = None) -> bool:
+        """Block until at least one sync attempt has completed.
+
+        Returns:
+            True if the last completed attempt succeeded
+        """
+        with self._completed:
+            self._completed.wait_for(lambda: self.stats.last_attempt_at is not None, timeout)
+            return self.stats.last_error is None and self.stats.last_success_at is not None
+
+    def staleness_seconds(self) -> Optional[float]:
+        """Seconds since the last successful sync (None before the first)."""
+        with self._lock:
+            last = self.stats.last_success_at
+        return None if last is None else max(0.0, time.time() - last)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Metrics snapshot, including staleness."""
+        with self._lock:
+            data = self.stats.to_dict()
+        data["staleness_seconds"] = self.staleness_seconds()
+        data["interval_seconds"] = self.interval_seconds
+        return data
+
+    def sync_once(self) -> bool:
+        """Run one sync on the calling thread and publish the new snapshot."""
+        start = time.perf_counter()
+        error = None
+        try:
+            if self._syncer is None:
+                self._syncer = self._sync_factory()
+            ok = bool(self._syncer.sync_positions())
+            if not ok:
+                error = "sync_positions() reported failure"
+        except Exception as e:
+            ok = False
+            error = str(e)
+            self._syncer = None  # Rebuild the client on the next attempt
+
+        if ok:
+            # Parse the new file here so the monitor's next read is a cache hit
+            try:
+                from .position_store import get_position_store
+
+                get_position_store(self._syncer.positions_file).records()
+            except Exception as e:
+                logger.debug(f"[POSITION-SYNC] Snapshot pre-parse skipped: {e}")
+
+        duration_ms = (time.perf_counter() - start) * 1000
+        with self._completed:
+            stats = self.stats
+            stats.last_attempt_at = time.time()
+            stats.last_duration_ms = round(duration_ms, 1)
+            stats.max_duration_ms = max(stats.max_duration_ms, stats.last_duration_ms)
+            stats.last_error = error
+            if ok:
+                stats.syncs += 1
+                stats.last_success_at = stats.last_attempt_at
+            else:
+                stats.failures += 1
+            self._completed.notify_all()
+
+        if ok:
+            logger.debug(f"[POSITION-SYNC] Synced positions from Alpaca ({self.env}) in {duration_ms:.0f}ms")
+        else:
+            staleness = self.staleness_seconds()
+            age = f"{staleness:.0f}s ago" if staleness is not None else "never"
+            logger.warning(f"[POSITION-SYNC] Sync failed ({self.env}): {error}; positions last synced {age}")
+        return ok
+
+    def _run(self) -> None:
+        next_at = time.monotonic()
+        while not self._stopping.is_set():
+            delay = next_at - time.monotonic()
+            if delay > 0:
+                self._wake.wait(delay)  # Returns early on request_sync() or stop()
+            self._wake.clear()
+            if self._stopping.is_set():
+                break
+            self.sync_once()
+            next_at = time.monotonic() + self.interval_seconds
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Pre-Trade Check Pipeline
+
+Runs the pre-trade risk checks for an order as a dependency graph instead of
+a fixed sequence. Checks with no unmet dependencies run concurrently, the
+pipeline short-circuits on the first hard failure, and every check records
+its latency so the signal-to-order critical path can be measured.
+
+Key Features:
+- Declarative dependencies between checks (e.g. LLM approval after risk inputs)
+- Concurrent execution of independent checks on a thread pool
+- Hard checks block the trade; soft checks only supply values downstream
+- Short-circuit: pending checks are skipped after the first hard failure
+- Per-check and end-to-end latency
+
+Usage:
+    from utils.pretrade_checks import PreTradeCheck, PreTradePipeline
+
+    pipeline = PreTradePipeline([
+        PreTradeCheck("feasibility", lambda v: trader.check_contract_feasibility(sym, qty),
+                      passes=lambda r: r["feasible"], reason=lambda r: r["reason"]),
+        PreTradeCheck("vix_bucket", lambda v: _get_vix_bucket(), hard=False),
+        PreTradeCheck("llm_entry", lambda v: approve(v), depends_on=("feasibility", "vix_bucket")),
+    ])
+    result = pipeline.run()
+    if not result.passed:
+        logger.info(result.failed.reason)
+
+Author: Robinhood HA Breakout System
+Version: 1.0.0
+License: MIT
+"""
+
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PreTradeCheck:
+    """A single pre-trade check.
+
+    func receives a dict of upstream check values keyed by check name and
+    returns the check's value; passes(value) decides whether it passed.
+    """
+    name: str
+    func: Callable[[Dict[str, Any]], Any]
+    depends_on: Tuple[str, ...] = ()
+    hard: bool = True
+    passes: Callable[[Any], bool] = bool
+    reason: Optional[Callable[[Any], str]] = None
+
+
+@dataclass
+class CheckResult:
+    """Outcome of a single check."""
+    name: str
+    passed: bool
+    value: Any = None
+    reason: str = ""
+    hard: bool = True
+    latency_ms: float = 0.0
+    skipped: bool = False
+
+
+@dataclass
+class PipelineResult:
+    """Outcome of a pipeline run."""
+    passed: bool
+    results: Dict[str, CheckResult] = field(default_factory=dict)
+    failed: Optional[CheckResult] = None
+    total_ms: float = 0.0
+
+    @property
+    def values(self) -> Dict[str, Any]:
+        """Values of all checks that ran."""
+        return {name: r.value for name, r in self.results.items() if not r.skipped}
+
+    def latency_summary(self) -> str:
+        """One-line per-check latency summary for logging."""
+        parts = [
+            f"{r.name}={'skip' if r.skipped else f'{r.latency_ms:.0f}ms'}"
+            for r in self.results.values()
+        ]
+        return f"total={self.total_ms:.0f}ms " + " ".join(parts)
+
+
+class PreTradePipeline:
+    """Dependency-aware concurrent runner for pre-trade checks."""
+
+    def __init__(self, checks: Sequence[PreTradeCheck], max_workers: int = 8):
+        """Initialize pipeline.
+
+        Args:
+            checks: Checks to run; dependencies must name other checks in the list
+            max_workers: Maximum checks running at once
+        """
+        self.checks = {check.name: check for check in checks}
+        self.max_workers = max_workers
+        self._validate()
+
+    def _validate(self) -> None:
+        for check in self.checks.values():
+            for dep in check.depends_on:
+                if dep not in self.checks:
+                    raise ValueError(f"Check '{check.name}' depends on unknown check '{dep}'")
+
+        # Reject cycles (Kahn's algorithm)
+        remaining = {name: set(check.depends_on) for name, check in self.checks.items()}
+        while remaining:
+            ready = [name for name, deps in remaining.items() if not deps]
+            if not ready:
+                raise ValueError(f"Dependency cycle among checks: {sorted(remaining)}")
+            for name in ready:
+                del remaining[name]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+
+    def run(self) -> PipelineResult:
+        """Run all checks, returning as soon as a hard check fails."""
+        start = time.perf_counter()
+        results: Dict[str, CheckResult] = {}
+        values: Dict[str, Any] = {}
+        running: Dict[Future, str] = {}
+        pending: List[str] = list(self.checks)
+        failed: Optional[CheckResult] = None
+
+        executor = ThreadPoolExecutor(
+            max_workers=min(self.max_workers, max(len(self.checks), 1)),
+            thread_name_prefix="pretrade",
+        )
+        try:
+            while (pending or running) and failed is None:
+                # Dispatch every check whose dependencies have completed
+                for name in list(pending):
+                    check = self.checks[name]
+                    if all(dep in results for dep in check.depends_on):
+                        inputs = {dep: values[dep] for dep in check.depends_on}
+                        running[executor.submit(self._timed, check, inputs)] = name
+                        pending.remove(name)
+
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    result = future.result()
+                    results[name] = result
+                    values[name] = result.value
+                    if result.hard and not result.passed and failed is None:
+                        failed = result
+        finally:
+            # Don't wait on in-flight checks once the outcome is decided
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        for name in list(pending) + list(running.values()):
+            results[name] = CheckResult(
+                name=name, passed=False, hard=self.checks[name].hard,
+                reason="skipped after hard failure", skipped=True,
+            )
+
+        total_ms = (time.perf_counter() - start) * 1000
+        ordered = {name: results[name] for name in self.checks if name in results}
+        pipeline_result = PipelineResult(
+            passed=failed is None, results=ordered, failed=failed, total_ms=total_ms
+        )
+
+        if failed:
+            logger.info(f"[PRE-TRADE] Blocked by {failed.name}: {failed.reason} ({pipeline_result.latency_summary()})")
+        else:
+            logger.info(f"[PRE-TRADE] All checks passed ({pipeline_result.latency_summary()})")
+        return pipeline_result
+
+    @staticmethod
+    def _timed(check: PreTradeCheck, inputs: Dict[str, Any]) -> CheckResult:
+        start = time.perf_counter()
+        try:
+            value = check.func(inputs)
+            passed = bool(check.passes(value))
+            reason = check.reason(value) if check.reason else ("" if passed else f"{check.name} failed")
+        except Exception as e:
+            logger.error(f"[PRE-TRADE] Check {check.name} raised: {e}")
+            value, passed, reason = None, False, f"{check.name} error: {e}"
+        return CheckResult(
+            name=check.name,
+            passed=passed,
+            value=value,
+            reason=reason,
+            hard=check.hard,
+            latency_ms=(time.perf_counter() - start) * 1000,
+        )
@@ -5,7 +5,9 @@ Functions
 load_recent(n: int) -> list[dict]
     Return a list of the last *n* trades from the scoped trade history CSV
     (``TRADE_LOG_FILE`` resolved from config via broker/env). The function is
-    purposely lightweight and avoids pandas for performance.
+    purposely lightweight and avoids pandas for performance; only the end of
+    the log is read (see ``utils.csv_tail``), so the cost does not grow with
+    the size of the history.
 
 Returned dict schema::
     {
@@ -23,7 +25,8 @@ from __future__ import annotations
 from datetime import datetime
 from pathlib import Path
 from typing import List, Dict
-import csv
+
+from utils.csv_tail import tail_csv_rows
 
 # NOTE: Avoid circular import by not importing utils.llm at module load time.
 # Default to scoped robinhood/live path if config is unavailable.
@@ -85,17 +88,8 @@ def load_recent(
     if not tf_path.exists():
         return []
 
-    # Read CSV using DictReader for schema-robust parsing
-    records: List[Dict[str, str]] = []
-    with tf_path.open(newline="", encoding="utf-8") as fh:
-        reader = csv.DictReader(fh)
-        for row in reader:
-            # Skip completely malformed rows
-            if not row:
-                continue
-            records.append(row)
-
-    recent_rows = records[-n:]
+    # Only the tail of the log is read (DictReader-shaped rows keyed by the header)
+    recent_rows = tail_csv_rows(tf_path, n)
     results: List[Dict[str, str]] = []
     for row in recent_rows:
         ts_raw = (row.get("timestamp") or "").strip()
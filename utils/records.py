@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+"""
+Typed Trade and Position Records
+
+Compact, typed records for the trades and positions that move between the
+bankroll ledger, the portfolio manager and Alpaca sync. Each module used to
+pass loose string-keyed dicts around and re-parse the same fields at every
+boundary (float(str(x).strip()), NaN checks on pandas rows, status/close_time
+probing). Records are parsed once when they enter the process and serialize
+back to the canonical schemas:
+
+- TradeRecord: one bankroll trade_history entry
+- LedgerPosition: one row of the Alpaca-scoped positions CSV
+  (POSITIONS_SCHEMA_ALPACA_V1, same column order); the monitor's
+  PositionRecord (utils.position_store) is built from it
+
+Both are dataclasses with __slots__, so a record costs a fraction of the
+equivalent dict and has no per-instance __dict__.
+
+Key Features:
+- Parse-once constructors tolerant of blanks, NaN and legacy column names
+- Canonical serialization (to_dict) matching the ledger/CSV schemas
+- Shared parse helpers (parse_float, parse_int, parse_text, parse_bool)
+- Timestamp-first positions rows remapped once, at parse time
+- Benchmark: python -m utils.records --bench
+
+Usage:
+    from utils.records import LedgerPosition, TradeRecord
+
+    trade = TradeRecord.from_details({"symbol": "SPY", "direction": "CALL", "premium": "1.25"})
+    ledger_row = trade.to_dict()
+
+    position = LedgerPosition.from_row(csv_row)
+    if not position.is_closed:
+        writer.writerow(position.to_dict())
+
+Author: Robinhood HA Breakout System
+Version: 1.0.0
+License: MIT
+"""
+
+import math
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Mapping, Optional
+
+from utils.ledger.constants import POSITIONS_SCHEMA_ALPACA_V1
+
+# Cell values pandas/CSV round-trips use for "no value"
+_MISSING_TEXT = frozenset(("", "nan", "none", "null", "nat", "n/a"))
+
+
+def parse_text(value: Any) -> str:
+    """Stripped string; "" for None, NaN and empty-like cells."""
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return ""
+    text = str(value).strip()
+    return "" if len(text) <= 4 and text.lower() in _MISSING_TEXT else text
+
+
+def parse_float(value: Any) -> Optional[float]:
+    """Float from a number or numeric string; None when blank, NaN or invalid."""
+    if value is None or value == "":
+        return None
+    try:
+        number = float(value)  # Accepts surrounding whitespace; "nan" parses and is rejected below
+    except (TypeError, ValueError):
+        return None
+    return None if math.isnan(number) else number
+
+
+def parse_int(value: Any) -> Optional[int]:
+    """Integer (rounded, so "1.0" parses); None when blank or invalid."""
+    number = parse_float(value)
+    if number is None or math.isinf(number):
+        return None
+    return int(round(number))
+
+
+def parse_bool(value: Any) -> Optional[bool]:
+    """Bool from a bool or "True"/"False"-style cell; None when blank or unrecognized."""
+    if isinstance(value, bool):
+        return value
+    text = parse_text(value).lower()
+    if text in ("true", "1", "yes"):
+        return True
+    if text in ("false", "0", "no"):
+        return False
+    return None
+
+
+def _option_type(value: Any) -> str:
+    """CALL/PUT from any casing or C/P prefix; other text kept upper-cased."""
+    text = parse_text(value).upper()
+    if text.startswith("C"):
+        return "CALL"
+    if text.startswith("P"):
+        return "PUT"
+    return text
+
+
+def _is_timestamp(text: str) -> bool:
+    try:
+        datetime.fromisoformat(text)
+        return True
+    except ValueError:
+        return False
+
+
+@dataclass(slots=True)
+class TradeRecord:
+    """One bankroll trade_history entry.
+
+    Treat as read-only; not frozen because a frozen __init__ roughly doubles
+    construction time for bulk history loads.
+    """
+
+    timestamp: str
+    symbol: str = "SPY"
+    direction: str = ""
+    strike: float = 0.0
+    expiry: str = ""
+    quantity: int = 0
+    premium: float = 0.0
+    total_cost: float = 0.0
+    decision_confidence: float = 0.0
+    llm_reason: str = ""
+    realized_pnl: float = 0.0
+    status: str = "OPEN"
+    position_id: str = ""
+
+    @classmethod
+    def from_details(cls, details: Mapping[str, Any], timestamp: Optional[str] = None) -> "TradeRecord":
+        """Build from the trade_details dict callers pass to BankrollManager.record_trade()."""
+        return cls(
+            timestamp=timestamp or datetime.now().isoformat(),
+            symbol=parse_text(details.get("symbol")) or "SPY",
+            direction=parse_text(details.get("direction")),
+            strike=parse_float(details.get("strike")) or 0.0,
+            expiry=parse_text(details.get("expiry")),
+            quantity=parse_int(details.get("quantity")) or 0,
+            premium=parse_float(details.get("premium")) or 0.0,
+            total_cost=parse_float(details.get("total_cost")) or 0.0,
+            decision_confidence=parse_float(details.get("confidence")) or 0.0,
+            llm_reason=parse_text(details.get("reason")),
+            realized_pnl=parse_float(details.get("realized_pnl")) or 0.0,
+            status=parse_text(details.get("status")) or "OPEN",
+            position_id=parse_text(details.get("position_id")),
+        )
+
+    @classmethod
+    def from_dict(cls, record: Mapping[str, Any]) -> "TradeRecord":
+        """Parse a stored trade_history entry (JSON ledger, SQLite record or CSV row)."""
+        return cls(
+            timestamp=parse_text(record.get("timestamp")),
+            symbol=parse_text(record.get("symbol")) or "SPY",
+            direction=parse_text(record.get("direction")),
+            strike=parse_float(record.get("strike")) or 0.0,
+            expiry=parse_text(record.get("expiry")),
+            quantity=parse_int(record.get("quantity")) or 0,
+            premium=parse_float(record.get("premium")) or 0.0,
+            total_cost=parse_float(record.get("total_cost")) or 0.0,
+            decision_confidence=parse_float(record.get("decision_confidence")) or 0.0,
+            llm_reason=parse_text(record.get("llm_reason")),
+            realized_pnl=parse_float(record.get("realized_pnl")) or 0.0,
+            status=parse_text(record.get("status")) or "OPEN",
+            position_id=parse_text(record.get("position_id")),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Canonical trade_history entry (position_id only when set)."""
+        record = {
+            "timestamp": self.timestamp,
+            "symbol": self.symbol,
+            "direction": self.direction,
+            "strike": self.strike,
+            "expiry": self.expiry,
+            "quantity": self.quantity,
+            "premium": self.premium,
+            "total_cost": self.total_cost,
+            "decision_confidence": self.decision_confidence,
+            "llm_reason": self.llm_reason,
+            "realized_pnl": self.realized_pnl,
+            "status": self.status,
+        }
+        if self.position_id:
+            record["position_id"] = self.position_id
+        return record
+
+
+@dataclass(slots=True)
+class LedgerPosition:
+    """One row of the Alpaca-scoped positions CSV (POSITIONS_SCHEMA_ALPACA_V1).
+
+    Mutable: AlpacaSync updates quantities and open/closed state in place
+    before rewriting the file.
+    """
+
+    symbol: str
+    occ_symbol: str = ""
+    strike: Optional[float] = None
+    option_type: str = ""  # CALL/PUT
+    expiry: str = ""  # YYYY-MM-DD
+    quantity: Optional[int] = None
+    contracts: Optional[int] = None
+    entry_price: Optional[float] = None
+    current_price: Optional[float] = None
+    pnl_pct: Optional[float] = None
+    pnl_amount: Optional[float] = None
+    timestamp: str = ""
+    status: str = ""
+    close_time: str = ""
+    market_value: Optional[float] = None
+    unrealized_pnl: Optional[float] = None
+    entry_time: str = ""
+    source: str = ""
+    sync_detected: Optional[bool] = None
+
+    @property
+    def is_closed(self) -> bool:
+        """Closed by status (closed, closed_sync, ...) or by a close_time."""
+        return self.status.lower().startswith("closed") or bool(self.close_time)
+
+    @classmethod
+    def from_row(cls, row: Mapping[str, Any]) -> "LedgerPosition":
+        """Parse a CSV row or position dict.
+
+        Accepts the legacy portfolio names (side, entry_premium), Alpaca's
+        unrealized_pl and underlying/base_symbol, and remaps
+        rows written with the timestamp-first layout under the canonical
+        header, e.g. symbol=<ISO timestamp>, strike=XLF, option_type=2025-09-12,
+        expiry=53.5, quantity=CALL, contracts=1.
+        """
+        symbol = parse_text(row.get("symbol")) or parse_text(row.get("underlying") or row.get("base_symbol"))
+        strike = row.get("strike")
+        option_type = row.get("option_type") or row.get("side")
+        expiry = row.get("expiry")
+        quantity = row.get("quantity")
+        contracts = row.get("contracts")
+        status = parse_text(row.get("status"))
+        if symbol and _is_timestamp(symbol):
+            symbol = parse_text(strike)
+            strike, expiry, option_type = expiry, option_type, quantity
+            quantity = parse_int(contracts) or 1
+            status = status or "normalized"
+
+        entry_price = row.get("entry_price")
+        if parse_float(entry_price) is None:
+            entry_price = row.get("entry_premium")
+
+        return cls(
+            symbol=symbol,
+            occ_symbol=parse_text(row.get("occ_symbol")),
+            strike=parse_float(strike),
+            option_type=_option_type(option_type),
+            expiry=parse_text(expiry),
+            quantity=parse_int(quantity),
+            contracts=parse_int(contracts),
+            entry_price=parse_float(entry_price),
+            current_price=parse_float(row.get("current_price")),
+            pnl_pct=parse_float(row.get("pnl_pct")),
+            pnl_amount=parse_float(row.get("pnl_amount")),
+            timestamp=parse_text(row.get("timestamp")),
+            status=status,
+            close_time=parse_text(row.get("close_time")),
+            market_value=parse_float(row.get("market_value")),
+            unrealized_pnl=parse_float(
+                row.get("unrealized_pnl") or row.get("unrealized_pl") or row.get("unrealized_intraday_pl")
+            ),
+            entry_time=parse_text(row.get("entry_time")),
+            source=parse_text(row.get("source")),
+            sync_detected=parse_bool(row.get("sync_detected")),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Row in canonical column order (None is written as an empty cell)."""
+        return {name: getattr(self, name) for name in POSITIONS_SCHEMA_ALPACA_V1}
+
+
+def _benchmark(trades: int = 100_000) -> Dict[str, Dict[str, float]]:
+    """Parse time, per-pass cost and memory: trade-log dicts vs TradeRecord."""
+    import csv
+    import gc
+    import io
+    import time
+    import tracemalloc
+
+    fields = list(TradeRecord.__dataclass_fields__)
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fields)
+    writer.writeheader()
+    for i in range(trades):
+        writer.writerow({
+            "timestamp": f"2026-{1 + i % 12:02d}-{1 + i % 28:02d}T10:{i % 60:02d}:00",
+            "symbol": ("SPY", "QQQ", "IWM", "DIA")[i % 4],
+            "direction": "CALL" if i % 2 else "PUT",
+            "strike": f"{500 + i % 100}.0",
+            "expiry": "2026-10-16",
+            "quantity": str(1 + i % 3),
+            "premium": f"{1 + (i % 250) / 100:.2f}",
+            "total_cost": f"{(1 + (i % 250) / 100) * 100:.2f}",
+            "decision_confidence": "0.65",
+            "llm_reason": "Breakout above resistance",
+            "realized_pnl": f"{(i % 41) - 20:.2f}",
+            "status": "CLOSED",
+            "position_id": f"P{i}",
+        })
+    text = buffer.getvalue()
+
+    def loose_pass(rows: List[Dict]) -> float:
+        # What every consumer of a dict row does: re-parse each field it reads
+        return sum(
+            float(str(r["realized_pnl"]).strip()) + float(str(r["premium"]).strip()) * int(r["quantity"])
+            for r in rows
+        )
+
+    def typed_pass(records: List[TradeRecord]) -> float:
+        return sum(r.realized_pnl + r.premium * r.quantity for r in records)
+
+    def measure(load, consume) -> Dict[str, float]:
+        gc.collect()
+        start = time.perf_counter()
+        loaded = load()
+        parse_s = time.perf_counter() - start
+        del loaded
+        gc.collect()
+        tracemalloc.start()  # Separate run: tracing slows the parse several-fold
+        loaded = load()
+        retained, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        start = time.perf_counter()
+        for _ in range(3):
+            consume(loaded)
+        pass_s = (time.perf_counter() - start) / 3
+        return {"parse_ms": parse_s * 1000, "pass_ms": pass_s * 1000, "retained_mb": retained / 1e6}
+
+    return {
+        "dict rows": measure(lambda: list(csv.DictReader(io.StringIO(text))), loose_pass),
+        "TradeRecord": measure(
+            lambda: [TradeRecord.from_dict(r) for r in csv.DictReader(io.StringIO(text))], typed_pass
+        ),
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Typed trade and position records")
+    parser.add_argument("--bench", action="store_true", help="Benchmark parse time and memory, then exit")
+    parser.add_argument("--trades", type=int, default=100_000, help="Trades in the benchmark log")
+    args = parser.parse_args()
+
+    if args.bench:
+        for name, row in _benchmark(args.trades).items():
+            print(f"{name:12s} " + "  ".join(f"{k}={v:,.1f}" for k, v in row.items()))
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Signal Journal
+
+In-memory per-symbol ring buffers of recent scanner signals (CALL / PUT /
+NO_TRADE), used by the rapid flip guard. The ring buffer is the source of
+truth while the process runs; every signal is also appended as one JSON line
+to .cache/signal_journal_{symbol}.jsonl so the history survives restarts.
+
+The journal only grows by appends. Once it holds COMPACT_FACTOR times the
+ring capacity, it is rewritten (atomically) with just the buffered entries.
+On first use of a symbol the buffer is recovered from its journal, skipping
+a torn or corrupt line. If there is no journal yet, the legacy
+signal_log_{symbol}.json is loaded instead and carried into the journal
+when the next signal is recorded.
+
+Key Features:
+- Bounded deque per symbol with __slots__ entries
+- O(1) append per signal (no read-modify-rewrite of a JSON file)
+- Periodic compaction bounds journal size
+- Recovery from the journal (or legacy JSON) on first access
+
+Usage:
+    from utils.signal_journal import get_signal_journal
+
+    journal = get_signal_journal(".cache")
+    journal.record("SPY", "CALL", confidence=0.72, reason="breakout", price=581.2)
+    last = journal.last_trade_signal("SPY")
+
+Author: Robinhood HA Breakout System
+Version: 1.0.0
+License: MIT
+"""
+
+import json
+import logging
+import os
+import threading
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Deque, Dict, Mapping, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAXLEN = 50
+COMPACT_FACTOR = 4  # Compact once the journal holds this many ring-buffers' worth of lines
+TRADE_DECISIONS = ("CALL", "PUT")
+
+
+class SignalEntry:
+    """One scanner signal."""
+
+    __slots__ = ("timestamp", "decision", "confidence", "reason", "price", "scanner_env")
+
+    def __init__(
+        self,
+        timestamp: str,
+        decision: str,
+        confidence: Any = None,
+        reason: str = "",
+        price: Any = None,
+        scanner_env: str = "unknown",
+    ):
+        self.timestamp = timestamp
+        self.decision = decision
+        self.confidence = confidence
+        self.reason = reason
+        self.price = price
+        self.scanner_env = scanner_env
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "SignalEntry":
+        return cls(
+            timestamp=data["timestamp"],
+            decision=data["decision"],
+            confidence=data.get("confidence"),
+            reason=data.get("reason", ""),
+            price=data.get("price"),
+            scanner_env=data.get("scanner_env", "unknown"),
+        )
+
+    def __repr__(self) -> str:
+        return f"SignalEntry({self.timestamp} {self.decision})"
+
+
+class SignalJournal:
+    """Per-symbol signal ring buffers persisted to append-only JSONL journals."""
+
+    def __init__(self, cache_dir: Union[str, Path] = ".cache", maxlen: int = DEFAULT_MAXLEN):
+        """Initialize the journal (symbols are recovered lazily on first access).
+
+        Args:
+            cache_dir: Directory holding the journals
+            maxlen: Signals kept per symbol
+        """
+        self.cache_dir = Path(cache_dir)
+        self.maxlen = int(maxlen)
+        self._buffers: Dict[str, Deque[SignalEntry]] = {}
+        self._lines: Dict[str, int] = {}  # Lines currently in each journal file
+        self._lock = threading.Lock()
+        self.appends = 0
+        self.compactions = 0
+        self.recovered = 0
+
+    def journal_path(self, symbol: str) -> Path:
+        return self.cache_dir / f"signal_journal_{symbol}.jsonl"
+
+    def legacy_path(self, symbol: str) -> Path:
+        return self.cache_dir / f"signal_log_{symbol}.json"
+
+    # ------------------------------------------------------------------
+    # Recovery and compaction
+    # ------------------------------------------------------------------
+
+    def _recover(self, symbol: str) -> Deque[SignalEntry]:
+        buffer: Deque[SignalEntry] = deque(maxlen=self.maxlen)
+        journal = self.journal_path(symbol)
+        lines = 0
+
+        if journal.exists():
+            with open(journal, "r", encoding="utf-8") as f:
+                for line in f:
+                    lines += 1
+                    try:
+                        buffer.append(SignalEntry.from_dict(json.loads(line)))
+                    except (ValueError, KeyError, TypeError):
+                        logger.warning(f"[SIGNAL-JOURNAL] Skipping corrupt line {lines} in {journal}")
+        else:
+            legacy = self.legacy_path(symbol)
+            if legacy.exists():
+                try:
+                    with open(legacy, "r", encoding="utf-8") as f:
+                        for data in json.load(f) or []:
+                            buffer.append(SignalEntry.from_dict(data))
+                except (ValueError, KeyError, TypeError) as e:
+                    logger.warning(f"[SIGNAL-JOURNAL] Ignoring unreadable legacy log {legacy}: {e}")
+                lines = -1  # Journal is written (with these entries) on the first record
+
+        self._buffers[symbol] = buffer
+        self._lines[symbol] = lines
+        self.recovered += len(buffer)
+        if lines >= self.maxlen * COMPACT_FACTOR:
+            self._compact(symbol)
+        return buffer
+
+    def _compact(self, symbol: str) -> None:
+        """Rewrite the journal with just the buffered entries (atomic)."""
+        buffer = self._buffers[symbol]
+        journal = self.journal_path(symbol)
+        if not buffer and not journal.exists():
+            self._lines[symbol] = 0
+            return
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = journal.with_name(journal.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for entry in buffer:
+                f.write(json.dumps(entry.to_dict()) + "\n")
+        os.replace(tmp_path, journal)
+        self._lines[symbol] = len(buffer)
+        self.compactions += 1
+
+    def compact(self, symbol: Optional[str] = None) -> None:
+        """Compact one symbol's journal, or every loaded symbol's."""
+        with self._lock:
+            for sym in [symbol] if symbol else list(self._buffers):
+                if sym not in self._buffers:
+                    self._recover(sym)
+                self._compact(sym)
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def entries(self, symbol: str) -> Deque[SignalEntry]:
+        """Ring buffer for a symbol, oldest first (recovered on first access)."""
+        with self._lock:
+            buffer = self._buffers.get(symbol)
+            return buffer if buffer is not None else self._recover(symbol)
+
+    def record(
+        self,
+        symbol: str,
+        decision: str,
+        confidence: Any = None,
+        reason: str = "",
+        price: Any = None,
+        scanner_env: str = "unknown",
+        timestamp: Optional[str] = None,
+    ) -> SignalEntry:
+        """Append a signal to the symbol's ring buffer and journal."""
+        entry = SignalEntry(
+            timestamp=timestamp or datetime.now().isoformat(),
+            decision=decision,
+            confidence=confidence,
+            reason=reason,
+            price=price,
+            scanner_env=scanner_env,
+        )
+        with self._lock:
+            buffer = self._buffers.get(symbol)
+            if buffer is None:
+                buffer = self._recover(symbol)
+            buffer.append(entry)
+
+            if self._lines[symbol] < 0:
+                self._compact(symbol)  # Migrated from the legacy log: start the journal
+                return entry
+
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with open(self.journal_path(symbol), "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry.to_dict()) + "\n")
+            self.appends += 1
+            self._lines[symbol] += 1
+            if self._lines[symbol] >= self.maxlen * COMPACT_FACTOR:
+                self._compact(symbol)
+        return entry
+
+    def last_trade_signal(self, symbol: str) -> Optional[SignalEntry]:
+        """Most recent CALL/PUT signal for a symbol, or None."""
+        with self._lock:
+            buffer = self._buffers.get(symbol)
+            if buffer is None:
+                buffer = self._recover(symbol)
+            for entry in reversed(buffer):
+                if entry.decision in TRADE_DECISIONS:
+                    return entry
+        return None
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "symbols": len(self._buffers),
+            "appends": self.appends,
+            "compactions": self.compactions,
+            "recovered": self.recovered,
+        }
+
+
+_instances: Dict[str, SignalJournal] = {}
+_instances_lock = threading.Lock()
+
+
+def get_signal_journal(cache_dir: Union[str, Path] = ".cache") -> SignalJournal:
+    """Shared journal for a cache directory (one instance per path)."""
+    key = os.path.abspath(cache_dir)
+    with _instances_lock:
+        journal = _instances.get(key)
+        if journal is None:
+            journal = _instances[key] = SignalJournal(cache_dir)
+    return journal
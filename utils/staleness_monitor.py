@@ -21,14 +21,12 @@ from dataclasses import dataclass
 from enum import Enum
 import asyncio
 from pathlib import Path
-import json
-import os
-import tempfile
-import shutil
+from collections import deque
 import threading
 
 from .data_validation import DataValidator, DataPoint, DataQuality
 from .enhanced_slack import EnhancedSlackIntegration
+from .state_store import get_state_store
 
 logger = logging.getLogger(__name__)
 
@@ -36,53 +34,14 @@ logger = logging.getLogger(__name__)
 def atomic_write_json(file_path: Path, data: any) -> None:
     """
     Atomic write function for JSON data that works reliably on Windows.
-    Uses same-directory temp file to avoid cross-directory permission issues.
+    Written through the shared state store (same-directory temp file, fsync,
+    rename under a cross-process lock file).
     """
     file_path = Path(file_path)
-    
-    # Ensure parent directory exists
-    file_path.parent.mkdir(parents=True, exist_ok=True)
-    
-    # Create temp file in same directory as target file
-    temp_fd = None
-    temp_path = None
-    
-    try:
-        # Use tempfile.mkstemp for atomic creation in same directory
-        temp_fd, temp_name = tempfile.mkstemp(
-            suffix='.tmp',
-            prefix=f'{file_path.stem}_',
-            dir=file_path.parent
-        )
-        temp_path = Path(temp_name)
-        
-        # Write JSON data to temp file
-        with os.fdopen(temp_fd, 'w') as f:
-            json.dump(data, f, indent=2)
-        temp_fd = None  # File is now closed
-        
-        # Atomic replace - works reliably on Windows
-        if os.name == 'nt':  # Windows
-            # On Windows, remove target first if it exists
-            if file_path.exists():
-                file_path.unlink()
-        
-        # Atomic move/rename
-        shutil.move(str(temp_path), str(file_path))
-        
-    except Exception as e:
-        # Cleanup on failure
-        if temp_fd is not None:
-            try:
-                os.close(temp_fd)
-            except:
-                pass
-        if temp_path and temp_path.exists():
-            try:
-                temp_path.unlink()
-            except:
-                pass
-        raise e
+    state = get_state_store().namespace(file_path.stem, file_path)
+    state.save(data, flush=True)
+    if state.dirty:
+        raise OSError(f"Could not write {file_path}")
 
 
 class StalenessLevel(Enum):
@@ -168,6 +127,8 @@ class StalenessMonitor:
         self.slack = EnhancedSlackIntegration(config) if config.get("SLACK_ENABLED") else None
         self.metrics_file = Path("logs/staleness_metrics.json")
         self._file_lock = threading.Lock()  # Prevent concurrent file access
+        self._metrics_log: Optional[deque] = None  # In-memory tail of metrics_file
+        self._metrics_log_path: Optional[Path] = None
         
         # Ensure metrics directory exists
         self.metrics_file.parent.mkdir(exist_ok=True)
@@ -468,28 +429,8 @@ class StalenessMonitor:
             logger.error(f"[STALENESS] Failed to send alert: {e}")
     
     def _log_metrics(self, metrics: StalenessMetrics):
-        """Log staleness metrics to file with JSON error protection"""
+        """Append staleness metrics to the metrics file (coalesced write through the state store)"""
         try:
-            # Use file lock to prevent concurrent access
-            with self._file_lock:
-                # Load existing metrics with robust error handling
-                all_metrics = []
-                if self.metrics_file.exists():
-                    try:
-                        with open(self.metrics_file, 'r') as f:
-                            content = f.read().strip()
-                            if content:  # Check if file has content
-                                all_metrics = json.loads(content)
-                            else:
-                                all_metrics = []  # Empty file, start fresh
-                    except (json.JSONDecodeError, ValueError) as json_err:
-                        # Corrupted JSON file - reinitialize with empty list
-                        if not self._json_error_logged:
-                            logger.warning(f"[STALENESS] Corrupted metrics file, reinitializing: {json_err}")
-                            self.__class__._json_error_logged = True
-                        all_metrics = []
-            
-            # Add new metrics entry
             metrics_dict = {
                 "symbol": metrics.symbol,
                 "timestamp": metrics.timestamp.isoformat(),
@@ -502,14 +443,19 @@ class StalenessMonitor:
                 "success_rate": metrics.success_rate
             }
             
-            all_metrics.append(metrics_dict)
-            
-            # Keep only last 1000 entries to prevent file bloat
-            if len(all_metrics) > 1000:
-                all_metrics = all_metrics[-1000:]
-            
-                # Write back to file with atomic operation (still within lock)
-                atomic_write_json(self.metrics_file, all_metrics)
+            with self._file_lock:
+                state = get_state_store().namespace("staleness_metrics", self.metrics_file)
+                if self._metrics_log is None or self._metrics_log_path != self.metrics_file:
+                    # Unreadable files are logged by the store and start fresh
+                    existing = state.load(default=[])
+                    if not isinstance(existing, list):
+                        existing = []
+                    # Keep only last 1000 entries to prevent file bloat
+                    self._metrics_log = deque(existing, maxlen=1000)
+                    self._metrics_log_path = self.metrics_file
+                
+                self._metrics_log.append(metrics_dict)
+                state.save(list(self._metrics_log))
                 
         except Exception as e:
             if not self._json_error_logged:
@@ -0,0 +1,998 @@
+#!/usr/bin/env python3
+"""
+Shared State Daemon
+
+A small local service that owns the state files every process reads
+(bankroll JSON, positions CSV, circuit breaker state). The trader,
+the monitors, the Alpaca sync and the dashboards all used to open and parse
+these files themselves, and saw another process's change only when they next
+re-read the file. Now:
+
+- The daemon parses a file once and serves it from memory. A read costs one
+  os.stat() to confirm the cached copy is current.
+- Writes sent to the daemon are serialized and written atomically. The
+  in-memory copy is updated in place. The daemon only writes the state files
+  it owns (WRITABLE_PATTERNS under its working directory) and refuses any
+  other path a client sends.
+- Subscribers get a change notification for every write through the daemon.
+  Files rewritten directly by other code are picked up by a poll of their
+  stat signatures.
+
+Clients connect over a Unix domain socket and speak newline-delimited JSON.
+Each client also keeps the last value it received, validated by the same
+stat signature, so a repeated read of an unchanged file never leaves the
+process. The trade log (LOCAL_ONLY_PATTERNS) is never sent over the socket:
+clients read it in-process. If the daemon is not running, or the platform has
+no AF_UNIX (Windows), get_state_service() returns an in-process service with
+the same interface and the same in-memory, stat-validated reads; if the daemon
+goes away later, the process switches to one.
+
+Key Features:
+- Reads served from memory, parsed once per file version
+- Serialized atomic writes (JSON documents, CSV rewrites and appends)
+- Change notifications pushed to subscribers
+- Client writes restricted to the daemon's own state files
+- Transparent in-process fallback when the daemon is absent or stops answering
+- Benchmark: python -m utils.state_daemon --bench
+
+Usage:
+    python -m utils.state_daemon            # run the daemon
+
+    from utils.state_daemon import get_state_service
+
+    service = get_state_service()
+    bankroll = service.read_json("bankroll_alpaca_paper.json")
+    positions = service.read_csv("positions_alpaca_paper.csv")
+    service.subscribe(lambda path, version: print("changed", path))
+
+Author: Robinhood HA Breakout System
+Version: 1.0.0
+License: MIT
+"""
+
+import csv
+import fnmatch
+import io
+import json
+import logging
+import os
+import socket
+import socketserver
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SOCKET = ".cache/state_daemon.sock"
+DEFAULT_POLL_SECONDS = 0.5
+CONNECT_TIMEOUT_S = 2.0
+REQUEST_TIMEOUT_S = 10.0
+KINDS = ("json", "csv")
+
+# Files the daemon writes on behalf of clients, relative to its root directory
+WRITABLE_PATTERNS = (
+    "bankroll*.json",
+    "positions*.csv",
+    "*circuit_breaker_state.json",
+    "daily_pnl_tracker.json",
+    "weekly_pnl_state.json",
+)
+
+# Files clients read and write in-process; they grow without bound and are not sent over the socket
+LOCAL_ONLY_PATTERNS = ("trade_history*.csv", "trade_log*.csv")
+
+PathLike = Union[str, Path]
+Listener = Callable[[str, int], None]
+
+
+class StateServiceError(RuntimeError):
+    """A request to the state daemon failed."""
+
+
+class StateDaemonUnavailable(StateServiceError):
+    """The daemon could not be reached or did not answer a request.
+
+    maybe_applied is True when a non-repeatable request (an append) was sent
+    before the connection failed, so the daemon may have carried it out.
+    """
+
+    def __init__(self, message: str, maybe_applied: bool = False):
+        super().__init__(message)
+        self.maybe_applied = maybe_applied
+
+
+def _key(path: PathLike) -> str:
+    return os.path.abspath(os.fspath(path))
+
+
+def _signature(path: str) -> Optional[List[int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def _local_only(key: str) -> bool:
+    name = os.path.basename(key)
+    return any(fnmatch.fnmatch(name, pattern) for pattern in LOCAL_ONLY_PATTERNS)
+
+
+def _fresh(kind: str, snapshot: Dict[str, Any]) -> Any:
+    """Fresh copy of a snapshot's value (callers may modify what they get back)."""
+    if snapshot["value"] is None:
+        return None
+    if kind == "csv":
+        return [dict(row) for row in snapshot["value"]]
+    return json.loads(snapshot["text"])
+
+
+class _Document:
+    """One owned file and its parsed contents."""
+
+    __slots__ = ("path", "kind", "value", "text", "fieldnames", "signature", "version", "loads")
+
+    def __init__(self, path: str, kind: str):
+        self.path = path
+        self.kind = kind
+        self.value: Any = None
+        self.text: Optional[str] = None  # JSON documents: file text, re-parsed for fresh copies
+        self.fieldnames: Optional[List[str]] = None
+        self.signature: Optional[List[int]] = None
+        self.version = 0
+        self.loads = 0
+
+    def load(self) -> None:
+        signature = _signature(self.path)
+        if signature is None:
+            self.value, self.text, self.fieldnames = None, None, None
+        elif self.kind == "csv":
+            with open(self.path, "r", newline="", encoding="utf-8") as f:
+                reader = csv.DictReader(f)
+                self.value = list(reader)
+                self.fieldnames = list(reader.fieldnames or [])
+        else:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.text = f.read()
+            self.value = json.loads(self.text)
+        # Re-stat: a write during the parse must not be cached under the old signature
+        self.signature = signature if _signature(self.path) == signature else None
+        self.loads += 1
+
+
+class LocalStateService:
+    """In-process state service: the daemon's core and the fallback when it is absent."""
+
+    def __init__(self):
+        self._docs: Dict[str, _Document] = {}
+        self._lock = threading.RLock()
+        self._listeners: List[Tuple[Listener, Optional[frozenset]]] = []
+        self.reads = 0
+        self.writes = 0
+
+    # ------------------------------------------------------------------
+    # Documents
+    # ------------------------------------------------------------------
+
+    def _document(self, path: PathLike, kind: str) -> _Document:
+        if kind not in KINDS:
+            raise ValueError(f"Unknown document kind {kind!r} (expected one of {KINDS})")
+        key = _key(path)
+        doc = self._docs.get(key)
+        if doc is None:
+            doc = self._docs[key] = _Document(key, kind)
+        elif doc.kind != kind:
+            raise ValueError(f"{key} is already served as {doc.kind}")
+        return doc
+
+    def _current(self, path: PathLike, kind: str) -> _Document:
+        # Caller holds self._lock
+        doc = self._document(path, kind)
+        signature = _signature(doc.path)
+        if doc.loads == 0 or signature != doc.signature or (signature is None and doc.value is not None):
+            if doc.loads:
+                doc.version += 1
+            doc.load()
+        return doc
+
+    def snapshot(self, path: PathLike, kind: str = "json") -> Dict[str, Any]:
+        """Current value with its version and stat signature (value is shared; do not modify)."""
+        with self._lock:
+            doc = self._current(path, kind)
+            self.reads += 1
+            return {"value": doc.value, "text": doc.text, "version": doc.version, "signature": doc.signature}
+
+    def read_json(self, path: PathLike, default: Any = None, copy: bool = True) -> Any:
+        """Parsed JSON document, or default if the file is missing.
+
+        Args:
+            path: JSON file
+            default: Returned if the file does not exist
+            copy: Return a fresh object (False returns the shared cached value; do not modify it)
+        """
+        snapshot = self.snapshot(path, "json")
+        value = _fresh("json", snapshot) if copy else snapshot["value"]
+        return default if value is None else value
+
+    def read_csv(self, path: PathLike, copy: bool = True) -> List[Dict[str, str]]:
+        """CSV rows as dicts keyed by the header ([] if the file is missing)."""
+        snapshot = self.snapshot(path, "csv")
+        return (_fresh("csv", snapshot) if copy else snapshot["value"]) or []
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def write_json(self, path: PathLike, value: Any) -> int:
+        """Replace a JSON document (atomic, through the shared state store).
+
+        Returns:
+            New document version
+        """
+        from utils.state_store import get_state_store
+
+        key = _key(path)
+        with self._lock:
+            doc = self._document(key, "json")
+            state = get_state_store().namespace(f"state_daemon:{os.path.basename(key)}", key)
+            state.save(value, flush=True)
+            if state.dirty:
+                raise StateServiceError(f"Could not write {key}")
+            doc.text = json.dumps(value, indent=2)
+            doc.value = json.loads(doc.text)
+            doc.signature = _signature(key)
+            doc.loads = max(doc.loads, 1)
+            version = self._bump(doc)
+        self._publish(key, version)
+        return version
+
+    def write_csv(self, path: PathLike, rows: List[Dict[str, Any]], fieldnames: List[str]) -> int:
+        """Rewrite a CSV file atomically.
+
+        Returns:
+            New document version
+        """
+        key = _key(path)
+        buf = io.StringIO(newline="")
+        writer = csv.DictWriter(buf, fieldnames=fieldnames, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(rows)
+        with self._lock:
+            doc = self._document(key, "csv")
+            tmp_path = f"{key}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", newline="", encoding="utf-8") as f:
+                f.write(buf.getvalue())
+            os.replace(tmp_path, key)
+            doc.load()
+            version = self._bump(doc)
+        self._notify_position_readers(key)
+        self._publish(key, version)
+        return version
+
+    def append_csv(self, path: PathLike, row: Dict[str, Any], fieldnames: Optional[List[str]] = None) -> int:
+        """Append one row (the header is written first if the file is new).
+
+        Returns:
+            New document version
+        """
+        key = _key(path)
+        with self._lock:
+            doc = self._current(key, "csv")
+            columns = doc.fieldnames or list(fieldnames or row.keys())
+            new_file = doc.value is None or os.path.getsize(key) == 0
+            buf = io.StringIO(newline="")
+            writer = csv.DictWriter(buf, fieldnames=columns, extrasaction="ignore")
+            if new_file:
+                writer.writeheader()
+            writer.writerow(row)
+            with open(key, "a", newline="", encoding="utf-8") as f:
+                f.write(buf.getvalue())
+            # Fold the row in as DictReader would return it
+            record = {c: "" if row.get(c) is None else str(row.get(c)) for c in columns}
+            doc.value = (doc.value or []) + [record] if new_file else doc.value + [record]
+            doc.fieldnames = columns
+            doc.signature = _signature(key)
+            version = self._bump(doc)
+        self._publish(key, version)
+        return version
+
+    def invalidate(self, path: PathLike) -> None:
+        """Drop the cached copy of a file this process just rewrote itself.
+
+        The stat signature cannot tell apart two same-size writes within one
+        filesystem timestamp tick; writers that bypass the service call this.
+        """
+        with self._lock:
+            doc = self._docs.get(_key(path))
+            if doc is not None:
+                doc.signature = None
+
+    def _bump(self, doc: _Document) -> int:
+        doc.version += 1
+        self.writes += 1
+        return doc.version
+
+    @staticmethod
+    def _notify_position_readers(key: str) -> None:
+        try:
+            from utils.position_store import notify_positions_changed
+
+            notify_positions_changed(key, invalidate_service=False)
+        except Exception:
+            pass
+
+    # ------------------------------------------------------------------
+    # Notifications
+    # ------------------------------------------------------------------
+
+    def subscribe(self, callback: Listener, paths: Optional[List[PathLike]] = None) -> None:
+        """Call callback(path, version) whenever a served file changes."""
+        filter_keys = frozenset(_key(p) for p in paths) if paths else None
+        with self._lock:
+            self._listeners.append((callback, filter_keys))
+
+    def unsubscribe(self, callback: Listener) -> None:
+        with self._lock:
+            self._listeners = [(cb, keys) for cb, keys in self._listeners if cb is not callback]
+
+    def _publish(self, key: str, version: int) -> None:
+        with self._lock:
+            listeners = list(self._listeners)
+        for callback, keys in listeners:
+            if keys is None or key in keys:
+                try:
+                    callback(key, version)
+                except Exception as e:
+                    logger.warning(f"[STATE-DAEMON] Subscriber failed for {key}: {e}")
+
+    def poll(self) -> List[str]:
+        """Reload files changed on disk by other writers and notify subscribers.
+
+        Returns:
+            Paths that changed
+        """
+        changed = []
+        with self._lock:
+            for key, doc in list(self._docs.items()):
+                if doc.loads and _signature(key) != doc.signature:
+                    before = doc.version
+                    self._current(key, doc.kind)
+                    if doc.version != before:
+                        changed.append((key, doc.version))
+        for key, version in changed:
+            self._publish(key, version)
+        return [key for key, _ in changed]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "mode": "local",
+                "reads": self.reads,
+                "writes": self.writes,
+                "files": {
+                    key: {"kind": doc.kind, "version": doc.version, "loads": doc.loads}
+                    for key, doc in self._docs.items()
+                },
+            }
+
+
+# ----------------------------------------------------------------------
+# Daemon
+# ----------------------------------------------------------------------
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    """One client connection: newline-delimited JSON requests and responses."""
+
+    def setup(self) -> None:
+        super().setup()
+        self.send_lock = threading.Lock()
+
+    def handle(self) -> None:
+        daemon: "StateDaemon" = self.server.state_daemon
+        try:
+            for line in self.rfile:
+                if not line.strip():
+                    continue
+                request: Dict[str, Any] = {}
+                try:
+                    request = json.loads(line)
+                    response = daemon.dispatch(request, self)
+                except Exception as e:
+                    response = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+                if "id" in request:
+                    response["id"] = request["id"]
+                self.send(response)
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            daemon.drop_subscriber(self)
+
+    def send(self, message: Dict[str, Any]) -> None:
+        data = (json.dumps(message) + "\n").encode("utf-8")
+        with self.send_lock:
+            self.wfile.write(data)
+            self.wfile.flush()
+
+
+class StateDaemon:
+    """Unix-socket front end for a LocalStateService."""
+
+    def __init__(
+        self,
+        socket_path: PathLike = DEFAULT_SOCKET,
+        poll_interval_s: float = DEFAULT_POLL_SECONDS,
+        service: Optional[LocalStateService] = None,
+        root: Optional[PathLike] = None,
+        writable_patterns: Tuple[str, ...] = WRITABLE_PATTERNS,
+    ):
+        """Initialize the daemon (call start() or serve_forever()).
+
+        Args:
+            socket_path: Unix socket to listen on
+            poll_interval_s: How often files are checked for direct writes by other code
+            service: Backing service (default: a new LocalStateService)
+            root: Directory the owned state files live in (default: current directory)
+            writable_patterns: Paths under root (glob patterns) clients may write
+        """
+        if not hasattr(socket, "AF_UNIX"):
+            raise StateServiceError("Unix domain sockets are not available on this platform")
+        self.socket_path = os.fspath(socket_path)
+        self.poll_interval_s = poll_interval_s
+        self.service = service or LocalStateService()
+        self.root = os.path.realpath(os.fspath(root) if root is not None else os.getcwd())
+        self.writable_patterns = tuple(writable_patterns)
+        self._subscribers: Dict[_Handler, Optional[frozenset]] = {}
+        self._subscribers_lock = threading.Lock()
+        self._server: Optional[socketserver.ThreadingUnixStreamServer] = None
+        self._threads: List[threading.Thread] = []
+        self._stopped = threading.Event()
+        self.service.subscribe(self._forward)
+
+    def start(self) -> "StateDaemon":
+        """Bind the socket and serve on background threads."""
+        if os.path.exists(self.socket_path):
+            if _socket_alive(self.socket_path):
+                raise StateServiceError(f"A state daemon is already listening on {self.socket_path}")
+            os.unlink(self.socket_path)  # Left behind by a daemon that did not shut down cleanly
+        os.makedirs(os.path.dirname(os.path.abspath(self.socket_path)), exist_ok=True)
+
+        self._server = socketserver.ThreadingUnixStreamServer(self.socket_path, _Handler)
+        self._server.daemon_threads = True
+        self._server.state_daemon = self
+        self._threads = [
+            threading.Thread(target=self._server.serve_forever, name="state-daemon-server", daemon=True),
+            threading.Thread(target=self._poll_loop, name="state-daemon-poll", daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+        logger.info(f"[STATE-DAEMON] Listening on {self.socket_path}")
+        return self
+
+    def serve_forever(self) -> None:
+        self.start()
+        try:
+            while not self._stopped.wait(1.0):
+                pass
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        try:
+            os.unlink(self.socket_path)
+        except FileNotFoundError:
+            pass
+        logger.info("[STATE-DAEMON] Stopped")
+
+    def _poll_loop(self) -> None:
+        while not self._stopped.wait(self.poll_interval_s):
+            try:
+                self.service.poll()
+            except Exception as e:
+                logger.warning(f"[STATE-DAEMON] Poll failed: {e}")
+
+    # ------------------------------------------------------------------
+    # Requests and notifications
+    # ------------------------------------------------------------------
+
+    def dispatch(self, request: Dict[str, Any], handler: _Handler) -> Dict[str, Any]:
+        op = request.get("op")
+        service = self.service
+        if op == "read":
+            if _local_only(request["path"]):
+                raise StateServiceError(f"{request['path']} is read in-process, not served by the daemon")
+            kind = request.get("kind", "json")
+            snapshot = service.snapshot(request["path"], kind)
+            if kind == "json":
+                snapshot["value"] = None  # Sent once, as the file text
+            return {"ok": True, **snapshot}
+        if op == "write_json":
+            path = self._writable(request["path"])
+            return {"ok": True, "version": service.write_json(path, request["value"])}
+        if op == "write_csv":
+            path = self._writable(request["path"])
+            return {"ok": True, "version": service.write_csv(path, request["rows"], request["fieldnames"])}
+        if op == "append_csv":
+            version = service.append_csv(self._writable(request["path"]), request["row"], request.get("fieldnames"))
+            return {"ok": True, "version": version}
+        if op == "invalidate":
+            service.invalidate(request["path"])
+            return {"ok": True}
+        if op == "subscribe":
+            paths = request.get("paths")
+            with self._subscribers_lock:
+                self._subscribers[handler] = frozenset(_key(p) for p in paths) if paths else None
+            return {"ok": True}
+        if op == "stats":
+            stats = service.stats()
+            stats.update(mode="daemon", subscribers=len(self._subscribers))
+            return {"ok": True, "value": stats}
+        if op == "ping":
+            return {"ok": True, "pid": os.getpid()}
+        raise StateServiceError(f"Unknown op {op!r}")
+
+    def _writable(self, path: str) -> str:
+        """Resolved path if it is one of the state files the daemon owns."""
+        real = os.path.realpath(path)
+        relative = os.path.relpath(real, self.root)
+        if relative.startswith(os.pardir) or os.path.isabs(relative):
+            raise StateServiceError(f"Refusing to write outside {self.root}: {path}")
+        relative = relative.replace(os.sep, "/")
+        if not any(fnmatch.fnmatch(relative, pattern) for pattern in self.writable_patterns):
+            raise StateServiceError(f"Refusing to write {relative}: not a state file owned by the daemon")
+        return real
+
+    def drop_subscriber(self, handler: _Handler) -> None:
+        with self._subscribers_lock:
+            self._subscribers.pop(handler, None)
+
+    def _forward(self, key: str, version: int) -> None:
+        with self._subscribers_lock:
+            targets = [h for h, keys in self._subscribers.items() if keys is None or key in keys]
+        event = {"event": "changed", "path": key, "version": version}
+        for handler in targets:
+            try:
+                handler.send(event)
+            except Exception:
+                self.drop_subscriber(handler)
+
+
+# ----------------------------------------------------------------------
+# Client
+# ----------------------------------------------------------------------
+
+
+def _socket_alive(socket_path: str) -> bool:
+    if not hasattr(socket, "AF_UNIX"):
+        return False
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(0.5)
+    try:
+        sock.connect(socket_path)
+        return True
+    except OSError:
+        return False
+    finally:
+        sock.close()
+
+
+class StateClient:
+    """Connection to a running state daemon (same interface as LocalStateService)."""
+
+    def __init__(
+        self,
+        socket_path: PathLike = DEFAULT_SOCKET,
+        timeout: float = CONNECT_TIMEOUT_S,
+        request_timeout: float = REQUEST_TIMEOUT_S,
+    ):
+        self.socket_path = os.fspath(socket_path)
+        self.timeout = timeout
+        self.request_timeout = request_timeout
+        self._sock, self._rfile = self._connect()
+        self._lock = threading.Lock()
+        self._next_id = 0
+        self._cache: Dict[str, Dict[str, Any]] = {}  # path -> snapshot from the daemon
+        self._local = LocalStateService()  # Files matching LOCAL_ONLY_PATTERNS
+        self._listener_sock: Optional[socket.socket] = None
+        self._callbacks: List[Tuple[Listener, Optional[frozenset]]] = []
+        self.requests = 0
+        self.cache_hits = 0
+
+    def _connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self.socket_path)
+        sock.settimeout(self.request_timeout)
+        return sock, sock.makefile("rb")
+
+    def _disconnect(self) -> None:
+        for stream in (self._rfile, self._sock):
+            if stream is not None:
+                try:
+                    stream.close()
+                except OSError:
+                    pass
+        self._sock, self._rfile = None, None
+
+    def _call(self, op: str, repeatable: bool = True, **fields) -> Dict[str, Any]:
+        """Send one request and return the daemon's reply to it.
+
+        After a timeout, a dropped connection or a reply carrying another
+        request's id, the connection is out of step and is replaced. A
+        repeatable request is then sent once more on the new connection;
+        StateDaemonUnavailable is raised if that fails too.
+        """
+        with self._lock:
+            self._next_id += 1
+            request_id = self._next_id
+            data = (json.dumps({"id": request_id, "op": op, **fields}) + "\n").encode("utf-8")
+            sent = False
+            for _ in range(2 if repeatable else 1):
+                try:
+                    if self._sock is None:
+                        self._sock, self._rfile = self._connect()
+                    self._sock.sendall(data)
+                    sent = True
+                    line = self._rfile.readline()
+                    if not line:
+                        raise ConnectionError("connection closed")
+                    response = json.loads(line)
+                    if response.get("id") != request_id:
+                        raise ValueError(f"reply to request {response.get('id')}, expected {request_id}")
+                    break
+                except (OSError, ValueError) as e:
+                    error = e
+                    self._disconnect()
+            else:
+                raise StateDaemonUnavailable(
+                    f"State daemon did not answer {op}: {error}", maybe_applied=sent and not repeatable
+                )
+            self.requests += 1
+        if not response.get("ok"):
+            raise StateServiceError(response.get("error", "request failed"))
+        return response
+
+    def snapshot(self, path: PathLike, kind: str = "json") -> Dict[str, Any]:
+        """Current value with its version and stat signature (value is shared; do not modify)."""
+        key = _key(path)
+        if _local_only(key):
+            return self._local.snapshot(key, kind)
+        cached = self._cache.get(key)
+        if cached is not None and cached["signature"] is not None and cached["signature"] == _signature(key):
+            self.cache_hits += 1
+            return cached
+        snapshot = self._call("read", path=key, kind=kind)
+        if kind == "json" and snapshot.get("text") is not None:
+            snapshot["value"] = json.loads(snapshot["text"])
+        self._cache[key] = snapshot
+        return snapshot
+
+    def read_json(self, path: PathLike, default: Any = None, copy: bool = True) -> Any:
+        snapshot = self.snapshot(path, "json")
+        value = _fresh("json", snapshot) if copy else snapshot["value"]
+        return default if value is None else value
+
+    def read_csv(self, path: PathLike, copy: bool = True) -> List[Dict[str, str]]:
+        snapshot = self.snapshot(path, "csv")
+        return (_fresh("csv", snapshot) if copy else snapshot["value"]) or []
+
+    def write_json(self, path: PathLike, value: Any) -> int:
+        key = _key(path)
+        if _local_only(key):
+            return self._local.write_json(key, value)
+        self._cache.pop(key, None)
+        return self._call("write_json", path=key, value=value)["version"]
+
+    def write_csv(self, path: PathLike, rows: List[Dict[str, Any]], fieldnames: List[str]) -> int:
+        key = _key(path)
+        if _local_only(key):
+            return self._local.write_csv(key, rows, fieldnames)
+        self._cache.pop(key, None)
+        version = self._call("write_csv", path=key, rows=rows, fieldnames=fieldnames)["version"]
+        LocalStateService._notify_position_readers(key)
+        return version
+
+    def append_csv(self, path: PathLike, row: Dict[str, Any], fieldnames: Optional[List[str]] = None) -> int:
+        key = _key(path)
+        if _local_only(key):
+            return self._local.append_csv(key, row, fieldnames)
+        self._cache.pop(key, None)
+        return self._call("append_csv", repeatable=False, path=key, row=row, fieldnames=fieldnames)["version"]
+
+    def invalidate(self, path: PathLike) -> None:
+        """Drop the cached copy here and in the daemon (see LocalStateService.invalidate)."""
+        key = _key(path)
+        if _local_only(key):
+            self._local.invalidate(key)
+            return
+        self._cache.pop(key, None)
+        self._call("invalidate", path=key)
+
+    def subscribe(self, callback: Listener, paths: Optional[List[PathLike]] = None) -> None:
+        """Call callback(path, version) when the daemon reports a change (on a listener thread)."""
+        filter_keys = frozenset(_key(p) for p in paths) if paths else None
+        self._callbacks.append((callback, filter_keys))
+        if self._listener_sock is None:
+            try:
+                sock, rfile = self._connect()
+                sock.sendall((json.dumps({"op": "subscribe"}) + "\n").encode("utf-8"))
+                rfile.readline()  # Subscription acknowledged
+            except OSError as e:
+                raise StateDaemonUnavailable(f"State daemon did not accept a subscription: {e}") from e
+            sock.settimeout(None)
+            self._listener_sock = sock
+            threading.Thread(target=self._listen, args=(rfile,), name="state-client-events", daemon=True).start()
+
+    def unsubscribe(self, callback: Listener) -> None:
+        self._callbacks = [(cb, keys) for cb, keys in self._callbacks if cb is not callback]
+
+    def _listen(self, rfile) -> None:
+        try:
+            for line in rfile:
+                event = json.loads(line)
+                if event.get("event") != "changed":
+                    continue
+                key, version = event["path"], event["version"]
+                cached = self._cache.get(key)
+                if cached is not None and cached["version"] < version:
+                    self._cache.pop(key, None)
+                for callback, keys in list(self._callbacks):
+                    if keys is None or key in keys:
+                        try:
+                            callback(key, version)
+                        except Exception as e:
+                            logger.warning(f"[STATE-DAEMON] Subscriber failed for {key}: {e}")
+        except (OSError, ValueError):
+            pass
+        logger.debug("[STATE-DAEMON] Event stream closed")
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self._call("stats")["value"]
+        stats.update(client_requests=self.requests, client_cache_hits=self.cache_hits)
+        return stats
+
+    def close(self) -> None:
+        self._disconnect()
+        if self._listener_sock is not None:
+            try:
+                self._listener_sock.close()
+            except OSError:
+                pass
+
+
+class FailoverStateService:
+    """A daemon client that is replaced by an in-process service once the daemon stops answering.
+
+    get_state_service() hands this out when a daemon is running, so callers
+    holding it keep working (on their own reads and writes) if the daemon dies.
+    Subscribers move to the in-process service, which picks up changes by poll().
+    """
+
+    def __init__(self, client: StateClient):
+        self.service: Union[StateClient, LocalStateService] = client
+        self._lock = threading.Lock()
+
+    def _run(self, method: str, *args, **kwargs) -> Any:
+        service = self.service
+        try:
+            return getattr(service, method)(*args, **kwargs)
+        except StateDaemonUnavailable as e:
+            local = self._fall_back(service, e)
+            if e.maybe_applied:
+                raise  # The daemon may have written it; repeating could write it twice
+            return getattr(local, method)(*args, **kwargs)
+
+    def _fall_back(self, failed: Any, error: Exception) -> Any:
+        with self._lock:
+            if self.service is failed and isinstance(failed, StateClient):
+                logger.warning(f"[STATE-DAEMON] {error}; using in-process state from now on")
+                local = LocalStateService()
+                for callback, keys in failed._callbacks:
+                    local.subscribe(callback, list(keys) if keys else None)
+                failed.close()
+                self.service = local
+            return self.service
+
+    def snapshot(self, path: PathLike, kind: str = "json") -> Dict[str, Any]:
+        return self._run("snapshot", path, kind)
+
+    def read_json(self, path: PathLike, default: Any = None, copy: bool = True) -> Any:
+        return self._run("read_json", path, default, copy)
+
+    def read_csv(self, path: PathLike, copy: bool = True) -> List[Dict[str, str]]:
+        return self._run("read_csv", path, copy)
+
+    def write_json(self, path: PathLike, value: Any) -> int:
+        return self._run("write_json", path, value)
+
+    def write_csv(self, path: PathLike, rows: List[Dict[str, Any]], fieldnames: List[str]) -> int:
+        return self._run("write_csv", path, rows, fieldnames)
+
+    def append_csv(self, path: PathLike, row: Dict[str, Any], fieldnames: Optional[List[str]] = None) -> int:
+        return self._run("append_csv", path, row, fieldnames)
+
+    def invalidate(self, path: PathLike) -> None:
+        self._run("invalidate", path)
+
+    def subscribe(self, callback: Listener, paths: Optional[List[PathLike]] = None) -> None:
+        self._run("subscribe", callback, paths)
+
+    def unsubscribe(self, callback: Listener) -> None:
+        self.service.unsubscribe(callback)
+
+    def stats(self) -> Dict[str, Any]:
+        return self._run("stats")
+
+    def close(self) -> None:
+        if isinstance(self.service, StateClient):
+            self.service.close()
+
+
+# ----------------------------------------------------------------------
+# Service lookup
+# ----------------------------------------------------------------------
+
+_service: Optional[Union[FailoverStateService, LocalStateService]] = None
+_service_lock = threading.Lock()
+
+
+def _daemon_settings() -> Dict[str, Any]:
+    try:
+        from utils.llm import load_config
+
+        config = load_config()
+    except Exception:
+        config = {}
+    return {
+        "enabled": bool(config.get("STATE_DAEMON_ENABLED", True)),
+        "socket": config.get("STATE_DAEMON_SOCKET", DEFAULT_SOCKET),
+        "poll_seconds": float(config.get("STATE_DAEMON_POLL_SECONDS", DEFAULT_POLL_SECONDS)),
+    }
+
+
+def connect_state_service(socket_path: PathLike = DEFAULT_SOCKET, use_daemon: bool = True):
+    """Client for the daemon at socket_path, or a new in-process service if none is running."""
+    socket_path = os.fspath(socket_path)
+    if use_daemon and hasattr(socket, "AF_UNIX") and os.path.exists(socket_path):
+        try:
+            client = StateClient(socket_path)
+            logger.info(f"[STATE-DAEMON] Connected to {socket_path}")
+            return client
+        except OSError as e:
+            logger.info(f"[STATE-DAEMON] Daemon at {socket_path} unreachable ({e}); using in-process state")
+    return LocalStateService()
+
+
+def invalidate_state(path: PathLike) -> None:
+    """Tell this process's state service (if one is in use) that path was rewritten directly."""
+    service = _service
+    if service is None:
+        return
+    try:
+        service.invalidate(path)
+    except Exception as e:
+        logger.debug(f"[STATE-DAEMON] Could not invalidate {path}: {e}")
+
+
+def get_state_service() -> Union[FailoverStateService, LocalStateService]:
+    """Shared state service for this process (daemon client, or in-process fallback)."""
+    global _service
+    with _service_lock:
+        if _service is None:
+            settings = _daemon_settings()
+            service = connect_state_service(settings["socket"], use_daemon=settings["enabled"])
+            _service = FailoverStateService(service) if isinstance(service, StateClient) else service
+        return _service
+
+
+# ----------------------------------------------------------------------
+# Benchmark
+# ----------------------------------------------------------------------
+
+
+def _benchmark(reads: int = 2000) -> Dict[str, Dict[str, float]]:
+    """Read latency and file I/O: direct re-reads vs in-process service vs daemon."""
+    import tempfile
+
+    workdir = Path(tempfile.mkdtemp(prefix="state_daemon_bench_"))
+    bankroll = workdir / "bankroll.json"
+    positions = workdir / "positions.csv"
+    bankroll.write_text(json.dumps({
+        "current_bankroll": 1234.5, "start_capital": 1000.0, "total_trades": 250,
+        "trade_history": [{"trade_id": i, "pnl": i * 0.5, "symbol": "SPY"} for i in range(250)],
+    }, indent=2))
+    fieldnames = ["symbol", "occ_symbol", "strike", "option_type", "expiry", "quantity", "entry_price", "entry_time"]
+    with open(positions, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        for i in range(12):
+            writer.writerow({"symbol": "SPY", "occ_symbol": f"SPY261016C00{580 + i}000", "strike": 580 + i,
+                             "option_type": "CALL", "expiry": "2026-10-16", "quantity": 1,
+                             "entry_price": 1.25, "entry_time": "2026-10-16T10:00:00"})
+
+    def direct():
+        with open(bankroll, "r", encoding="utf-8") as f:
+            json.load(f)
+        with open(positions, "r", newline="", encoding="utf-8") as f:
+            list(csv.DictReader(f))
+
+    def timed(fn) -> float:
+        start = time.perf_counter()
+        for _ in range(reads):
+            fn()
+        return (time.perf_counter() - start) / reads * 1e6
+
+    results = {"direct re-read": {"us_per_read": timed(direct), "file_opens": 2.0 * reads}}
+
+    local = LocalStateService()
+    local_time = timed(lambda: (local.read_json(bankroll), local.read_csv(positions)))
+    results["in-process service"] = {
+        "us_per_read": local_time,
+        "file_opens": float(sum(d["loads"] for d in local.stats()["files"].values())),
+    }
+    results["in-process, shared"] = {
+        "us_per_read": timed(lambda: (local.read_json(bankroll, copy=False), local.read_csv(positions, copy=False))),
+        "file_opens": 0.0,
+    }
+
+    if hasattr(socket, "AF_UNIX"):
+        daemon = StateDaemon(workdir / "bench.sock", poll_interval_s=60).start()
+        client = StateClient(workdir / "bench.sock")
+        try:
+            client_time = timed(lambda: (client.read_json(bankroll), client.read_csv(positions)))
+            stats = client.stats()
+            results["daemon client"] = {
+                "us_per_read": client_time,
+                "file_opens": float(sum(d["loads"] for d in stats["files"].values())),
+                "round_trips": float(stats["client_requests"] - 1),
+            }
+            results["daemon client, shared"] = {
+                "us_per_read": timed(lambda: (client.read_json(bankroll, copy=False),
+                                              client.read_csv(positions, copy=False))),
+                "file_opens": 0.0,
+            }
+            uncached = StateClient(workdir / "bench.sock")
+            results["daemon round trip"] = {
+                "us_per_read": timed(lambda: (uncached._call("read", path=str(bankroll), kind="json"),
+                                              uncached._call("read", path=str(positions), kind="csv"))),
+                "file_opens": 0.0,
+            }
+            uncached.close()
+        finally:
+            client.close()
+            daemon.stop()
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Shared state daemon")
+    parser.add_argument("--socket", help="Unix socket path (default: STATE_DAEMON_SOCKET from config)")
+    parser.add_argument("--poll", type=float, help="Seconds between checks for direct file writes")
+    parser.add_argument("--bench", action="store_true", help="Benchmark read latency and file I/O, then exit")
+    parser.add_argument("--stats", action="store_true", help="Print a running daemon's stats, then exit")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+    if args.bench:
+        for name, row in _benchmark().items():
+            print(f"{name:22s} " + "  ".join(f"{k}={v:,.1f}" for k, v in row.items()))
+        raise SystemExit(0)
+
+    settings = _daemon_settings()
+    socket_path = args.socket or settings["socket"]
+    if args.stats:
+        print(json.dumps(StateClient(socket_path).stats(), indent=2))
+        raise SystemExit(0)
+    StateDaemon(socket_path, poll_interval_s=args.poll or settings["poll_seconds"]).serve_forever()
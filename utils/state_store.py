@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+"""
+State Store
+
+Shared persistence for the small JSON state files kept by the risk and
+monitoring singletons (circuit breakers, P&L trackers, symbol states, market
+calendar cache, VIX monitor, staleness metrics). Each namespace is one JSON
+document in the file the owning module has always used, so the on-disk
+format and paths do not change.
+
+Reads are served from memory. The file is only re-read if its size or mtime
+changed (another process wrote it). Saving serializes the value, skips the
+write if the text is unchanged, and otherwise marks the namespace dirty. A
+background thread writes dirty namespaces after a short coalescing delay, so
+a burst of saves becomes one write. Callers that need a change on disk
+before they continue (circuit breaker trips, kill switch) pass flush=True.
+Pending changes are flushed on interpreter exit.
+
+Writes go to a per-process temp file next to the target, are fsynced, and
+are renamed over the target while holding a cross-process lock file
+(<file>.lock, created with O_EXCL). A temp file left behind by a crash is
+recovered on the next load if the target is missing or unreadable.
+
+Key Features:
+- Namespaced documents with in-memory reads
+- Dirty tracking (unchanged saves are skipped)
+- Coalesced write-behind on a background flusher, flush on exit
+- Cross-process lock file around every write
+- Crash-safe recovery from interrupted writes
+
+Usage:
+    from utils.state_store import get_state_store
+
+    state = get_state_store().namespace("daily_pnl", "daily_pnl_tracker.json")
+    data = state.load(default={})
+    data["last_updated"] = now.isoformat()
+    state.save(data)               # coalesced
+    state.save(data, flush=True)   # on disk before returning
+
+Author: Robinhood HA Breakout System
+Version: 1.0.0
+License: MIT
+"""
+
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FLUSH_DELAY_S = 1.0
+LOCK_TIMEOUT_S = 5.0
+LOCK_STALE_SECONDS = 30  # Writes take milliseconds; an older lock file was left by a crash
+LOCK_SUFFIX = ".lock"
+TMP_SUFFIX = ".tmp"
+
+
+def _signature(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+@contextmanager
+def _file_lock(lock_path: Path, wait_seconds: float) -> Iterator[bool]:
+    """Cross-process lock file (yields False if still busy after wait_seconds)."""
+    deadline = time.monotonic() + wait_seconds
+    fd = None
+    while fd is None:
+        try:
+            fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            try:
+                if time.time() - lock_path.stat().st_mtime > LOCK_STALE_SECONDS:
+                    logger.warning(f"[STATE-STORE] Breaking stale lock {lock_path}")
+                    lock_path.unlink()
+                    continue
+            except FileNotFoundError:
+                continue
+            if time.monotonic() >= deadline:
+                yield False
+                return
+            time.sleep(0.01)
+    try:
+        os.write(fd, str(os.getpid()).encode())
+        yield True
+    finally:
+        os.close(fd)
+        try:
+            lock_path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class StateNamespace:
+    """One JSON state document managed by a StateStore."""
+
+    def __init__(self, store: "StateStore", name: str, path: Path, indent: Optional[int] = 2):
+        self.name = name
+        self.path = path
+        self.indent = indent
+        self._store = store
+        self._lock_path = path.with_name(path.name + LOCK_SUFFIX)
+        self._tmp_path = path.with_name(f"{path.name}.{os.getpid()}{TMP_SUFFIX}")
+        self._write_lock = threading.Lock()  # One writer per namespace in this process
+        self._text: Optional[str] = None  # Text on disk as of the last load/write
+        self._signature: Optional[Tuple[int, int]] = None
+        self._loaded = False
+        self._pending: Optional[str] = None  # Saved text not yet written
+        self.writes = 0
+        self.skipped = 0
+        self.reloads = 0
+        self.recovered = 0
+
+    @property
+    def dirty(self) -> bool:
+        return self._pending is not None
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def load(self, default: Any = None) -> Any:
+        """Current value as a fresh object (default if missing or unreadable)."""
+        with self._store._lock:
+            text = self._pending if self._pending is not None else self._disk_text()
+        if text is None:
+            return default
+        return json.loads(text)
+
+    def _disk_text(self) -> Optional[str]:
+        # Caller holds the store lock
+        signature = _signature(self.path)
+        if self._loaded and signature == self._signature:
+            return self._text
+        if self._loaded:
+            self.reloads += 1
+        self._text = self._read()
+        self._signature = _signature(self.path)
+        self._loaded = True
+        return self._text
+
+    def _read(self) -> Optional[str]:
+        try:
+            text = self.path.read_text(encoding="utf-8")
+            json.loads(text)
+            return text
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logger.warning(f"[STATE-STORE] Unreadable {self.name} state {self.path}: {e}")
+        return self._recover()
+
+    def _recover(self) -> Optional[str]:
+        """Promote the newest complete temp file left by an interrupted write."""
+        if not self.path.parent.exists():
+            return None
+        candidates = sorted(
+            self.path.parent.glob(f"{self.path.name}.*{TMP_SUFFIX}"),
+            key=lambda p: p.stat().st_mtime if p.exists() else 0,
+            reverse=True,
+        )
+        if not candidates:
+            return None
+        with _file_lock(self._lock_path, self._store.lock_timeout_s) as acquired:
+            if not acquired:
+                return None  # A writer is active; its result will be picked up on the next load
+            recovered = None
+            for tmp_path in candidates:
+                try:
+                    text = tmp_path.read_text(encoding="utf-8")
+                    json.loads(text)
+                except (OSError, ValueError):
+                    tmp_path.unlink(missing_ok=True)
+                    continue
+                if recovered is None:
+                    os.replace(tmp_path, self.path)
+                    recovered = text
+                else:
+                    tmp_path.unlink(missing_ok=True)
+        if recovered is not None:
+            self.recovered += 1
+            logger.warning(f"[STATE-STORE] Recovered {self.name} state {self.path} from an interrupted write")
+        return recovered
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def save(self, value: Any, flush: bool = False) -> bool:
+        """Replace the document.
+
+        Args:
+            value: JSON-serializable value
+            flush: Write now instead of on the background flusher
+
+        Returns:
+            True if the file was written by this call
+        """
+        text = json.dumps(value, indent=self.indent)
+        flush = flush or self._store._closed  # No flusher after shutdown
+        with self._store._lock:
+            if self._pending is not None:
+                current = self._pending
+            else:
+                current = self._disk_text() if self._loaded else None
+            if text == current:
+                self.skipped += 1
+                return False
+            self._pending = None if text == self._text else text
+            if self._pending is None:
+                return False
+            self._store._mark_dirty()  # Also retries a flush=True write that fails below
+        return self.flush() if flush else False
+
+    def flush(self) -> bool:
+        """Write the pending change, if any."""
+        with self._write_lock:
+            with self._store._lock:
+                text = self._pending
+            if text is None:
+                return False
+            if not self._write(text):
+                return False
+            with self._store._lock:
+                self._text = text
+                self._signature = _signature(self.path)
+                self._loaded = True
+                if self._pending is text:
+                    self._pending = None
+            self.writes += 1
+            return True
+
+    def delete(self) -> bool:
+        """Remove the document's file (immediately)."""
+        with self._write_lock, self._store._lock:
+            self._pending = None
+            self._text = None
+            self._loaded = True
+            try:
+                self.path.unlink()
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.error(f"[STATE-STORE] Could not remove {self.path}: {e}")
+                return False
+            self._signature = None
+            return True
+
+    def _write(self, text: str) -> bool:
+        with _file_lock(self._lock_path, self._store.lock_timeout_s) as acquired:
+            if not acquired:
+                logger.warning(f"[STATE-STORE] {self.path} is locked by another process; write deferred")
+                return False
+            try:
+                with open(self._tmp_path, "w", encoding="utf-8") as f:
+                    f.write(text)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(self._tmp_path, self.path)
+                return True
+            except Exception as e:
+                logger.warning(f"[STATE-STORE] Failed to persist {self.name} state {self.path}: {e}")
+                try:
+                    self._tmp_path.unlink(missing_ok=True)
+                except OSError:
+                    pass
+                return False
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "path": str(self.path),
+            "writes": self.writes,
+            "unchanged_skipped": self.skipped,
+            "reloads": self.reloads,
+            "recovered": self.recovered,
+            "dirty": self.dirty,
+        }
+
+
+class StateStore:
+    """Namespaced JSON state documents with coalesced write-behind persistence."""
+
+    def __init__(self, flush_delay_s: float = DEFAULT_FLUSH_DELAY_S, lock_timeout_s: float = LOCK_TIMEOUT_S):
+        """Initialize the store (namespaces are bound with namespace()).
+
+        Args:
+            flush_delay_s: Coalescing delay before dirty namespaces are written
+            lock_timeout_s: How long a write waits for another process's lock
+        """
+        self.flush_delay_s = flush_delay_s
+        self.lock_timeout_s = lock_timeout_s
+        self._lock = threading.RLock()
+        self._namespaces: Dict[str, StateNamespace] = {}  # abspath -> namespace
+        self._by_name: Dict[str, StateNamespace] = {}  # Most recent binding of each name
+        self._wake = threading.Event()
+        self._closed = False
+        self._writer: Optional[threading.Thread] = None
+
+    def namespace(self, name: str, path: Union[str, Path], indent: Optional[int] = 2) -> StateNamespace:
+        """Bind (or return) the namespace persisted at path."""
+        path = Path(path)
+        key = os.path.abspath(path)
+        with self._lock:
+            ns = self._namespaces.get(key)
+            if ns is None:
+                try:
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                except OSError:
+                    pass
+                ns = self._namespaces[key] = StateNamespace(self, name, path, indent)
+            self._by_name[name] = ns
+            return ns
+
+    def get(self, name: str, default: Any = None) -> Any:
+        """Value of a bound namespace."""
+        ns = self._by_name.get(name)
+        return ns.load(default) if ns is not None else default
+
+    def set(self, name: str, value: Any, flush: bool = False) -> bool:
+        """Save a bound namespace."""
+        ns = self._by_name.get(name)
+        if ns is None:
+            raise KeyError(f"State namespace {name!r} is not bound")
+        return ns.save(value, flush=flush)
+
+    def flush(self) -> int:
+        """Write every dirty namespace now.
+
+        Returns:
+            Number of files written
+        """
+        with self._lock:
+            dirty = [ns for ns in self._namespaces.values() if ns.dirty]
+        return sum(ns.flush() for ns in dirty)
+
+    def close(self) -> None:
+        """Flush pending changes and stop the background flusher."""
+        self._closed = True
+        self._wake.set()
+        if self._writer and self._writer.is_alive():
+            self._writer.join(timeout=self.flush_delay_s + 1)
+        self.flush()
+
+    def _mark_dirty(self) -> None:
+        # Caller holds self._lock
+        if self._closed:
+            return
+        if self._writer is None or not self._writer.is_alive():
+            self._writer = threading.Thread(target=self._write_loop, name="state-store-writer", daemon=True)
+            self._writer.start()
+        self._wake.set()
+
+    def _write_loop(self) -> None:
+        while not self._closed:
+            self._wake.wait()
+            if self._closed:
+                break
+            # Coalesce bursts of saves into one write per namespace
+            time.sleep(self.flush_delay_s)
+            self._wake.clear()
+            self.flush()
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {ns.name: ns.metrics() for ns in self._by_name.values()}
+
+
+# Global store instance
+_global_state_store: Optional[StateStore] = None
+_store_lock = threading.Lock()
+
+
+def get_state_store() -> StateStore:
+    """Get global state store instance."""
+    global _global_state_store
+    with _store_lock:
+        if _global_state_store is None:
+            _global_state_store = StateStore()
+            atexit.register(_global_state_store.close)
+        return _global_state_store
@@ -0,0 +1,416 @@
+#!/usr/bin/env python3
+"""
+Streaming Tick-Driven Exit Monitoring
+
+Evaluates exit strategies on every quote tick instead of on a fixed polling
+interval, so a fast-moving 0DTE position is acted on within milliseconds of
+the move rather than at the next monitoring cycle.
+
+Key Features:
+- Real-time stock and option quote subscriptions for open positions only
+- Subscriptions added/removed as positions open and close
+- In-memory last-quote table shared with the rest of the monitor
+- Per-position debounced ExitStrategyManager.evaluate_exit on each tick
+- Confirmation counted in ticks or seconds instead of monitoring cycles
+- Confirmed decisions dispatched off the stream threads
+
+Usage:
+    from utils.streaming_exits import QuoteStream, StreamingExitEvaluator
+
+    evaluator = StreamingExitEvaluator(exit_manager, on_decision=handle_exit)
+    stream = QuoteStream(api_key, secret_key, on_quote=evaluator.on_quote)
+    evaluator.quotes = stream.quotes
+
+    evaluator.set_positions(positions)   # each with symbol + occ_symbol
+    stream.set_symbols(evaluator.underlyings, evaluator.occ_symbols)
+
+Author: Robinhood HA Breakout System
+Version: 1.0.0
+License: MIT
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from .exit_strategies import ExitDecision, ExitReason
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class LastQuote:
+    """Most recent quote for a symbol."""
+    bid: float
+    ask: float
+    received_at: float  # time.monotonic()
+
+    @property
+    def mid(self) -> Optional[float]:
+        """Mid price, tolerating a missing bid or ask (same rules as the polling monitor)."""
+        if self.bid > 0 and self.ask > 0:
+            return (self.bid + self.ask) / 2.0
+        if self.ask > 0:
+            return self.ask * 0.95
+        if self.bid > 0:
+            return self.bid
+        return None
+
+
+class QuoteTable:
+    """Thread-safe last-quote table keyed by symbol."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._quotes: Dict[str, LastQuote] = {}
+
+    def update(self, symbol: str, bid: Optional[float], ask: Optional[float]) -> LastQuote:
+        quote = LastQuote(float(bid or 0.0), float(ask or 0.0), time.monotonic())
+        with self._lock:
+            self._quotes[symbol] = quote
+        return quote
+
+    def get(self, symbol: str) -> Optional[LastQuote]:
+        with self._lock:
+            return self._quotes.get(symbol)
+
+    def mid(self, symbol: str) -> Optional[float]:
+        quote = self.get(symbol)
+        return quote.mid if quote else None
+
+    def discard(self, symbols: Iterable[str]) -> None:
+        with self._lock:
+            for symbol in symbols:
+                self._quotes.pop(symbol, None)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._quotes)
+
+
+class QuoteStream:
+    """Manages Alpaca stock and option quote websocket subscriptions.
+
+    Each stream connects lazily on its first subscription (alpaca-py's
+    DataStream spins until it has something to subscribe to) and runs on its
+    own daemon thread.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        secret_key: str,
+        on_quote: Optional[Callable[[str], None]] = None,
+        url_override: Optional[str] = None,
+        stock_url_override: Optional[str] = None,
+        option_url_override: Optional[str] = None,
+    ):
+        """Initialize the quote stream (nothing connects until set_symbols()).
+
+        Args:
+            api_key: Alpaca API key
+            secret_key: Alpaca secret key
+            on_quote: Called with the symbol after each quote lands in the table
+            url_override: Websocket URL for both streams (e.g. local stand-in)
+            stock_url_override: Stock stream URL (takes precedence over url_override)
+            option_url_override: Option stream URL (takes precedence over url_override)
+        """
+        self.api_key = api_key
+        self.secret_key = secret_key
+        self.on_quote = on_quote
+        self.stock_url = stock_url_override or url_override
+        self.option_url = option_url_override or url_override
+        self.quotes = QuoteTable()
+
+        self._lock = threading.Lock()
+        self._streams: Dict[str, Any] = {}
+        self._threads: Dict[str, threading.Thread] = {}
+        self._subscribed: Dict[str, Set[str]] = {"stock": set(), "option": set()}
+
+        self.ticks_received = 0
+
+    @property
+    def subscribed(self) -> Set[str]:
+        """All currently subscribed symbols."""
+        with self._lock:
+            return self._subscribed["stock"] | self._subscribed["option"]
+
+    def set_symbols(self, stocks: Iterable[str], options: Iterable[str]) -> None:
+        """Subscribe to exactly these symbols, unsubscribing anything else."""
+        with self._lock:
+            for kind, wanted in (("stock", set(stocks)), ("option", set(options))):
+                current = self._subscribed[kind]
+                added = sorted(wanted - current)
+                removed = sorted(current - wanted)
+                if not added and not removed:
+                    continue
+                stream = self._stream(kind)
+                if added:
+                    stream.subscribe_quotes(self._handle_quote, *added)
+                if removed:
+                    stream.unsubscribe_quotes(*removed)
+                    self.quotes.discard(removed)
+                self._subscribed[kind] = wanted
+                if kind not in self._threads:
+                    self._start(kind)
+                logger.info(f"[STREAM] {kind} quotes: +{len(added)} -{len(removed)} ({len(wanted)} subscribed)")
+
+    def stop(self) -> None:
+        """Close both streams."""
+        with self._lock:
+            for kind, stream in self._streams.items():
+                try:
+                    loop = getattr(stream, "_loop", None)
+                    if loop is not None and loop.is_running():
+                        stream.stop()
+                        # Close the socket as well so the pending receive (up to 5s) ends now
+                        asyncio.run_coroutine_threadsafe(stream.close(), loop).result(timeout=5)
+                except Exception as e:
+                    logger.debug(f"[STREAM] Error stopping {kind} stream: {e}")
+            for thread in self._threads.values():
+                thread.join(timeout=5)
+            self._streams.clear()
+            self._threads.clear()
+            self._subscribed = {"stock": set(), "option": set()}
+
+    def _stream(self, kind: str):
+        # Caller holds self._lock
+        stream = self._streams.get(kind)
+        if stream is None:
+            if kind == "stock":
+                from alpaca.data.live import StockDataStream
+                stream = StockDataStream(self.api_key, self.secret_key, raw_data=True, url_override=self.stock_url)
+            else:
+                from alpaca.data.live import OptionDataStream
+                stream = OptionDataStream(self.api_key, self.secret_key, raw_data=True, url_override=self.option_url)
+            self._streams[kind] = stream
+        return stream
+
+    def _start(self, kind: str) -> None:
+        # Caller holds self._lock
+        thread = threading.Thread(target=self._streams[kind].run, name=f"quote-stream-{kind}", daemon=True)
+        self._threads[kind] = thread
+        thread.start()
+
+    async def _handle_quote(self, msg: Dict[str, Any]) -> None:
+        symbol = msg.get("S")
+        if not symbol:
+            return
+        self.quotes.update(symbol, msg.get("bp"), msg.get("ap"))
+        self.ticks_received += 1
+        if self.on_quote:
+            try:
+                self.on_quote(symbol)
+            except Exception as e:
+                logger.error(f"[STREAM] Quote handler failed for {symbol}: {e}")
+
+
+@dataclass
+class _PositionState:
+    """Per-position evaluation state."""
+    position: Dict
+    last_eval: float = 0.0
+    timer: Optional[threading.Timer] = None
+    breach_reason: Optional[ExitReason] = None
+    breach_ticks: int = 0
+    breach_started: float = 0.0
+    exiting: bool = False
+    first_tick_at: Optional[float] = None  # earliest tick not yet evaluated
+
+
+class StreamingExitEvaluator:
+    """Debounced, tick-confirmed exit evaluation over a last-quote table."""
+
+    def __init__(
+        self,
+        exit_manager,
+        on_decision: Callable[[Dict, float, float, ExitDecision], None],
+        quotes: Optional[QuoteTable] = None,
+        debounce_ms: float = 250.0,
+        confirm_ticks: int = 3,
+        confirm_seconds: float = 2.0,
+        confirm_reasons: Tuple[ExitReason, ...] = (ExitReason.STOP_LOSS,),
+    ):
+        """Initialize evaluator.
+
+        Args:
+            exit_manager: ExitStrategyManager used for evaluate_exit
+            on_decision: Called (off the stream threads) with position, stock price,
+                option price and decision once a decision is confirmed
+            quotes: Last-quote table (usually QuoteStream.quotes)
+            debounce_ms: Minimum spacing between evaluations of one position
+            confirm_ticks: Consecutive breaching evaluations that confirm (0 disables)
+            confirm_seconds: Breach duration that confirms (0 disables)
+            confirm_reasons: Exit reasons that need confirmation; others act immediately
+        """
+        self.exit_manager = exit_manager
+        self.on_decision = on_decision
+        self.quotes = quotes if quotes is not None else QuoteTable()
+        self.debounce_s = debounce_ms / 1000.0
+        self.confirm_ticks = confirm_ticks
+        self.confirm_seconds = confirm_seconds
+        self.confirm_reasons = set(confirm_reasons)
+
+        self._lock = threading.Lock()
+        self._eval_lock = threading.Lock()
+        self._states: Dict[str, _PositionState] = {}
+        self._by_symbol: Dict[str, List[str]] = {}
+        self._dispatcher = ThreadPoolExecutor(max_workers=1, thread_name_prefix="exit-dispatch")
+
+        self.evaluations = 0
+        self.decisions_dispatched = 0
+        self.last_decision_latency_ms: Optional[float] = None
+
+    @property
+    def underlyings(self) -> Set[str]:
+        with self._lock:
+            return {s.position["symbol"] for s in self._states.values()}
+
+    @property
+    def occ_symbols(self) -> Set[str]:
+        with self._lock:
+            return set(self._states)
+
+    def set_positions(self, positions: Iterable[Dict]) -> None:
+        """Replace the tracked positions (each needs 'symbol' and 'occ_symbol').
+
+        State (debounce, pending confirmations, exit latch) is kept for
+        positions that remain open.
+        """
+        with self._lock:
+            incoming = {p["occ_symbol"]: p for p in positions if p.get("occ_symbol")}
+            for key in set(self._states) - set(incoming):
+                state = self._states.pop(key)
+                if state.timer:
+                    state.timer.cancel()
+            for key, position in incoming.items():
+                if key in self._states:
+                    self._states[key].position = position
+                else:
+                    self._states[key] = _PositionState(position=position)
+            self._by_symbol = {}
+            for key, state in self._states.items():
+                self._by_symbol.setdefault(key, []).append(key)
+                self._by_symbol.setdefault(state.position["symbol"], []).append(key)
+
+    def on_quote(self, symbol: str) -> None:
+        """Tick handler: schedule evaluation of every position priced off this symbol."""
+        now = time.monotonic()
+        with self._lock:
+            keys = list(self._by_symbol.get(symbol, ()))
+            run_now = []
+            for key in keys:
+                state = self._states[key]
+                if state.exiting:
+                    continue
+                if state.first_tick_at is None:
+                    state.first_tick_at = now
+                if state.timer is not None:
+                    continue  # Already scheduled; it will see this tick's quote
+                wait = state.last_eval + self.debounce_s - now
+                if wait <= 0:
+                    state.last_eval = now
+                    run_now.append(key)
+                else:
+                    self._defer(key, state, wait)
+        for key in run_now:
+            self._evaluate(key)
+
+    def release(self, occ_symbol: str) -> None:
+        """Re-arm a position after an exit decision that did not close it."""
+        with self._lock:
+            state = self._states.get(occ_symbol)
+            if state:
+                state.exiting = False
+
+    def close(self) -> None:
+        """Cancel pending evaluations and wait for in-flight dispatches."""
+        with self._lock:
+            for state in self._states.values():
+                if state.timer:
+                    state.timer.cancel()
+        self._dispatcher.shutdown(wait=True)
+
+    def _defer(self, key: str, state: _PositionState, wait: float) -> None:
+        # Caller holds self._lock
+        state.timer = threading.Timer(wait, self._deferred, args=(key,))
+        state.timer.daemon = True
+        state.timer.start()
+
+    def _deferred(self, key: str) -> None:
+        with self._lock:
+            state = self._states.get(key)
+            if state is None:
+                return
+            state.timer = None
+            state.last_eval = time.monotonic()
+        self._evaluate(key)
+
+    def _evaluate(self, key: str) -> None:
+        with self._lock:
+            state = self._states.get(key)
+            if state is None or state.exiting:
+                return
+            position = state.position
+        stock_price = self.quotes.mid(position["symbol"])
+        option_price = self.quotes.mid(key)
+        if not stock_price or not option_price:
+            return
+
+        with self._eval_lock:
+            decision = self.exit_manager.evaluate_exit(position, stock_price, option_price)
+        self.evaluations += 1
+
+        now = time.monotonic()
+        with self._lock:
+            if self._states.get(key) is not state:
+                return  # Position closed while evaluating
+            tick_at, state.first_tick_at = state.first_tick_at, None
+            if decision.reason == ExitReason.NO_EXIT and not decision.should_exit:
+                state.breach_reason = None
+                state.breach_ticks = 0
+                return
+
+            if decision.reason in self.confirm_reasons:
+                if state.breach_reason != decision.reason:
+                    state.breach_reason = decision.reason
+                    state.breach_ticks = 0
+                    state.breach_started = now
+                state.breach_ticks += 1
+                by_ticks = self.confirm_ticks > 0 and state.breach_ticks >= self.confirm_ticks
+                by_time = self.confirm_seconds > 0 and now - state.breach_started >= self.confirm_seconds
+                if not (by_ticks or by_time):
+                    logger.info(
+                        f"[STREAM-EXIT] {key} {decision.reason.value} confirmation "
+                        f"{state.breach_ticks}/{self.confirm_ticks} ticks, "
+                        f"{now - state.breach_started:.1f}/{self.confirm_seconds:.1f}s"
+                    )
+                    if self.confirm_seconds > 0 and state.timer is None:
+                        # Re-check when the time window closes even if no tick arrives
+                        self._defer(key, state, self.confirm_seconds - (now - state.breach_started))
+                    return
+
+            state.breach_reason = None
+            state.breach_ticks = 0
+            if decision.should_exit:
+                state.exiting = True
+            if tick_at is not None:
+                # Tick-to-decision latency, including any debounce wait
+                self.last_decision_latency_ms = (now - tick_at) * 1000
+
+        logger.info(
+            f"[STREAM-EXIT] {key} {decision.reason.value} confirmed at "
+            f"stock=${stock_price:.2f} option=${option_price:.2f} ({decision.current_pnl_pct:+.1f}%)"
+        )
+        self.decisions_dispatched += 1
+        self._dispatcher.submit(self._dispatch, position, stock_price, option_price, decision)
+
+    def _dispatch(self, position: Dict, stock_price: float, option_price: float, decision: ExitDecision) -> None:
+        try:
+            self.on_decision(position, stock_price, option_price, decision)
+        except Exception as e:
+            logger.error(f"[STREAM-EXIT] Exit handler failed for {position.get('occ_symbol')}: {e}")
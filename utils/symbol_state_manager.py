@@ -5,7 +5,6 @@ Manages symbol states during suspected corporate actions (splits, dividends, etc
 to prevent trading on inconsistent data.
 """
 
-import json
 import logging
 import time
 from datetime import datetime, timedelta
@@ -14,6 +13,8 @@ from typing import Dict, Optional, Tuple, List
 from enum import Enum
 import math
 
+from .state_store import get_state_store
+
 logger = logging.getLogger(__name__)
 
 class SymbolState(Enum):
@@ -144,25 +145,25 @@ class SymbolStateManager:
     
     def __init__(self, state_file: str = "symbol_states.json"):
         self.state_file = Path(state_file)
+        self._store = get_state_store().namespace("symbol_states", self.state_file)
         self.states = self._load_states()
         self.stability_required_scans = self.STABLE_RELEASE_SCANS
         
     def _load_states(self) -> Dict:
-        """Load symbol states from file"""
+        """Load symbol states (served from the state store)"""
         try:
-            if self.state_file.exists():
-                with open(self.state_file, 'r') as f:
-                    return json.load(f)
+            states = self._store.load()
+            if isinstance(states, dict):
+                return states
         except Exception as e:
             logger.warning(f"[SYMBOL-STATE] Error loading states: {e}")
         
         return {}
     
     def _save_states(self):
-        """Save symbol states to file"""
+        """Save symbol states (coalesced write through the state store)"""
         try:
-            with open(self.state_file, 'w') as f:
-                json.dump(self.states, f, indent=2)
+            self._store.save(self.states)
         except Exception as e:
             logger.error(f"[SYMBOL-STATE] Error saving states: {e}")
     
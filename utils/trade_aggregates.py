@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+"""
+Trade Aggregates
+
+Materialized per-symbol performance aggregates over the scoped trade-history
+CSV, for the LLM decision context. Instead of re-reading the whole trade log
+before every decision, the store remembers how far into the log it has read
+and folds in only rows appended since (any writer: trader, monitors, Alpaca
+sync). Reads are served from the aggregates. The store is persisted next to
+the trade log, so a restart resumes from the saved offset. If the log is
+rewritten or truncated rather than appended to, the store is rebuilt from
+scratch.
+
+Key Features:
+- Per-symbol win counts, PnL sums, streaks and recent-outcome ring buffers
+- Recent-N trade pattern ring buffer across all symbols
+- Incremental catch-up from a byte offset (cost proportional to new rows)
+- Rewrite/truncation detection with automatic rebuild
+- Rebuild command: python -m utils.trade_aggregates --rebuild
+
+Usage:
+    from utils.trade_aggregates import get_trade_aggregates
+
+    aggregates = get_trade_aggregates("logs/trade_history_alpaca_paper.csv")
+    print(aggregates.symbol_performance())
+    print(aggregates.recent_patterns(5))
+
+Author: Robinhood HA Breakout System
+Version: 1.0.0
+License: MIT
+"""
+
+import csv
+import io
+import json
+import logging
+import os
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Mapping, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+STORE_VERSION = 1
+PNL_FIELDS = ("pnl_amount", "pnl", "pnl_dollars")
+_TAIL_BYTES = 64  # Bytes before the offset re-checked to detect a rewritten log
+
+
+def _row_pnl(row: Mapping[str, Any]) -> Optional[float]:
+    """PnL for a completed trade row, or None if the row has no PnL."""
+    for name in PNL_FIELDS:
+        value = row.get(name)
+        if value is not None and str(value).strip() != "":
+            try:
+                return float(value)
+            except (TypeError, ValueError):
+                return None
+    return None
+
+
+def _row_pnl_pct(row: Mapping[str, Any]) -> float:
+    for name in ("pnl_pct", "pnl_percent"):
+        value = row.get(name)
+        if value not in (None, ""):
+            try:
+                return float(value)
+            except (TypeError, ValueError):
+                return 0.0
+    return 0.0
+
+
+def _row_option_type(row: Mapping[str, Any]) -> str:
+    if row.get("option_type"):
+        return row["option_type"]
+    decision = str(row.get("decision", "")).upper()
+    if "CALL" in decision:
+        return "CALL"
+    if "PUT" in decision:
+        return "PUT"
+    return "UNKNOWN"
+
+
+@dataclass
+class SymbolAggregate:
+    """Running totals for one symbol."""
+
+    wins: int = 0
+    total: int = 0
+    total_pnl: float = 0.0
+    streak: int = 0  # +N consecutive wins, -N consecutive losses
+    recent: Deque[bool] = field(default_factory=deque)
+
+    def add(self, pnl: float, recent_size: int) -> None:
+        is_win = pnl > 0
+        self.total += 1
+        self.total_pnl += pnl
+        if is_win:
+            self.wins += 1
+        self.streak = (max(self.streak, 0) + 1) if is_win else (min(self.streak, 0) - 1)
+        self.recent.append(is_win)
+        while len(self.recent) > recent_size:
+            self.recent.popleft()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "wins": self.wins,
+            "total": self.total,
+            "total_pnl": self.total_pnl,
+            "streak": self.streak,
+            "recent": list(self.recent),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "SymbolAggregate":
+        return cls(
+            wins=int(data["wins"]),
+            total=int(data["total"]),
+            total_pnl=float(data["total_pnl"]),
+            streak=int(data["streak"]),
+            recent=deque(data.get("recent") or []),
+        )
+
+
+class TradeAggregates:
+    """Incrementally maintained performance aggregates for one trade log."""
+
+    def __init__(
+        self,
+        trade_log: Union[str, Path],
+        store_path: Optional[Union[str, Path]] = None,
+        recent_size: int = 50,
+    ):
+        """Initialize aggregates (loads the persisted store if it matches the log).
+
+        Args:
+            trade_log: Trade-history CSV
+            store_path: Persisted aggregates (default: next to the trade log)
+            recent_size: Capacity of the recent-pattern and per-symbol outcome ring buffers
+        """
+        self.trade_log = Path(trade_log)
+        self.store_path = Path(store_path) if store_path else self.trade_log.with_suffix(".aggregates.json")
+        self.recent_size = int(recent_size)
+        self.rebuilds = 0
+        self._lock = threading.Lock()
+        self._reset()
+        self._load_store()
+
+    def _reset(self) -> None:
+        self.offset = 0
+        self.rows = 0
+        self._tail = b""
+        self._header: Optional[List[str]] = None
+        self.symbols: Dict[str, SymbolAggregate] = {}
+        self.recent: Deque[Dict[str, Any]] = deque(maxlen=self.recent_size)
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _load_store(self) -> None:
+        try:
+            with open(self.store_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != STORE_VERSION or data.get("recent_size") != self.recent_size:
+                return
+            self.offset = int(data["offset"])
+            self.rows = int(data["rows"])
+            self._tail = bytes.fromhex(data["tail"])
+            self._header = data["header"]
+            self.symbols = {s: SymbolAggregate.from_dict(v) for s, v in data["symbols"].items()}
+            self.recent = deque(data["recent"], maxlen=self.recent_size)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"[AGGREGATES] Ignoring unreadable store {self.store_path}: {e}")
+            self._reset()
+
+    def _save_store(self) -> None:
+        data = {
+            "version": STORE_VERSION,
+            "trade_log": str(self.trade_log),
+            "recent_size": self.recent_size,
+            "offset": self.offset,
+            "rows": self.rows,
+            "tail": self._tail.hex(),
+            "header": self._header,
+            "symbols": {s: agg.to_dict() for s, agg in self.symbols.items()},
+            "recent": list(self.recent),
+        }
+        tmp_path = f"{self.store_path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.store_path)
+        except Exception as e:
+            logger.warning(f"[AGGREGATES] Could not persist {self.store_path}: {e}")
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def record(self, row: Mapping[str, Any]) -> bool:
+        """Fold one trade-log row into the aggregates.
+
+        Returns:
+            True if the row was a completed trade (had a PnL)
+        """
+        pnl = _row_pnl(row)
+        if pnl is None:
+            return False
+        symbol = row.get("symbol") or "UNKNOWN"
+        self.symbols.setdefault(symbol, SymbolAggregate()).add(pnl, self.recent_size)
+        self.recent.append({
+            "symbol": symbol,
+            "option_type": _row_option_type(row),
+            "outcome": "WIN" if pnl > 0 else "LOSS",
+            "pnl_pct": _row_pnl_pct(row),
+            "reason": row.get("reason") or "",
+        })
+        self.rows += 1
+        return True
+
+    def _log_rewritten(self, size: int) -> bool:
+        if size < self.offset:
+            return True
+        if not self._tail:
+            return self.offset > 0
+        with open(self.trade_log, "rb") as f:
+            f.seek(self.offset - len(self._tail))
+            return f.read(len(self._tail)) != self._tail
+
+    def refresh(self) -> int:
+        """Fold in rows appended to the trade log since the last refresh.
+
+        Returns:
+            Number of completed trades added
+        """
+        with self._lock:
+            try:
+                size = os.path.getsize(self.trade_log)
+            except OSError:
+                if self.offset:
+                    self._reset()
+                return 0
+            rewritten = self._log_rewritten(size)
+            if size == self.offset and not rewritten:
+                return 0  # Nothing appended (the common case)
+
+            if rewritten:
+                logger.info(f"[AGGREGATES] {self.trade_log} was rewritten; rebuilding")
+                self._reset()
+                self.rebuilds += 1
+
+            with open(self.trade_log, "rb") as f:
+                f.seek(self.offset)
+                chunk = f.read(size - self.offset)
+            end = chunk.rfind(b"\n") + 1  # Leave a partially written last line for next time
+            if end == 0:
+                return 0
+            chunk = chunk[:end]
+
+            reader = csv.reader(io.StringIO(chunk.decode("utf-8", errors="replace"), newline=""))
+            added = 0
+            for values in reader:
+                if not values:
+                    continue
+                if self._header is None:
+                    self._header = values
+                    continue
+                added += self.record(dict(zip(self._header, values)))
+
+            self.offset += end
+            self._tail = (self._tail + chunk)[-_TAIL_BYTES:]
+            self._save_store()
+            return added
+
+    def rebuild(self) -> int:
+        """Regenerate the aggregates from the full trade log.
+
+        Returns:
+            Number of completed trades aggregated
+        """
+        with self._lock:
+            self._reset()
+            self.rebuilds += 1
+        self.refresh()
+        return self.rows
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def symbol_performance(self) -> Dict[str, Dict[str, float]]:
+        """Per-symbol win rate, trade count and average PnL."""
+        with self._lock:  # refresh() may be adding symbols on another thread
+            symbols = [(symbol, agg.wins, agg.total, agg.total_pnl) for symbol, agg in self.symbols.items()]
+        return {
+            symbol: {
+                "win_rate": wins / total,
+                "total_trades": total,
+                "avg_pnl": total_pnl / total,
+            }
+            for symbol, wins, total, total_pnl in symbols
+            if total > 0
+        }
+
+    def recent_patterns(self, last_n: int = 5) -> List[Dict[str, Any]]:
+        """Most recent completed trades, oldest first."""
+        if last_n <= 0:
+            return []
+        with self._lock:
+            return [dict(p) for p in list(self.recent)[-last_n:]]
+
+    def streak(self, symbol: str) -> int:
+        with self._lock:
+            agg = self.symbols.get(symbol)
+            return agg.streak if agg else 0
+
+    def recent_outcomes(self, symbol: str) -> List[bool]:
+        with self._lock:
+            agg = self.symbols.get(symbol)
+            return list(agg.recent) if agg else []
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "trade_log": str(self.trade_log),
+            "rows": self.rows,
+            "symbols": len(self.symbols),
+            "offset": self.offset,
+            "rebuilds": self.rebuilds,
+        }
+
+
+_instances: Dict[str, TradeAggregates] = {}
+_instances_lock = threading.Lock()
+
+
+def get_trade_aggregates(trade_log: Union[str, Path]) -> TradeAggregates:
+    """Shared, refreshed aggregates for a trade log (one instance per path)."""
+    key = os.path.abspath(trade_log)
+    with _instances_lock:
+        aggregates = _instances.get(key)
+        if aggregates is None:
+            aggregates = _instances[key] = TradeAggregates(trade_log)
+    aggregates.refresh()
+    return aggregates
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Trade log performance aggregates")
+    parser.add_argument("trade_log", nargs="?", help="Trade-history CSV (default: TRADE_LOG_FILE from config)")
+    parser.add_argument("--rebuild", action="store_true", help="Regenerate the aggregates from the full trade log")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+    trade_log = args.trade_log
+    if not trade_log:
+        from utils.llm import load_config
+
+        trade_log = load_config().get("TRADE_LOG_FILE", "logs/trade_history_robinhood_live.csv")
+
+    aggregates = TradeAggregates(trade_log)
+    if args.rebuild:
+        print(f"Rebuilt {aggregates.store_path}: {aggregates.rebuild()} trades")
+    else:
+        aggregates.refresh()
+    print(json.dumps({"metrics": aggregates.metrics(), "symbols": aggregates.symbol_performance()}, indent=2))
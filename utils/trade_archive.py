@@ -0,0 +1,853 @@
+#!/usr/bin/env python3
+"""
+Trade Archive
+
+Columnar copy of the trade-history CSV, partitioned by date and symbol, for
+the analytics dashboards. Every row the trade-log writers append (trade
+decisions, per-symbol NO_TRADE decisions, realized trades) is also buffered
+here. The rows are written in batches as columnar part files:
+
+    logs/archive/<trade log name>/date=2026-10-16/symbol=SPY/part-<ns>-<pid>-<n>.parquet
+
+Readers load only the partitions inside the requested date/symbol range and
+only the requested columns, so NO_TRADE volume and free-text columns no
+longer slow down every dashboard load. Parts are written as Parquet when
+pyarrow is installed. Without pyarrow, each part is an uncompressed NumPy
+.npz with one array per column (numeric columns as float64; string columns
+dictionary-encoded as int32 codes plus their distinct values), which still
+allows column-selective reads.
+
+Each column has one type for the whole archive: the trade-log columns have
+fixed types (COLUMN_TYPES), and any other column is typed by all of its
+values in the CSV at backfill time, or by the first values written. The types
+are kept in the manifest, so every part stores a column the same way and
+numeric-looking values in a text column stay text.
+
+The first row mirrored for a trade log without an archive starts the CSV
+backfill on a background thread; new rows are buffered until it finishes.
+
+Compaction merges a partition's parts into one file. The merged file is
+renamed into place with a sidecar listing the parts it replaces; readers
+ignore the replaced parts, and a crash mid-compaction is finished (or
+discarded) on the next run.
+
+The CSV stays the source of truth. Rows still buffered when a process dies
+(at most TRADE_ARCHIVE_FLUSH_SECONDS worth) are lost; --rebuild re-imports
+the archive from the CSV.
+
+Key Features:
+- Date/symbol partition pruning and column pruning on read
+- Batched appends (by row count and age, plus at interpreter exit)
+- One-time backfill from the existing trade log, off the logging path
+- One type per column across all parts
+- Automatic and on-demand compaction of fragmented partitions
+- Parquet (pyarrow) or NumPy .npz part files
+
+Usage:
+    from utils.trade_archive import open_trade_archive
+
+    archive = open_trade_archive("logs/trade_history_alpaca_paper.csv")
+    df = archive.read(columns=["timestamp", "symbol", "pnl_amount"], start="2026-10-01")
+
+    python -m utils.trade_archive --compact
+    python -m utils.trade_archive --rebuild logs/trade_history_alpaca_paper.csv
+
+Author: Robinhood HA Breakout System
+Version: 1.0.0
+License: MIT
+"""
+
+import atexit
+import csv
+import json
+import logging
+import os
+import re
+import shutil
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow.parquet as pq
+
+    PARQUET_AVAILABLE = True
+except ImportError:
+    pq = None
+    PARQUET_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_VERSION = 1
+MANIFEST_NAME = "_archive.json"
+LOCK_NAME = "_archive.lock"
+LOCK_STALE_SECONDS = 600
+FORMAT_SUFFIXES = {"parquet": ".parquet", "npz": ".npz"}
+REPLACES_SUFFIX = ".replaces.json"
+DICT_PREFIX = "__values__."
+
+_DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}")
+_SYMBOL_RE = re.compile(r"[^A-Za-z0-9._-]")
+
+DateLike = Union[str, datetime, None]
+
+# Trade-log columns (utils.logging_utils.TRADE_LOG_HEADER) and their archive types
+COLUMN_TYPES = {
+    **dict.fromkeys(("timestamp", "symbol", "decision", "reason", "status", "exit_reason", "vix_regime"), "str"),
+    **dict.fromkeys(("confidence", "current_price", "strike", "premium", "quantity", "total_cost", "fill_price",
+                     "pnl_pct", "pnl_amount", "vix_level", "vix_adjustment_factor"), "float"),
+}
+
+
+def archive_root_for(trade_log: Union[str, Path]) -> Path:
+    """Default archive directory for a trade log: logs/archive/<log name>/."""
+    trade_log = Path(trade_log)
+    return trade_log.parent / "archive" / trade_log.stem
+
+
+def resolve_format(fmt: Optional[str] = "auto") -> str:
+    """Resolve "auto"/"parquet"/"npz" to the part format actually used."""
+    fmt = (fmt or "auto").lower()
+    if fmt == "auto":
+        return "parquet" if PARQUET_AVAILABLE else "npz"
+    if fmt not in FORMAT_SUFFIXES:
+        raise ValueError(f"Unknown trade archive format '{fmt}' (expected parquet, npz or auto)")
+    if fmt == "parquet" and not PARQUET_AVAILABLE:
+        raise ValueError("Parquet trade archive requires pyarrow (pip install pyarrow)")
+    return fmt
+
+
+def partition_key(row: Mapping[str, Any]) -> Tuple[str, str]:
+    """(date, symbol) partition for a trade-log row."""
+    timestamp = str(row.get("timestamp") or "")
+    day = timestamp[:10] if _DATE_RE.match(timestamp) else "unknown"
+    symbol = _SYMBOL_RE.sub("_", str(row.get("symbol") or "")) or "UNKNOWN"
+    return day, symbol
+
+
+def _day(value: DateLike) -> Optional[str]:
+    if value is None:
+        return None
+    if hasattr(value, "isoformat"):
+        return value.isoformat()[:10]
+    return str(value)[:10]
+
+
+def _blank(value: Any) -> bool:
+    return value is None or value == "" or (isinstance(value, float) and value != value)
+
+
+def _numeric(value: Any) -> bool:
+    if isinstance(value, bool):
+        return False
+    try:
+        float(value)
+    except (TypeError, ValueError):
+        return False
+    return True
+
+
+def _infer_type(values: Iterable[Any]) -> Optional[str]:
+    """"float" if every non-blank value is numeric, "str" otherwise, None if all are blank."""
+    kind = None
+    for value in values:
+        if _blank(value):
+            continue
+        if not _numeric(value):
+            return "str"
+        kind = "float"
+    return kind
+
+
+def _column_array(values: Sequence[Any], kind: Optional[str] = None) -> np.ndarray:
+    """Column of the given type ("float" or "str"; inferred from the values if None).
+
+    float64 columns hold NaN for blank (or non-numeric) values; string columns hold "" for blanks.
+    """
+    kind = kind or _infer_type(values) or "float"
+    if kind == "float":
+        floats = np.full(len(values), np.nan, dtype=np.float64)
+        for i, value in enumerate(values):
+            if not _blank(value) and _numeric(value):
+                floats[i] = float(value)
+        return floats
+    return np.array(["" if _blank(v) else str(v) for v in values], dtype=str)
+
+
+def _merge_columns(
+    chunks: Iterable[Tuple[Dict[str, np.ndarray], int]],
+    kinds: Optional[Mapping[str, str]] = None,
+) -> Dict[str, np.ndarray]:
+    """Concatenate column dicts (missing columns filled with blanks), using kinds where given."""
+    chunks = list(chunks)
+    kinds = kinds or {}
+    names = list(dict.fromkeys(name for columns, _ in chunks for name in columns))
+    merged = {}
+    for name in names:
+        values: List[Any] = []
+        for columns, rows in chunks:
+            values.extend(columns[name].tolist() if name in columns else [None] * rows)
+        merged[name] = _column_array(values, kinds.get(name))
+    return merged
+
+
+def _csv_rows(trade_log: Union[str, Path], limit: Optional[int] = None) -> Iterator[Dict[str, str]]:
+    """Rows of a trade-log CSV, stopping at byte offset limit (the file size when a backfill started)."""
+    def lines() -> Iterator[str]:
+        with open(trade_log, "rb") as f:
+            while limit is None or f.tell() < limit:
+                line = f.readline()
+                if not line:
+                    break
+                yield line.decode("utf-8", errors="replace")
+
+    return csv.DictReader(lines())
+
+
+def _dictionary_encode(columns: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """Store string columns as int32 codes plus their distinct values (.npz parts)."""
+    encoded = {}
+    for name, array in columns.items():
+        if array.dtype.kind == "U":
+            values, codes = np.unique(array, return_inverse=True)
+            encoded[name] = codes.astype(np.int32)
+            encoded[DICT_PREFIX + name] = values
+        else:
+            encoded[name] = array
+    return encoded
+
+
+class TradeArchive:
+    """Date/symbol-partitioned columnar archive of one trade log."""
+
+    def __init__(
+        self,
+        root: Union[str, Path],
+        fmt: str = "auto",
+        flush_rows: int = 500,
+        flush_seconds: float = 30.0,
+        compact_parts: int = 16,
+    ):
+        """Initialize the archive.
+
+        Args:
+            root: Archive directory
+            fmt: Part format for new writes ("parquet", "npz" or "auto")
+            flush_rows: Buffered rows that trigger a write
+            flush_seconds: Age of the oldest buffered row that triggers a write
+            compact_parts: Compact a partition once it has this many parts (0 disables)
+        """
+        self.root = Path(root)
+        self.format = resolve_format(fmt)
+        self.flush_rows = max(1, int(flush_rows))
+        self.flush_seconds = float(flush_seconds)
+        self.compact_parts = int(compact_parts)
+
+        self._lock = threading.RLock()
+        self._buffers: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        self._buffered = 0
+        self._oldest: Optional[float] = None
+        self._initialized = False
+        self._seq = 0
+        self._kinds: Optional[Dict[str, str]] = None  # Column types, as kept in the manifest
+        self._backfill: Optional[threading.Thread] = None
+        self._backfilling = False
+
+        self.rows_written = 0
+        self.parts_written = 0
+        self.compactions = 0
+        self.write_errors = 0
+
+    # ------------------------------------------------------------------
+    # Layout
+    # ------------------------------------------------------------------
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.root / MANIFEST_NAME
+
+    @property
+    def initialized(self) -> bool:
+        """True once the archive has been created or backfilled from its trade log."""
+        if not self._initialized:
+            self._initialized = self.manifest_path.exists()
+        return self._initialized
+
+    def _write_manifest(self, **fields: Any) -> None:
+        data = {"version": ARCHIVE_VERSION, "format": self.format,
+                "created_at": datetime.now().isoformat(), **fields}
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.manifest_path.with_name(MANIFEST_NAME + f".{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+        self._initialized = True
+
+    def _read_manifest(self) -> Dict[str, Any]:
+        try:
+            return json.loads(self.manifest_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def _column_kinds(self, names: Iterable[str], rows: Sequence[Mapping[str, Any]]) -> Dict[str, str]:
+        """Archive type of each column; a column's type is decided the first time it has values."""
+        if self._kinds is None:
+            self._kinds = {**COLUMN_TYPES, **self._read_manifest().get("columns", {})}
+        names = list(names)
+        if any(name not in self._kinds for name in names):
+            self._kinds.update(self._read_manifest().get("columns", {}))  # Decided by another process?
+            decided = {}
+            for name in names:
+                if name not in self._kinds:
+                    kind = _infer_type(row.get(name) for row in rows)
+                    if kind:
+                        decided[name] = kind
+            if decided:
+                self._kinds.update(decided)
+                if self.initialized:
+                    manifest = self._read_manifest()
+                    self._write_manifest(**{k: v for k, v in manifest.items() if k not in ("version", "format")},
+                                         columns=self._kinds)
+        return self._kinds
+
+    def partition_dir(self, day: str, symbol: str) -> Path:
+        return self.root / f"date={day}" / f"symbol={symbol}"
+
+    def partitions(
+        self,
+        start: DateLike = None,
+        end: DateLike = None,
+        symbols: Optional[Iterable[str]] = None,
+    ) -> List[Tuple[str, str, Path]]:
+        """Partitions inside the date range (inclusive) and symbol set, in date order."""
+        start, end = _day(start), _day(end)
+        wanted = {s.upper() for s in symbols} if symbols else None
+        found = []
+        if not self.root.is_dir():
+            return found
+        for day_dir in sorted(self.root.glob("date=*")):
+            day = day_dir.name[len("date="):]
+            if (start or end) and not _DATE_RE.match(day):
+                continue
+            if (start and day < start) or (end and day > end):
+                continue
+            for symbol_dir in sorted(day_dir.glob("symbol=*")):
+                symbol = symbol_dir.name[len("symbol="):]
+                if wanted is None or symbol.upper() in wanted:
+                    found.append((day, symbol, symbol_dir))
+        return found
+
+    @staticmethod
+    def _parts(path: Path) -> List[Path]:
+        """Live part files of a partition (oldest first), excluding parts already compacted away."""
+        if not path.is_dir():
+            return []
+        replaced = set()
+        for sidecar in path.glob(f"*{REPLACES_SUFFIX}"):
+            merged = sidecar.with_name(sidecar.name[:-len(REPLACES_SUFFIX)])
+            if merged.exists():
+                try:
+                    replaced.update(json.loads(sidecar.read_text(encoding="utf-8")))
+                except (OSError, ValueError):
+                    pass
+        return sorted(
+            p for p in path.iterdir()
+            if p.name.startswith("part-") and p.suffix in (".parquet", ".npz") and p.name not in replaced
+        )
+
+    # ------------------------------------------------------------------
+    # Part files
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _dump(path: Path, columns: Dict[str, np.ndarray], parquet: bool) -> None:
+        if parquet:
+            pd.DataFrame(columns).to_parquet(path, index=False)
+        else:
+            with open(path, "wb") as f:
+                np.savez(f, **_dictionary_encode(columns))
+
+    def _write_part(self, path: Path, columns: Dict[str, np.ndarray]) -> None:
+        tmp_path = path.with_name(path.name + ".tmp")
+        self._dump(tmp_path, columns, parquet=path.suffix == ".parquet")
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _read_part(path: Path, columns: Optional[Sequence[str]] = None) -> Tuple[Dict[str, np.ndarray], int]:
+        """Read (a subset of) a part's columns without touching the others."""
+        if path.suffix == ".parquet":
+            if pq is None:
+                raise RuntimeError(f"Reading {path} requires pyarrow")
+            names = pq.read_schema(path).names
+            wanted = names if columns is None else [c for c in columns if c in names]
+            table = pq.read_table(path, columns=wanted)
+            data = {}
+            for name in wanted:
+                array = table.column(name).to_numpy(zero_copy_only=False)
+                if array.dtype == object:
+                    array[array == ""] = np.nan
+                data[name] = array
+            return data, table.num_rows
+        with np.load(path, allow_pickle=False) as npz:
+            keys = set(npz.files)
+            names = [n for n in npz.files if not n.startswith(DICT_PREFIX)]
+            wanted = names if columns is None else [c for c in columns if c in keys and c in names]
+            data = {}
+            for name in wanted:
+                array = npz[name]
+                if DICT_PREFIX + name in keys:
+                    # Shared string objects per distinct value; blanks become NaN like pd.read_csv
+                    values = npz[DICT_PREFIX + name].astype(object)
+                    values[values == ""] = np.nan
+                    array = values[array]
+                data[name] = array
+            rows = len(data[wanted[0]]) if wanted else len(npz[names[0]]) if names else 0
+        return data, rows
+
+    def _new_part_path(self, directory: Path) -> Path:
+        self._seq += 1
+        return directory / f"part-{time.time_ns():020d}-{os.getpid()}-{self._seq}{FORMAT_SUFFIXES[self.format]}"
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def append(self, row: Mapping[str, Any]) -> None:
+        """Buffer one trade-log row (written once the batch is full or old enough, and no backfill is running)."""
+        with self._lock:
+            self._buffers.setdefault(partition_key(row), []).append(
+                {k: v for k, v in row.items() if isinstance(k, str)}
+            )
+            self._buffered += 1
+            if self._oldest is None:
+                self._oldest = time.monotonic()
+            due = self._buffered >= self.flush_rows or time.monotonic() - self._oldest >= self.flush_seconds
+            if due:
+                self.flush()
+
+    def flush(self) -> int:
+        """Write all buffered rows as one new part per partition.
+
+        While a backfill is running the rows stay buffered (it flushes them
+        when it finishes; if the process exits first, the next backfill
+        imports them from the CSV).
+
+        Returns:
+            Number of rows written
+        """
+        with self._lock:
+            if not self._buffered or self._backfilling:
+                return 0
+            buffers, self._buffers = self._buffers, {}
+            self._buffered, self._oldest = 0, None
+
+            written = sum(self._write_rows(day, symbol, rows, compact=True)
+                          for (day, symbol), rows in buffers.items())
+            self.rows_written += written
+            return written
+
+    def _write_rows(self, day: str, symbol: str, rows: List[Dict[str, Any]], compact: bool = False) -> int:
+        """Write rows as one new part of a partition. Returns the rows written (0 on error)."""
+        directory = self.partition_dir(day, symbol)
+        names = list(dict.fromkeys(name for row in rows for name in row))
+        kinds = self._column_kinds(names, rows)
+        columns = {name: _column_array([row.get(name) for row in rows], kinds.get(name)) for name in names}
+        try:
+            directory.mkdir(parents=True, exist_ok=True)
+            self._write_part(self._new_part_path(directory), columns)
+        except Exception as e:
+            self.write_errors += 1
+            logger.error(f"[ARCHIVE] Failed to write {len(rows)} rows to {directory}: {e}")
+            return 0
+        self.parts_written += 1
+        if compact and self.compact_parts and len(self._parts(directory)) >= self.compact_parts:
+            try:
+                with self._exclusive() as acquired:
+                    if acquired:
+                        self._compact_partition(directory)
+            except Exception as e:
+                logger.warning(f"[ARCHIVE] Compaction of {directory} failed: {e}")
+        return len(rows)
+
+    @contextmanager
+    def _exclusive(self, wait_seconds: float = 0.0) -> Iterator[bool]:
+        """Cross-process lock for compaction and backfill (yields False if busy)."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        lock_path = self.root / LOCK_NAME
+        deadline = time.monotonic() + wait_seconds
+        fd = None
+        while fd is None:
+            try:
+                fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                try:
+                    if time.time() - lock_path.stat().st_mtime > LOCK_STALE_SECONDS:
+                        logger.warning(f"[ARCHIVE] Breaking stale lock {lock_path}")
+                        lock_path.unlink()
+                        continue
+                except FileNotFoundError:
+                    continue
+                if time.monotonic() >= deadline:
+                    yield False
+                    return
+                time.sleep(0.05)
+        try:
+            os.write(fd, str(os.getpid()).encode())
+            yield True
+        finally:
+            os.close(fd)
+            try:
+                lock_path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def import_csv(self, trade_log: Union[str, Path], replace: bool = False, limit: Optional[int] = None) -> int:
+        """Backfill the archive from a trade-log CSV (once, unless replace=True).
+
+        Column types are taken from all of a column's values in the CSV. Parts
+        left by an import that did not finish are replaced.
+
+        Args:
+            trade_log: Trade-history CSV
+            replace: Drop existing partitions and re-import (rebuild)
+            limit: Import only the rows before this byte offset
+
+        Returns:
+            Rows imported (0 if the archive was already initialized)
+        """
+        if replace:
+            with self._lock:
+                self._buffers, self._buffered, self._oldest = {}, 0, None
+        with self._exclusive(wait_seconds=30.0) as acquired:
+            if not acquired:
+                logger.warning(f"[ARCHIVE] {self.root} is locked by another process; import skipped")
+                return 0
+            self._initialized = False
+            if not replace and self.initialized:
+                return 0
+            for day_dir in self.root.glob("date=*"):
+                shutil.rmtree(day_dir, ignore_errors=True)
+
+            kinds = dict(COLUMN_TYPES)
+            if os.path.exists(trade_log):
+                for row in _csv_rows(trade_log, limit):
+                    for name, value in row.items():
+                        if name in COLUMN_TYPES or not isinstance(name, str) or _blank(value):
+                            continue
+                        if kinds.get(name) != "str":
+                            kinds[name] = "float" if _numeric(value) else "str"
+            self._kinds = kinds
+
+            imported = pending = 0
+            buffers: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+            if os.path.exists(trade_log):
+                for row in _csv_rows(trade_log, limit):
+                    buffers.setdefault(partition_key(row), []).append(
+                        {k: v for k, v in row.items() if isinstance(k, str)}
+                    )
+                    imported += 1
+                    pending += 1
+                    if pending >= self.flush_rows:
+                        for (day, symbol), rows in buffers.items():
+                            self.rows_written += self._write_rows(day, symbol, rows)
+                        buffers, pending = {}, 0
+                for (day, symbol), rows in buffers.items():
+                    self.rows_written += self._write_rows(day, symbol, rows)
+            self._compact_all()
+            self._write_manifest(source=str(trade_log), imported_rows=imported, columns=kinds)
+            logger.info(f"[ARCHIVE] Imported {imported} rows from {trade_log} into {self.root}")
+            return imported
+
+    def start_backfill(self, trade_log: Union[str, Path]) -> bool:
+        """Import the trade log on a background thread (once per archive instance).
+
+        The import covers the CSV as it is now. Rows appended afterwards are
+        passed to append() as usual and buffered until the import finishes.
+
+        Returns:
+            True if this call started the import
+        """
+        with self._lock:
+            if self._backfill is not None:
+                return False
+            try:
+                limit = os.path.getsize(trade_log)
+            except OSError:
+                limit = 0
+            self._backfilling = True
+            self._backfill = threading.Thread(
+                target=self._run_backfill, args=(trade_log, limit), name="trade-archive-backfill", daemon=True
+            )
+            self._backfill.start()
+            return True
+
+    def _run_backfill(self, trade_log: Union[str, Path], limit: int) -> None:
+        try:
+            self.import_csv(trade_log, limit=limit)
+        except Exception as e:
+            logger.error(f"[ARCHIVE] Backfill of {self.root} from {trade_log} failed: {e}")
+        finally:
+            with self._lock:
+                self._backfilling = False
+                self.flush()
+
+    def wait_for_backfill(self, timeout: Optional[float] = None) -> bool:
+        """Wait for a running backfill. Returns True if none is running anymore."""
+        thread = self._backfill
+        if thread is not None:
+            thread.join(timeout)
+        return not self._backfilling
+
+    # ------------------------------------------------------------------
+    # Compaction
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _recover(directory: Path) -> None:
+        """Finish (or discard) a compaction interrupted by a crash."""
+        for tmp_path in directory.glob("*.tmp"):
+            if time.time() - tmp_path.stat().st_mtime > LOCK_STALE_SECONDS:
+                tmp_path.unlink(missing_ok=True)
+        for sidecar in directory.glob(f"*{REPLACES_SUFFIX}"):
+            merged = sidecar.with_name(sidecar.name[:-len(REPLACES_SUFFIX)])
+            if merged.exists():
+                for name in json.loads(sidecar.read_text(encoding="utf-8")):
+                    (directory / name).unlink(missing_ok=True)
+            sidecar.unlink(missing_ok=True)
+
+    def _compact_partition(self, directory: Path) -> int:
+        """Merge a partition's parts into one file. Returns the number of parts merged."""
+        self._recover(directory)
+        parts = self._parts(directory)
+        if len(parts) < 2:
+            return 0
+
+        merged_columns = _merge_columns((self._read_part(p) for p in parts), self._column_kinds((), []))
+        # Sorts after every input and before parts appended meanwhile
+        stem = parts[-1].stem
+        stem = stem[:-2] if stem.endswith("-c") else stem
+        merged = directory / f"{stem}-c{FORMAT_SUFFIXES[self.format]}"
+        if merged in parts:
+            merged = directory / f"{stem}-c-c{FORMAT_SUFFIXES[self.format]}"
+
+        tmp_path = merged.with_name(merged.name + ".tmp")
+        self._dump(tmp_path, merged_columns, parquet=merged.suffix == ".parquet")
+        sidecar = merged.with_name(merged.name + REPLACES_SUFFIX)
+        sidecar.write_text(json.dumps([p.name for p in parts]), encoding="utf-8")
+        os.replace(tmp_path, merged)  # Readers switch to the merged part here
+        for part in parts:
+            part.unlink(missing_ok=True)
+        sidecar.unlink(missing_ok=True)
+
+        self.compactions += 1
+        return len(parts)
+
+    def _compact_all(self, min_parts: int = 2) -> Dict[str, int]:
+        result = {"partitions": 0, "parts_merged": 0}
+        for _, _, directory in self.partitions():
+            if len(self._parts(directory)) >= min_parts:
+                merged = self._compact_partition(directory)
+                if merged:
+                    result["partitions"] += 1
+                    result["parts_merged"] += merged
+            else:
+                self._recover(directory)
+        return result
+
+    def compact(self, min_parts: int = 2) -> Dict[str, int]:
+        """Merge every partition that has at least min_parts parts.
+
+        Returns:
+            {"partitions": compacted partitions, "parts_merged": input parts removed}
+        """
+        with self._lock:
+            self.flush()
+            with self._exclusive() as acquired:
+                if not acquired:
+                    logger.info(f"[ARCHIVE] Compaction of {self.root} already running elsewhere")
+                    return {"partitions": 0, "parts_merged": 0}
+                result = self._compact_all(min_parts)
+        if result["partitions"]:
+            logger.info(f"[ARCHIVE] Compacted {result['partitions']} partitions "
+                        f"({result['parts_merged']} parts) in {self.root}")
+        return result
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def read(
+        self,
+        columns: Optional[Sequence[str]] = None,
+        start: DateLike = None,
+        end: DateLike = None,
+        symbols: Optional[Iterable[str]] = None,
+    ) -> pd.DataFrame:
+        """Load archived rows in trade-log order.
+
+        Args:
+            columns: Columns to load (None for all); absent columns are skipped
+            start: First date to include (inclusive)
+            end: Last date to include (inclusive)
+            symbols: Symbols to include (None for all)
+
+        Returns:
+            DataFrame with blank strings as NaN (like pd.read_csv)
+        """
+        self.flush()
+        load = None if columns is None else list(dict.fromkeys([*columns, "timestamp"]))
+        frames = []
+        for _, _, directory in self.partitions(start, end, symbols):
+            for attempt in range(3):
+                try:
+                    chunks = [self._read_part(p, load) for p in self._parts(directory)]
+                    break
+                except FileNotFoundError:
+                    if attempt == 2:  # Compacted underneath us three times in a row
+                        raise
+            frames.extend(pd.DataFrame(data, index=range(rows)) for data, rows in chunks if rows)
+
+        if not frames:
+            return pd.DataFrame(columns=list(columns or []))
+        df = pd.concat(frames, ignore_index=True)
+        if "timestamp" in df.columns:
+            df = df.sort_values("timestamp", kind="stable", ignore_index=True)
+            if columns is not None and "timestamp" not in columns:
+                df = df.drop(columns="timestamp")
+        if columns is not None:
+            df = df[[c for c in columns if c in df.columns]]
+        return df
+
+    def metrics(self) -> Dict[str, Any]:
+        partitions = self.partitions()
+        return {
+            "root": str(self.root),
+            "format": self.format,
+            "partitions": len(partitions),
+            "parts": sum(len(self._parts(d)) for _, _, d in partitions),
+            "buffered_rows": self._buffered,
+            "rows_written": self.rows_written,
+            "parts_written": self.parts_written,
+            "compactions": self.compactions,
+            "write_errors": self.write_errors,
+        }
+
+
+# ----------------------------------------------------------------------
+# Shared instances and the trade-log writer hook
+# ----------------------------------------------------------------------
+
+_settings: Optional[Dict[str, Any]] = None
+_instances: Dict[str, TradeArchive] = {}
+_instances_lock = threading.Lock()
+
+
+def _archive_settings() -> Dict[str, Any]:
+    global _settings
+    if _settings is None:
+        try:
+            from utils.llm import load_config
+
+            config = load_config()
+        except Exception:
+            config = {}
+        _settings = {
+            "enabled": bool(config.get("TRADE_ARCHIVE_ENABLED", False)),
+            "format": config.get("TRADE_ARCHIVE_FORMAT", "auto"),
+            "flush_rows": int(config.get("TRADE_ARCHIVE_FLUSH_ROWS", 500)),
+            "flush_seconds": float(config.get("TRADE_ARCHIVE_FLUSH_SECONDS", 30)),
+            "compact_parts": int(config.get("TRADE_ARCHIVE_COMPACT_PARTS", 16)),
+        }
+    return _settings
+
+
+def flush_trade_archives() -> None:
+    """Write buffered rows of every open archive (also run at exit)."""
+    for archive in list(_instances.values()):
+        try:
+            archive.flush()
+        except Exception as e:
+            logger.error(f"[ARCHIVE] Flush at exit failed for {archive.root}: {e}")
+
+
+def get_trade_archive(trade_log: Union[str, Path]) -> TradeArchive:
+    """Shared archive for a trade log (one instance per path, flushed at exit)."""
+    key = os.path.abspath(trade_log)
+    with _instances_lock:
+        archive = _instances.get(key)
+        if archive is None:
+            settings = _archive_settings()
+            if not _instances:
+                atexit.register(flush_trade_archives)
+            archive = _instances[key] = TradeArchive(
+                archive_root_for(trade_log),
+                fmt=settings["format"],
+                flush_rows=settings["flush_rows"],
+                flush_seconds=settings["flush_seconds"],
+                compact_parts=settings["compact_parts"],
+            )
+    return archive
+
+
+def open_trade_archive(trade_log: Union[str, Path]) -> Optional[TradeArchive]:
+    """Archive for a trade log if one has been initialized, else None (read from the CSV)."""
+    root = archive_root_for(trade_log)
+    if not (root / MANIFEST_NAME).exists():
+        return None
+    key = os.path.abspath(trade_log)
+    with _instances_lock:
+        archive = _instances.get(key)
+    return archive or TradeArchive(root)
+
+
+def archive_trade_row(trade_log: Union[str, Path], row: Mapping[str, Any]) -> None:
+    """Mirror a row just appended to the trade log (no-op unless TRADE_ARCHIVE_ENABLED)."""
+    archive_trade_rows(trade_log, [row])
+
+
+def archive_trade_rows(trade_log: Union[str, Path], rows: List[Mapping[str, Any]]) -> None:
+    """Mirror rows just appended to the trade log in one batch (no-op unless TRADE_ARCHIVE_ENABLED)."""
+    if not rows or not _archive_settings()["enabled"]:
+        return
+    try:
+        archive = get_trade_archive(trade_log)
+        if not archive.initialized and archive.start_backfill(trade_log):
+            return  # The backfill reads these rows from the CSV
+        for row in rows:
+            archive.append(row)
+    except Exception as e:
+        logger.warning(f"[ARCHIVE] Could not archive {len(rows)} row(s) for {trade_log}: {e}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Partitioned columnar trade archive")
+    parser.add_argument("trade_log", nargs="?", help="Trade-history CSV (default: TRADE_LOG_FILE from config)")
+    parser.add_argument("--compact", action="store_true", help="Merge fragmented partitions")
+    parser.add_argument("--rebuild", action="store_true", help="Re-import the archive from the trade-log CSV")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+    trade_log = args.trade_log
+    if not trade_log:
+        from utils.llm import load_config
+
+        trade_log = load_config().get("TRADE_LOG_FILE", "logs/trade_history_robinhood_live.csv")
+
+    settings = _archive_settings()
+    archive = TradeArchive(archive_root_for(trade_log), fmt=settings["format"])
+    if args.rebuild:
+        print(f"Imported {archive.import_csv(trade_log, replace=True)} rows into {archive.root}")
+    elif not archive.initialized:
+        print(f"Imported {archive.import_csv(trade_log)} rows into {archive.root}")
+    if args.compact:
+        print(f"Compaction: {archive.compact()}")
+    print(json.dumps(archive.metrics(), indent=2))
@@ -13,8 +13,12 @@ from typing import Optional, Dict, Any
 from dataclasses import dataclass
 import yaml
 
+from .state_store import get_state_store
+
 logger = logging.getLogger(__name__)
 
+VIX_STATE_FILE = ".cache/vix_monitor_state.json"
+
 @dataclass
 class VIXData:
     """VIX data container with timestamp and value."""
@@ -55,7 +59,10 @@ class VIXMonitor:
         self.enabled = self.config.get('VIX_ENABLED', True)
         
         self._cached_vix: Optional[VIXData] = None
-        self._last_spike_state = False  # Track spike state changes for alerts
+        # Track spike state changes for alerts (persisted so a restart does not re-alert)
+        self._state = get_state_store().namespace("vix_monitor", VIX_STATE_FILE)
+        saved = self._state.load(default={})
+        self._last_spike_state = bool(saved.get("spike_active", False)) if isinstance(saved, dict) else False
         self._initialized = True
         
         self.logger.info(f"[VIX-MONITOR] Initialized (enabled: {self.enabled}, threshold: {self.vix_threshold})")
@@ -164,6 +171,12 @@ class VIXMonitor:
         if send_alerts and is_spike != self._last_spike_state:
             self._send_vix_alert(is_spike, vix_data.value)
             self._last_spike_state = is_spike
+            self._state.save({
+                "spike_active": is_spike,
+                "vix_value": vix_data.value,
+                "threshold": self.vix_threshold,
+                "changed_at": datetime.now().isoformat(),
+            })
         
         if is_spike:
             reason = f"VIX spike detected: {vix_data.value:.2f} > {self.vix_threshold:.1f} threshold"
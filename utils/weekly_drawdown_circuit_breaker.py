@@ -5,7 +5,6 @@ This module implements the weekly drawdown protection system that completely
 disables the trading system when weekly losses exceed configurable thresholds.
 """
 
-import json
 import logging
 from datetime import datetime
 from pathlib import Path
@@ -13,6 +12,7 @@ from typing import Dict, Tuple
 import pytz
 
 from .weekly_pnl_tracker import get_weekly_pnl_tracker
+from .state_store import get_state_store
 
 logger = logging.getLogger(__name__)
 
@@ -39,6 +39,7 @@ class WeeklyDrawdownCircuitBreaker:
     def __init__(self, config: Dict):
         self.config = config
         self.state_file = Path("weekly_circuit_breaker_state.json")
+        self._store = get_state_store().namespace("weekly_circuit_breaker", self.state_file)
         self.threshold_percent = config.get("WEEKLY_DRAWDOWN_THRESHOLD_PERCENT", 15.0)
         self.enabled = config.get("WEEKLY_DRAWDOWN_ENABLED", True)
         self.require_manual_reenable = config.get("WEEKLY_DRAWDOWN_REQUIRE_MANUAL_REENABLE", True)
@@ -55,16 +56,14 @@ class WeeklyDrawdownCircuitBreaker:
             logger.info(f"[WEEKLY-CIRCUIT-BREAKER] Initialized (enabled: {self.enabled}, threshold: {self.threshold_percent}%)")
     
     def _load_state(self) -> Dict:
-        """Load weekly circuit breaker state from file"""
+        """Load weekly circuit breaker state (served from the state store)"""
         try:
-            if self.state_file.exists():
-                with open(self.state_file, 'r') as f:
-                    state = json.load(f)
-                    logger.debug(f"[WEEKLY-CIRCUIT-BREAKER] Loaded state: {state.get('is_system_disabled', False)}")
-                    return state
-            else:
-                logger.info(f"[WEEKLY-CIRCUIT-BREAKER] No existing state file, creating new state")
-                return self._create_new_state()
+            state = self._store.load()
+            if isinstance(state, dict):
+                logger.debug(f"[WEEKLY-CIRCUIT-BREAKER] Loaded state: {state.get('is_system_disabled', False)}")
+                return state
+            logger.info(f"[WEEKLY-CIRCUIT-BREAKER] No usable state file, creating new state")
+            return self._create_new_state()
         except Exception as e:
             logger.error(f"[WEEKLY-CIRCUIT-BREAKER] Error loading state: {e}, creating new state")
             return self._create_new_state()
@@ -88,10 +87,9 @@ class WeeklyDrawdownCircuitBreaker:
         return state
     
     def _save_state(self, state: Dict):
-        """Save state to file"""
+        """Save state (written through: every change here is a disable or re-enable)"""
         try:
-            with open(self.state_file, 'w') as f:
-                json.dump(state, f, indent=2)
+            self._store.save(state, flush=True)
             logger.debug(f"[WEEKLY-CIRCUIT-BREAKER] State saved successfully")
         except Exception as e:
             logger.error(f"[WEEKLY-CIRCUIT-BREAKER] Error saving state: {e}")
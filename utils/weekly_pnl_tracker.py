@@ -9,8 +9,6 @@ from utils.logging_utils import setup_logging
 from utils.llm import load_config
 from utils.scoped_files import get_scoped_paths
 import pandas as pd
-import json
-import os
 import logging
 from datetime import datetime, timedelta
 from typing import Dict, List, Tuple, Optional
@@ -18,6 +16,7 @@ from pathlib import Path
 import pytz
 
 from .daily_pnl_tracker import get_daily_pnl_tracker
+from .state_store import get_state_store
 
 logger = logging.getLogger(__name__)
 
@@ -50,7 +49,10 @@ class WeeklyPnLTracker:
         
         # Load or create state
         self.state_file = Path("weekly_pnl_state.json")
+        self._store = get_state_store().namespace("weekly_pnl", self.state_file)
         self._state = self._load_state()
+        # ((today, cutoff), pnl, percent, records) for the lookback days before today
+        self._prior_totals: Optional[Tuple[Tuple[str, str], float, float, List[Dict]]] = None
         
         # Only log initialization once per process
         if not WeeklyPnLTracker._initialized:
@@ -58,16 +60,14 @@ class WeeklyPnLTracker:
             WeeklyPnLTracker._initialized = True
     
     def _load_state(self) -> Dict:
-        """Load weekly P&L state from file"""
+        """Load weekly P&L state (served from the state store)"""
         try:
-            if self.state_file.exists():
-                with open(self.state_file, 'r') as f:
-                    state = json.load(f)
-                    logger.debug(f"[WEEKLY-PNL] Loaded state with {len(state.get('daily_history', []))} daily records")
-                    return state
-            else:
-                logger.info(f"[WEEKLY-PNL] No existing state file, creating new state")
-                return self._create_new_state()
+            state = self._store.load()
+            if isinstance(state, dict):
+                logger.debug(f"[WEEKLY-PNL] Loaded state with {len(state.get('daily_history', []))} daily records")
+                return state
+            logger.info(f"[WEEKLY-PNL] No usable state file, creating new state")
+            return self._create_new_state()
         except Exception as e:
             logger.error(f"[WEEKLY-PNL] Error loading state: {e}, creating new state")
             return self._create_new_state()
@@ -91,10 +91,9 @@ class WeeklyPnLTracker:
         return state
     
     def _save_state(self, state: Dict):
-        """Save state to file"""
+        """Save state (coalesced; only called when the history or summary changes)"""
         try:
-            with open(self.state_file, 'w') as f:
-                json.dump(state, f, indent=2)
+            self._store.save(state)
             logger.debug(f"[WEEKLY-PNL] State saved successfully")
         except Exception as e:
             logger.error(f"[WEEKLY-PNL] Error saving state: {e}")
@@ -103,56 +102,55 @@ class WeeklyPnLTracker:
         """
         Update daily P&L record and return current daily performance.
         
+        Today's record is the last entry of the date-sorted history, so an
+        update is O(1); pruning and sorting only happen when a new day's
+        record is added. State is saved only when the record changes.
+        
         Returns:
             Tuple of (daily_pnl_amount, daily_pnl_percent, breakdown)
         """
         try:
-            # Get current daily P&L from daily tracker
+            # Get current daily P&L from daily tracker (cached balances)
             daily_pnl, daily_pnl_percent, breakdown = self.daily_pnl_tracker.calculate_current_daily_pnl()
             
             now_et = datetime.now(ET_TZ)
             today_date = now_et.strftime("%Y-%m-%d")
             
-            # Update or add today's record
-            daily_history = self._state.get("daily_history", [])
+            daily_history = self._state.setdefault("daily_history", [])
+            today_record = self._today_record(today_date)
             
-            # Check if today's record already exists
-            today_record = None
-            for record in daily_history:
-                if record.get("date") == today_date:
-                    today_record = record
-                    break
-            
-            if today_record:
-                # Update existing record
-                today_record.update({
+            if today_record is None:
+                # First update of the day: add the record, prune and re-sort once
+                daily_history.append({
+                    "date": today_date,
                     "pnl_amount": daily_pnl,
                     "pnl_percent": daily_pnl_percent,
                     "breakdown": breakdown,
+                    "timestamp": now_et.isoformat(),
                     "last_updated": now_et.isoformat()
                 })
+                
+                # Keep only the last 30 days of history (for performance)
+                cutoff_date = (now_et - timedelta(days=30)).strftime("%Y-%m-%d")
+                daily_history = [r for r in daily_history if r.get("date", "") >= cutoff_date]
+                daily_history.sort(key=lambda x: x.get("date", ""))
+                self._state["daily_history"] = daily_history
+                self._prior_totals = None
+            elif (
+                today_record.get("pnl_amount") == daily_pnl
+                and today_record.get("pnl_percent") == daily_pnl_percent
+                and today_record.get("breakdown") == breakdown
+            ):
+                return daily_pnl, daily_pnl_percent, breakdown  # Unchanged: nothing to persist
             else:
-                # Add new record
-                new_record = {
-                    "date": today_date,
+                today_record.update({
                     "pnl_amount": daily_pnl,
                     "pnl_percent": daily_pnl_percent,
                     "breakdown": breakdown,
-                    "timestamp": now_et.isoformat(),
                     "last_updated": now_et.isoformat()
-                }
-                daily_history.append(new_record)
-            
-            # Keep only the last 30 days of history (for performance)
-            cutoff_date = (now_et - timedelta(days=30)).strftime("%Y-%m-%d")
-            daily_history = [r for r in daily_history if r.get("date", "") >= cutoff_date]
-            
-            # Sort by date
-            daily_history.sort(key=lambda x: x.get("date", ""))
+                })
             
-            self._state["daily_history"] = daily_history
             self._state["last_updated"] = now_et.isoformat()
-            
             self._save_state(self._state)
             
             logger.debug(f"[WEEKLY-PNL] Updated daily P&L: ${daily_pnl:.2f} ({daily_pnl_percent:.2f}%)")
@@ -163,10 +161,40 @@ class WeeklyPnLTracker:
             logger.error(f"[WEEKLY-PNL] Error updating daily P&L: {e}")
             return 0.0, 0.0, {}
     
+    def _today_record(self, today_date: str) -> Optional[Dict]:
+        """Today's history record (normally the last one), or None"""
+        daily_history = self._state.get("daily_history", [])
+        if daily_history and daily_history[-1].get("date") == today_date:
+            return daily_history[-1]
+        for record in daily_history:
+            if record.get("date") == today_date:
+                return record
+        return None
+    
+    def _prior_days(self, today_date: str, cutoff_date: str) -> Tuple[float, float, List[Dict]]:
+        """Totals of the lookback days before today (computed once per day)"""
+        key = (today_date, cutoff_date)
+        if self._prior_totals is None or self._prior_totals[0] != key:
+            records = [
+                r for r in self._state.get("daily_history", [])
+                if cutoff_date <= r.get("date", "") < today_date
+            ]
+            self._prior_totals = (
+                key,
+                sum(r.get("pnl_amount", 0.0) for r in records),
+                sum(r.get("pnl_percent", 0.0) for r in records),
+                records,
+            )
+        _, pnl, percent, records = self._prior_totals
+        return pnl, percent, records
+    
     def calculate_weekly_pnl(self) -> Tuple[float, float, List[Dict]]:
         """
         Calculate rolling 7-day P&L performance.
         
+        Earlier days' totals are cached for the day; only today's running
+        P&L is added on each call.
+        
         Returns:
             Tuple of (weekly_pnl_amount, weekly_pnl_percent, weekly_records)
         """
@@ -175,29 +203,31 @@ class WeeklyPnLTracker:
             self.update_daily_pnl()
             
             now_et = datetime.now(ET_TZ)
+            today_date = now_et.strftime("%Y-%m-%d")
             cutoff_date = (now_et - timedelta(days=self.lookback_days)).strftime("%Y-%m-%d")
             
             # Get records within the lookback period
-            daily_history = self._state.get("daily_history", [])
-            weekly_records = [r for r in daily_history if r.get("date", "") >= cutoff_date]
+            prior_pnl, prior_percent, prior_records = self._prior_days(today_date, cutoff_date)
+            today_record = self._today_record(today_date)
+            weekly_records = prior_records + ([today_record] if today_record is not None else [])
             
             if not weekly_records:
                 logger.warning(f"[WEEKLY-PNL] No records found for weekly calculation")
                 return 0.0, 0.0, []
             
             # Calculate total weekly P&L
-            total_pnl = sum(record.get("pnl_amount", 0.0) for record in weekly_records)
+            total_pnl = prior_pnl + (today_record.get("pnl_amount", 0.0) if today_record else 0.0)
             
             # Calculate weekly percentage (approximate based on average daily percentages)
             # This is a simplified calculation - in production, you might want to use
             # actual starting balance from 7 days ago for more accuracy
-            daily_percentages = [record.get("pnl_percent", 0.0) for record in weekly_records]
-            weekly_percent = sum(daily_percentages)  # Simplified additive approach
+            weekly_percent = prior_percent + (today_record.get("pnl_percent", 0.0) if today_record else 0.0)  # Simplified additive approach
             
             logger.debug(f"[WEEKLY-PNL] Weekly calculation: ${total_pnl:.2f} ({weekly_percent:.2f}%) over {len(weekly_records)} days")
             
             # Update weekly summary
-            self._update_weekly_summary(total_pnl, weekly_percent)
+            if self._update_weekly_summary(total_pnl, weekly_percent):
+                self._save_state(self._state)
             
             return total_pnl, weekly_percent, weekly_records
             
@@ -205,9 +235,10 @@ class WeeklyPnLTracker:
             logger.error(f"[WEEKLY-PNL] Error calculating weekly P&L: {e}")
             return 0.0, 0.0, []
     
-    def _update_weekly_summary(self, weekly_pnl: float, weekly_percent: float):
-        """Update weekly summary statistics"""
+    def _update_weekly_summary(self, weekly_pnl: float, weekly_percent: float) -> bool:
+        """Update weekly summary statistics (returns True if anything changed)"""
         summary = self._state.get("weekly_summary", {})
+        before = dict(summary)
         
         # Update current week
         summary["current_week_pnl"] = weekly_pnl
@@ -224,6 +255,7 @@ class WeeklyPnLTracker:
             summary["best_week_percent"] = weekly_percent
         
         self._state["weekly_summary"] = summary
+        return summary != before
     
     def is_weekly_threshold_exceeded(self) -> Tuple[bool, str, Dict]:
         """